@@ -14,6 +14,12 @@ def create_app(config_name='development'):
     app = Flask(__name__)
     app.config.from_object(config_by_name[config_name])
 
+    # 응답 직렬화 (orjson 사용, 키 정렬/날짜 형식은 Flask 기본과 동일)
+    # 한글을 \uXXXX로 이스케이프하지 않고 UTF-8로 응답 (ensure_ascii가 True이면 orjson을 사용할 수 없음)
+    from utils.fast_json import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    app.json.ensure_ascii = False
+
     # 확장 프로그램 초기화
     db.init_app(app)
     migrate.init_app(app, db)
@@ -22,6 +28,34 @@ def create_app(config_name='development'):
     cache.init_app(app)
     CORS(app)
 
+    # 카탈로그 변경 시 음식 영양 정보 백필 작업자
+    from services.meal_nutrition import nutrition_backfill
+    nutrition_backfill.init_app(app)
+
+    # 식사/음식 변경 시 일일 영양 합계 테이블 갱신
+    from services import nutrition_rollup
+    nutrition_rollup.init_app(app)
+
+    # 사용자 데이터 변경 시 사용자별 캐시 버전 갱신
+    from services import user_cache
+    user_cache.init_app(app)
+
+    # 식사/음식/레시피 변경 시 검색 인덱스 갱신
+    from services import search_index
+    search_index.init_app(app)
+
+    # 검색 화면의 AI 레시피 제안 작업자
+    from services.recipe_suggestions import recipe_suggestions
+    recipe_suggestions.init_app(app)
+
+    # 추천/챗봇 기록 지연 쓰기 작업자
+    from services.audit_queue import audit_writer
+    audit_writer.init_app(app)
+
+    # 오래 걸리는 LLM API의 비동기 작업 실행기
+    from services.async_jobs import job_queue
+    job_queue.init_app(app)
+
     # 블루프린트 등록 - 지연 임포트 사용
     with app.app_context():
         from app.routers.auth import auth_bp
@@ -34,6 +68,7 @@ def create_app(config_name='development'):
         from app.routers.speech import speech_bp
         from app.routers.main import main_bp
         from app.routers.recognition import recognition_bp  # 음식 인식 Blueprint 추가
+        from app.routers.jobs import jobs_bp
 
         app.register_blueprint(auth_bp, url_prefix='/api/auth')
         app.register_blueprint(meal_bp, url_prefix='/api/meals')
@@ -45,6 +80,7 @@ def create_app(config_name='development'):
         app.register_blueprint(speech_bp, url_prefix='/api/speech')
         app.register_blueprint(main_bp, url_prefix='/api/main')
         app.register_blueprint(recognition_bp, url_prefix='/api/recognize')  # 새로운 음식 인식 엔드포인트
+        app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
 
     # 오류 핸들러 등록
     register_error_handlers(app)
@@ -100,6 +136,9 @@ def register_api_endpoints(app):
         nutrition_service = service_manager.get_service('nutrition')
         result = nutrition_service.analyze_food_nutrients(food_name, quantity, unit)
 
+        # 카탈로그에 없는 식품은 백그라운드에서 해석 중 (202 Accepted)
+        if result.get("source") == "pending":
+            return jsonify(result), 202
         return jsonify(result)
 
     # /api/recognize 엔드포인트는 이제 recognition_bp에서 처리하므로 삭제 또는 주석처리
@@ -122,6 +161,8 @@ def register_api_endpoints(app):
         recommendation_service = service_manager.get_service('recommendation')
         result = recommendation_service.get_similar_foods(food_name, limit)
 
+        if result.get("source") == "pending":
+            return jsonify(result), 202
         return jsonify(result)
 
 
@@ -24,6 +24,20 @@ class Config:
     # 캐시 설정
     CACHE_TYPE = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT = 300  # 5분
+    # 사용자별 화면 캐시 (데이터 변경 시 사용자 캐시 버전이 올라가 무효화되므로 길게 유지)
+    USER_VIEW_CACHE_TIMEOUT = 6 * 3600  # 6시간
+    # 검색 화면의 AI 레시피 제안 (백그라운드에서 생성한 결과 보관 시간)
+    RECIPE_SUGGESTION_CACHE_TIMEOUT = 3600  # 1시간
+
+    # 추천/챗봇 기록 지연 쓰기 (간격 또는 개수가 차면 한 번에 저장)
+    AUDIT_FLUSH_INTERVAL = 1.0  # 초
+    AUDIT_BATCH_SIZE = 100
+    AUDIT_MAX_ATTEMPTS = 5
+
+    # 오래 걸리는 LLM API의 비동기 작업 (?async=true, 결과는 /api/jobs/<job_id>로 조회)
+    ASYNC_JOB_WORKERS = 4  # 동시에 실행할 작업 수
+    ASYNC_JOB_MAX_PENDING = 100  # 실행 중 + 대기 중인 작업 최대 수 (초과 시 503)
+    ASYNC_JOB_RESULT_TIMEOUT = 600  # 작업 상태/결과 보관 시간 (초)
 
     # API 요청 제한
     RATELIMIT_DEFAULT = "200 per day, 50 per hour"
@@ -76,13 +76,13 @@ def calculate_daily_nutrition_target(user):
 
     return base_targets
 
-def generate_nutrition_insights(nutrition_data, user):
-    """영양 데이터 기반 인사이트 생성 헬퍼 함수"""
+def generate_nutrition_insights(nutrition_data, user, targets=None):
+    """영양 데이터 기반 인사이트 생성 헬퍼 함수 (targets: 인사이트 스냅샷 등에서 미리 계산된 목표 영양소)"""
     if not nutrition_data:
         return []
 
     # 사용자별 목표 영양소
-    targets = calculate_daily_nutrition_target(user)
+    targets = targets or calculate_daily_nutrition_target(user)
 
     insights = []
 
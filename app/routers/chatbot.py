@@ -1,39 +1,19 @@
 import os
+import json
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from utils.responses import success_response, error_response
-from services.chatbot import initialize_nutrition_chatbot
-
-# dotenv 라이브러리 추가
-from dotenv import load_dotenv
-
-# .env 파일의 환경 변수 로드
-load_dotenv()
-
-# 환경 변수에서 OpenAI API 키 가져오기
-OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
-
-# 의존성 주입에 필요한 저장소/서비스 임포트
-from repositories.user_repository import UserRepository
-from repositories.meal_repository import MealRepository
-from services.nutrition_service import NutritionService
+from app.routers.jobs import wants_async, job_accepted_response
+from services import service_manager
 
 # 챗봇 블루프린트 생성
 chatbot_bp = Blueprint('chatbot', __name__)
 
-# 챗봇 서비스 초기화
-nutrition_chatbot = initialize_nutrition_chatbot(
-    openai_api_key=OPENAI_API_KEY,
-    user_repository=UserRepository(),
-    nutrition_service=NutritionService(),
-    meal_repository=MealRepository()
-)
-
 @chatbot_bp.route('/api/chat', methods=['POST'])
 @jwt_required()  # JWT 인증 필요
 def chat_endpoint():
     """
-    개인화된 영양 챗봇 대화 엔드포인트
+    개인화된 영양 챗봇 대화 엔드포인트 (?async=true 또는 {"async": true}이면 작업 ID를 바로 반환)
     """
     try:
         # 현재 인증된 사용자 ID 가져오기
@@ -47,29 +27,41 @@ def chat_endpoint():
         if not message:
             return error_response('메시지를 입력해주세요.', 400)
 
-        # 대화 의도 분석
-        intent = nutrition_chatbot.analyze_conversation_intent(message)
-
-        # 챗봇 응답 생성
-        response = nutrition_chatbot.generate_chat_response(
-            user_id=current_user_id,
-            user_message=message
-        )
-
-        # 개인화된 추천 생성
-        recommendations = nutrition_chatbot.generate_personalized_recommendation(
-            user_id=current_user_id,
-            intent_category=intent.get('intent_category', '기타')
-        )
+        if wants_async():
+            return job_accepted_response('chat', current_user_id, process_chat_message, current_user_id, message)
 
         # 성공 응답
-        return success_response({
-            'response': response.get('response', ''),
-            'intent': intent,
-            'recommendations': recommendations,
-            'nutrition_context': response.get('nutrition_context', {})
-        })
+        return success_response(process_chat_message(current_user_id, message))
 
     except Exception as e:
         # 서버 오류 처리
-        return error_response(f'챗봇 응답 생성 중 오류 발생: {str(e)}', 500)
\ No newline at end of file
+        return error_response(f'챗봇 응답 생성 중 오류 발생: {str(e)}', 500)
+
+
+def process_chat_message(current_user_id, message):
+    """
+    챗봇 응답 데이터 생성 (요청 처리 또는 비동기 작업에서 실행)
+    """
+    # 애플리케이션 범위 챗봇 인스턴스 (최초 요청 시 생성)
+    nutrition_chatbot = service_manager.nutrition_chatbot
+
+    # 의도 분석, 응답, 추천을 한 번의 LLM 호출과 한 번의 컨텍스트 조회로 처리
+    result = nutrition_chatbot.process_message(
+        user_id=current_user_id,
+        user_message=message
+    )
+
+    # 대화 기록 저장 (백그라운드에서 모아서 저장, 다음 턴부터 대화 메모리에 사용)
+    service_manager.conversation_memory.record_turn(
+        current_user_id,
+        message,
+        result['response'],
+        json.dumps({'intent': result['intent']}, ensure_ascii=False, default=str)
+    )
+
+    return {
+        'response': result['response'],
+        'intent': result['intent'],
+        'recommendations': result['recommendations'],
+        'nutrition_context': result['nutrition_context']
+    }
@@ -0,0 +1,70 @@
+from flask import Blueprint, request, url_for, current_app
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from services.async_jobs import job_queue, JobQueueFull, FINISHED_STATUSES
+from utils.responses import success_response, error_response
+
+# 비동기 작업 블루프린트 생성
+jobs_bp = Blueprint('jobs', __name__)
+
+# long-poll 최대 대기 시간 (초)
+MAX_WAIT_SECONDS = 30
+
+
+def wants_async():
+    """요청이 비동기 실행을 선택했는지 확인 (?async=true 또는 Prefer: respond-async 헤더)"""
+    value = request.args.get('async')
+    if value is None and request.is_json:
+        value = str((request.get_json(silent=True) or {}).get('async', ''))
+    if value is not None and value.lower() in ('true', '1', 'yes'):
+        return True
+    return 'respond-async' in request.headers.get('Prefer', '')
+
+
+def job_accepted_response(kind, uid, func, *args, params=None):
+    """
+    작업을 등록하고 202 응답 반환 (같은 요청이 실행 중이면 그 작업 ID 반환)
+
+    :param kind: 작업 종류
+    :param uid: 요청한 사용자 ID
+    :param func: 앱 컨텍스트 안에서 실행할 함수 (응답 데이터 반환)
+    :param args: 함수 인자
+    :param params: 같은 요청 판단에 사용할 파라미터
+    :return: 작업 ID와 상태 조회 URL을 담은 응답
+    """
+    try:
+        job = job_queue.submit(kind, uid, func, *args, params=params)
+    except JobQueueFull as e:
+        current_app.logger.warning(f"비동기 작업 등록 거부 ({kind}): {str(e)}")
+        return error_response('요청이 많아 작업을 등록할 수 없습니다. 잠시 후 다시 시도해주세요.', 503)
+
+    status_url = url_for('jobs.get_job', job_id=job['job_id'])
+    response, status_code = success_response({
+        'job_id': job['job_id'],
+        'status': job['status'],
+        'status_url': status_url
+    }, 202)
+    return response, status_code, {'Location': status_url}
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+@jwt_required()
+def get_job(job_id):
+    """
+    비동기 작업 상태 조회 API
+
+    wait 파라미터(초)를 주면 작업이 끝나거나 대기 시간이 지날 때까지 기다린 뒤 응답한다.
+    완료 전에는 202, 완료(성공/실패) 후에는 200을 반환한다.
+    """
+    current_user_id = get_jwt_identity()
+    wait = min(max(request.args.get('wait', 0, type=float), 0), MAX_WAIT_SECONDS)
+
+    if wait > 0:
+        job = job_queue.wait(job_id, current_user_id, wait)
+    else:
+        job = job_queue.get(job_id, current_user_id)
+
+    if job is None:
+        return error_response('작업을 찾을 수 없습니다.', 404)
+
+    data = {key: value for key, value in job.items() if key != 'uid'}
+    return success_response(data, 200 if job['status'] in FINISHED_STATUSES else 202)
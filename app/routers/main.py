@@ -1,4 +1,4 @@
-from flask import Blueprint, jsonify, current_app, request
+from flask import Blueprint, jsonify, current_app, request, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.extensions import db, cache
 from models.user import User
@@ -6,13 +6,15 @@ from models.meal import Meal
 from models.food import Food
 from models.recommendation import Recommendation
 from utils.responses import success_response, error_response
+from utils.serializers import meal_list_options, serialize_meal, serialize_meals, meal_row_columns, serialize_meal_rows
+from services.user_cache import cached_user_view, get_cache_stats
 from datetime import datetime, timedelta
 
 main_bp = Blueprint('main', __name__)
 
 @main_bp.route('/dashboard', methods=['GET'])
 @jwt_required()
-@cache.cached(timeout=300, key_prefix=lambda: f'dashboard_{get_jwt_identity()}')
+@cached_user_view('dashboard', key_parts=lambda: [datetime.now().strftime('%Y-%m-%d')])
 def get_dashboard():
     """메인 대시보드 API"""
     current_user_id = get_jwt_identity()
@@ -26,43 +28,45 @@ def get_dashboard():
     today = datetime.now().date()
 
     # 오늘의 식사 목록
-    today_meals = Meal.query.filter_by(
+    today_meals = Meal.query.options(*meal_list_options()).filter_by(
         uid=current_user_id,
         date=today
     ).order_by(Meal.mid.desc()).all()
 
-    # 오늘의 영양 섭취 정보
+    # 오늘의 영양 섭취 정보 (일일 영양 합계 테이블)
     today_nutrition = {}
     if today_meals:
-        all_foods = []
-        for meal in today_meals:
-            foods = Food.query.filter_by(mid=meal.mid).all()
-            for food in foods:
-                all_foods.append(food.food_name)
-
-        if all_foods:
-            from services.nutrition_analysis import analyze_meal_nutrition
-            try:
-                today_nutrition = analyze_meal_nutrition(all_foods)
-            except Exception as e:
-                current_app.logger.error(f"영양 분석 오류: {str(e)}")
+        from services.nutrition_rollup import get_daily_rollups
+        try:
+            rollup = get_daily_rollups(current_user_id, today).get(today)
+            if rollup:
+                today_nutrition = rollup.get_nutrition()
+        except Exception as e:
+            current_app.logger.error(f"영양 분석 오류: {str(e)}")
 
     # 최근 추천 정보
     recent_recommendations = Recommendation.query.filter_by(
         uid=current_user_id
     ).order_by(Recommendation.rid.desc()).limit(3).all()
 
+    # 주간 인사이트 스냅샷 (야간 배치 작업에서 미리 계산된 목표/인사이트)
+    from services.insight_snapshot import get_user_snapshot
+    snapshot = get_user_snapshot(user)
+    targets = snapshot.get_targets() if snapshot else {}
+    calories_target = targets.get('calories', 2000)
+    protein_target = targets.get('protein', 60)
+
     # 목표 달성 상태
     goal_status = {
         'calories': {
             'current': today_nutrition.get('calories', 0),
-            'target': 2000,  # 사용자 정보에 따라 조정 가능
-            'percentage': min(100, round(today_nutrition.get('calories', 0) / 2000 * 100, 1))
+            'target': calories_target,
+            'percentage': min(100, round(today_nutrition.get('calories', 0) / calories_target * 100, 1))
         },
         'protein': {
             'current': today_nutrition.get('protein', 0),
-            'target': 60,  # 사용자 정보에 따라 조정 가능
-            'percentage': min(100, round(today_nutrition.get('protein', 0) / 60 * 100, 1))
+            'target': protein_target,
+            'percentage': min(100, round(today_nutrition.get('protein', 0) / protein_target * 100, 1))
         },
         'water': {
             'current': 1200,  # 실제로는 사용자 입력 또는 다른 소스에서 가져와야 함
@@ -74,9 +78,10 @@ def get_dashboard():
     return success_response({
         'user': user.to_dict(),
         'today_date': today.strftime('%Y-%m-%d'),
-        'today_meals': [meal.to_dict() for meal in today_meals],
+        'today_meals': serialize_meals(today_meals),
         'today_nutrition': today_nutrition,
         'goal_status': goal_status,
+        'weekly_insights': snapshot.to_dict() if snapshot else None,
         'recent_recommendations': [rec.to_dict() for rec in recent_recommendations]
     })
 
@@ -106,7 +111,7 @@ def get_quick_stats():
     ).count()
 
     # 최근 기록된 식사
-    last_meal = Meal.query.filter_by(
+    last_meal = Meal.query.options(*meal_list_options()).filter_by(
         uid=current_user_id
     ).order_by(Meal.date.desc(), Meal.mid.desc()).first()
 
@@ -118,7 +123,7 @@ def get_quick_stats():
     return success_response({
         'today_meal_count': today_meal_count,
         'weekly_meal_count': weekly_meal_count,
-        'last_meal': last_meal.to_dict() if last_meal else None,
+        'last_meal': serialize_meal(last_meal) if last_meal else None,
         'last_recommendation': last_recommendation.to_dict() if last_recommendation else None,
         'today_date': today.strftime('%Y-%m-%d'),
         'week_start_date': week_start.strftime('%Y-%m-%d')
@@ -212,40 +217,60 @@ def get_featured_content():
 @main_bp.route('/search', methods=['GET'])
 @jwt_required()
 def search():
-    """통합 검색 API"""
-    query = request.args.get('q', '')
+    """
+    통합 검색 API
+
+    식사 설명, 음식 이름, 저장된 레시피를 검색 인덱스에서 찾는다.
+    ai_recipes=true이면 AI 레시피 제안을 백그라운드에서 생성하고 /search/ai-recipes 조회 경로를 함께 반환한다.
+    """
+    query = request.args.get('q', '').strip()
 
     if not query or len(query) < 2:
         return error_response('검색어는 2글자 이상이어야 합니다.', 400)
 
     current_user_id = get_jwt_identity()
-    search_results = {}
 
-    # 식사 기록 검색
-    meals = Meal.query.filter(
-        Meal.uid == current_user_id,
-        Meal.content.like(f'%{query}%')
-    ).order_by(Meal.date.desc()).limit(5).all()
-
-    # 음식 검색
-    foods = Food.query.join(Meal).filter(
-        Meal.uid == current_user_id,
-        Food.food_name.like(f'%{query}%')
-    ).order_by(Food.fid.desc()).limit(5).all()
-
-    # 레시피 검색 (외부 서비스 활용)
-    from services.recommendation import search_recipes
-    try:
-        recipes = search_recipes(query)
-    except Exception as e:
-        current_app.logger.error(f"레시피 검색 오류: {str(e)}")
-        recipes = []
+    from services import search_index
+    meals = search_index.search_meals(current_user_id, query, meal_row_columns())
+    foods = search_index.search_foods(current_user_id, query)
+    recipes = search_index.search_recipes(query)
 
     search_results = {
         'query': query,
-        'meals': [meal.to_dict() for meal in meals],
+        'meals': serialize_meal_rows(meals),
         'foods': [{'fid': food.fid, 'food_name': food.food_name, 'meal_id': food.mid} for food in foods],
         'recipes': recipes
     }
 
-    return success_response(search_results)
\ No newline at end of file
+    # AI 레시피 제안 (요청한 경우에만, 응답을 기다리지 않음)
+    if request.args.get('ai_recipes', 'false').lower() in ('true', '1', 'yes'):
+        search_results['ai_recipes'] = _ai_recipes(query)
+
+    return success_response(search_results)
+
+@main_bp.route('/search/ai-recipes', methods=['GET'])
+@jwt_required()
+def search_ai_recipes():
+    """AI 레시피 제안 조회 API (status가 pending이면 잠시 후 다시 조회)"""
+    query = request.args.get('q', '').strip()
+
+    if not query or len(query) < 2:
+        return error_response('검색어는 2글자 이상이어야 합니다.', 400)
+
+    return success_response({'query': query, **_ai_recipes(query)})
+
+def _ai_recipes(query):
+    """검색어의 AI 레시피 제안 상태와 조회 경로"""
+    from services.recipe_suggestions import recipe_suggestions
+    result = recipe_suggestions.get(query)
+    return {
+        'status': result['status'],
+        'recipes': result['recipes'],
+        'poll_url': url_for('main.search_ai_recipes', q=query)
+    }
+
+@main_bp.route('/cache-stats', methods=['GET'])
+@jwt_required()
+def cache_stats():
+    """사용자 화면 캐시 적중률 API (엔드포인트별)"""
+    return success_response({'endpoints': get_cache_stats()})
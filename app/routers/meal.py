@@ -4,12 +4,11 @@ import logging
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from services import service_manager
 from app.extensions import db  # 데이터베이스 연결
-from services.meal_service import MealService
+from utils.pagination import InvalidCursorError, parse_include_total
 
 # Blueprint 정의
 meal_bp = Blueprint('meal', __name__)
 logger = logging.getLogger(__name__)
-meal_service = MealService()
 
 # 헬퍼 함수 - 지연 임포트로 순환 참조 방지
 def get_meal_helpers():
@@ -98,9 +97,11 @@ def get_meal_records():
         end_date = request.args.get('end_date')
         meal_type = request.args.get('meal_type')
 
-        # 페이징 처리
+        # 페이징 처리 (cursor가 있으면 키셋 페이징, 없으면 기존 page/limit)
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 10))
+        cursor = request.args.get('cursor')
+        include_total = parse_include_total(request.args.get('include_total'))
 
         # 정렬 옵션
         sort_by = request.args.get('sort_by', 'datetime')
@@ -116,9 +117,20 @@ def get_meal_records():
             page=page,
             limit=limit,
             sort_by=sort_by,
-            sort_order=sort_order
+            sort_order=sort_order,
+            cursor=cursor,
+            include_total=include_total
         )
 
+        if cursor is not None:
+            return jsonify({
+                "success": True,
+                "meals": result.get('meals', []),
+                "total": result.get('total'),
+                "limit": limit,
+                "next_cursor": result.get('next_cursor')
+            }), 200
+
         return jsonify({
             "success": True,
             "meals": result.get('meals', []),
@@ -127,6 +139,8 @@ def get_meal_records():
             "limit": limit
         }), 200
 
+    except InvalidCursorError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         logger.error(f"식사 기록 조회 중 오류 발생: {str(e)}")
         return jsonify({"error": "식사 기록 조회 중 오류가 발생했습니다."}), 500
@@ -138,6 +152,7 @@ def get_meal_detail(meal_id):
     try:
         user_id = get_jwt_identity()
 
+        meal_service = service_manager.get_service('meal')
         result = meal_service.get_meal_detail(meal_id, user_id)
 
         if not result.get('success', False):
@@ -165,7 +180,8 @@ def update_meal(meal_id):
     if not data:
         return jsonify({"error": "수정할 식사 데이터가 필요합니다."}), 400
 
-    # 인스턴스를 통해 update_meal_record() 호출 (self 자동 전달)
+    # 공유 인스턴스를 통해 update_meal_record() 호출
+    meal_service = service_manager.get_service('meal')
     result = meal_service.update_meal_record(meal_id, user_id, data)
 
     if not result.get('success', False):
@@ -1,12 +1,16 @@
 from flask import Blueprint, request, jsonify, current_app
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
 from app.extensions import db, cache
 from models.meal import Meal
 from models.food import Food
-from models.user import User
-from services.nutrition_analysis import analyze_meal_nutrition, get_nutrition_insights
+from services.nutrition_analysis import get_nutrition_insights
 from services.rag_service import get_nutritional_research
+from services.meal_nutrition import meal_nutrition_totals, meals_with_foods, totals_from_foods
+from services.nutrition_rollup import get_daily_rollups, daily_series, average_nutrition
+from services.user_cache import cached_user_view
 from utils.responses import success_response, error_response
+from app.routers.jobs import wants_async, job_accepted_response
+from utils.serializers import serialize_meal
 from datetime import datetime, timedelta
 
 nutrition_bp = Blueprint('nutrition', __name__)
@@ -22,19 +26,16 @@ def analyze_meal(meal_id):
     if not meal:
         return error_response('식사 기록을 찾을 수 없습니다.', 404)
 
-    # 음식 목록 가져오기
-    foods = Food.query.filter_by(mid=meal_id).all()
-    if not foods:
+    # 음식 목록 확인
+    if not Food.query.filter_by(mid=meal_id).first():
         return error_response('이 식사에는 등록된 음식이 없습니다.', 404)
 
-    food_names = [food.food_name for food in foods]
-
     try:
-        # 영양 분석
-        nutrition_data = analyze_meal_nutrition(food_names)
+        # 영양 분석 (기록 시 저장된 음식별 영양소의 합계)
+        nutrition_data = meal_nutrition_totals([meal_id]).get(meal_id, {})
 
-        # 사용자 정보 가져오기 (나이, 성별 등에 따른 권장 섭취량 계산을 위해)
-        user = User.query.filter_by(uid=current_user_id).first()
+        # 사용자 정보 (나이, 성별 등에 따른 권장 섭취량 계산을 위해, JWT 검증 시 조회됨)
+        user = get_current_user()
 
         # 영양 인사이트 생성하기
         insights = get_nutrition_insights(nutrition_data, user)
@@ -62,11 +63,8 @@ def get_daily_nutrition():
     except ValueError:
         return error_response('날짜 형식이 올바르지 않습니다.', 400)
 
-    # 해당 날짜의 모든 식사 조회
-    meals = Meal.query.filter_by(
-        uid=current_user_id,
-        date=target_date
-    ).all()
+    # 해당 날짜의 모든 식사와 음식 조회 (한 번의 조인 쿼리)
+    meals = meals_with_foods(Meal.uid == current_user_id, Meal.date == target_date)
 
     if not meals:
         return success_response({
@@ -76,39 +74,21 @@ def get_daily_nutrition():
             'meals': []
         })
 
-    # 모든 식사의 음식 집계
-    all_foods = []
-    meal_data = []
-
-    for meal in meals:
-        foods = Food.query.filter_by(mid=meal.mid).all()
-        food_names = [food.food_name for food in foods]
-
-        if food_names:
-            all_foods.extend(food_names)
-            try:
-                nutrition = analyze_meal_nutrition(food_names)
-                meal_data.append({
-                    'meal': meal.to_dict(),
-                    'nutrition': nutrition
-                })
-            except Exception as e:
-                current_app.logger.error(f"식사 영양 분석 오류: {str(e)}")
-                meal_data.append({
-                    'meal': meal.to_dict(),
-                    'nutrition': None
-                })
-
-    # 전체 영양 분석
-    total_nutrition = {}
-    if all_foods:
-        try:
-            total_nutrition = analyze_meal_nutrition(all_foods)
-        except Exception as e:
-            current_app.logger.error(f"전체 영양 분석 오류: {str(e)}")
-
-    # 사용자 정보 가져오기
-    user = User.query.filter_by(uid=current_user_id).first()
+    # 식사별 영양소 합계 (함께 조회한 음식 행의 저장된 값 합계)
+    meal_data = [
+        {
+            'meal': serialize_meal(meal),
+            'nutrition': totals_from_foods(meal.foods)
+        }
+        for meal in meals if meal.foods
+    ]
+
+    # 전체 영양 합계 (일일 영양 합계 테이블)
+    rollup = get_daily_rollups(current_user_id, target_date).get(target_date)
+    total_nutrition = rollup.get_nutrition() if rollup else {}
+
+    # 사용자 정보 (JWT 검증 시 조회됨)
+    user = get_current_user()
 
     # 영양 인사이트 생성
     insights = get_nutrition_insights(total_nutrition, user)
@@ -122,7 +102,7 @@ def get_daily_nutrition():
 
 @nutrition_bp.route('/weekly', methods=['GET'])
 @jwt_required()
-@cache.cached(timeout=3600, key_prefix=lambda: f'weekly_nutrition_{get_jwt_identity()}_{request.args.get("end_date", datetime.now().strftime("%Y-%m-%d"))}')
+@cached_user_view('weekly_nutrition', key_parts=lambda: [request.args.get('end_date', datetime.now().strftime('%Y-%m-%d'))])
 def get_weekly_nutrition():
     """주간 영양 섭취 분석 API"""
     current_user_id = get_jwt_identity()
@@ -136,66 +116,14 @@ def get_weekly_nutrition():
     except ValueError:
         return error_response('날짜 형식이 올바르지 않습니다.', 400)
 
-    # 날짜별 영양 정보 초기화
-    daily_nutrition = {}
-    for i in range(7):
-        current_date = start_date + timedelta(days=i)
-        daily_nutrition[current_date.strftime('%Y-%m-%d')] = {
-            'date': current_date.strftime('%Y-%m-%d'),
-            'nutrition': {},
-            'meal_count': 0
-        }
-
-    # 해당 기간의 식사 조회
-    meals = Meal.query.filter(
-        Meal.uid == current_user_id,
-        Meal.date >= start_date,
-        Meal.date <= end_date
-    ).all()
-
-    # 날짜별 식사 분류 및 영양 분석
-    for meal in meals:
-        date_str = meal.date.strftime('%Y-%m-%d')
-        daily_nutrition[date_str]['meal_count'] += 1
-
-        foods = Food.query.filter_by(mid=meal.mid).all()
-        food_names = [food.food_name for food in foods]
-
-        if food_names:
-            try:
-                nutrition = analyze_meal_nutrition(food_names)
-
-                # 기존 영양 정보에 합산
-                if not daily_nutrition[date_str]['nutrition']:
-                    daily_nutrition[date_str]['nutrition'] = nutrition
-                else:
-                    for key, value in nutrition.items():
-                        if key in daily_nutrition[date_str]['nutrition']:
-                            daily_nutrition[date_str]['nutrition'][key] += value
-                        else:
-                            daily_nutrition[date_str]['nutrition'][key] = value
-            except Exception as e:
-                current_app.logger.error(f"영양 분석 오류: {str(e)}")
+    # 날짜별 영양 합계 (일일 영양 합계 테이블, 기록 없는 날은 빈 값)
+    daily_nutrition = daily_series(current_user_id, start_date, end_date)
 
     # 주간 평균 계산
-    weekly_average = {}
-    days_with_data = 0
-
-    for day_data in daily_nutrition.values():
-        if day_data['nutrition']:
-            days_with_data += 1
-            for key, value in day_data['nutrition'].items():
-                if key in weekly_average:
-                    weekly_average[key] += value
-                else:
-                    weekly_average[key] = value
+    weekly_average, _ = average_nutrition(daily_nutrition)
 
-    if days_with_data > 0:
-        for key in weekly_average:
-            weekly_average[key] /= days_with_data
-
-    # 사용자 정보
-    user = User.query.filter_by(uid=current_user_id).first()
+    # 사용자 정보 (JWT 검증 시 조회됨)
+    user = get_current_user()
 
     # 주간 인사이트
     weekly_insights = get_nutrition_insights(weekly_average, user, is_average=True)
@@ -205,29 +133,36 @@ def get_weekly_nutrition():
             'start_date': start_date.strftime('%Y-%m-%d'),
             'end_date': end_date.strftime('%Y-%m-%d')
         },
-        'daily_nutrition': list(daily_nutrition.values()),
+        'daily_nutrition': daily_nutrition,
         'weekly_average': weekly_average,
         'insights': weekly_insights,
-        'total_meals': sum(day['meal_count'] for day in daily_nutrition.values())
+        'total_meals': sum(day['meal_count'] for day in daily_nutrition)
     })
 
 @nutrition_bp.route('/research', methods=['GET'])
 @jwt_required()
 def get_nutrition_research():
-    """영양 관련 연구 정보 API (RAG 활용)"""
+    """영양 관련 연구 정보 API (RAG 활용, ?async=true이면 작업 ID를 바로 반환)"""
     query = request.args.get('query', '')
 
     if not query:
         return error_response('검색어가 필요합니다.', 400)
 
-    try:
-        # RAG 서비스를 통한 영양 연구 정보 검색
-        research_data = get_nutritional_research(query)
+    if wants_async():
+        return job_accepted_response('nutrition_research', get_jwt_identity(), build_nutrition_research, query)
 
-        return success_response({
-            'query': query,
-            'results': research_data
-        })
+    try:
+        return success_response(build_nutrition_research(query))
     except Exception as e:
         current_app.logger.error(f"연구 정보 검색 오류: {str(e)}")
-        return error_response(f'연구 정보 검색 실패: {str(e)}', 500)
\ No newline at end of file
+        return error_response(f'연구 정보 검색 실패: {str(e)}', 500)
+
+def build_nutrition_research(query):
+    """연구 정보 응답 데이터 생성 (요청 처리 또는 비동기 작업에서 실행)"""
+    # RAG 서비스를 통한 영양 연구 정보 검색
+    research_data = get_nutritional_research(query)
+
+    return {
+        'query': query,
+        'results': research_data
+    }
\ No newline at end of file
@@ -6,10 +6,14 @@ from models.food import Food
 from models.user import User
 from models.recommendation import Recommendation
 from models.allergy import Allergy
-from services.recommendation import RecommendationService
-from services.rag_service import RAGService
+from services import service_manager
 from services.recommendation import generate_food_alternatives, generate_meal_recommendations
+from services.audit_queue import audit_writer
+from services.async_jobs import JobError
+from app.routers.jobs import wants_async, job_accepted_response
 from utils.responses import success_response, error_response
+from utils.pagination import keyset_page, InvalidCursorError, parse_include_total
+from utils.serializers import recommendation_row_columns, serialize_recommendation_rows
 from datetime import datetime, timedelta
 import os
 import json
@@ -17,23 +21,33 @@ from models.recipe import Recipe
 
 recommendation_bp = Blueprint('recommendation', __name__)
 
-# RAGService 인스턴스 생성
-openai_api_key = os.getenv("OPENAI_API_KEY")
-rag_service = RAGService(openai_api_key=openai_api_key)
-recommendation_service = RecommendationService(rag_service=rag_service)
-
 @recommendation_bp.route('/meal', methods=['GET'])
 @jwt_required()
 # 캐시 비활성화 (문제 해결 후 필요하면 다시 활성화)
 # @cache.cached(timeout=3600, key_prefix=lambda: f'meal_recommendations_{get_jwt_identity()}')
 def get_meal_recommendations():
-    """개인 맞춤형 식단 추천 API"""
+    """개인 맞춤형 식단 추천 API (?async=true이면 작업 ID를 바로 반환)"""
     current_user_id = get_jwt_identity()
 
+    if wants_async():
+        return job_accepted_response('meal_recommendations', current_user_id,
+                                     build_meal_recommendations, current_user_id)
+
+    try:
+        return success_response(build_meal_recommendations(current_user_id))
+    except JobError as e:
+        return error_response(e.message, e.status_code)
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"식단 추천 오류: {str(e)}")
+        return error_response(f'식단 추천 생성 실패: {str(e)}', 500)
+
+def build_meal_recommendations(current_user_id):
+    """식단 추천 응답 데이터 생성 (요청 처리 또는 비동기 작업에서 실행)"""
     # 사용자 정보 조회
     user = User.query.filter_by(uid=current_user_id).first()
     if not user:
-        return error_response('사용자 정보를 찾을 수 없습니다.', 404)
+        raise JobError('사용자 정보를 찾을 수 없습니다.', 404)
 
     # 사용자 알레르기 정보
     allergies = Allergy.query.filter_by(uid=current_user_id).all()
@@ -56,34 +70,25 @@ def get_meal_recommendations():
         for food in foods:
             recent_foods.append(food.food_name)
 
-    try:
-        # 맞춤형 식단 추천 생성
-        recommendations = generate_meal_recommendations(
-            user=user,
-            allergies=allergy_list,
-            recent_foods=recent_foods
-        )
-
-        # DB에 추천 정보 저장
-        for rec_type, rec_items in recommendations.items():
-            for item in rec_items:
-                recommendation = Recommendation(
-                    uid=current_user_id,
-                    reason=f"{rec_type} 기반 추천: {item['reason'] if 'reason' in item else ''}"
-                )
-                db.session.add(recommendation)
-
-        db.session.commit()
-
-        return success_response({
-            'recommendations': recommendations,
-            'user_allergies': allergy_list,
-            'health_goal': user.health_goal
-        })
-    except Exception as e:
-        db.session.rollback()
-        current_app.logger.error(f"식단 추천 오류: {str(e)}")
-        return error_response(f'식단 추천 생성 실패: {str(e)}', 500)
+    # 맞춤형 식단 추천 생성
+    recommendations = generate_meal_recommendations(
+        user=user,
+        allergies=allergy_list,
+        recent_foods=recent_foods
+    )
+
+    # 추천 기록 저장 (백그라운드에서 모아서 저장)
+    audit_writer.enqueue(Recommendation, [
+        {'uid': int(current_user_id), 'reason': f"{rec_type} 기반 추천: {item['reason'] if 'reason' in item else ''}"}
+        for rec_type, rec_items in recommendations.items()
+        for item in rec_items
+    ])
+
+    return {
+        'recommendations': recommendations,
+        'user_allergies': allergy_list,
+        'health_goal': user.health_goal
+    }
 
 @recommendation_bp.route('/alternatives', methods=['POST'])
 @jwt_required()
@@ -107,19 +112,15 @@ def get_food_alternatives():
         # 대체 음식 추천
         alternatives = generate_food_alternatives(
             food_name=food_name,
-            reason=reason,
+            health_goal=reason,
             allergies=allergy_list
         )
 
-        # DB에 추천 정보 저장
-        for alt in alternatives:
-            recommendation = Recommendation(
-                uid=current_user_id,
-                reason=f"{food_name}의 대체 음식 ({reason}): {alt['name']}"
-            )
-            db.session.add(recommendation)
-
-        db.session.commit()
+        # 추천 기록 저장 (백그라운드에서 모아서 저장)
+        audit_writer.enqueue(Recommendation, [
+            {'uid': int(current_user_id), 'reason': f"{food_name}의 대체 음식 ({reason}): {alt['name']}"}
+            for alt in alternatives
+        ])
 
         return success_response({
             'original_food': food_name,
@@ -131,81 +132,147 @@ def get_food_alternatives():
         current_app.logger.error(f"대체 음식 추천 오류: {str(e)}")
         return error_response(f'대체 음식 추천 실패: {str(e)}', 500)
 
-def save_recipe_to_db(title, ingredients, instructions):
-    """레시피를 데이터베이스에 저장"""
+def save_recipes_to_db(recipes):
+    """레시피 목록을 데이터베이스에 저장 (같은 제목이 있으면 건너뜀, 한 번의 커밋)"""
     try:
-        # 기존 레시피가 있는지 확인
-        existing_recipe = Recipe.query.filter_by(title=title).first()
-        if existing_recipe:
-            return existing_recipe.to_dict()  # 기존 레시피 반환
-
-        # 새 레시피 저장
-        new_recipe = Recipe(
-            title=title,
-            ingredients=", ".join(ingredients),  # 리스트를 문자열로 변환
-            instructions=instructions
-        )
-        db.session.add(new_recipe)
+        titles = [recipe["title"] for recipe in recipes]
+        existing = {title for (title,) in db.session.query(Recipe.title).filter(Recipe.title.in_(titles))}
+
+        new_recipes = []
+        for recipe in recipes:
+            if recipe["title"] in existing:
+                continue
+            existing.add(recipe["title"])
+            new_recipes.append(Recipe(
+                title=recipe["title"],
+                ingredients=", ".join(recipe["ingredients"]),  # 리스트를 문자열로 변환
+                instructions=recipe["instructions"]
+            ))
+        db.session.add_all(new_recipes)
         db.session.commit()
-
-        return new_recipe.to_dict()  # 저장된 레시피 반환
+        return len(new_recipes)
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"레시피 저장 오류: {str(e)}")
-        return None
+        return 0
+
+def generate_ai_recipes(ingredients, meal_type, health_goal, allergy_list, limit):
+    """LLM으로 레시피 생성 (로컬 레시피가 부족할 때만 사용)"""
+    # RAG 모델에 전달할 쿼리
+    query = f"재료: {ingredients}, 식사 유형: {meal_type}, 건강 목표: {health_goal}. " \
+            f"각 레시피는 '음식명', '재료', '조리법'을 JSON 형식으로 제공해주세요."
+    if allergy_list:
+        query += f" 다음 재료는 제외해주세요: {', '.join(allergy_list)}."
+
+    # RAGService를 통해 레시피 추천
+    raw_response = service_manager.rag_service.get_recipe_recommendations(query=query, limit=limit)
+    current_app.logger.info(f"RAG 모델 원본 응답: {raw_response}")
+
+    # JSON 문자열을 실제 JSON 데이터로 변환
+    try:
+        recipes_json = json.loads(raw_response["recipes"])
+        if isinstance(recipes_json, dict) and "recipes" not in recipes_json:  # 단일 레시피 객체라면 리스트로 변환
+            recipes_json = {"recipes": [recipes_json]}
+        elif isinstance(recipes_json, list):
+            recipes_json = {"recipes": recipes_json}
+    except (json.JSONDecodeError, TypeError) as e:
+        current_app.logger.error(f"JSON 변환 오류: {str(e)}")
+        recipes_json = {"recipes": []}
+
+    # `_parse_recipes()`를 활용하여 데이터 정제 (재료가 문자열이면 목록으로 변환)
+    recipes = service_manager.recommendation._parse_recipes(recipes_json)
+    for recipe in recipes:
+        if isinstance(recipe["ingredients"], str):
+            recipe["ingredients"] = [item.strip() for item in recipe["ingredients"].split(",") if item.strip()]
+    return recipes
 
 @recommendation_bp.route('/recipes', methods=['GET'])
 @jwt_required()
 def get_recipes():
-    """레시피 추천 API"""
+    """
+    레시피 추천 API
+
+    로컬 레시피 엔진(기본 레시피 + 저장된 레시피)에서 먼저 찾고,
+    결과가 limit보다 적을 때만 LLM으로 부족한 수만큼 생성한다 (ai=false이면 생성하지 않음).
+    생성한 레시피는 레시피 엔진에 저장되어 같은 조건의 다음 요청부터 로컬에서 반환된다.
+    ?async=true이면 작업 ID를 바로 반환하고 /api/jobs/<job_id>로 결과를 조회한다.
+    """
     current_user_id = get_jwt_identity()
 
     # 쿼리 파라미터 가져오기
-    ingredients = request.args.get('ingredients', '')
-    meal_type = request.args.get('meal_type', '')
-    health_goal = request.args.get('health_goal', '')
+    params = {
+        'ingredients': request.args.get('ingredients', ''),
+        'meal_type': request.args.get('meal_type', ''),
+        'health_goal': request.args.get('health_goal', ''),
+        'max_calories': request.args.get('max_calories', type=float),
+        'min_protein': request.args.get('min_protein', type=float),
+        'limit': request.args.get('limit', 5, type=int),
+        'use_ai': request.args.get('ai', 'true').lower() not in ('false', '0', 'no')
+    }
+
+    if wants_async():
+        return job_accepted_response('recipe_recommendations', current_user_id,
+                                     build_recipe_recommendations, current_user_id, params, params=params)
 
     try:
-        # 디버깅 로그 추가
-        current_app.logger.info(f"레시피 추천 요청: user_id={current_user_id}, ingredients={ingredients}, meal_type={meal_type}, health_goal={health_goal}")
-
-        # RAG 모델에 전달할 쿼리
-        query = f"재료: {ingredients}, 식사 유형: {meal_type}, 건강 목표: {health_goal}. " \
-                f"각 레시피는 '음식명', '재료', '조리법'을 JSON 형식으로 제공해주세요."
-
-        # RAGService를 통해 레시피 추천
-        raw_response = rag_service.get_recipe_recommendations(query=query, limit=5)
-        current_app.logger.info(f"RAG 모델 원본 응답: {raw_response}")
-
-        # JSON 문자열을 실제 JSON 데이터로 변환
-        try:
-            recipes_json = json.loads(raw_response["recipes"])
-            if isinstance(recipes_json, dict):  # ✅ 단일 레시피 객체라면 리스트로 변환
-                recipes_json = {"recipes": [recipes_json]}
-        except json.JSONDecodeError as e:
-            current_app.logger.error(f"JSON 변환 오류: {str(e)}")
-            recipes_json = {"recipes": []}
-
-        # `_parse_recipes()`를 활용하여 데이터 정제
-        parsed_recipes = recommendation_service._parse_recipes(recipes_json)
-
-        # DB에 저장
-        saved_recipes = []
-        for recipe in parsed_recipes:
-            saved_recipe = save_recipe_to_db(recipe["title"], recipe["ingredients"], recipe["instructions"])
-            if saved_recipe:
-                saved_recipes.append(saved_recipe)
-
-        return success_response({
-            'ingredients': ingredients,
-            'meal_type': meal_type,
-            'health_goal': health_goal,
-            'recipes': saved_recipes  # DB에 저장된 레시피 반환
-        })
+        return success_response(build_recipe_recommendations(current_user_id, params))
     except Exception as e:
         current_app.logger.error(f"레시피 추천 오류: {str(e)}")
         return error_response(f'레시피 추천 실패: {str(e)}', 500)
 
+def build_recipe_recommendations(current_user_id, params):
+    """레시피 추천 응답 데이터 생성 (요청 처리 또는 비동기 작업에서 실행)"""
+    ingredients = params['ingredients']
+    meal_type = params['meal_type']
+    health_goal = params['health_goal']
+    limit = params['limit']
+
+    ingredient_list = [item.strip() for item in ingredients.split(',') if item.strip()]
+    allergy_list = [allergy.allergy_name for allergy in Allergy.query.filter_by(uid=current_user_id).all()]
+
+    current_app.logger.info(f"레시피 추천 요청: user_id={current_user_id}, ingredients={ingredients}, meal_type={meal_type}, health_goal={health_goal}")
+
+    from services.recipe_engine import allergen_keywords, contains_allergens
+    engine = service_manager.recipe_engine
+    recipes = engine.recommend(
+        ingredients=ingredient_list,
+        meal_type=meal_type,
+        health_goal=health_goal,
+        allergies=allergy_list,
+        max_calories=params['max_calories'],
+        min_protein=params['min_protein'],
+        limit=limit
+    )
+
+    # 로컬 레시피가 부족한 경우에만 LLM으로 채움
+    if params['use_ai'] and len(recipes) < limit:
+        try:
+            generated = generate_ai_recipes(ingredients, meal_type, health_goal, allergy_list,
+                                            limit - len(recipes))
+        except Exception as e:
+            current_app.logger.error(f"AI 레시피 생성 오류: {str(e)}")
+            generated = []
+
+        excluded = allergen_keywords(allergy_list)
+        known = {recipe['title'] for recipe in recipes}
+        generated = [
+            recipe for recipe in generated
+            if recipe['title'] not in known and not contains_allergens(recipe['ingredients'], excluded)
+        ][:limit - len(recipes)]
+
+        if generated:
+            # 레시피 엔진과 레시피 테이블에 저장 (다음 요청부터 로컬 검색 대상)
+            engine.add(generated, meal_type=meal_type, health_goal=health_goal)
+            save_recipes_to_db(generated)
+            recipes += [dict(recipe, source='ai') for recipe in generated]
+
+    return {
+        'ingredients': ingredients,
+        'meal_type': meal_type,
+        'health_goal': health_goal,
+        'recipes': recipes
+    }
+
 
 
 @recommendation_bp.route('/history', methods=['GET'])
@@ -214,13 +281,45 @@ def get_recommendation_history():
     """추천 히스토리 API"""
     current_user_id = get_jwt_identity()
 
-    # 페이지네이션
+    # 페이지네이션 (cursor가 있으면 rid 키셋 페이징, 없으면 기존 page/limit)
     limit = int(request.args.get('limit', 10))
     page = int(request.args.get('page', 1))
+    cursor = request.args.get('cursor')
+    include_total = parse_include_total(request.args.get('include_total'))
+
+    # 추천 기록 조회 (읽기 전용 목록이므로 필요한 컬럼만 행으로 조회)
+    query = db.session.query(*recommendation_row_columns()).filter(Recommendation.uid == current_user_id)
+
+    if cursor is not None:
+        try:
+            recommendations, next_cursor = keyset_page(query, (Recommendation.rid,), limit, cursor=cursor)
+        except InvalidCursorError as e:
+            return error_response(str(e), 400)
+
+        pagination = {'limit': limit, 'next_cursor': next_cursor}
+        if include_total:
+            pagination['total_count'] = query.with_entities(db.func.count(Recommendation.rid)).scalar()
+        return success_response({
+            'recommendations': serialize_recommendation_rows(recommendations),
+            'pagination': pagination
+        })
+
+    if include_total is False:
+        # 전체 개수 없이 한 건 더 읽어 다음 페이지 여부만 확인
+        rows = query.order_by(Recommendation.rid.desc()) \
+            .offset((page - 1) * limit) \
+            .limit(limit + 1) \
+            .all()
+        return success_response({
+            'recommendations': serialize_recommendation_rows(rows[:limit]),
+            'pagination': {
+                'current_page': page,
+                'limit': limit,
+                'has_next': len(rows) > limit
+            }
+        })
 
-    # 추천 기록 조회
-    query = Recommendation.query.filter_by(uid=current_user_id)
-    total_count = query.count()
+    total_count = query.with_entities(db.func.count(Recommendation.rid)).scalar()
     total_pages = (total_count + limit - 1) // limit
 
     recommendations = query.order_by(Recommendation.rid.desc()) \
@@ -229,11 +328,11 @@ def get_recommendation_history():
         .all()
 
     return success_response({
-        'recommendations': [rec.to_dict() for rec in recommendations],
+        'recommendations': serialize_recommendation_rows(recommendations),
         'pagination': {
             'total_count': total_count,
             'total_pages': total_pages,
             'current_page': page,
             'limit': limit
         }
-    })
\ No newline at end of file
+    })
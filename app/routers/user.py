@@ -218,7 +218,8 @@ def get_user_dashboard():
 
     # 최근 식사 기록 (최대 5개)
     from models.meal import Meal
-    recent_meals = Meal.query.filter_by(uid=current_user_id) \
+    from utils.serializers import meal_list_options, serialize_meals
+    recent_meals = Meal.query.options(*meal_list_options()).filter_by(uid=current_user_id) \
         .order_by(Meal.date.desc(), Meal.mid.desc()) \
         .limit(5) \
         .all()
@@ -235,7 +236,7 @@ def get_user_dashboard():
 
     return success_response({
         'user': user.to_dict(),
-        'recent_meals': [meal.to_dict() for meal in recent_meals],
+        'recent_meals': serialize_meals(recent_meals),
         'allergies': [allergy.to_dict() for allergy in allergies],
         'recent_recommendations': [rec.to_dict() for rec in recent_recommendations],
         'health_goal': user.health_goal
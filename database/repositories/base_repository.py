@@ -2,6 +2,7 @@ from app.extensions import db
 from typing import TypeVar, Generic, Type, List, Optional, Any, Dict, Union
 from sqlalchemy.exc import SQLAlchemyError
 import logging
+from utils.pagination import keyset_page
 
 # 모델 타입 변수 정의
 T = TypeVar('T')
@@ -191,20 +192,34 @@ class BaseRepository(Generic[T]):
         """
         return self.count(**kwargs) > 0
 
-    def paginate(self, page: int = 1, per_page: int = 10, **kwargs) -> Dict[str, Any]:
+    def paginate(self, page: int = 1, per_page: int = 10, with_total: bool = True, **kwargs) -> Dict[str, Any]:
         """
         페이지네이션
-        
+
         Args:
             page (int): 페이지 번호
             per_page (int): 페이지당 항목 수
+            with_total (bool): 전체 개수 계산 여부 (False면 COUNT 없이 한 건 더 읽어 has_next 판단)
             **kwargs: 필터링 조건
-            
+
         Returns:
-            Dict[str, Any]: 페이지네이션 결과
+            Dict[str, Any]: 페이지네이션 결과 (with_total=False면 total, pages는 None)
         """
         try:
             query = self.model_class.query.filter_by(**kwargs)
+
+            if not with_total:
+                items = query.offset((page - 1) * per_page).limit(per_page + 1).all()
+                return {
+                    'items': items[:per_page],
+                    'page': page,
+                    'per_page': per_page,
+                    'total': None,
+                    'pages': None,
+                    'has_next': len(items) > per_page,
+                    'has_prev': page > 1
+                }
+
             total = query.count()
             items = query.offset((page - 1) * per_page).limit(per_page).all()
 
@@ -220,4 +235,39 @@ class BaseRepository(Generic[T]):
         except SQLAlchemyError as e:
             logger.error(f"{self.model_class.__name__} 페이지네이션 오류: {str(e)}")
             db.session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+    def paginate_by_cursor(self, cursor: Optional[str] = None, per_page: int = 10,
+                           with_total: bool = False, **kwargs) -> Dict[str, Any]:
+        """
+        키셋(커서) 페이지네이션 (기본 키 내림차순)
+
+        Args:
+            cursor (Optional[str]): 이전 결과의 next_cursor (None이면 첫 페이지)
+            per_page (int): 페이지당 항목 수
+            with_total (bool): 전체 개수 계산 여부
+            **kwargs: 필터링 조건
+
+        Returns:
+            Dict[str, Any]: items, per_page, next_cursor, has_next, total(with_total=False면 None)
+
+        Raises:
+            InvalidCursorError: 커서 토큰이 올바르지 않은 경우
+        """
+        try:
+            # 'query' 컬럼이 있는 모델도 있으므로 세션 쿼리 사용
+            query = db.session.query(self.model_class).filter_by(**kwargs)
+            columns = tuple(self.model_class.__mapper__.primary_key)
+            items, next_cursor = keyset_page(query, columns, per_page, cursor=cursor)
+
+            return {
+                'items': items,
+                'per_page': per_page,
+                'next_cursor': next_cursor,
+                'has_next': next_cursor is not None,
+                'total': query.count() if with_total else None
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"{self.model_class.__name__} 커서 페이지네이션 오류: {str(e)}")
+            db.session.rollback()
+            raise
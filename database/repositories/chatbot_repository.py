@@ -1,5 +1,6 @@
 from database.repositories.base_repository import BaseRepository
 from models.chatbot import Chatbot
+from models.chat_memory import ChatMemory
 from app.extensions import db
 from typing import Optional, List, Dict, Any
 from sqlalchemy.exc import SQLAlchemyError
@@ -54,7 +55,8 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             Dict[str, Any]: 페이지네이션 결과
         """
         try:
-            query = Chatbot.query.filter_by(uid=uid).order_by(Chatbot.timestamp.desc())
+            # Chatbot.query는 질문 컬럼이라 Model.query 대신 세션 쿼리 사용
+            query = db.session.query(Chatbot).filter_by(uid=uid).order_by(Chatbot.timestamp.desc())
 
             total = query.count()
             items = query.offset((page - 1) * per_page).limit(per_page).all()
@@ -85,7 +87,7 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             List[Chatbot]: 대화 목록
         """
         try:
-            return Chatbot.query.filter_by(uid=uid) \
+            return db.session.query(Chatbot).filter_by(uid=uid) \
                 .order_by(Chatbot.timestamp.desc()) \
                 .limit(limit) \
                 .all()
@@ -94,6 +96,77 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             db.session.rollback()
             raise
 
+    def get_turns_after(self, uid: int, after_cid: int = 0, limit: int = 50) -> List[Chatbot]:
+        """
+        대화 메모리에 아직 요약되지 않은 대화 조회 (최신순)
+
+        Args:
+            uid (int): 사용자 ID
+            after_cid (int): 이 ID 이후의 대화만 조회 (요약에 반영된 마지막 대화 ID)
+            limit (int): 최대 개수
+
+        Returns:
+            List[Chatbot]: 대화 목록 (최신순)
+        """
+        try:
+            return db.session.query(Chatbot).filter(
+                Chatbot.uid == uid,
+                Chatbot.cid > after_cid
+            ).order_by(Chatbot.cid.desc()).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"요약 대상 대화 조회 오류: {str(e)}")
+            db.session.rollback()
+            raise
+
+    def get_memory(self, uid: int) -> Optional[ChatMemory]:
+        """
+        사용자 대화 메모리(누적 요약) 조회
+
+        Args:
+            uid (int): 사용자 ID
+
+        Returns:
+            Optional[ChatMemory]: 대화 메모리 (없으면 None)
+        """
+        try:
+            return db.session.get(ChatMemory, uid)
+        except SQLAlchemyError as e:
+            logger.error(f"대화 메모리 조회 오류: {str(e)}")
+            db.session.rollback()
+            raise
+
+    def save_memory(self, uid: int, summary: str, summary_tokens: int, last_cid: int) -> Optional[ChatMemory]:
+        """
+        대화 메모리 저장 (이미 더 최근 대화까지 요약되어 있으면 저장하지 않음)
+
+        Args:
+            uid (int): 사용자 ID
+            summary (str): 누적 요약
+            summary_tokens (int): 요약 토큰 수
+            last_cid (int): 요약에 반영된 마지막 대화 ID
+
+        Returns:
+            Optional[ChatMemory]: 저장된 대화 메모리 (저장하지 않았으면 None)
+        """
+        try:
+            memory = db.session.get(ChatMemory, uid)
+            if memory is None:
+                memory = ChatMemory(uid=uid)
+                db.session.add(memory)
+            elif memory.last_cid >= last_cid:
+                # 동시에 처리된 다른 요청이 먼저 요약을 갱신한 경우
+                return None
+
+            memory.summary = summary
+            memory.summary_tokens = summary_tokens
+            memory.last_cid = last_cid
+            db.session.commit()
+            return memory
+        except SQLAlchemyError as e:
+            logger.error(f"대화 메모리 저장 오류: {str(e)}")
+            db.session.rollback()
+            raise
+
     def get_conversations_by_date(self, uid: int, start_date: datetime,
                                   end_date: datetime) -> List[Chatbot]:
         """
@@ -108,7 +181,7 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             List[Chatbot]: 대화 목록
         """
         try:
-            return Chatbot.query.filter(
+            return db.session.query(Chatbot).filter(
                 Chatbot.uid == uid,
                 Chatbot.timestamp >= start_date,
                 Chatbot.timestamp <= end_date
@@ -130,7 +203,7 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             List[Chatbot]: 대화 목록
         """
         try:
-            return Chatbot.query.filter(
+            return db.session.query(Chatbot).filter(
                 Chatbot.uid == uid,
                 (Chatbot.query.like(f'%{keyword}%')) | (Chatbot.response.like(f'%{keyword}%'))
             ).order_by(Chatbot.timestamp.desc()).all()
@@ -150,7 +223,9 @@ class ChatbotRepository(BaseRepository[Chatbot]):
             bool: 성공 여부
         """
         try:
-            Chatbot.query.filter_by(uid=uid).delete()
+            db.session.query(Chatbot).filter_by(uid=uid).delete()
+            # 삭제한 대화의 요약도 함께 삭제
+            db.session.query(ChatMemory).filter_by(uid=uid).delete()
             db.session.commit()
             return True
         except SQLAlchemyError as e:
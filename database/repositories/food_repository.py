@@ -181,7 +181,7 @@ class FoodRepository(BaseRepository[Food]):
 
     def get_nutrition_stats(self, uid: Optional[int] = None) -> Dict[str, Any]:
         """
-        영양 통계 조회
+        영양 통계 조회 (저장된 영양소 컬럼의 SUM, 한 번의 집계 쿼리)
 
         Args:
             uid (Optional[int]): 사용자 ID (없으면 전체)
@@ -192,27 +192,24 @@ class FoodRepository(BaseRepository[Food]):
         try:
             from models.meal import Meal
 
-            foods = []
-            query = Food.query.join(Meal)
+            query = db.session.query(
+                func.count(Food.fid),
+                *[func.sum(getattr(Food, key)).label(key) for key in Food.NUTRIENT_COLUMNS]
+            ).join(Meal, Meal.mid == Food.mid)
 
             if uid:
                 query = query.filter(Meal.uid == uid)
 
-            foods = query.all()
-
-            # 영양소별 통계
-            nutrition_sums = {}
-            food_count = 0
-
-            for food in foods:
-                food_count += 1
-                nutrition_info = food.get_nutrition_info()
+            row = query.one()
+            food_count = row[0]
 
-                for key, value in nutrition_info.items():
-                    if isinstance(value, (int, float)):
-                        nutrition_sums[key] = nutrition_sums.get(key, 0) + value
+            # 영양소별 합계 (값이 저장된 음식이 없는 영양소는 제외)
+            nutrition_sums = {
+                key: getattr(row, key) for key in Food.NUTRIENT_COLUMNS
+                if getattr(row, key) is not None
+            }
 
-            # 평균 계산
+            # 평균 계산 (전체 음식 수 기준)
             nutrition_avg = {}
             if food_count > 0:
                 for key, value in nutrition_sums.items():
@@ -226,4 +223,4 @@ class FoodRepository(BaseRepository[Food]):
         except SQLAlchemyError as e:
             logger.error(f"영양 통계 조회 오류: {str(e)}")
             db.session.rollback()
-            raise
\ No newline at end of file
+            raise
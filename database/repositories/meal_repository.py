@@ -3,8 +3,10 @@ from models.meal import Meal
 from models.food import Food
 from app.extensions import db
 from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy import func
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime, timedelta
+from services.meal_nutrition import date_bucket, food_frequency, record_food_nutrition
 import logging
 
 logger = logging.getLogger(__name__)
@@ -134,6 +136,8 @@ class MealRepository(BaseRepository[Meal]):
         """
         식사에 음식 추가
 
+        칼로리와 영양 정보가 주어지지 않으면 MealService와 같이 카탈로그 기준 영양소를 저장한다.
+
         Args:
             meal_id (int): 식사 ID
             food_name (str): 음식 이름
@@ -154,6 +158,8 @@ class MealRepository(BaseRepository[Meal]):
             )
 
             db.session.add(food)
+            if calories is None and not nutrition_info:
+                self._materialize_nutrition(food)
             db.session.commit()
             return food
         except SQLAlchemyError as e:
@@ -161,9 +167,18 @@ class MealRepository(BaseRepository[Meal]):
             db.session.rollback()
             raise
 
+    @staticmethod
+    def _materialize_nutrition(food: Food):
+        """카탈로그 기준 영양소 저장 (실패해도 음식 추가는 진행, 백필 대상으로 남음)"""
+        try:
+            from services import service_manager
+            record_food_nutrition([food], service_manager.nutrient_aggregator)
+        except Exception as e:
+            logger.error(f"음식 영양 정보 저장 오류: {str(e)}")
+
     def get_meal_stats(self, uid: int, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
         """
-        식사 통계 계산
+        식사 통계 계산 (식사 시간/날짜/음식 이름별 GROUP BY 쿼리)
 
         Args:
             uid (int): 사용자 ID
@@ -174,38 +189,35 @@ class MealRepository(BaseRepository[Meal]):
             Dict[str, Any]: 통계 정보
         """
         try:
-            meals = Meal.query.filter(
-                Meal.uid == uid,
-                Meal.date >= start_date,
-                Meal.date <= end_date
-            ).all()
+            criteria = (Meal.uid == uid, Meal.date >= start_date, Meal.date <= end_date)
 
             # 식사 시간별 통계
-            meal_time_stats = {}
-            for meal in meals:
-                meal_time_stats[meal.meal_time] = meal_time_stats.get(meal.meal_time, 0) + 1
+            meal_time_stats = dict(
+                db.session.query(Meal.meal_time, func.count(Meal.mid))
+                .filter(*criteria)
+                .group_by(Meal.meal_time)
+                .all()
+            )
 
             # 날짜별 식사 수
-            date_stats = {}
-            for meal in meals:
-                date_str = meal.date.strftime('%Y-%m-%d')
-                date_stats[date_str] = date_stats.get(date_str, 0) + 1
-
-            # 식사별 음식 통계
-            food_stats = {}
-            for meal in meals:
-                for food in meal.foods:
-                    food_stats[food.food_name] = food_stats.get(food.food_name, 0) + 1
+            day = date_bucket(Meal.date, 'day')
+            date_stats = dict(
+                db.session.query(day, func.count(Meal.mid))
+                .filter(*criteria)
+                .group_by(day)
+                .order_by(day)
+                .all()
+            )
 
             # 가장 자주 먹는 음식 Top 5
-            top_foods = sorted(food_stats.items(), key=lambda x: x[1], reverse=True)[:5]
+            top_foods = food_frequency(*criteria, limit=5)
 
             return {
                 'meal_time_stats': meal_time_stats,
                 'date_stats': date_stats,
                 'top_foods': [{'name': name, 'count': count} for name, count in top_foods],
-                'total_meals': len(meals)
+                'total_meals': sum(meal_time_stats.values())
             }
         except SQLAlchemyError as e:
             logger.error(f"식사 통계 계산 오류: {str(e)}")
-            raise
\ No newline at end of file
+            raise
@@ -0,0 +1,34 @@
+"""Add full-text search index tables
+
+Revision ID: d2a7f4c9e381
+Revises: b7c2d9e4f015
+Create Date: 2026-10-19 21:05:12.480193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7f4c9e381'
+down_revision = 'b7c2d9e4f015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FTS5 가상 테이블은 SQLite에서만 생성 (다른 DB는 LIKE 검색 사용)
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS meal_search USING fts5(owner, grams1, grams2, tokenize='unicode61')")
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS food_search USING fts5(owner, grams1, grams2, tokenize='unicode61')")
+    op.execute("CREATE VIRTUAL TABLE IF NOT EXISTS recipe_search USING fts5(grams1, grams2, tokenize='unicode61')")
+    # 기존 기록은 scripts/rebuild_search_index.py로 채운다
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS recipe_search")
+    op.execute("DROP TABLE IF EXISTS food_search")
+    op.execute("DROP TABLE IF EXISTS meal_search")
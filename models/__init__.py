@@ -6,4 +6,7 @@ from app.extensions import db
 
 # 모든 모델 클래스를 임포트
 from models.user import User
-from models.chatbot import Chatbot
\ No newline at end of file
+from models.chatbot import Chatbot
+from models.chat_memory import ChatMemory
+from models.daily_nutrition import DailyNutrition
+from models.insight_snapshot import InsightSnapshot
@@ -4,6 +4,9 @@ from datetime import datetime
 class Allergy(db.Model):
     """알레르기 모델"""
     __tablename__ = 'allergy'
+    __table_args__ = (
+        db.Index('ix_allergy_uid', 'uid'),  # 사용자별 알레르기 조회
+    )
 
     aid = db.Column(db.Integer, primary_key=True)
     uid = db.Column(db.Integer, db.ForeignKey('users.uid'), nullable=False)
@@ -0,0 +1,26 @@
+from app.extensions import db
+from datetime import datetime
+
+class ChatMemory(db.Model):
+    """사용자별 대화 메모리 (오래된 대화를 누적 요약한 내용)"""
+    __tablename__ = 'chat_memory'
+
+    uid = db.Column(db.Integer, db.ForeignKey('users.uid'), primary_key=True)
+    summary = db.Column(db.Text, nullable=False, default='')  # 이전 대화 누적 요약
+    summary_tokens = db.Column(db.Integer, nullable=False, default=0)
+    last_cid = db.Column(db.Integer, nullable=False, default=0)  # 요약에 반영된 마지막 대화 ID
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now, nullable=False)
+
+    def to_dict(self):
+        """대화 메모리 정보를 딕셔너리로 변환"""
+        return {
+            'uid': self.uid,
+            'summary': self.summary,
+            'summary_tokens': self.summary_tokens,
+            'last_cid': self.last_cid,
+            'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def __repr__(self):
+        """모델 표현"""
+        return f'<ChatMemory {self.uid}: {self.last_cid}>'
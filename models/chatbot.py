@@ -4,6 +4,9 @@ from datetime import datetime
 class Chatbot(db.Model):
     """챗봇 대화 모델"""
     __tablename__ = 'chatbot'
+    __table_args__ = (
+        db.Index('ix_chatbot_uid_timestamp', 'uid', 'timestamp'),  # 사용자별 대화 기록 (시간 역순)
+    )
 
     cid = db.Column(db.Integer, primary_key=True)
     uid = db.Column(db.Integer, db.ForeignKey('users.uid'), nullable=False)
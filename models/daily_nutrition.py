@@ -0,0 +1,40 @@
+from app.extensions import db
+from datetime import datetime
+
+class DailyNutrition(db.Model):
+    """사용자별 일일 영양 합계 (식사/음식 변경 시 같은 트랜잭션에서 갱신되는 롤업 테이블)"""
+    __tablename__ = 'daily_nutrition'
+
+    NUTRIENT_COLUMNS = ('calories', 'carbs', 'protein', 'fat', 'sodium', 'fiber', 'sugar')
+
+    uid = db.Column(db.Integer, db.ForeignKey('users.uid'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    meal_count = db.Column(db.Integer, nullable=False, default=0)
+    resolved_food_count = db.Column(db.Integer, nullable=False, default=0)  # 영양 정보가 있는 음식 수
+    calories = db.Column(db.Float, nullable=False, default=0)
+    carbs = db.Column(db.Float, nullable=False, default=0)
+    protein = db.Column(db.Float, nullable=False, default=0)
+    fat = db.Column(db.Float, nullable=False, default=0)
+    sodium = db.Column(db.Float, nullable=False, default=0)
+    fiber = db.Column(db.Float, nullable=False, default=0)
+    sugar = db.Column(db.Float, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+
+    def get_nutrition(self):
+        """영양소 합계를 딕셔너리로 반환 (영양 정보가 있는 음식이 없으면 빈 딕셔너리)"""
+        if not self.resolved_food_count:
+            return {}
+        return {column: round(getattr(self, column) or 0, 2) for column in self.NUTRIENT_COLUMNS}
+
+    def to_dict(self):
+        """일일 영양 합계를 딕셔너리로 변환"""
+        return {
+            'uid': self.uid,
+            'date': self.date.strftime('%Y-%m-%d'),
+            'meal_count': self.meal_count,
+            'nutrition': self.get_nutrition()
+        }
+
+    def __repr__(self):
+        """모델 표현"""
+        return f'<DailyNutrition {self.uid}: {self.date}>'
@@ -5,12 +5,22 @@ from datetime import datetime
 class Food(db.Model):
     """음식 모델"""
     __tablename__ = 'food'
+    __table_args__ = (
+        db.Index('ix_food_mid', 'mid'),  # 식사별 음식 조회/조인
+    )
 
     fid = db.Column(db.Integer, primary_key=True)
     mid = db.Column(db.Integer, db.ForeignKey('meal.mid'), nullable=False)
     food_name = db.Column(db.String(255), nullable=False)
     category = db.Column(db.String(100), nullable=True)
     calories = db.Column(db.Float, nullable=True)
+    # 식사 기록 시점에 카탈로그에서 계산해 저장하는 1인분 영양소 (집계는 SQL SUM으로 수행)
+    carbs = db.Column(db.Float, nullable=True)
+    protein = db.Column(db.Float, nullable=True)
+    fat = db.Column(db.Float, nullable=True)
+    sodium = db.Column(db.Float, nullable=True)
+    fiber = db.Column(db.Float, nullable=True)
+    sugar = db.Column(db.Float, nullable=True)
     nutrition_info = db.Column(db.Text, nullable=True)  # JSON 형식으로 저장된 영양 정보
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
@@ -26,10 +36,10 @@ class Food(db.Model):
         self.category = category
         self.calories = calories
 
-        # nutrition_info가 딕셔너리인 경우 JSON 문자열로 변환
+        # nutrition_info가 딕셔너리인 경우 JSON 문자열로 변환 (영양소 컬럼도 함께 저장)
         if nutrition_info:
             if isinstance(nutrition_info, dict):
-                self.nutrition_info = json.dumps(nutrition_info)
+                self.update_nutrition_info(nutrition_info)
             else:
                 self.nutrition_info = nutrition_info
 
@@ -42,14 +52,18 @@ class Food(db.Model):
                 return {}
         return {}
 
+    # nutrition_info 중 개별 컬럼으로도 저장하는 영양소
+    NUTRIENT_COLUMNS = ('calories', 'carbs', 'protein', 'fat', 'sodium', 'fiber', 'sugar')
+
     def update_nutrition_info(self, nutrition_data):
         """영양 정보 업데이트"""
         if nutrition_data:
             self.nutrition_info = json.dumps(nutrition_data)
 
-            # 칼로리 정보가 있으면 칼로리 필드도 업데이트
-            if 'calories' in nutrition_data:
-                self.calories = nutrition_data['calories']
+            # 영양소 값이 있으면 해당 컬럼도 업데이트
+            for column in self.NUTRIENT_COLUMNS:
+                if column in nutrition_data:
+                    setattr(self, column, nutrition_data[column])
 
     def to_dict(self):
         """음식 정보를 딕셔너리로 변환"""
@@ -0,0 +1,58 @@
+from app.extensions import db
+from datetime import datetime
+import json
+
+class InsightSnapshot(db.Model):
+    """사용자별 영양 인사이트 스냅샷 (야간 배치 작업에서 미리 계산)"""
+    __tablename__ = 'insight_snapshots'
+
+    uid = db.Column(db.Integer, db.ForeignKey('users.uid'), primary_key=True)
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    days_with_data = db.Column(db.Integer, nullable=False, default=0)
+    total_meals = db.Column(db.Integer, nullable=False, default=0)
+    weekly_average = db.Column(db.Text, nullable=True)  # JSON 형식
+    targets = db.Column(db.Text, nullable=True)  # JSON 형식
+    insights = db.Column(db.Text, nullable=True)  # JSON 형식
+    source_version = db.Column(db.String(100), nullable=True)  # 계산에 사용한 일일 합계 데이터의 지문
+    computed_at = db.Column(db.DateTime, default=datetime.now, nullable=False)
+
+    @staticmethod
+    def _load(value, default):
+        if value:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return default
+        return default
+
+    def get_weekly_average(self):
+        """주간 평균 영양소를 딕셔너리로 반환"""
+        return self._load(self.weekly_average, {})
+
+    def get_targets(self):
+        """목표 영양소를 딕셔너리로 반환"""
+        return self._load(self.targets, {})
+
+    def get_insights(self):
+        """인사이트 목록 반환"""
+        return self._load(self.insights, [])
+
+    def to_dict(self):
+        """스냅샷 정보를 딕셔너리로 변환"""
+        return {
+            'period': {
+                'start_date': self.period_start.strftime('%Y-%m-%d'),
+                'end_date': self.period_end.strftime('%Y-%m-%d')
+            },
+            'days_with_data': self.days_with_data,
+            'total_meals': self.total_meals,
+            'weekly_average': self.get_weekly_average(),
+            'targets': self.get_targets(),
+            'insights': self.get_insights(),
+            'computed_at': self.computed_at.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def __repr__(self):
+        """모델 표현"""
+        return f'<InsightSnapshot {self.uid}: {self.period_end}>'
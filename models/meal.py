@@ -4,6 +4,9 @@ from datetime import datetime
 class Meal(db.Model):
     """식사 모델"""
     __tablename__ = 'meal'
+    __table_args__ = (
+        db.Index('ix_meal_uid_date', 'uid', 'date'),  # 사용자별 날짜 조회
+    )
 
     mid = db.Column(db.Integer, primary_key=True)
     uid = db.Column(db.Integer, db.ForeignKey('users.uid'), nullable=False)
@@ -15,6 +18,9 @@ class Meal(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # 목록 조회에서 image(BLOB)를 지연 로딩할 때 이미지 존재 여부만 SQL로 계산 (utils.serializers 참고)
+    image_exists = db.query_expression()
+
     # 관계 설정
     foods = db.relationship('Food', backref='meal', lazy=True, cascade='all, delete-orphan')
     recommendations = db.relationship('Recommendation', backref='meal', lazy=True, cascade='all, delete-orphan')
@@ -4,6 +4,9 @@ from datetime import datetime
 class Recommendation(db.Model):
     """식단 추천 모델"""
     __tablename__ = 'recommendation'
+    __table_args__ = (
+        db.Index('ix_recommendation_uid_rid', 'uid', 'rid'),  # 사용자별 최신 추천 조회 (rid 역순)
+    )
 
     rid = db.Column(db.Integer, primary_key=True)
     uid = db.Column(db.Integer, db.ForeignKey('users.uid'), nullable=False)
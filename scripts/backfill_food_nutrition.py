@@ -0,0 +1,39 @@
+import os
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+# 환경 변수 로드
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 음식 행의 영양 정보 백필')
+    parser.add_argument('--config', type=str, default='development', help='애플리케이션 설정 이름')
+    parser.add_argument('--foods', type=str, default='', help='다시 계산할 음식 이름 (쉼표 구분, 기본: 영양 정보가 없는 모든 음식)')
+    args = parser.parse_args()
+
+    from app import create_app
+    from services import service_manager
+    from services.meal_nutrition import nutrition_backfill
+
+    app = create_app(config_name=args.config)
+    names = [name.strip() for name in args.foods.split(',') if name.strip()] or None
+
+    with app.app_context():
+        updated = nutrition_backfill.backfill(service_manager.nutrient_aggregator, names)
+
+    logger.info(f"백필 완료: {updated}개 음식 행 갱신")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, List, Optional
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from langchain_community.chat_models.fake import FakeListChatModel
+
+REPLY = json.dumps({
+    'intent_category': '건강 목표 관련',
+    'confidence': 0.9,
+    'key_entities': ['체중'],
+    'response': '저녁 탄수화물을 줄이고 단백질을 늘려보세요.'
+}, ensure_ascii=False)
+
+
+class FixedLatencyChatModel(FakeListChatModel):
+    """호출마다 고정 지연 후 정해진 응답을 반환하는 LLM 대역"""
+
+    latency: float = 0.2
+    calls: int = 0
+
+    def _call(self, messages: List[Any], stop: Optional[List[str]] = None, run_manager=None, **kwargs: Any) -> str:
+        time.sleep(self.latency)
+        self.calls += 1
+        return super()._call(messages, stop, run_manager, **kwargs)
+
+
+def build_chatbot(llm_latency: float, db_latency: float, cache_context: bool = False):
+    """고정 지연의 LLM과 저장소를 사용하는 챗봇 (cache_context: 사용자 데이터가 바뀌지 않는 대화)"""
+    from services.chatbot import PersonalizedNutritionChatbot
+    from repositories.user_repository import UserRepository
+    from repositories.meal_repository import MealRepository
+    from services.nutrition_service import NutritionService
+
+    class SlowUserRepository(UserRepository):
+        def get_user(self, user_id):
+            time.sleep(db_latency)
+            return super().get_user(user_id)
+
+    class SlowMealRepository(MealRepository):
+        def get_user_meals(self, user_id, date=None):
+            time.sleep(db_latency)
+            return super().get_user_meals(user_id, date)
+
+    llm = FixedLatencyChatModel(responses=[REPLY], latency=llm_latency)
+    chatbot = PersonalizedNutritionChatbot(
+        openai_api_key='sk-benchmark',
+        user_repository=SlowUserRepository(),
+        nutrition_service=NutritionService(),
+        meal_repository=SlowMealRepository(),
+        llm=llm,
+        context_version=(lambda user_id: 'v1') if cache_context else None
+    )
+    return chatbot, llm
+
+
+def legacy_turn(chatbot, user_id: str, message: str):
+    """기존 파이프라인 (의도 분석, 응답 생성 각각 LLM 호출 + 추천 시 컨텍스트 재조회)"""
+    intent = chatbot.analyze_conversation_intent(message)
+    response = chatbot.generate_chat_response(user_id=user_id, user_message=message)
+    recommendations = chatbot.generate_personalized_recommendation(
+        user_id=user_id,
+        intent_category=intent.get('intent_category', '기타')
+    )
+    return response, recommendations
+
+
+def combined_turn(chatbot, user_id: str, message: str):
+    """통합 파이프라인 (LLM 호출 1회, 컨텍스트 조회 1회)"""
+    return chatbot.process_message(user_id=user_id, user_message=message)
+
+
+def percentile(values, ratio: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * ratio), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='챗봇 파이프라인 벤치마크 (기존 2회 LLM 호출 vs 통합 1회 호출 vs 통합 + 컨텍스트 캐시)'
+    )
+    parser.add_argument('--llm-latency', type=float, default=0.2, help='LLM 호출당 지연 (초)')
+    parser.add_argument('--db-latency', type=float, default=0.005, help='저장소 조회당 지연 (초)')
+    parser.add_argument('--turns', type=int, default=20, help='측정할 대화 턴 수')
+    args = parser.parse_args()
+
+    message = '요즘 체중이 잘 안 빠지는데 저녁은 어떻게 먹어야 할까?'
+    results = {}
+    for name, turn, cache_context in (
+        ('legacy', legacy_turn, False),
+        ('combined', combined_turn, False),
+        ('cached', combined_turn, True)
+    ):
+        chatbot, llm = build_chatbot(args.llm_latency, args.db_latency, cache_context)
+        latencies = []
+        for _ in range(args.turns):
+            start = time.perf_counter()
+            turn(chatbot, '1', message)
+            latencies.append((time.perf_counter() - start) * 1000)
+        # 컨텍스트 준비 시간 (캐시를 사용하면 첫 턴 이후 딕셔너리 조회)
+        start = time.perf_counter()
+        for _ in range(args.turns):
+            chatbot.load_context('1')
+        context_ms = (time.perf_counter() - start) * 1000 / args.turns
+        results[name] = (latencies, llm.calls / args.turns, context_ms)
+
+    print(f"LLM 지연 {args.llm_latency * 1000:.0f}ms, 저장소 지연 {args.db_latency * 1000:.0f}ms, 대화 {args.turns}턴")
+    print(f"{'pipeline':<10} {'llm_calls':>9} {'p50_ms':>8} {'p95_ms':>8} {'context_ms':>10}")
+    for name, (latencies, calls, context_ms) in results.items():
+        print(f"{name:<10} {calls:>9.1f} {percentile(latencies, 0.5):>8.1f} {percentile(latencies, 0.95):>8.1f} "
+              f"{context_ms:>10.3f}")
+
+    speedup = percentile(results['legacy'][0], 0.5) / percentile(results['combined'][0], 0.5)
+    print(f"p50 기준 {speedup:.2f}배 빠름")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+FOOD_NAMES = ['김치찌개', '된장찌개', '공기밥', '비빔밥', '불고기', '잡채', '계란말이', '두부조림']
+
+
+def seed(uid: int, meals: int, foods_per_meal: int):
+    """벤치마크용 사용자 데이터 생성 (식사, 음식, 추천을 일괄 INSERT)"""
+    from sqlalchemy import insert
+    from app.extensions import db
+    from models.meal import Meal
+    from models.food import Food
+    from models.recommendation import Recommendation
+
+    now = datetime.now()
+    start = now.date() - timedelta(days=meals // 3)
+    db.session.execute(insert(Meal), [
+        {'uid': uid, 'meal_time': ('아침', '점심', '저녁')[i % 3], 'content': f'식사 {i}',
+         'date': start + timedelta(days=i // 3), 'created_at': now, 'updated_at': now}
+        for i in range(meals)
+    ])
+    mids = db.session.execute(db.select(Meal.mid).where(Meal.uid == uid)).scalars().all()
+
+    foods = []
+    for mid in mids:
+        for _ in range(foods_per_meal):
+            calories = float(random.randint(50, 800))
+            nutrition = {'calories': calories, 'protein': calories / 20, 'fat': calories / 40}
+            foods.append({'mid': mid, 'food_name': random.choice(FOOD_NAMES), 'calories': calories,
+                          'protein': nutrition['protein'], 'fat': nutrition['fat'],
+                          'nutrition_info': json.dumps(nutrition), 'created_at': now, 'updated_at': now})
+    db.session.execute(insert(Food), foods)
+
+    db.session.execute(insert(Recommendation), [
+        {'uid': uid, 'mid': mid, 'reason': '단백질 보충',
+         'content': json.dumps({'recipe': '두부조림', 'ingredients': ['두부', '간장', '파'], 'calories': 180},
+                               ensure_ascii=False),
+         'created_at': now}
+        for mid in mids
+    ])
+    db.session.commit()
+
+
+def measure(func, repeat: int) -> float:
+    """repeat회 실행한 시간의 중앙값 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def scenarios(app, uid: int, page_size: int):
+    """(이름, ORM 경로, 프로젝션 경로) 목록. 각 경로는 조회 + 직렬화 + JSON 인코딩까지 수행"""
+    from flask.json.provider import DefaultJSONProvider
+    from app.extensions import db
+    from models.meal import Meal
+    from models.recommendation import Recommendation
+    from utils.fast_json import FastJSONProvider
+    from utils.serializers import (
+        meal_list_options, serialize_meals, meal_row_columns, serialize_meal_rows,
+        recommendation_row_columns, serialize_recommendation_rows
+    )
+
+    default_json = DefaultJSONProvider(app)
+    fast_json = FastJSONProvider(app)
+    fast_json.ensure_ascii = app.json.ensure_ascii
+
+    def orm_meals(limit):
+        def run():
+            meals = Meal.query.options(*meal_list_options()).filter_by(uid=uid) \
+                .order_by(Meal.date.desc(), Meal.mid.desc()).limit(limit).all()
+            default_json.dumps({'meals': serialize_meals(meals)})
+            db.session.remove()
+        return run
+
+    def row_meals(limit):
+        def run():
+            rows = db.session.query(*meal_row_columns()).filter(Meal.uid == uid) \
+                .order_by(Meal.date.desc(), Meal.mid.desc()).limit(limit).all()
+            fast_json.dumps({'meals': serialize_meal_rows(rows)})
+            db.session.remove()
+        return run
+
+    def orm_recommendations():
+        recommendations = Recommendation.query.filter_by(uid=uid).order_by(Recommendation.rid.desc()).all()
+        default_json.dumps({'recommendations': [rec.to_dict() for rec in recommendations]})
+        db.session.remove()
+
+    def row_recommendations():
+        rows = db.session.query(*recommendation_row_columns()) \
+            .filter(Recommendation.uid == uid).order_by(Recommendation.rid.desc()).all()
+        fast_json.dumps({'recommendations': serialize_recommendation_rows(rows)})
+        db.session.remove()
+
+    return [
+        (f'meals (limit {page_size})', orm_meals(page_size), row_meals(page_size)),
+        ('meals (all)', orm_meals(None), row_meals(None)),
+        ('recommendations (all)', orm_recommendations, row_recommendations)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='목록 API 직렬화 벤치마크 (ORM to_dict vs 컬럼 프로젝션 + orjson)')
+    parser.add_argument('--meals', type=int, default=10000, help='사용자의 식사 수 (추천도 같은 수 생성)')
+    parser.add_argument('--foods-per-meal', type=int, default=3, help='식사당 음식 수')
+    parser.add_argument('--page-size', type=int, default=100, help='페이지 조회 시나리오의 limit')
+    parser.add_argument('--repeat', type=int, default=5, help='시나리오별 반복 횟수 (중앙값 사용)')
+    args = parser.parse_args()
+
+    from app import create_app
+    from app.config import TestingConfig
+    from app.extensions import db
+    from models.user import User
+    from utils import fast_json
+
+    with tempfile.TemporaryDirectory() as directory:
+        TestingConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        app = create_app('testing')
+
+        with app.app_context():
+            db.create_all()
+            user = User(email='benchmark@test.com', password='password', name='벤치마크')
+            db.session.add(user)
+            db.session.commit()
+            uid = user.uid
+            seed(uid, args.meals, args.foods_per_meal)
+
+            print(f"식사 {args.meals}개, 식사당 음식 {args.foods_per_meal}개, 추천 {args.meals}개 "
+                  f"(orjson {'사용' if fast_json.orjson else '없음'}), 반복 {args.repeat}회 중앙값")
+            print(f"{'scenario':<24} {'orm_ms':>10} {'rows_ms':>10} {'speedup':>8}")
+            for name, orm_path, row_path in scenarios(app, uid, args.page_size):
+                orm_ms = measure(orm_path, args.repeat)
+                row_ms = measure(row_path, args.repeat)
+                print(f"{name:<24} {orm_ms:>10.2f} {row_ms:>10.2f} {orm_ms / row_ms:>7.2f}x")
+
+            db.session.remove()
+            db.drop_all()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
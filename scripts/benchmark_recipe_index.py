@@ -0,0 +1,83 @@
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+STAPLES = ['소금', '후추', '간장', '참기름', '다진 마늘', '설탕', '식용유', '고춧가루']
+
+
+def build_engine(directory: str, size: int, vocabulary: int):
+    """합성 레시피 size개를 저장한 레시피 엔진 (기본 레시피 데이터 제외)"""
+    from services.food_database import FoodDatabaseService
+    from services.recipe_engine import RecipeEngine
+
+    ingredients = [f'재료{i}' for i in range(vocabulary)]
+    recipes = []
+    for i in range(size):
+        mains = random.sample(ingredients, random.randint(3, 8))
+        recipes.append({
+            'title': f'레시피{i}',
+            'ingredients': mains + random.sample(STAPLES, random.randint(1, 4)),
+            'instructions': '조리한다',
+            'calories': random.randint(100, 900)
+        })
+
+    food_db = FoodDatabaseService(db_path=os.path.join(directory, 'food.db'))
+    food_db.add_recipes(recipes)
+    return RecipeEngine(food_db, corpus_path=None), ingredients
+
+
+def percentile(values, ratio: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * ratio), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='보유 재료 레시피 검색 벤치마크 (재료 역색인 vs 전체 순회)')
+    parser.add_argument('--size', type=int, default=5000, help='레시피 수')
+    parser.add_argument('--vocabulary', type=int, default=400, help='주재료 종류 수')
+    parser.add_argument('--pantry', type=int, default=8, help='질의당 보유 재료 수')
+    parser.add_argument('--queries', type=int, default=200, help='질의 횟수')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine, ingredients = build_engine(directory, args.size, args.vocabulary)
+
+        start = time.perf_counter()
+        count = len(engine)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        pantries = [random.sample(ingredients, args.pantry) + STAPLES[:3] for _ in range(args.queries)]
+        results = {}
+        for name, search in (
+            ('inverted index', lambda pantry: engine.cook_with(pantry, limit=10)),
+            ('linear scan', lambda pantry: engine.recommend(ingredients=pantry, limit=10))
+        ):
+            latencies = []
+            for pantry in pantries:
+                start = time.perf_counter()
+                search(pantry)
+                latencies.append((time.perf_counter() - start) * 1000)
+            results[name] = latencies
+
+        start = time.perf_counter()
+        engine.add([{'title': '추가 레시피', 'ingredients': ingredients[:5], 'instructions': '조리한다'}])
+        engine.cook_with(ingredients[:5], limit=1)
+        add_ms = (time.perf_counter() - start) * 1000
+
+    print(f"레시피 {count}개 (인덱스 로드 {load_ms:.1f}ms, 증분 추가 후 첫 검색 {add_ms:.1f}ms), "
+          f"보유 재료 {args.pantry}+3개, 질의 {args.queries}회")
+    print(f"{'method':<16} {'p50_ms':>8} {'p95_ms':>8}")
+    for name, latencies in results.items():
+        print(f"{name:<16} {percentile(latencies, 0.5):>8.3f} {percentile(latencies, 0.95):>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
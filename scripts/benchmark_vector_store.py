@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import resource
+import tempfile
+import subprocess
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+EMBEDDING_SIZE = 1536  # OpenAIEmbeddings 기본 차원
+
+
+def _fake_embeddings():
+    from langchain_core.embeddings import DeterministicFakeEmbedding
+    return DeterministicFakeEmbedding(size=EMBEDDING_SIZE)
+
+
+def build_corpus(backend: str, directory: str, size: int):
+    """벤치마크용 합성 코퍼스 생성"""
+    from services.vector_store import create_vector_store
+
+    store = create_vector_store(directory, _fake_embeddings(), backend=backend)
+    texts = [f"식품명: 음식{i}\n카테고리: 분류{i % 20}\n칼로리: {random.randint(10, 900)}kcal" for i in range(size)]
+    for start in range(0, size, 500):
+        batch = texts[start:start + 500]
+        store.add_texts(batch, [{"type": "food", "name": f"음식{start + i}"} for i in range(len(batch))])
+
+
+def measure(backend: str, directory: str, queries: int) -> dict:
+    """저장소 로드 시간, 질의 지연 시간, 최대 메모리 측정"""
+    from services.vector_store import create_vector_store
+
+    embeddings = _fake_embeddings()
+    query_vectors = [embeddings.embed_query(f"질의 {i}") for i in range(queries)]
+
+    start = time.perf_counter()
+    store = create_vector_store(directory, embeddings, backend=backend)
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    latencies = []
+    for vector in query_vectors:
+        start = time.perf_counter()
+        store.similarity_search_by_vector(vector, k=3)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+
+    return {
+        "backend": backend,
+        "startup_ms": round(startup_ms, 2),
+        "query_p50_ms": round(latencies[len(latencies) // 2], 3),
+        "query_p95_ms": round(latencies[int(len(latencies) * 0.95)], 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벡터 저장소 백엔드 벤치마크 (NumPy vs Chroma)')
+    parser.add_argument('--size', type=int, default=2000, help='코퍼스 문서 수')
+    parser.add_argument('--queries', type=int, default=200, help='질의 횟수')
+    parser.add_argument('--backends', type=str, default='numpy,chroma', help='비교할 백엔드 목록')
+    parser.add_argument('--worker', nargs=3, metavar=('MODE', 'BACKEND', 'DIR'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # 하위 프로세스: 백엔드별로 독립된 프로세스에서 빌드/측정
+    if args.worker:
+        mode, backend, directory = args.worker
+        if mode == 'build':
+            build_corpus(backend, directory, args.size)
+        else:
+            print(json.dumps(measure(backend, directory, args.queries)))
+        return 0
+
+    results = []
+    for backend in args.backends.split(','):
+        with tempfile.TemporaryDirectory() as directory:
+            base = [sys.executable, os.path.abspath(__file__), '--size', str(args.size), '--queries', str(args.queries)]
+            subprocess.run(base + ['--worker', 'build', backend, directory], check=True)
+            output = subprocess.run(base + ['--worker', 'measure', backend, directory],
+                                    check=True, capture_output=True, text=True).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"코퍼스 {args.size}개 문서, 질의 {args.queries}회")
+    print(f"{'backend':<8} {'startup_ms':>11} {'p50_ms':>8} {'p95_ms':>8} {'max_rss_mb':>11}")
+    for result in results:
+        print(f"{result['backend']:<8} {result['startup_ms']:>11} {result['query_p50_ms']:>8} "
+              f"{result['query_p95_ms']:>8} {result['max_rss_mb']:>11}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import os
+import sys
+import logging
+import argparse
+from datetime import datetime
+from dotenv import load_dotenv
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+# 환경 변수 로드
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """
+    전체 사용자의 주간 인사이트 스냅샷 계산 (야간 cron 실행용)
+
+    예: 0 3 * * * python scripts/compute_insight_snapshots.py --config production
+    """
+    parser = argparse.ArgumentParser(description='사용자별 주간 영양 인사이트 스냅샷 계산')
+    parser.add_argument('--config', type=str, default='development', help='애플리케이션 설정 이름')
+    parser.add_argument('--workers', type=int, default=None, help='작업 프로세스 수 (기본: CPU 수, 1: 단일 프로세스)')
+    parser.add_argument('--batch-size', type=int, default=500, help='한 번에 처리할 사용자 수')
+    parser.add_argument('--end-date', type=str, default=None, help='기간 종료 날짜 (YYYY-MM-DD, 기본: 오늘)')
+    parser.add_argument('--full', action='store_true', help='변경 여부와 관계없이 모든 사용자 재계산')
+    args = parser.parse_args()
+
+    from app import create_app
+    from services.insight_snapshot import InsightSnapshotJob
+
+    app = create_app(config_name=args.config)
+    end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date() if args.end_date else None
+
+    with app.app_context():
+        job = InsightSnapshotJob(workers=args.workers, batch_size=args.batch_size)
+        stats = job.run(end_date=end_date, full=args.full)
+
+    logger.info(f"스냅샷 계산 완료: 사용자 {stats['users']}명, 재계산 {stats['computed']}명, 변경 없음 {stats['skipped']}명")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
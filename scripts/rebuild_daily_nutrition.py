@@ -0,0 +1,46 @@
+import os
+import sys
+import json
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+# 환경 변수 로드
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='일일 영양 합계 테이블 재구축 및 정합성 검사')
+    parser.add_argument('--config', type=str, default='development', help='애플리케이션 설정 이름')
+    parser.add_argument('--uid', type=int, default=None, help='대상 사용자 ID (기본: 전체)')
+    parser.add_argument('--check', action='store_true', help='재구축하지 않고 정합성만 검사')
+    args = parser.parse_args()
+
+    from app import create_app
+    from services.nutrition_rollup import rebuild_daily_nutrition, check_daily_nutrition_consistency
+
+    app = create_app(config_name=args.config)
+
+    with app.app_context():
+        if args.check:
+            problems = check_daily_nutrition_consistency(args.uid)
+            for problem in problems:
+                logger.warning(json.dumps(problem, ensure_ascii=False, default=str))
+            logger.info(f"정합성 검사 완료: 불일치 {len(problems)}건")
+            return 1 if problems else 0
+
+        count = rebuild_daily_nutrition(args.uid)
+
+    logger.info(f"재구축 완료: {count}개 일일 합계 행")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
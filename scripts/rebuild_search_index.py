@@ -0,0 +1,41 @@
+import os
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+# 환경 변수 로드
+load_dotenv()
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='통합 검색 인덱스(식사/음식/레시피) 재구축')
+    parser.add_argument('--config', type=str, default='development', help='애플리케이션 설정 이름')
+    parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 색인할 행 수')
+    args = parser.parse_args()
+
+    from app import create_app
+    from services.search_index import rebuild_search_index
+
+    app = create_app(config_name=args.config)
+
+    with app.app_context():
+        try:
+            counts = rebuild_search_index(args.batch_size)
+        except RuntimeError as e:
+            logger.error(str(e))
+            return 1
+
+    logger.info(f"재구축 완료: {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 프로젝트 루트 디렉토리를 가져와 sys.path에 추가
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from services.intent_classifier import (
+    IntentClassifier, DEFAULT_INTENT_DATASET, DEFAULT_INTENT_HOLDOUT, DEFAULT_INTENT_MODEL,
+    load_intent_samples, fit_temperature, stratified_folds, expected_calibration_error, _softmax
+)
+
+THRESHOLDS = (0.5, 0.6, 0.7, 0.8, 0.9)
+
+
+def percentile(values, ratio: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * ratio), len(values) - 1)]
+
+
+def cross_fitted_probabilities(model: IntentClassifier, samples, folds: int = 2) -> np.ndarray:
+    """평가 데이터를 나눠 한쪽에서 맞춘 온도로 다른 쪽 확률을 계산 (보정 성능을 공정하게 평가)"""
+    logits = np.array([model.logits(sample['text']) for sample in samples])
+    y = np.array([model.labels.index(sample['intent']) for sample in samples])
+    probabilities = np.zeros_like(logits)
+    for fold in stratified_folds(y, folds):
+        rest = np.setdiff1d(np.arange(len(samples)), fold)
+        probabilities[fold] = _softmax(logits[fold] / fit_temperature(logits[rest], y[rest]))
+    return probabilities
+
+
+def main():
+    parser = argparse.ArgumentParser(description='챗봇 의도 분류기 학습 및 정확도/지연 리포트')
+    parser.add_argument('--dataset', default=DEFAULT_INTENT_DATASET, help='학습 데이터 (JSON)')
+    parser.add_argument('--holdout', default=DEFAULT_INTENT_HOLDOUT, help='보정/평가 데이터 (JSON)')
+    parser.add_argument('--output', default=DEFAULT_INTENT_MODEL, help='모델 저장 경로')
+    parser.add_argument('--l2', type=float, default=1e-3, help='L2 정규화 계수')
+    parser.add_argument('--epochs', type=int, default=300, help='경사 하강 반복 수')
+    parser.add_argument('--repeat', type=int, default=50, help='지연 측정 반복 수')
+    parser.add_argument('--dry-run', action='store_true', help='모델을 저장하지 않고 리포트만 출력')
+    args = parser.parse_args()
+
+    samples = load_intent_samples(args.dataset)
+    holdout = load_intent_samples(args.holdout)
+
+    start = time.perf_counter()
+    model = IntentClassifier.train(samples, holdout, l2=args.l2, epochs=args.epochs)
+    train_s = time.perf_counter() - start
+
+    if not args.dry_run:
+        model.save(args.output)
+
+    y = np.array([model.labels.index(sample['intent']) for sample in holdout])
+    raw = np.array([_softmax(model.logits(sample['text'])) for sample in holdout])
+    calibrated = cross_fitted_probabilities(model, holdout)
+    predicted = calibrated.argmax(axis=1)
+    confidence = calibrated.max(axis=1)
+    correct = predicted == y
+
+    print(f"학습 {len(samples)}문장, 평가 {len(holdout)}문장, 특징 {len(model.vocabulary)}개, "
+          f"학습 {train_s:.2f}s, 온도 {model.temperature:.3f}")
+    if not args.dry_run:
+        print(f"모델 저장: {args.output}")
+
+    print(f"\n평가 정확도 {correct.mean():.3f}")
+    print(f"ECE 보정 전 {expected_calibration_error(raw.max(axis=1), raw.argmax(axis=1) == y):.3f} "
+          f"/ 보정 후 {expected_calibration_error(confidence, correct):.3f} (2-fold 교차 보정)")
+
+    print(f"\n{'intent':<10} {'precision':>9} {'recall':>7} {'n':>4}")
+    for index, label in enumerate(model.labels):
+        hits = ((predicted == index) & correct).sum()
+        precision = hits / max((predicted == index).sum(), 1)
+        recall = hits / max((y == index).sum(), 1)
+        print(f"{label:<10} {precision:>9.3f} {recall:>7.3f} {(y == index).sum():>4}")
+
+    print(f"\n{'threshold':>9} {'local':>7} {'local_acc':>9} {'llm':>6}")
+    for threshold in THRESHOLDS:
+        local = confidence >= threshold
+        accuracy = correct[local].mean() if local.any() else float('nan')
+        print(f"{threshold:>9.1f} {local.mean():>7.3f} {accuracy:>9.3f} {1 - local.mean():>6.3f}")
+
+    latencies = []
+    for _ in range(args.repeat):
+        for sample in holdout:
+            start = time.perf_counter()
+            model.predict(sample['text'])
+            latencies.append((time.perf_counter() - start) * 1e6)
+    print(f"\n예측 지연 p50 {percentile(latencies, 0.5):.1f}us, p95 {percentile(latencies, 0.95):.1f}us "
+          f"({len(latencies)}회)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,30 +1,47 @@
-from typing import Optional, Dict, Any
-
-from .food_database import FoodDatabaseService
-from .rag_service import RAGService
-from .data_processor import DataProcessorService
-from .nutrition_analysis import NutritionAnalysisService
-from .food_recognition_service import FoodRecognitionService
-from .recommendation import RecommendationService
-from .meal_service import MealService
-from .chatbot import PersonalizedNutritionChatbot, initialize_nutrition_chatbot
-from .chatbot_service import ChatbotService
-from repositories.user_repository import UserRepository
-from repositories.meal_repository import MealRepository
-from services.nutrition_service import NutritionService
-from dotenv import load_dotenv
 import os
+import threading
+from typing import Optional, Dict, Any, Callable
+
+from dotenv import load_dotenv
 
 # .env 파일 로드
 load_dotenv()
 
+
 class ServiceManager:
     """
-    모든 서비스를 통합적으로 관리하는 매니저 클래스
+    모든 서비스를 통합적으로 관리하는 애플리케이션 범위 서비스 컨테이너
+
+    각 서비스는 처음 접근할 때 한 번만 생성되어 프로세스 전체에서 공유된다.
+    라우터와 모듈 수준 래퍼 함수는 서비스를 직접 생성하지 않고 이 컨테이너를 사용한다.
     """
     _instance: Optional['ServiceManager'] = None
     _initialized: bool = False
 
+    # 서비스 이름 → 생성 메서드 이름
+    _FACTORIES: Dict[str, str] = {
+        'food_db': '_create_food_db',
+        'nutrient_aggregator': '_create_nutrient_aggregator',
+        'recipe_engine': '_create_recipe_engine',
+        'rag_service': '_create_rag_service',
+        'data_processor': '_create_data_processor',
+        'nutrition_analysis': '_create_nutrition_analysis',
+        'food_recognition': '_create_food_recognition',
+        'recommendation': '_create_recommendation',
+        'meal': '_create_meal',
+        'intent_classifier': '_create_intent_classifier',
+        'conversation_memory': '_create_conversation_memory',
+        'nutrition_chatbot': '_create_nutrition_chatbot',
+        'chatbot': '_create_chatbot'
+    }
+
+    # get_service에서 사용하는 별칭
+    _ALIASES: Dict[str, str] = {
+        'rag': 'rag_service',
+        'nutrition': 'nutrition_analysis',
+        'recognition': 'food_recognition'
+    }
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ServiceManager, cls).__new__(cls)
@@ -35,34 +52,161 @@ class ServiceManager:
         if self._initialized:
             return
 
+        self._services: Dict[str, Any] = {}
+        # 서비스 생성 중 다른 서비스를 요청할 수 있으므로 재진입 가능한 락 사용
+        self._lock = threading.RLock()
+        self._initialized = True
+
+    def _get(self, name: str) -> Any:
+        """서비스 반환 (없으면 생성)"""
+        service = self._services.get(name)
+        if service is not None:
+            return service
+
+        with self._lock:
+            service = self._services.get(name)
+            if service is None:
+                factory: Callable[[], Any] = getattr(self, self._FACTORIES[name])
+                service = factory()
+                self._services[name] = service
+            return service
+
+    def reset(self) -> None:
+        """생성된 서비스 인스턴스 모두 제거 (테스트용)"""
+        with self._lock:
+            self._services.clear()
+
+    @staticmethod
+    def _openai_api_key() -> str:
         # .env에서 OpenAI API 키 가져오기
         openai_api_key = os.getenv("OPENAI_API_KEY")
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
+        return openai_api_key
+
+    # 기본 서비스
+    def _create_food_db(self):
+        from services.food_database import FoodDatabaseService
+        from services.meal_nutrition import nutrition_backfill
+        food_db = FoodDatabaseService()
+        # 카탈로그가 바뀌면 저장된 음식 영양소를 백그라운드에서 다시 계산
+        food_db.add_change_listener(nutrition_backfill.schedule)
+        return food_db
+
+    def _create_nutrient_aggregator(self):
+        from services.nutrition_engine import NutrientAggregator
+        return NutrientAggregator(self.food_db)
+
+    def _create_recipe_engine(self):
+        from services.recipe_engine import RecipeEngine
+        return RecipeEngine(self.food_db)
+
+    def _create_rag_service(self):
+        from services.rag_service import RAGService
+        return RAGService(openai_api_key=self._openai_api_key())
+
+    def _create_data_processor(self):
+        from services.data_processor import DataProcessorService
+        return DataProcessorService(self.food_db, self.rag_service)
+
+    # 기능 서비스 (의존성 주입)
+    def _create_nutrition_analysis(self):
+        from services.nutrition_analysis import NutritionAnalysisService
+        return NutritionAnalysisService(self.food_db, self.rag_service, self.nutrient_aggregator)
+
+    def _create_food_recognition(self):
+        from services.food_recognition_service import FoodRecognitionService
+        return FoodRecognitionService(self.food_db, self.rag_service)
 
-        # 기본 서비스 초기화
-        self.food_db: FoodDatabaseService = FoodDatabaseService()
-        self.rag_service: RAGService = RAGService(openai_api_key=openai_api_key)
-        self.data_processor: DataProcessorService = DataProcessorService(self.food_db, self.rag_service)
+    def _create_recommendation(self):
+        from services.recommendation import RecommendationService
+        return RecommendationService(self.food_db, self.rag_service, self.recipe_engine)
 
-        # 기능 서비스 초기화 (의존성 주입)
-        self.nutrition_analysis: NutritionAnalysisService = NutritionAnalysisService(self.food_db, self.rag_service)
-        self.food_recognition: FoodRecognitionService = FoodRecognitionService(self.food_db, self.rag_service)
-        self.recommendation: RecommendationService = RecommendationService(self.food_db, self.rag_service)
+    def _create_meal(self):
+        from services.meal_service import MealService
+        return MealService(self.nutrient_aggregator)
 
-        # Meal 서비스 추가
-        self.meal: MealService = MealService()
+    def _create_intent_classifier(self):
+        from services.intent_classifier import load_intent_classifier
+        return load_intent_classifier()
 
-        # Chatbot 서비스 추가 (래퍼 클래스 사용)
-        chatbot_instance = initialize_nutrition_chatbot(
-            openai_api_key=openai_api_key,
+    def _create_conversation_memory(self):
+        from services.conversation_memory import ConversationMemory
+        return ConversationMemory()
+
+    def _create_nutrition_chatbot(self):
+        from services.chatbot import initialize_nutrition_chatbot
+        from repositories.user_repository import UserRepository
+        from repositories.meal_repository import MealRepository
+        from services.nutrition_service import NutritionService
+        from services.user_cache import get_version
+        return initialize_nutrition_chatbot(
+            openai_api_key=self._openai_api_key(),
             user_repository=UserRepository(),
             nutrition_service=NutritionService(),
-            meal_repository=MealRepository()
+            meal_repository=MealRepository(),
+            intent_classifier=self.intent_classifier,
+            # 식사/음식/프로필 변경 시 바뀌는 사용자 캐시 버전으로 대화 컨텍스트 캐시 무효화
+            context_version=get_version,
+            memory=self.conversation_memory
         )
-        self.chatbot: ChatbotService = ChatbotService(chatbot_instance)
 
-        self._initialized = True
+    def _create_chatbot(self):
+        # Chatbot 서비스 (래퍼 클래스 사용)
+        from services.chatbot_service import ChatbotService
+        return ChatbotService(self.nutrition_chatbot)
+
+    @property
+    def food_db(self):
+        return self._get('food_db')
+
+    @property
+    def nutrient_aggregator(self):
+        return self._get('nutrient_aggregator')
+
+    @property
+    def recipe_engine(self):
+        return self._get('recipe_engine')
+
+    @property
+    def rag_service(self):
+        return self._get('rag_service')
+
+    @property
+    def data_processor(self):
+        return self._get('data_processor')
+
+    @property
+    def nutrition_analysis(self):
+        return self._get('nutrition_analysis')
+
+    @property
+    def food_recognition(self):
+        return self._get('food_recognition')
+
+    @property
+    def recommendation(self):
+        return self._get('recommendation')
+
+    @property
+    def meal(self):
+        return self._get('meal')
+
+    @property
+    def intent_classifier(self):
+        return self._get('intent_classifier')
+
+    @property
+    def conversation_memory(self):
+        return self._get('conversation_memory')
+
+    @property
+    def nutrition_chatbot(self):
+        return self._get('nutrition_chatbot')
+
+    @property
+    def chatbot(self):
+        return self._get('chatbot')
 
     def initialize_databases(self, force_rebuild: bool = False) -> None:
         """
@@ -87,33 +231,24 @@ class ServiceManager:
             service_name: 서비스 이름
 
         Returns:
-            해당 서비스 인스턴스
+            해당 서비스 인스턴스 (알 수 없는 이름이면 None)
         """
-        services: Dict[str, Any] = {
-            'food_db': self.food_db,
-            'rag': self.rag_service,
-            'data_processor': self.data_processor,
-            'nutrition': self.nutrition_analysis,
-            'recognition': self.food_recognition,
-            'recommendation': self.recommendation,
-            'meal': self.meal,
-            'chatbot': self.chatbot  # 래퍼 클래스 사용
-        }
-
-        return services.get(service_name)
+        name = self._ALIASES.get(service_name, service_name)
+        if name not in self._FACTORIES:
+            return None
+        return self._get(name)
+
 
 # 쉬운 접근을 위한 싱글톤 인스턴스
 service_manager = ServiceManager()
 
-# 개별 서비스에 쉽게 접근할 수 있는 변수들
-food_db = service_manager.food_db
-rag_service = service_manager.rag_service
-data_processor = service_manager.data_processor
-nutrition_analysis = service_manager.nutrition_analysis
-food_recognition = service_manager.food_recognition
-recommendation = service_manager.recommendation
-meal = service_manager.meal
-chatbot = service_manager.chatbot
+
+def __getattr__(name: str) -> Any:
+    """개별 서비스 변수(food_db, rag_service 등)는 처음 접근할 때 생성"""
+    if name in ServiceManager._FACTORIES:
+        return service_manager.get_service(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def initialize_all(force_rebuild: bool = False) -> ServiceManager:
     """
@@ -126,4 +261,4 @@ def initialize_all(force_rebuild: bool = False) -> ServiceManager:
 
     # 추가 초기화 작업이 필요한 경우 여기에 구현
 
-    return service_manager
\ No newline at end of file
+    return service_manager
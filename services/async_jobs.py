@@ -0,0 +1,241 @@
+"""
+오래 걸리는 LLM API의 비동기 작업 실행
+
+추천/레시피/연구 검색/챗봇 API는 LLM 호출 동안 요청 작업자를 붙잡고 있으므로,
+async 옵션을 사용하면 작업 ID만 바로 반환하고 작업은 제한된 크기의 스레드 풀에서 실행한다.
+작업 상태와 결과는 캐시에 보관 시간(ASYNC_JOB_RESULT_TIMEOUT) 동안 저장하고,
+클라이언트는 /api/jobs/<job_id>로 조회하거나 wait 파라미터로 완료될 때까지 기다린다(long-poll).
+
+같은 사용자의 같은 요청(작업 종류 + 파라미터)이 실행 중이면 새 작업을 만들지 않고 실행 중인 작업 ID를 반환한다.
+"""
+import json
+import time
+import uuid
+import atexit
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable
+
+from app.extensions import cache
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+ERROR = 'error'
+
+FINISHED_STATUSES = (DONE, ERROR)
+
+# long-poll 중 다른 프로세스의 작업 완료를 확인하는 간격 (초)
+POLL_INTERVAL = 0.5
+
+
+class JobError(Exception):
+    """작업 함수의 요청 오류 (동기 요청에서는 같은 상태 코드의 오류 응답으로 변환)"""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업 수가 최대치에 도달해 새 작업을 받을 수 없음"""
+
+
+def job_key(job_id: str) -> str:
+    """작업 상태 캐시 키"""
+    return f"async_job_{job_id}"
+
+
+def dedupe_key(kind: str, uid, params: Optional[Dict[str, Any]]) -> str:
+    """실행 중인 같은 요청을 찾기 위한 캐시 키 (작업 종류, 사용자, 파라미터)"""
+    payload = json.dumps([kind, str(uid), params or {}], ensure_ascii=False, sort_keys=True, default=str)
+    return f"async_job_inflight_{hashlib.md5(payload.encode('utf-8')).hexdigest()}"
+
+
+class JobQueue:
+    """
+    제한된 크기의 스레드 풀에서 작업을 실행하고 결과를 캐시에 저장
+
+    Flask 확장과 같은 방식으로 init_app()에서 애플리케이션을 등록한다.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100, result_timeout: int = 600):
+        """
+        Args:
+            max_workers (int): 동시에 실행할 작업 수
+            max_pending (int): 실행 중 + 대기 중인 작업의 최대 수 (초과하면 JobQueueFull)
+            result_timeout (int): 작업 상태/결과 보관 시간 (초)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_timeout = result_timeout
+        self.app = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._inflight = 0
+        self._atexit_registered = False
+
+    def init_app(self, app):
+        """애플리케이션 등록 및 종료 시 작업자 정리 예약"""
+        self.app = app
+        self.max_workers = app.config.get('ASYNC_JOB_WORKERS', self.max_workers)
+        self.max_pending = app.config.get('ASYNC_JOB_MAX_PENDING', self.max_pending)
+        self.result_timeout = app.config.get('ASYNC_JOB_RESULT_TIMEOUT', self.result_timeout)
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def submit(self, kind: str, uid, func: Callable[..., Dict[str, Any]], *args,
+               params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        작업 등록 (같은 요청이 실행 중이면 그 작업을 반환)
+
+        Args:
+            kind (str): 작업 종류 (예: "chat", "meal_recommendations")
+            uid: 요청한 사용자 ID (본인만 조회 가능)
+            func (Callable[..., Dict[str, Any]]): 앱 컨텍스트 안에서 실행할 함수 (응답 데이터 반환)
+            *args: 함수 인자
+            params (Optional[Dict[str, Any]]): 같은 요청 판단에 사용할 파라미터 (없으면 args 사용)
+
+        Returns:
+            Dict[str, Any]: 작업 상태
+
+        Raises:
+            JobQueueFull: 대기 중인 작업이 너무 많은 경우
+        """
+        if self.app is None:
+            raise RuntimeError("애플리케이션이 등록되지 않아 비동기 작업을 실행할 수 없습니다.")
+
+        inflight_key = dedupe_key(kind, uid, params if params is not None else {'args': list(args)})
+        job_id = uuid.uuid4().hex
+
+        # 다른 요청이 먼저 등록했으면 add()가 실패하므로 같은 요청의 작업은 하나만 실행됨
+        if not cache.add(inflight_key, job_id, timeout=self.result_timeout):
+            existing = cache.get(inflight_key)
+            job = cache.get(job_key(existing)) if existing else None
+            if job is not None and job['status'] not in FINISHED_STATUSES:
+                logger.debug(f"실행 중인 같은 작업 반환: {kind} {existing}")
+                return job
+            cache.set(inflight_key, job_id, timeout=self.result_timeout)
+
+        with self._lock:
+            if self._inflight >= self.max_pending:
+                cache.delete(inflight_key)
+                raise JobQueueFull(f"대기 중인 작업이 너무 많습니다 ({self._inflight}건).")
+            self._inflight += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="async-job")
+            executor = self._executor
+
+        job = {
+            'job_id': job_id,
+            'kind': kind,
+            'uid': str(uid),
+            'status': PENDING,
+            'created_at': datetime.now().isoformat(),
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'status_code': None
+        }
+        cache.set(job_key(job_id), job, timeout=self.result_timeout)
+
+        try:
+            executor.submit(self._run, self.app, job, inflight_key, func, args)
+        except Exception:
+            with self._lock:
+                self._inflight -= 1
+            cache.delete(inflight_key)
+            cache.delete(job_key(job_id))
+            raise
+        return job
+
+    def _run(self, app, job: Dict[str, Any], inflight_key: str, func: Callable[..., Dict[str, Any]], args):
+        with app.app_context():
+            try:
+                cache.set(job_key(job['job_id']), dict(job, status=RUNNING), timeout=self.result_timeout)
+                try:
+                    job = dict(job, status=DONE, result=func(*args), status_code=200)
+                except JobError as e:
+                    job = dict(job, status=ERROR, error=e.message, status_code=e.status_code)
+                except Exception as e:
+                    logger.error(f"비동기 작업 오류 ({job['kind']} {job['job_id']}): {str(e)}")
+                    job = dict(job, status=ERROR, error=str(e), status_code=500)
+
+                job['finished_at'] = datetime.now().isoformat()
+                cache.set(job_key(job['job_id']), job, timeout=self.result_timeout)
+                if cache.get(inflight_key) == job['job_id']:
+                    cache.delete(inflight_key)
+            except Exception as e:
+                logger.error(f"비동기 작업 상태 저장 오류 ({job['job_id']}): {str(e)}")
+            finally:
+                with self._finished:
+                    self._inflight -= 1
+                    self._finished.notify_all()
+
+    def get(self, job_id: str, uid) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태 조회
+
+        Args:
+            job_id (str): 작업 ID
+            uid: 조회하는 사용자 ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 작업 상태 (없거나, 만료되었거나, 다른 사용자의 작업이면 None)
+        """
+        job = cache.get(job_key(job_id))
+        if job is None or job['uid'] != str(uid):
+            return None
+        return job
+
+    def wait(self, job_id: str, uid, timeout: float) -> Optional[Dict[str, Any]]:
+        """
+        작업이 끝나거나 timeout이 지날 때까지 대기 후 상태 조회 (long-poll)
+
+        Args:
+            job_id (str): 작업 ID
+            uid: 조회하는 사용자 ID
+            timeout (float): 최대 대기 시간 (초)
+
+        Returns:
+            Optional[Dict[str, Any]]: 작업 상태 (없으면 None)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id, uid)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] in FINISHED_STATUSES or remaining <= 0:
+                return job
+            # 이 프로세스의 작업은 완료 알림으로, 다른 프로세스의 작업은 주기적으로 확인
+            with self._finished:
+                self._finished.wait(min(remaining, POLL_INTERVAL))
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        등록된 작업이 모두 끝날 때까지 대기
+
+        Returns:
+            bool: 모든 작업이 끝났는지 여부
+        """
+        with self._finished:
+            return self._finished.wait_for(lambda: self._inflight == 0, timeout)
+
+    def shutdown(self, wait: bool = True):
+        """스레드 풀 종료 (wait=True이면 실행 중인 작업이 끝날 때까지 대기)"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# 애플리케이션 공용 작업 큐 (create_app에서 init_app 호출)
+job_queue = JobQueue()
@@ -0,0 +1,231 @@
+"""
+추천/챗봇 기록의 지연 쓰기 (write-behind)
+
+요청 처리 중에는 기록을 큐에 넣기만 하고, 백그라운드 작업자가 일정 간격(AUDIT_FLUSH_INTERVAL) 또는
+일정 개수(AUDIT_BATCH_SIZE)마다 모델별 다중 행 INSERT 한 번으로 저장한다.
+일괄 저장이 실패하면 나누어 저장해 실패한 기록만 다시 큐에 넣어 재시도하고(최대 AUDIT_MAX_ATTEMPTS회),
+프로세스 종료 시 남은 기록을 저장한다.
+"""
+import time
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+# (모델, 행 값, 시도 횟수)
+AuditRecord = Tuple[Any, Dict[str, Any], int]
+
+
+class AuditWriter:
+    """
+    추천/챗봇 기록을 모아서 저장하는 백그라운드 작업자
+
+    Flask 확장과 같은 방식으로 init_app()에서 애플리케이션을 등록한다.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, batch_size: int = 100, max_attempts: int = 5):
+        """
+        Args:
+            flush_interval (float): 저장 간격 (초)
+            batch_size (int): 간격이 지나기 전이라도 저장할 기록 수
+            max_attempts (int): 저장 실패 시 최대 시도 횟수 (초과하면 버림)
+        """
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.app = None
+        self._queue: "queue.Queue[Optional[AuditRecord]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._atexit_registered = False
+
+    def init_app(self, app):
+        """애플리케이션 등록 및 종료 시 저장 예약"""
+        self.app = app
+        self.flush_interval = app.config.get('AUDIT_FLUSH_INTERVAL', self.flush_interval)
+        self.batch_size = app.config.get('AUDIT_BATCH_SIZE', self.batch_size)
+        self.max_attempts = app.config.get('AUDIT_MAX_ATTEMPTS', self.max_attempts)
+        self._stopped.clear()
+        if not self._atexit_registered:
+            atexit.register(self.shutdown)
+            self._atexit_registered = True
+
+    def enqueue(self, model, rows: List[Dict[str, Any]]):
+        """
+        저장할 기록 추가 (요청 스레드에서는 DB에 쓰지 않음)
+
+        Args:
+            model: 모델 클래스 (Recommendation, Chatbot 등)
+            rows (List[Dict[str, Any]]): 컬럼 값 목록 (생성 시각이 없으면 현재 시각으로 채움)
+        """
+        if self.app is None:
+            logger.warning("애플리케이션이 등록되지 않아 기록 저장을 건너뜁니다.")
+            return
+
+        now = datetime.now()
+        for row in rows:
+            row = dict(row)
+            for column in ('created_at', 'timestamp'):
+                if column in model.__table__.c and row.get(column) is None:
+                    row[column] = now
+            self._queue.put((model, row, 0))
+
+        with self._lock:
+            if not self._stopped.is_set() and (self._worker is None or not self._worker.is_alive()):
+                self._worker = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._worker.start()
+
+    def join(self):
+        """큐에 들어간 기록이 모두 저장(또는 포기)될 때까지 대기"""
+        self._queue.join()
+
+    def shutdown(self, timeout: Optional[float] = 10.0):
+        """
+        작업자 종료 (남은 기록을 모두 저장한 뒤 종료)
+
+        Args:
+            timeout (Optional[float]): 작업자 종료 대기 시간 (초)
+        """
+        with self._lock:
+            self._stopped.set()
+            worker = self._worker
+            self._worker = None
+
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            worker.join(timeout)
+            return
+
+        # 작업자가 없으면 현재 스레드에서 남은 기록 저장
+        records = self._drain()
+        if records:
+            self._write(records)
+
+    def _drain(self) -> List[AuditRecord]:
+        records = []
+        while True:
+            try:
+                record = self._queue.get_nowait()
+            except queue.Empty:
+                return records
+            if record is None:
+                self._queue.task_done()
+            else:
+                records.append(record)
+
+    def _collect(self) -> Tuple[List[AuditRecord], bool]:
+        """
+        저장할 기록 모으기 (첫 기록 후 flush_interval이 지나거나 batch_size가 차면 반환)
+
+        Returns:
+            Tuple[List[AuditRecord], bool]: (기록 목록, 종료 요청 여부)
+        """
+        record = self._queue.get()
+        if record is None:
+            self._queue.task_done()
+            return self._drain(), True
+
+        records = [record]
+        deadline = time.monotonic() + self.flush_interval
+        while len(records) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                record = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if record is None:
+                self._queue.task_done()
+                return records + self._drain(), True
+            records.append(record)
+        return records, False
+
+    def _run(self):
+        while True:
+            records, stopping = self._collect()
+            if records and not self._write(records) and not stopping:
+                # 실패한 기록은 다시 큐에 들어갔으므로 잠시 후 재시도
+                self._stopped.wait(self.flush_interval)
+            if stopping:
+                # 종료 시에는 재시도 대기 없이 남은 기록을 한 번 더 저장
+                retry = self._drain()
+                if retry:
+                    self._write(retry)
+                return
+
+    def _write(self, records: List[AuditRecord]) -> bool:
+        """
+        모델별 다중 행 INSERT로 저장
+
+        일괄 저장이 실패하면 기록을 반으로 나누어 다시 저장해 실패한 기록만 골라내고,
+        그 기록만 시도 횟수를 늘려 다시 큐에 넣는다 (max_attempts를 넘으면 버림).
+
+        Returns:
+            bool: 모든 기록의 저장 성공 여부
+        """
+        try:
+            failed = self._write_or_split(records)
+            for model, row, attempts in failed:
+                if attempts + 1 < self.max_attempts:
+                    self._queue.put((model, row, attempts + 1))
+                else:
+                    logger.error(f"기록 저장 재시도 횟수 초과로 버림: {model.__name__} {row}")
+            return not failed
+
+        finally:
+            for _ in records:
+                self._queue.task_done()
+
+    def _write_or_split(self, records: List[AuditRecord]) -> List[AuditRecord]:
+        """
+        기록 저장 (실패하면 나누어 재귀적으로 저장)
+
+        Returns:
+            List[AuditRecord]: 저장하지 못한 기록
+        """
+        try:
+            self._insert(records)
+            return []
+        except Exception as e:
+            if len(records) == 1:
+                logger.error(f"기록 저장 오류 ({records[0][0].__name__}): {str(e)}")
+                return records
+            logger.warning(f"기록 {len(records)}건 일괄 저장 실패, 나누어 다시 저장: {str(e)}")
+            middle = len(records) // 2
+            return self._write_or_split(records[:middle]) + self._write_or_split(records[middle:])
+
+    def _insert(self, records: List[AuditRecord]):
+        """한 트랜잭션에서 모델별 다중 행 INSERT 실행 (실패하면 롤백 후 예외 전달)"""
+        from services import user_cache
+
+        grouped: Dict[Any, List[Dict[str, Any]]] = {}
+        for model, row, _ in records:
+            grouped.setdefault(model, []).append(row)
+
+        with self.app.app_context():
+            try:
+                for model, rows in grouped.items():
+                    db.session.execute(insert(model), rows)
+                    if issubclass(model, user_cache.TRACKED_MODELS):
+                        user_cache.mark_changed(db.session, {row.get('uid') for row in rows})
+                db.session.commit()
+                logger.debug(f"기록 {len(records)}건 저장 완료")
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+
+
+# 애플리케이션 공용 작업자 (create_app에서 init_app 호출)
+audit_writer = AuditWriter()
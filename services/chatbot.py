@@ -1,7 +1,9 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 import json
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, date
 import os
 
 # AI 모델 관련 라이브러리
@@ -9,6 +11,9 @@ from langchain_community.chat_models import ChatOpenAI
 from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 
+from services.conversation_memory import select_recent_turns, format_conversation
+from utils.prompt_builder import compact_json, user_profile_fields, nutrition_context_fields, fit_prompt_sections
+
 # 의존성 주입용 추상 클래스
 from abc import ABC, abstractmethod
 
@@ -43,6 +48,75 @@ class MealRepository(ABC):
     def get_recent_meals(self, user_id, limit=3):
         pass
 
+# 의도 분석 카테고리와 분석 실패 시 기본값
+INTENT_CATEGORIES = ("영양 상담", "식품 정보", "건강 목표 관련", "레시피 추천", "일반 대화", "기타")
+DEFAULT_INTENT = {
+    "intent_category": "기타",
+    "confidence": 0.5,
+    "key_entities": []
+}
+FALLBACK_RESPONSE = "죄송합니다. 현재 상담이 어렵습니다. 잠시 후 다시 시도해주세요."
+
+# 사용자별 컨텍스트 캐시에 보관할 최대 사용자 수 (초과하면 가장 오래 사용하지 않은 사용자부터 제거)
+CONTEXT_CACHE_SIZE = 1024
+
+# 로컬 의도 분류기 결과를 그대로 사용할 최소 신뢰도 (보정된 확률, 낮으면 LLM 분석)
+INTENT_CONFIDENCE_THRESHOLD = 0.7
+
+# 상담 프롬프트의 사용자 프로필 필드 (건강 목표는 별도 항목)
+PROFILE_FIELDS = ('name', 'gender', 'age', 'height', 'weight', 'allergies')
+
+# 상담 프롬프트 섹션별 최대 토큰 수 (대화 이력은 대화 메모리의 토큰 예산으로 제한)
+PROMPT_SECTION_BUDGETS = {
+    "user_profile": 150,
+    "recent_nutrition": 300,
+    "health_goal": 50,
+    "user_message": 500
+}
+
+
+def parse_structured_reply(text: str) -> Dict[str, Any]:
+    """
+    통합 프롬프트의 JSON 응답에서 의도와 답변 추출
+
+    코드 블록이나 앞뒤 설명이 붙어도 첫 번째 JSON 객체를 찾아 사용하고,
+    JSON이 아니면 전체 텍스트를 답변으로 보고 기본 의도를 사용한다.
+
+    Args:
+        text (str): LLM 출력
+
+    Returns:
+        Dict[str, Any]: {"intent": 의도 분석 결과, "response": 답변}
+    """
+    text = (text or "").strip()
+    data = None
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        try:
+            data = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            data = None
+
+    if not isinstance(data, dict):
+        return {"intent": dict(DEFAULT_INTENT), "response": text or FALLBACK_RESPONSE}
+
+    category = data.get("intent_category")
+    try:
+        confidence = float(data.get("confidence", DEFAULT_INTENT["confidence"]))
+    except (TypeError, ValueError):
+        confidence = DEFAULT_INTENT["confidence"]
+    entities = data.get("key_entities")
+
+    return {
+        "intent": {
+            "intent_category": category if category in INTENT_CATEGORIES else DEFAULT_INTENT["intent_category"],
+            "confidence": confidence,
+            "key_entities": entities if isinstance(entities, list) else []
+        },
+        "response": str(data.get("response") or "").strip() or FALLBACK_RESPONSE
+    }
+
+
 class PersonalizedNutritionChatbot:
     """
     개인화된 영양 상담 챗봇 서비스
@@ -53,25 +127,55 @@ class PersonalizedNutritionChatbot:
             user_repository: UserRepository,
             nutrition_service: NutritionService,
             meal_repository: MealRepository,
-            context_window_days: int = 7
+            context_window_days: int = 7,
+            llm=None,
+            intent_classifier=None,
+            intent_threshold: float = INTENT_CONFIDENCE_THRESHOLD,
+            context_version: Optional[Callable[[str], Any]] = None,
+            context_cache_size: int = CONTEXT_CACHE_SIZE,
+            memory=None
     ):
         """
         챗봇 서비스 초기화
+
+        Args:
+            llm: 사용할 채팅 모델 (없으면 ChatOpenAI 생성, 테스트/벤치마크에서 주입)
+            intent_classifier: 로컬 의도 분류기 (없으면 항상 LLM으로 의도 분석)
+            intent_threshold (float): 로컬 분류 결과를 사용할 최소 신뢰도
+            context_version (Optional[Callable[[str], Any]]): 사용자 데이터 버전 조회 함수
+                (식사/프로필이 바뀌면 값이 바뀜, 없으면 컨텍스트를 캐시하지 않음)
+            context_cache_size (int): 컨텍스트를 캐시할 최대 사용자 수
+            memory: 사용자별 대화 메모리 (ConversationMemory, 없으면 전달받은 대화 이력만 사용)
         """
         self.logger = logging.getLogger(__name__)
 
         # AI 모델 초기화
-        self.llm = ChatOpenAI(
+        self.llm = llm or ChatOpenAI(
             openai_api_key=openai_api_key,
             model_name="gpt-3.5-turbo",
             temperature=0.5
         )
+        # 통합 프롬프트는 JSON 모드로 호출 (OpenAI 모델일 때만 지원)
+        self.structured_llm = (
+            self.llm.bind(response_format={"type": "json_object"})
+            if isinstance(self.llm, ChatOpenAI) else self.llm
+        )
 
         # 서비스 및 저장소 의존성 주입
         self.user_repository = user_repository
         self.nutrition_service = nutrition_service
         self.meal_repository = meal_repository
         self.context_window_days = context_window_days
+        self.intent_classifier = intent_classifier
+        self.intent_threshold = intent_threshold
+
+        # 사용자 ID → ((데이터 버전, 날짜), 컨텍스트)
+        self.context_version = context_version
+        self.context_cache_size = context_cache_size
+        self._context_cache: "OrderedDict[str, Tuple[Tuple[Any, date], Dict[str, Any]]]" = OrderedDict()
+        self._context_lock = threading.Lock()
+
+        self.memory = memory
 
         # 대화 프롬프트 템플릿 설정
         self._setup_conversation_template()
@@ -109,6 +213,264 @@ class PersonalizedNutritionChatbot:
             """
         )
 
+        # 의도 분석과 답변을 한 번의 호출로 생성하는 통합 프롬프트
+        self.combined_prompt = PromptTemplate(
+            input_variables=self.conversation_prompt.input_variables,
+            template="""
+            너는 개인화된 영양 상담 AI 어시스턴트야.
+
+            사용자 프로필:
+            {user_profile}
+
+            최근 영양 섭취 현황:
+            {recent_nutrition}
+
+            건강 목표: {health_goal}
+
+            대화 이력:
+            {conversation_history}
+
+            사용자 메시지: {user_message}
+
+            1. 메시지의 주요 의도를 다음 중 하나로 분류해:
+               영양 상담, 식품 정보, 건강 목표 관련, 레시피 추천, 일반 대화, 기타
+            2. 사용자의 건강 목표와 최근 영양 섭취 상태를 고려해서
+               전문적이고 친절하며 구체적이고 실천 가능한 맞춤형 답변을 작성해.
+
+            다른 설명 없이 다음 JSON 형식으로만 답해:
+            {{
+                "intent_category": "...",
+                "confidence": 0.0,
+                "key_entities": [],
+                "response": "..."
+            }}
+            """
+        )
+
+        # 오래된 대화를 누적 요약에 합치는 프롬프트 (대화 메모리)
+        self.summary_prompt = PromptTemplate(
+            input_variables=["previous_summary", "conversation", "max_tokens"],
+            template="""
+            다음은 영양 상담 대화의 기존 요약과 그 뒤에 이어진 대화야.
+            기존 요약에 새 대화 내용을 합쳐서 하나의 요약으로 다시 써줘.
+            사용자의 건강 상태, 목표, 식습관, 선호/기피 음식, 알레르기, 이미 받은 조언처럼
+            이후 상담에 필요한 정보만 남기고 {max_tokens}토큰 이내의 한국어 문장으로 작성해.
+
+            기존 요약:
+            {previous_summary}
+
+            새 대화:
+            {conversation}
+            """
+        )
+
+    def summarize_conversation(self, previous_summary: str, turns: List[Dict[str, Any]], max_tokens: int) -> str:
+        """
+        이전 요약에 오래된 대화를 합친 새 누적 요약 생성 (대화 메모리의 요약 함수)
+
+        Args:
+            previous_summary (str): 이전 누적 요약
+            turns (List[Dict[str, Any]]): 요약에 합칠 대화 목록 (오래된 순)
+            max_tokens (int): 요약 최대 토큰 수
+
+        Returns:
+            str: 새 누적 요약
+        """
+        inputs = fit_prompt_sections("chatbot.summarize_conversation", {
+            "previous_summary": previous_summary or "(없음)",
+            "conversation": format_conversation(turns),
+            "max_tokens": max_tokens
+        }, template=self.summary_prompt)
+        chain = LLMChain(llm=self.llm, prompt=self.summary_prompt)
+        return chain.run(**inputs)
+
+    def _prompt_inputs(self, call_site: str, prompt: PromptTemplate, user, nutrition_context: Dict[str, Any],
+                       conversation_history: str, user_message: str) -> Dict[str, str]:
+        """
+        상담 프롬프트 입력 (템플릿에 필요한 필드만 간결하게, 섹션별 토큰 예산 적용)
+
+        Args:
+            call_site (str): 토큰 수를 기록할 호출 위치
+            prompt (PromptTemplate): 사용할 프롬프트
+            user: 사용자
+            nutrition_context (Dict[str, Any]): 최근 영양 컨텍스트
+            conversation_history (str): 대화 이력 문자열
+            user_message (str): 사용자 메시지
+
+        Returns:
+            Dict[str, str]: 프롬프트 입력
+        """
+        return fit_prompt_sections(call_site, {
+            "user_profile": compact_json(user_profile_fields(user, PROFILE_FIELDS)),
+            "recent_nutrition": compact_json(nutrition_context_fields(nutrition_context)),
+            "health_goal": getattr(user, "health_goal", None) or "없음",
+            "conversation_history": conversation_history,
+            "user_message": user_message
+        }, PROMPT_SECTION_BUDGETS, template=prompt)
+
+    def _conversation_history(self, user_id: str,
+                              conversation_history: Optional[List[Dict[str, str]]] = None) -> str:
+        """
+        프롬프트에 넣을 대화 이력 (누적 요약 + 토큰 예산 안의 최근 대화)
+
+        대화 이력을 전달받지 않으면 대화 메모리에서 조회한다.
+        """
+        if conversation_history is None and self.memory is not None:
+            memory = self.memory.load(user_id, self.summarize_conversation)
+            return format_conversation(memory["turns"], memory["summary"])
+
+        _, recent = select_recent_turns(list(conversation_history or []))
+        return format_conversation(recent)
+
+    def load_context(self, user_id: str) -> Dict[str, Any]:
+        """
+        대화 단계와 턴에서 공유할 사용자/영양 컨텍스트 조회
+
+        사용자 데이터 버전과 날짜가 같으면 이전에 만든 컨텍스트를 그대로 사용한다.
+        식사/음식/프로필 변경이 커밋되면 버전이 바뀌어 다음 메시지에서 다시 계산하고,
+        날짜가 바뀌면 조회 기간이 달라지므로 다시 계산한다.
+
+        Args:
+            user_id (str): 사용자 ID
+
+        Returns:
+            Dict[str, Any]: {"user": 사용자, "nutrition_context": 최근 영양 컨텍스트}
+        """
+        key = self._context_key(user_id)
+        if key is not None:
+            with self._context_lock:
+                entry = self._context_cache.get(str(user_id))
+                if entry is not None and entry[0] == key:
+                    self._context_cache.move_to_end(str(user_id))
+                    return entry[1]
+
+        context = {
+            "user": self.user_repository.get_user(user_id),
+            "nutrition_context": self._get_recent_nutrition_context(user_id)
+        }
+
+        # 조회 실패로 빈 컨텍스트가 된 경우는 저장하지 않음
+        if key is not None and context["nutrition_context"]:
+            with self._context_lock:
+                self._context_cache[str(user_id)] = (key, context)
+                self._context_cache.move_to_end(str(user_id))
+                while len(self._context_cache) > self.context_cache_size:
+                    self._context_cache.popitem(last=False)
+        return context
+
+    def _context_key(self, user_id: str) -> Optional[Tuple[Any, date]]:
+        """컨텍스트 캐시 키 (버전 조회 함수가 없거나 실패하면 None으로 캐시 사용 안 함)"""
+        if self.context_version is None:
+            return None
+        try:
+            return self.context_version(user_id), date.today()
+        except Exception as e:
+            self.logger.warning(f"사용자 데이터 버전 조회 실패, 컨텍스트를 새로 계산합니다: {str(e)}")
+            return None
+
+    def classify_intent(self, user_message: str) -> Optional[Dict[str, Any]]:
+        """
+        로컬 분류기로 의도 분석 (LLM 호출 없음)
+
+        Args:
+            user_message (str): 사용자 메시지
+
+        Returns:
+            Optional[Dict[str, Any]]: 의도 분석 결과 (분류기가 없거나 신뢰도가 임계값 미만이면 None)
+        """
+        if self.intent_classifier is None:
+            return None
+
+        try:
+            category, confidence = self.intent_classifier.predict(user_message)
+        except Exception as e:
+            self.logger.error(f"로컬 의도 분류 중 오류: {str(e)}")
+            return None
+
+        if confidence < self.intent_threshold or category not in INTENT_CATEGORIES:
+            self.logger.debug(f"로컬 의도 신뢰도 부족 ({category}, {confidence:.2f}), LLM 분석 사용")
+            return None
+
+        return {
+            "intent_category": category,
+            "confidence": round(confidence, 4),
+            "key_entities": []
+        }
+
+    def process_message(
+            self,
+            user_id: str,
+            user_message: str,
+            conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        메시지 한 건 처리 (의도 분석 + 답변 + 추천)
+
+        사용자/영양 컨텍스트는 한 번만 조회해 모든 단계에서 공유한다.
+        로컬 분류기가 의도를 충분한 신뢰도로 분류하면 답변만 생성하고,
+        그렇지 않으면 의도와 답변을 통합 프롬프트 한 번의 LLM 호출로 함께 생성한다.
+
+        Args:
+            user_id (str): 사용자 ID
+            user_message (str): 사용자 메시지
+            conversation_history (Optional[List[Dict[str, str]]]): 이전 대화 목록
+
+        Returns:
+            Dict[str, Any]: {"response", "intent", "recommendations", "nutrition_context"}
+        """
+        try:
+            context = self.load_context(user_id)
+        except Exception as e:
+            self.logger.error(f"챗봇 컨텍스트 조회 중 오류: {str(e)}")
+            return {
+                "response": FALLBACK_RESPONSE,
+                "intent": dict(DEFAULT_INTENT),
+                "recommendations": {},
+                "nutrition_context": {}
+            }
+
+        user = context["user"]
+        nutrition_context = context["nutrition_context"]
+
+        intent = self.classify_intent(user_message)
+        try:
+            if intent is not None:
+                chain = LLMChain(llm=self.llm, prompt=self.conversation_prompt)
+            else:
+                chain = LLMChain(llm=self.structured_llm, prompt=self.combined_prompt)
+
+            output = chain.run(**self._prompt_inputs(
+                "chatbot.process_message",
+                chain.prompt,
+                user,
+                nutrition_context,
+                self._conversation_history(user_id, conversation_history),
+                user_message
+            ))
+
+            if intent is not None:
+                reply = {"intent": intent, "response": output.strip() or FALLBACK_RESPONSE}
+            else:
+                reply = parse_structured_reply(output)
+
+        except Exception as e:
+            self.logger.error(f"챗봇 응답 생성 중 오류: {str(e)}")
+            reply = {"intent": intent or dict(DEFAULT_INTENT), "response": FALLBACK_RESPONSE}
+
+        recommendations = self.generate_personalized_recommendation(
+            user_id=user_id,
+            intent_category=reply["intent"]["intent_category"],
+            user=user,
+            nutrition_context=nutrition_context
+        )
+
+        return {
+            "response": reply["response"],
+            "intent": reply["intent"],
+            "recommendations": recommendations,
+            "nutrition_context": nutrition_context
+        }
+
     def _get_recent_nutrition_context(self, user_id: str) -> Dict[str, Any]:
         """
         최근 영양 섭취 컨텍스트 조회
@@ -148,30 +510,26 @@ class PersonalizedNutritionChatbot:
         개인화된 챗봇 응답 생성
         """
         try:
-            # 사용자 정보 조회
-            user = self.user_repository.get_user(user_id)
-
-            # 최근 영양 컨텍스트 조회
-            nutrition_context = self._get_recent_nutrition_context(user_id)
+            # 사용자 정보와 최근 영양 컨텍스트 조회 (캐시)
+            context = self.load_context(user_id)
+            user = context["user"]
+            nutrition_context = context["nutrition_context"]
 
             # 대화 이력 처리
-            conversation_history = conversation_history or []
-            history_str = "\n".join([
-                f"사용자: {entry['user']}\n어시스턴트: {entry['assistant']}"
-                for entry in conversation_history[-5:]  # 최근 5개 대화만 포함
-            ])
+            history_str = self._conversation_history(user_id, conversation_history)
 
             # LLM 체인 생성
             chain = LLMChain(llm=self.llm, prompt=self.conversation_prompt)
 
             # 응답 생성
-            response = chain.run(
-                user_profile=json.dumps(user.__dict__, ensure_ascii=False),
-                recent_nutrition=json.dumps(nutrition_context, ensure_ascii=False),
-                health_goal=user.health_goal,
-                conversation_history=history_str,
-                user_message=user_message
-            )
+            response = chain.run(**self._prompt_inputs(
+                "chatbot.generate_chat_response",
+                self.conversation_prompt,
+                user,
+                nutrition_context,
+                history_str,
+                user_message
+            ))
 
             return {
                 "response": response,
@@ -181,14 +539,18 @@ class PersonalizedNutritionChatbot:
         except Exception as e:
             self.logger.error(f"챗봇 응답 생성 중 오류: {str(e)}")
             return {
-                "response": "죄송합니다. 현재 상담이 어렵습니다. 잠시 후 다시 시도해주세요.",
+                "response": FALLBACK_RESPONSE,
                 "nutrition_context": {}
             }
 
     def analyze_conversation_intent(self, user_message: str) -> Dict[str, Any]:
         """
-        사용자 메시지의 의도 분석
+        사용자 메시지의 의도 분석 (로컬 분류기 신뢰도가 낮을 때만 LLM 호출)
         """
+        intent = self.classify_intent(user_message)
+        if intent is not None:
+            return intent
+
         try:
             # 대화 의도 분석을 위한 프롬프트
             intent_prompt = PromptTemplate(
@@ -225,33 +587,34 @@ class PersonalizedNutritionChatbot:
                 intent_result = json.loads(intent_result_str)
             except json.JSONDecodeError:
                 # 파싱 실패 시 기본값
-                intent_result = {
-                    "intent_category": "기타",
-                    "confidence": 0.5,
-                    "key_entities": []
-                }
+                intent_result = dict(DEFAULT_INTENT)
 
             return intent_result
 
         except Exception as e:
             self.logger.error(f"대화 의도 분석 중 오류: {str(e)}")
-            return {
-                "intent_category": "기타",
-                "confidence": 0.5,
-                "key_entities": []
-            }
+            return dict(DEFAULT_INTENT)
 
     def generate_personalized_recommendation(
             self,
             user_id: str,
-            intent_category: str
+            intent_category: str,
+            user=None,
+            nutrition_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """
         의도에 기반한 개인화된 추천 생성
+
+        Args:
+            user_id (str): 사용자 ID
+            intent_category (str): 의도 카테고리
+            user: 이미 조회한 사용자 (없으면 컨텍스트 캐시에서 조회)
+            nutrition_context (Optional[Dict[str, Any]]): 이미 조회한 영양 컨텍스트 (없으면 컨텍스트 캐시에서 조회)
         """
         try:
             # 사용자 정보 조회
-            user = self.user_repository.get_user(user_id)
+            if user is None:
+                user = self.load_context(user_id)["user"]
 
             # 의도별 추천 로직
             recommendations = {}
@@ -267,14 +630,17 @@ class PersonalizedNutritionChatbot:
                 recent_meals = self.meal_repository.get_recent_meals(user_id, limit=3)
                 recommendations = {
                     "recent_foods": [
-                        self.nutrition_service.get_food_nutrition(meal.food_name)
+                        self.nutrition_service.get_food_nutrition(
+                            meal['food_name'] if isinstance(meal, dict) else meal.food_name
+                        )
                         for meal in recent_meals
                     ]
                 }
 
             elif intent_category == "건강 목표 관련":
                 # 건강 목표 진행 상황 및 추천
-                nutrition_context = self._get_recent_nutrition_context(user_id)
+                if nutrition_context is None:
+                    nutrition_context = self.load_context(user_id)["nutrition_context"]
                 recommendations = {
                     "health_goal": user.health_goal,
                     "nutrition_progress": nutrition_context,
@@ -358,7 +724,10 @@ def initialize_nutrition_chatbot(
         openai_api_key: str,
         user_repository: UserRepository,
         nutrition_service: NutritionService,
-        meal_repository: MealRepository
+        meal_repository: MealRepository,
+        intent_classifier=None,
+        context_version: Optional[Callable[[str], Any]] = None,
+        memory=None
 ) -> PersonalizedNutritionChatbot:
     """
     영양 챗봇 서비스 초기화
@@ -367,5 +736,8 @@ def initialize_nutrition_chatbot(
         openai_api_key=openai_api_key,
         user_repository=user_repository,
         nutrition_service=nutrition_service,
-        meal_repository=meal_repository
+        meal_repository=meal_repository,
+        intent_classifier=intent_classifier,
+        context_version=context_version,
+        memory=memory
     )
\ No newline at end of file
@@ -22,24 +22,16 @@ class ChatbotService:
         Returns:
             Dict[str, Any]: 챗봇 응답
         """
-        # 대화 의도 분석
-        intent = self.chatbot.analyze_conversation_intent(message)
-
-        # 챗봇 응답 생성
-        response = self.chatbot.generate_chat_response(
+        # 의도 분석 + 응답 + 추천 (LLM 호출 1회, 컨텍스트 조회 1회)
+        result = self.chatbot.process_message(
             user_id=user_id,
             user_message=message
         )
-
-        # 개인화된 추천 생성
-        recommendations = self.chatbot.generate_personalized_recommendation(
-            user_id=user_id,
-            intent_category=intent.get('intent_category', '기타')
-        )
+        recommendations = result['recommendations']
 
         return {
-            'response': response.get('response', ''),
+            'response': result['response'],
             'alternative_foods': recommendations.get('recent_foods', []),
             'meal_recommendations': recommendations.get('suggested_actions', []),
-            'intent': intent
+            'intent': result['intent']
         }
\ No newline at end of file
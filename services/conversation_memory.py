@@ -0,0 +1,218 @@
+"""
+사용자별 대화 메모리
+
+최근 대화는 토큰 예산 안에서 원문 그대로 사용하고, 예산을 넘는 오래된 대화는
+누적 요약(chat_memory 테이블)에 점진적으로 합친다. 대화가 아무리 길어져도
+프롬프트에 들어가는 대화 이력은 (요약 예산 + 최근 대화 예산) 토큰을 넘지 않는다.
+
+요약은 예산을 넘을 때마다 하지 않고, 넘으면 최근 대화를 예산의 절반까지 줄이도록
+한 번에 요약하므로 LLM 요약 호출은 여러 턴에 한 번만 일어난다.
+"""
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable, Tuple, Deque
+
+from utils.tokenizer import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 최근 대화(원문)와 누적 요약의 토큰 예산
+DEFAULT_RECENT_TOKEN_BUDGET = 1000
+DEFAULT_SUMMARY_TOKEN_BUDGET = 300
+
+# 한 번에 조회하는 요약 전 대화 수 (요약이 계속 실패해도 조회량 제한)
+MAX_UNSUMMARIZED_TURNS = 50
+
+# 대화 한 턴의 형식 토큰 ("사용자: ", "어시스턴트: ", 줄바꿈)
+TURN_OVERHEAD_TOKENS = 8
+
+# 지연 저장(audit_writer)이 끝나기 전의 대화를 보관하는 시간(초)과 사용자당 최대 개수
+PENDING_TTL = 60
+PENDING_TURNS = 20
+
+# (이전 요약, 요약할 대화 목록, 최대 토큰 수) → 새 요약
+Summarizer = Callable[[str, List[Dict[str, Any]], int], Optional[str]]
+
+
+def turn_tokens(turn: Dict[str, Any]) -> int:
+    """대화 한 턴(질문 + 응답)의 토큰 수 (미리 계산한 "tokens" 값이 있으면 사용)"""
+    if 'tokens' in turn:
+        return turn['tokens']
+    return count_tokens(turn.get('user') or '') + count_tokens(turn.get('assistant') or '') + TURN_OVERHEAD_TOKENS
+
+
+def select_recent_turns(turns: List[Dict[str, Any]], budget: int = DEFAULT_RECENT_TOKEN_BUDGET
+                        ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    토큰 예산 안에 들어가는 최근 대화 선택
+
+    Args:
+        turns (List[Dict[str, Any]]): 대화 목록 (오래된 순, {"user", "assistant"})
+        budget (int): 최근 대화 토큰 예산
+
+    Returns:
+        Tuple[List, List]: (예산을 넘는 오래된 대화, 최근 대화) - 둘 다 오래된 순
+    """
+    used = 0
+    split = len(turns)
+    for index in range(len(turns) - 1, -1, -1):
+        tokens = turn_tokens(turns[index])
+        if used + tokens > budget:
+            break
+        used += tokens
+        split = index
+    return turns[:split], turns[split:]
+
+
+class ConversationMemory:
+    """
+    ChatbotRepository 기반 사용자별 대화 메모리
+
+    대화 기록은 record_turn()이 지연 저장 큐(audit_writer)로 저장하며,
+    저장이 끝나기 전의 대화도 같은 프로세스에서는 바로 다음 턴부터 사용한다.
+    """
+
+    def __init__(self, repository=None, recent_token_budget: int = DEFAULT_RECENT_TOKEN_BUDGET,
+                 summary_token_budget: int = DEFAULT_SUMMARY_TOKEN_BUDGET,
+                 max_turns: int = MAX_UNSUMMARIZED_TURNS):
+        """
+        Args:
+            repository: 대화 저장소 (기본: ChatbotRepository)
+            recent_token_budget (int): 원문으로 사용할 최근 대화 토큰 예산
+            summary_token_budget (int): 누적 요약 토큰 예산
+            max_turns (int): 한 번에 조회할 요약 전 대화 수
+        """
+        if repository is None:
+            from database.repositories.chatbot_repository import ChatbotRepository
+            repository = ChatbotRepository()
+
+        self.repository = repository
+        self.recent_token_budget = recent_token_budget
+        self.summary_token_budget = summary_token_budget
+        self.max_turns = max_turns
+        self._pending: Dict[str, Deque[Tuple[float, Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def record_turn(self, uid, query: str, response: str, context: Optional[str] = None) -> Dict[str, Any]:
+        """
+        대화 한 턴 저장 (지연 저장 큐에 넣고 저장 전까지 메모리에 보관)
+
+        Args:
+            uid: 사용자 ID
+            query (str): 사용자 메시지
+            response (str): 챗봇 응답
+            context (Optional[str]): 대화 컨텍스트 (JSON 문자열)
+
+        Returns:
+            Dict[str, Any]: 저장할 대화 행
+        """
+        from models.chatbot import Chatbot
+        from services.audit_queue import audit_writer
+
+        row = {
+            'uid': int(uid),
+            'query': query,
+            'response': response,
+            'context': context,
+            'timestamp': datetime.now()
+        }
+        with self._lock:
+            pending = self._pending.setdefault(str(uid), deque(maxlen=PENDING_TURNS))
+            pending.append((time.monotonic(), {'user': query, 'assistant': response}))
+
+        audit_writer.enqueue(Chatbot, [row])
+        return row
+
+    def _pending_turns(self, uid, stored: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """저장이 끝나지 않은 대화 (저장된 대화와 같거나 오래된 항목은 제거)"""
+        stored_keys = {(turn['user'], turn['assistant']) for turn in stored}
+        deadline = time.monotonic() - PENDING_TTL
+        with self._lock:
+            pending = self._pending.get(str(uid))
+            if not pending:
+                return []
+            kept = [(recorded, turn) for recorded, turn in pending
+                    if recorded >= deadline and (turn['user'], turn['assistant']) not in stored_keys]
+            pending.clear()
+            pending.extend(kept)
+            if not kept:
+                self._pending.pop(str(uid), None)
+            return [dict(turn) for _, turn in kept]
+
+    def load(self, uid, summarize: Optional[Summarizer] = None) -> Dict[str, Any]:
+        """
+        프롬프트에 넣을 대화 메모리 조회 (필요하면 오래된 대화를 요약에 합침)
+
+        Args:
+            uid: 사용자 ID
+            summarize (Optional[Summarizer]): 요약 함수 (없으면 예산을 넘는 대화는 제외만 함)
+
+        Returns:
+            Dict[str, Any]: {"summary": 누적 요약, "turns": 최근 대화 목록 (오래된 순)}
+        """
+        try:
+            memory = self.repository.get_memory(int(uid))
+            summary = memory.summary if memory else ''
+            last_cid = memory.last_cid if memory else 0
+            rows = self.repository.get_turns_after(int(uid), last_cid, limit=self.max_turns)
+        except Exception as e:
+            logger.error(f"대화 메모리 조회 오류 (uid={uid}): {str(e)}")
+            _, recent = select_recent_turns(self._pending_turns(uid, []), self.recent_token_budget)
+            return {'summary': '', 'turns': recent}
+
+        stored = [{'cid': row.cid, 'user': row.query, 'assistant': row.response or ''} for row in reversed(rows)]
+        turns = stored + self._pending_turns(uid, stored)
+        for turn in turns:
+            turn['tokens'] = turn_tokens(turn)
+        older, recent = select_recent_turns(turns, self.recent_token_budget)
+
+        if older and summarize is not None:
+            # 다음 몇 턴 동안 다시 요약하지 않도록 최근 대화를 예산의 절반까지 줄여서 함께 요약 (마지막 턴은 유지)
+            while len(recent) > 1 and recent[0].get('cid') \
+                    and sum(turn_tokens(turn) for turn in recent) > self.recent_token_budget // 2:
+                older.append(recent.pop(0))
+
+            folded = [turn for turn in older if turn.get('cid')]
+            if folded:
+                summary = self._fold(uid, summary, folded, summarize)
+
+        return {'summary': summary, 'turns': [{'user': turn['user'], 'assistant': turn['assistant']}
+                                              for turn in recent]}
+
+    def _fold(self, uid, summary: str, turns: List[Dict[str, Any]], summarize: Summarizer) -> str:
+        """오래된 대화를 누적 요약에 합쳐 저장 (실패하면 이전 요약 유지)"""
+        try:
+            updated = summarize(summary, turns, self.summary_token_budget)
+        except Exception as e:
+            logger.error(f"대화 요약 오류 (uid={uid}): {str(e)}")
+            return summary
+
+        if not updated:
+            return summary
+
+        updated = truncate_tokens(updated.strip(), self.summary_token_budget)
+        try:
+            self.repository.save_memory(int(uid), updated, count_tokens(updated), turns[-1]['cid'])
+            logger.debug(f"대화 {len(turns)}턴을 요약에 반영 (uid={uid})")
+        except Exception as e:
+            logger.error(f"대화 메모리 저장 오류 (uid={uid}): {str(e)}")
+        return updated
+
+
+def format_conversation(turns: List[Dict[str, Any]], summary: str = '') -> str:
+    """
+    대화 이력 프롬프트 문자열
+
+    Args:
+        turns (List[Dict[str, Any]]): 최근 대화 목록 (오래된 순)
+        summary (str): 이전 대화 누적 요약
+
+    Returns:
+        str: 프롬프트에 넣을 대화 이력
+    """
+    lines = [f"[이전 대화 요약]\n{summary}\n"] if summary else []
+    lines.extend(f"사용자: {turn['user']}\n어시스턴트: {turn['assistant']}" for turn in turns)
+    return "\n".join(lines)
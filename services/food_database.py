@@ -3,7 +3,7 @@ import json
 import logging
 import pandas as pd
 import sqlite3
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Callable
 from pathlib import Path
 
 class FoodDatabaseService:
@@ -55,6 +55,10 @@ class FoodDatabaseService:
         """
         self.logger = logging.getLogger(__name__)
         self.db_path = db_path
+        # 카탈로그 변경 시 증가 (영양소 집계 캐시 무효화용)
+        self.catalog_version = 0
+        # 카탈로그 변경 시 변경된 식품 이름 목록으로 호출되는 콜백
+        self._change_listeners: List[Callable[[List[str]], None]] = []
 
         # 디렉토리 생성
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
@@ -62,6 +66,25 @@ class FoodDatabaseService:
         # 데이터베이스 초기화
         self._init_database()
 
+    def add_change_listener(self, listener: Callable[[List[str]], None]):
+        """
+        카탈로그 변경 알림 등록
+
+        Args:
+            listener (Callable[[List[str]], None]): 변경된 식품 이름 목록을 받는 콜백
+        """
+        if listener not in self._change_listeners:
+            self._change_listeners.append(listener)
+
+    def _notify_catalog_changed(self, names: List[str]):
+        """카탈로그 버전 증가 및 변경 알림"""
+        self.catalog_version += 1
+        for listener in self._change_listeners:
+            try:
+                listener(names)
+            except Exception as e:
+                self.logger.error(f"카탈로그 변경 알림 오류: {str(e)}")
+
     def is_initialized(self) -> bool:
         """ 데이터베이스 파일이 존재하는지 확인 """
         return os.path.exists(self.db_path)
@@ -147,6 +170,7 @@ class FoodDatabaseService:
 
             # 배치 처리
             total_records = 0
+            imported_names = []
             conn = sqlite3.connect(self.db_path)
 
             for i in range(0, len(df), batch_size):
@@ -173,9 +197,11 @@ class FoodDatabaseService:
                 # 데이터베이스에 배치 삽입
                 self._insert_food_batch(conn, batch_records)
                 total_records += len(batch_records)
+                imported_names.extend(record["name"] for record in batch_records)
                 self.logger.info(f"식품 데이터 {total_records}/{len(df)} 임포트 완료")
 
             conn.close()
+            self._notify_catalog_changed(imported_names)
             self.logger.info(f"총 {total_records}개의 식품 데이터 가져오기 완료")
             return total_records
 
@@ -243,6 +269,152 @@ class FoodDatabaseService:
 
         conn.commit()
 
+    def add_food(self, record: Dict[str, Any]) -> bool:
+        """
+        단일 식품을 카탈로그에 추가 (이미 있으면 갱신)
+
+        Args:
+            record (Dict[str, Any]): 식품 정보 (name 필수, 나머지 컬럼은 선택)
+
+        Returns:
+            bool: 성공 여부
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            self._insert_food_batch(conn, [{
+                "name": record["name"],
+                "category": record.get("category") or "기타",
+                "calories": record.get("calories", 0),
+                "carbs": record.get("carbs", 0),
+                "protein": record.get("protein", 0),
+                "fat": record.get("fat", 0),
+                "sodium": record.get("sodium", 0),
+                "fiber": record.get("fiber", 0),
+                "sugar": record.get("sugar", 0),
+                "tags": self._serialize_list(record.get("tags", [])),
+                "description": record.get("description", ""),
+                "source": record.get("source", "")
+            }])
+            self._notify_catalog_changed([record["name"]])
+            return True
+
+        except Exception as e:
+            self.logger.error(f"식품 추가 오류: {str(e)}")
+            return False
+        finally:
+            if conn:
+                conn.close()
+
+    def add_recipes(self, records: List[Dict[str, Any]]) -> int:
+        """
+        레시피를 한 번의 트랜잭션으로 추가 (같은 제목이 이미 있으면 건너뜀)
+
+        Args:
+            records (List[Dict[str, Any]]): 레시피 정보 (title, ingredients, instructions 필수)
+
+        Returns:
+            int: 추가된 레시피 수
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.executemany("""
+                INSERT OR IGNORE INTO recipes
+                (title, ingredients, instructions, calories, carbs, protein, fat,
+                 time, difficulty, tags, health_goals)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, [
+                (
+                    record["title"],
+                    self._serialize_list(record.get("ingredients", [])),
+                    record.get("instructions", ""),
+                    record.get("calories"),
+                    record.get("carbs"),
+                    record.get("protein"),
+                    record.get("fat"),
+                    record.get("time"),
+                    record.get("difficulty"),
+                    self._serialize_list(record.get("tags", [])),
+                    self._serialize_list(record.get("health_goals", []))
+                )
+                for record in records
+            ])
+            conn.commit()
+            return max(cursor.rowcount, 0)
+
+        except Exception as e:
+            self.logger.error(f"레시피 추가 오류: {str(e)}")
+            return 0
+        finally:
+            if conn:
+                conn.close()
+
+    def import_recipes_from_json(self, json_path: str) -> int:
+        """
+        JSON 파일(레시피 목록)에서 레시피 가져오기
+
+        Args:
+            json_path (str): JSON 파일 경로
+
+        Returns:
+            int: 추가된 레시피 수
+        """
+        with open(json_path, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        count = self.add_recipes(records)
+        self.logger.info(f"레시피 가져오기 완료: {count}개 추가 ({json_path})")
+        return count
+
+    def get_recipe_version(self) -> Tuple[int, int]:
+        """
+        레시피 테이블 버전 (레시피 수, 마지막 ID) - 레시피 엔진 인덱스 무효화용
+
+        레시피는 추가만 되므로 두 값이 같으면 테이블 내용도 같다.
+
+        Returns:
+            Tuple[int, int]: (레시피 수, 마지막 ID), 조회 실패 시 (0, 0)
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            count, last_id = conn.execute("SELECT COUNT(*), COALESCE(MAX(id), 0) FROM recipes").fetchone()
+            return count, last_id
+
+        except Exception as e:
+            self.logger.error(f"레시피 버전 조회 오류: {str(e)}")
+            return 0, 0
+        finally:
+            if conn:
+                conn.close()
+
+    def get_recipes(self) -> List[Dict[str, Any]]:
+        """
+        전체 레시피 조회 (레시피 엔진용, 목록 컬럼은 파싱된 리스트)
+
+        Returns:
+            List[Dict[str, Any]]: 레시피 목록
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM recipes ORDER BY id").fetchall()
+            recipes = []
+            for row in rows:
+                recipe = dict(row)
+                for key in ("ingredients", "tags", "health_goals"):
+                    recipe[key] = self._safe_json_loads(recipe[key])
+                recipes.append(recipe)
+            return recipes
+
+        except Exception as e:
+            self.logger.error(f"레시피 조회 오류: {str(e)}")
+            return []
+        finally:
+            if conn:
+                conn.close()
+
     def _serialize_list(self, list_data: Any) -> str:
         """
         리스트 데이터를 직렬화
@@ -312,6 +484,31 @@ class FoodDatabaseService:
             if conn:
                 conn.close()
 
+    def get_nutrient_table(self, nutrient_keys) -> Tuple[List[str], List[Tuple[float, ...]]]:
+        """
+        전체 식품의 영양소 값 조회 (집계 엔진용)
+
+        Args:
+            nutrient_keys: 조회할 영양소 컬럼 목록
+
+        Returns:
+            Tuple[List[str], List[Tuple[float, ...]]]: 식품 이름 목록, 영양소 값 목록
+        """
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            columns = ", ".join(f"COALESCE({key}, 0)" for key in nutrient_keys)
+            cursor = conn.execute(f"SELECT name, {columns} FROM foods")
+            rows = cursor.fetchall()
+            return [row[0] for row in rows], [tuple(row[1:]) for row in rows]
+
+        except Exception as e:
+            self.logger.error(f"영양소 테이블 조회 오류: {str(e)}")
+            return [], []
+        finally:
+            if conn:
+                conn.close()
+
     def get_all_foods(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
         모든 식품 정보 조회
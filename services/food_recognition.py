@@ -1,15 +1,12 @@
 # services/food_recognition.py 파일 생성
-from services.food_recognition_service import FoodRecognitionService
-
-# FoodRecognitionService 인스턴스 생성
-food_recognition_service = FoodRecognitionService()
+from services import service_manager
 
 def recognize_food_from_image(image_data):
     """
     이미지로부터 음식 인식 함수
-    FoodRecognitionService의 메서드를 래핑
+    FoodRecognitionService의 메서드를 래핑 (서비스 컨테이너의 공유 인스턴스 사용)
     """
-    return food_recognition_service.recognize_food_from_image(image_data)
+    return service_manager.food_recognition.recognize_food_from_image(image_data)
 
 def extract_food_names_from_text(text_description):
     """
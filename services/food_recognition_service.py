@@ -7,6 +7,7 @@ import random
 from werkzeug.utils import secure_filename
 from services.food_database import FoodDatabaseService
 from services.rag_service import RAGService
+from services.food_resolution import get_resolution_queue
 from dotenv import load_dotenv
 
 
@@ -33,6 +34,7 @@ class FoodRecognitionService:
 
         self.food_db = food_db or FoodDatabaseService()
         self.rag_service = rag_service or RAGService(openai_api_key=openai_api_key)
+        self.resolution_queue = get_resolution_queue(self.food_db, self.rag_service)
 
         # 샘플 음식 데이터 (모델이 실제로 구현되기 전까지 사용)
         # 실제 구현에서는 ML 모델을 통해 이미지 인식 수행
@@ -260,12 +262,20 @@ class FoodRecognitionService:
                     "source": "database"
                 }
             else:
-                # 데이터베이스에 없는 경우 RAG 시스템 활용
-                rag_info = self.rag_service.query_food_info(f"{food_name}의 상세 정보")
+                # 데이터베이스에 없는 경우 백그라운드 해석을 요청하고 즉시 반환 (이름이 비슷한 식품의 추정값이 있으면 함께 반환)
+                status = self.resolution_queue.request(food_name)
+                guess = self.resolution_queue.guess(food_name)
+                if guess:
+                    return {
+                        "name": food_name,
+                        "details": guess,
+                        "source": guess["source"]
+                    }
                 return {
                     "name": food_name,
-                    "details": {"description": rag_info},
-                    "source": "rag"
+                    "details": {"description": f"{food_name}에 대한 정보를 확인하고 있습니다."
+                                if status == "pending" else f"{food_name}에 대한 정보를 찾을 수 없습니다."},
+                    "source": status
                 }
 
         except Exception as e:
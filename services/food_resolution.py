@@ -0,0 +1,308 @@
+import re
+import json
+import time
+import queue
+import logging
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+from services.nutrition_engine import NUTRIENT_KEYS
+
+logger = logging.getLogger(__name__)
+
+# 해석 결과 상태
+STATUS_PENDING = "pending"
+STATUS_UNKNOWN = "unknown"
+STATUS_GUESS = "guess"
+
+# RAG 응답에서 영양소 값을 찾기 위한 이름 (영문 키 → 한글 표기)
+_NUTRIENT_LABELS = {
+    "calories": ("칼로리", "열량"),
+    "carbs": ("탄수화물",),
+    "protein": ("단백질",),
+    "fat": ("지방",),
+    "sodium": ("나트륨",),
+    "fiber": ("식이섬유",),
+    "sugar": ("당류", "당분")
+}
+
+_RAG_NUTRITION_PROMPT = (
+    "{food_name} 100g당 영양 정보를 다음 JSON 형식으로만 답하세요: "
+    '{{"category": "", "calories": 0, "carbs": 0, "protein": 0, "fat": 0, "sodium": 0, "fiber": 0, "sugar": 0}}'
+)
+
+
+class NegativeLookupCache:
+    """카탈로그에서 찾지 못한 식품 이름의 TTL 캐시 (이름별 값을 함께 보관할 수 있음)"""
+
+    def __init__(self, ttl_seconds: float = 600):
+        """
+        Args:
+            ttl_seconds (float): 항목 유지 시간 (초)
+        """
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """이름의 값 조회 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[name]
+                return None
+            return entry[1]
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def add(self, name: str, value: Any = True) -> None:
+        """이름 등록 (TTL 갱신)"""
+        with self._lock:
+            self._entries[name] = (time.monotonic() + self.ttl_seconds, value)
+
+    def discard(self, name: str) -> None:
+        """이름 제거"""
+        with self._lock:
+            self._entries.pop(name, None)
+
+
+def normalize_food_name(name: str) -> str:
+    """이름 비교용 정규화 (공백 제거, 소문자)"""
+    return re.sub(r"\s+", "", name).lower()
+
+
+def parse_nutrition_answer(answer: str) -> Optional[Dict[str, Any]]:
+    """
+    RAG 응답에서 100g당 영양 정보 추출
+
+    Args:
+        answer (str): RAG 응답 문자열 (JSON 또는 '칼로리: 120kcal' 형태의 텍스트)
+
+    Returns:
+        Optional[Dict[str, Any]]: 영양소 값 (칼로리를 찾지 못하면 None)
+    """
+    if not answer:
+        return None
+
+    nutrition: Dict[str, Any] = {}
+    match = re.search(r"\{.*\}", answer, re.DOTALL)
+    if match:
+        try:
+            data = json.loads(match.group(0))
+            for key in NUTRIENT_KEYS:
+                if isinstance(data.get(key), (int, float)):
+                    nutrition[key] = float(data[key])
+            if isinstance(data.get("category"), str) and data["category"]:
+                nutrition["category"] = data["category"]
+        except (json.JSONDecodeError, AttributeError):
+            pass
+
+    for key, labels in _NUTRIENT_LABELS.items():
+        if key in nutrition:
+            continue
+        for label in labels:
+            found = re.search(rf"{label}\s*[:：]?\s*(\d+(?:\.\d+)?)", answer)
+            if found:
+                nutrition[key] = float(found.group(1))
+                break
+
+    if "calories" not in nutrition:
+        return None
+    return nutrition
+
+
+class FoodResolutionQueue:
+    """
+    미확인 식품 백그라운드 해석 큐
+
+    카탈로그에 없는 식품 이름을 요청 경로에서 즉시 반환하고, 백그라운드 스레드에서
+    이름 매칭 → RAG 순서로 해석하여 결과를 새 카탈로그 항목으로 기록한다.
+
+    카탈로그에 기록하는 이름 매칭은 정규화한 이름이 같은 경우(예: '김치 찌개' → '김치찌개')뿐이다.
+    부분 문자열/단어 매칭(예: '김치찌개 한 그릇' → '김치찌개')은 틀릴 수 있으므로 추정값으로
+    TTL 동안 메모리에만 보관하고(guess()), 만료 후 다시 해석한다.
+    해석에 실패한 이름은 TTL 동안 부정 캐시에 남아 재시도하지 않는다.
+    """
+
+    def __init__(self, food_db, rag_service=None, negative_ttl: float = 600):
+        """
+        Args:
+            food_db (FoodDatabaseService): 식품 데이터베이스 서비스
+            rag_service (Optional[RAGService]): RAG 서비스 (없으면 이름 매칭만 수행)
+            negative_ttl (float): 부정 캐시 유지 시간 (초)
+        """
+        self.food_db = food_db
+        self.rag_service = rag_service
+        self.negative_cache = NegativeLookupCache(ttl_seconds=negative_ttl)
+        self.guesses = NegativeLookupCache(ttl_seconds=negative_ttl)
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def request(self, food_name: str) -> str:
+        """
+        미확인 식품 해석 요청
+
+        Args:
+            food_name (str): 카탈로그에서 찾지 못한 식품 이름
+
+        Returns:
+            str: 'pending'(해석 대기/진행 중), 'guess'(추정값만 있음, guess()로 조회) 또는 'unknown'(최근 해석 실패)
+        """
+        name = food_name.strip()
+        if name in self.guesses:
+            return STATUS_GUESS
+        if name in self.negative_cache:
+            return STATUS_UNKNOWN
+
+        with self._lock:
+            if name not in self._pending:
+                self._pending.add(name)
+                self._queue.put(name)
+                self._ensure_worker()
+        return STATUS_PENDING
+
+    def guess(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """
+        이름 일부가 일치하는 카탈로그 식품으로 추정한 영양 정보 (카탈로그에는 기록하지 않음)
+
+        Args:
+            food_name (str): 식품 이름
+
+        Returns:
+            Optional[Dict[str, Any]]: 추정 식품 정보 (source: 'guess:<카탈로그 식품 이름>'), 없거나 만료되면 None
+        """
+        return self.guesses.get(food_name.strip())
+
+    def is_pending(self, food_name: str) -> bool:
+        """해석 대기/진행 중 여부"""
+        with self._lock:
+            return food_name.strip() in self._pending
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="food-resolution", daemon=True)
+            self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            name = self._queue.get()
+            try:
+                if self.resolve(name):
+                    self.negative_cache.discard(name)
+                    self.guesses.discard(name)
+                else:
+                    self.negative_cache.add(name)
+            except Exception as e:
+                logger.error(f"미확인 식품 해석 오류 ({name}): {str(e)}")
+                self.negative_cache.add(name)
+            finally:
+                with self._lock:
+                    self._pending.discard(name)
+                self._queue.task_done()
+
+    def join(self) -> None:
+        """대기 중인 해석 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def resolve(self, food_name: str) -> bool:
+        """
+        식품 이름을 해석하여 카탈로그에 기록 (동기)
+
+        Args:
+            food_name (str): 식품 이름
+
+        Returns:
+            bool: 카탈로그 기록 성공 여부
+        """
+        if self.food_db.get_food_by_name(food_name):
+            return True
+
+        record, guess = self._resolve_by_name(food_name)
+        record = record or self._resolve_by_rag(food_name)
+        if record is None:
+            if guess is not None:
+                self.guesses.add(food_name, guess)
+                logger.info(f"'{food_name}'을(를) '{guess['source']}'(으)로 추정했습니다. (카탈로그에 기록하지 않음)")
+            else:
+                logger.warning(f"'{food_name}'의 정보를 해석하지 못했습니다.")
+            return False
+
+        if not self.food_db.add_food(record):
+            return False
+        logger.info(f"'{food_name}'을(를) 카탈로그에 추가했습니다. (출처: {record['source']})")
+        return True
+
+    def _resolve_by_name(self, food_name: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        이름이 일치하는 카탈로그 식품의 영양 정보 복사
+
+        Returns:
+            Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+                (정규화한 이름이 같은 식품의 별칭 항목, 이름이 서로 포함 관계인 식품의 추정 항목)
+        """
+        normalized = normalize_food_name(food_name)
+        guess = None
+        # 전체 이름으로 먼저 찾고, 없으면 단어별로 검색 (예: '김치 찌개' → '김치찌개')
+        search_terms = [food_name] + [word for word in food_name.split() if len(word) > 1 and word != food_name]
+        for term in search_terms:
+            for candidate in self.food_db.search_foods(term, limit=5):
+                candidate_name = normalize_food_name(candidate["name"])
+                if candidate_name == normalized:
+                    return self._copy_record(food_name, candidate, f"alias:{candidate['name']}"), None
+                if guess is None and (candidate_name in normalized or normalized in candidate_name):
+                    guess = self._copy_record(food_name, candidate, f"guess:{candidate['name']}")
+        return None, guess
+
+    @staticmethod
+    def _copy_record(food_name: str, food: Dict[str, Any], source: str) -> Dict[str, Any]:
+        record = {key: food.get(key) or 0 for key in NUTRIENT_KEYS}
+        record.update({
+            "name": food_name,
+            "category": food.get("category"),
+            "tags": food.get("tags", []),
+            "description": food.get("description", ""),
+            "source": source
+        })
+        return record
+
+    def _resolve_by_rag(self, food_name: str) -> Optional[Dict[str, Any]]:
+        """RAG 응답에서 영양 정보 추출"""
+        if self.rag_service is None:
+            return None
+
+        answer = self.rag_service.query_food_info(_RAG_NUTRITION_PROMPT.format(food_name=food_name))
+        nutrition = parse_nutrition_answer(answer)
+        if nutrition is None:
+            return None
+        return {**nutrition, "name": food_name, "description": answer, "source": "rag"}
+
+
+# 같은 식품 DB를 쓰는 서비스는 하나의 해석 큐를 공유
+_queues: Dict[str, FoodResolutionQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_resolution_queue(food_db, rag_service=None) -> FoodResolutionQueue:
+    """
+    식품 DB별 공유 해석 큐 반환
+
+    Args:
+        food_db (FoodDatabaseService): 식품 데이터베이스 서비스
+        rag_service (Optional[RAGService]): RAG 서비스
+
+    Returns:
+        FoodResolutionQueue: 해석 큐
+    """
+    with _queues_lock:
+        resolution_queue = _queues.get(food_db.db_path)
+        if resolution_queue is None:
+            resolution_queue = FoodResolutionQueue(food_db, rag_service)
+            _queues[food_db.db_path] = resolution_queue
+        elif resolution_queue.rag_service is None:
+            resolution_queue.rag_service = rag_service
+        return resolution_queue
@@ -186,6 +186,14 @@ def import_default_data(services: Dict[str, Any]) -> bool:
         else:
             print(f"기본 식품 CSV 파일이 없습니다: {default_food_csv}")
 
+        # 기본 레시피를 레시피 테이블에 임포트 (레시피 엔진 검색 대상)
+        if os.path.exists(default_recipe_json):
+            recipe_count = food_db.import_recipes_from_json(default_recipe_json)
+            print(f"{recipe_count}개의 레시피 데이터 임포트 완료")
+            logger.info(f"{recipe_count}개의 레시피 데이터 임포트 완료")
+        else:
+            print(f"기본 레시피 JSON 파일이 없습니다: {default_recipe_json}")
+
         logger.info("기본 데이터 임포트 완료")
         print("기본 데이터 임포트 완료")
         return True
@@ -0,0 +1,266 @@
+import os
+import json
+import logging
+from datetime import datetime, date, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import func, update
+
+from app.extensions import db
+from models.user import User
+from models.daily_nutrition import DailyNutrition
+from models.insight_snapshot import InsightSnapshot
+from services.nutrition_analysis import NutritionAnalysisService
+from services.nutrition_rollup import fill_series, average_nutrition
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷이 다루는 기간 (/api/nutrition/weekly와 동일한 7일)
+WINDOW_DAYS = 7
+
+
+class UserProfile:
+    """
+    작업 프로세스로 전달하는 사용자 정보
+
+    목표 영양소 계산에 필요한 값만 보관하며 User 모델과 같은 인터페이스(calculate_age)를 제공한다.
+    """
+
+    def __init__(self, uid: int, gender: Optional[int] = None, age: Optional[int] = None,
+                 health_goal: Optional[str] = None):
+        self.uid = uid
+        self.gender = gender
+        self.age = age
+        self.health_goal = health_goal
+
+    @classmethod
+    def from_user(cls, user: User) -> 'UserProfile':
+        return cls(user.uid, user.gender, user.calculate_age(), user.health_goal)
+
+    def calculate_age(self) -> Optional[int]:
+        return self.age
+
+
+def compute_snapshot(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    한 사용자의 스냅샷 값 계산 (DB를 사용하지 않으므로 작업 프로세스에서 실행 가능)
+
+    Args:
+        payload (Dict[str, Any]): profile, series, period_start, period_end, source_version
+
+    Returns:
+        Dict[str, Any]: InsightSnapshot 컬럼 값
+    """
+    profile = payload['profile']
+    series = payload['series']
+
+    average, days_with_data = average_nutrition(series)
+    targets = NutritionAnalysisService.calculate_target_nutrients(profile)
+    insights = NutritionAnalysisService.get_nutrition_insights(average, profile, is_average=True)
+
+    return {
+        'uid': profile.uid,
+        'period_start': payload['period_start'],
+        'period_end': payload['period_end'],
+        'days_with_data': days_with_data,
+        'total_meals': sum(day['meal_count'] for day in series),
+        'weekly_average': json.dumps(average, ensure_ascii=False),
+        'targets': json.dumps(targets, ensure_ascii=False),
+        'insights': json.dumps(insights, ensure_ascii=False),
+        'source_version': payload['source_version']
+    }
+
+
+def _window(end_date: Optional[date] = None):
+    end_date = end_date or datetime.now().date()
+    return end_date - timedelta(days=WINDOW_DAYS - 1), end_date
+
+
+def _source_versions(uids: List[int], start_date: date, end_date: date) -> Dict[int, str]:
+    """
+    사용자별 기간 내 일일 합계 데이터의 지문 (한 번의 GROUP BY 쿼리)
+
+    식사가 추가/수정/삭제되거나 기간이 바뀌어 포함되는 날이 달라지면 지문도 달라진다.
+    """
+    rows = db.session.query(
+        DailyNutrition.uid,
+        func.count(),
+        func.min(DailyNutrition.date),
+        func.max(DailyNutrition.date),
+        func.max(DailyNutrition.updated_at)
+    ).filter(
+        DailyNutrition.uid.in_(uids),
+        DailyNutrition.date >= start_date,
+        DailyNutrition.date <= end_date
+    ).group_by(DailyNutrition.uid).all()
+
+    versions = {uid: '0' for uid in uids}
+    for uid, count, first_day, last_day, last_updated in rows:
+        versions[uid] = f'{count}:{first_day}:{last_day}:{last_updated}'
+    return versions
+
+
+def _is_stale(snapshot: Optional[InsightSnapshot], user: User, version: str) -> bool:
+    if snapshot is None or snapshot.source_version != version:
+        return True
+    # 성별/생년월일/건강 목표가 바뀌면 목표 영양소가 달라짐
+    return bool(user.updated_at and user.updated_at > snapshot.computed_at)
+
+
+def _build_payloads(users: List[User], versions: Dict[int, str], start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    """스냅샷을 다시 계산할 사용자들의 입력 데이터 (일일 합계 한 번의 쿼리)"""
+    rollups: Dict[int, Dict[date, DailyNutrition]] = {user.uid: {} for user in users}
+    rows = DailyNutrition.query.filter(
+        DailyNutrition.uid.in_(list(rollups)),
+        DailyNutrition.date >= start_date,
+        DailyNutrition.date <= end_date
+    ).all()
+    for row in rows:
+        rollups[row.uid][row.date] = row
+
+    return [
+        {
+            'profile': UserProfile.from_user(user),
+            'series': fill_series(rollups[user.uid], start_date, end_date),
+            'period_start': start_date,
+            'period_end': end_date,
+            'source_version': versions[user.uid]
+        }
+        for user in users
+    ]
+
+
+def _save_snapshots(results: List[Dict[str, Any]], snapshots: Dict[int, InsightSnapshot]) -> List[InsightSnapshot]:
+    saved = []
+    now = datetime.now()
+    for values in results:
+        snapshot = snapshots.get(values['uid'])
+        if snapshot is None:
+            snapshot = InsightSnapshot(uid=values['uid'])
+            db.session.add(snapshot)
+        for key, value in values.items():
+            setattr(snapshot, key, value)
+        snapshot.computed_at = now
+        saved.append(snapshot)
+    return saved
+
+
+class InsightSnapshotJob:
+    """
+    전체 사용자의 인사이트 스냅샷을 계산하는 배치 작업 (야간 실행용)
+
+    사용자를 batch_size 단위로 나누어 DB에서 입력을 한꺼번에 읽고,
+    규칙 기반 계산은 프로세스 풀에서 병렬로 수행한 뒤 배치마다 커밋한다.
+    """
+
+    def __init__(self, workers: Optional[int] = None, batch_size: int = 500):
+        """
+        Args:
+            workers (Optional[int]): 작업 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+            batch_size (int): 한 번에 처리할 사용자 수
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+
+    def run(self, end_date: Optional[date] = None, full: bool = False) -> Dict[str, int]:
+        """
+        스냅샷 계산 실행 (앱 컨텍스트 안에서 호출)
+
+        Args:
+            end_date (Optional[date]): 기간 종료 날짜 (기본: 오늘)
+            full (bool): True이면 변경 여부와 관계없이 모든 사용자 재계산
+
+        Returns:
+            Dict[str, int]: users(검사한 사용자 수), computed(재계산), skipped(변경 없음)
+        """
+        start_date, end_date = _window(end_date)
+        stats = {'users': 0, 'computed': 0, 'skipped': 0}
+
+        executor = ProcessPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        try:
+            last_uid = 0
+            while True:
+                users = User.query.filter(User.uid > last_uid) \
+                    .order_by(User.uid) \
+                    .limit(self.batch_size) \
+                    .all()
+                if not users:
+                    break
+                last_uid = users[-1].uid
+
+                computed = self._run_batch(users, start_date, end_date, full, executor)
+                stats['users'] += len(users)
+                stats['computed'] += computed
+                stats['skipped'] += len(users) - computed
+
+            logger.info(f"인사이트 스냅샷 계산 완료: {stats}")
+            return stats
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"인사이트 스냅샷 계산 오류: {str(e)}")
+            raise
+
+        finally:
+            if executor:
+                executor.shutdown()
+
+    def _run_batch(self, users: List[User], start_date: date, end_date: date, full: bool, executor) -> int:
+        uids = [user.uid for user in users]
+        snapshots = {snapshot.uid: snapshot for snapshot in
+                     InsightSnapshot.query.filter(InsightSnapshot.uid.in_(uids)).all()}
+        versions = _source_versions(uids, start_date, end_date)
+
+        stale = [user for user in users
+                 if full or _is_stale(snapshots.get(user.uid), user, versions[user.uid])]
+        stale_uids = {user.uid for user in stale}
+        fresh_uids = [uid for uid in snapshots if uid not in stale_uids]
+
+        payloads = _build_payloads(stale, versions, start_date, end_date)
+        if executor and len(payloads) > 1:
+            chunksize = max(1, len(payloads) // (self.workers * 4))
+            results = list(executor.map(compute_snapshot, payloads, chunksize=chunksize))
+        else:
+            results = [compute_snapshot(payload) for payload in payloads]
+        _save_snapshots(results, snapshots)
+
+        if fresh_uids:
+            # 데이터가 바뀌지 않은 사용자는 기간만 갱신
+            db.session.execute(
+                update(InsightSnapshot)
+                .where(InsightSnapshot.uid.in_(fresh_uids))
+                .values(period_start=start_date, period_end=end_date)
+                .execution_options(synchronize_session=False)
+            )
+
+        db.session.commit()
+        return len(stale)
+
+
+def get_user_snapshot(user: User, end_date: Optional[date] = None) -> Optional[InsightSnapshot]:
+    """
+    사용자의 인사이트 스냅샷 조회
+
+    아직 배치 작업이 계산하지 않은 사용자는 즉시 계산한 값을 저장하지 않고 반환한다.
+    조회 요청에서 DB에 쓰지 않도록 저장은 배치 작업(InsightSnapshotJob)에 맡긴다.
+
+    Args:
+        user (User): 사용자
+        end_date (Optional[date]): 기간 종료 날짜 (기본: 오늘)
+
+    Returns:
+        Optional[InsightSnapshot]: 인사이트 스냅샷 (세션에 추가되지 않은 계산 결과일 수 있음, 계산 실패 시 None)
+    """
+    snapshot = InsightSnapshot.query.filter_by(uid=user.uid).first()
+    if snapshot is not None:
+        return snapshot
+
+    start_date, end_date = _window(end_date)
+    try:
+        versions = _source_versions([user.uid], start_date, end_date)
+        payloads = _build_payloads([user], versions, start_date, end_date)
+        return InsightSnapshot(**compute_snapshot(payloads[0]), computed_at=datetime.now())
+    except Exception as e:
+        logger.error(f"인사이트 스냅샷 계산 오류: {str(e)}")
+        return None
@@ -0,0 +1,312 @@
+"""
+챗봇 대화 의도 분류기 (로컬)
+
+문자 n-gram TF-IDF 특징과 다중 클래스 로지스틱 회귀로 메시지를 6개 의도 중 하나로 분류한다.
+확률은 온도(temperature scaling)로 보정하며, 챗봇은 신뢰도가 임계값보다 낮을 때만 LLM 의도 분석을 사용한다.
+
+학습 데이터: database/default_data/chat_intents.json (템플릿 기반 문장)
+보정/평가 데이터: database/default_data/chat_intents_holdout.json (학습 데이터와 표현이 다른 직접 작성 문장)
+학습/평가 리포트: scripts/train_intent_classifier.py
+"""
+import os
+import json
+import math
+import logging
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 번들 학습 데이터와 학습된 모델 저장 경로
+DEFAULT_INTENT_DATASET = os.path.join(_ROOT, "database", "default_data", "chat_intents.json")
+DEFAULT_INTENT_HOLDOUT = os.path.join(_ROOT, "database", "default_data", "chat_intents_holdout.json")
+DEFAULT_INTENT_MODEL = os.path.join(_ROOT, "database", "data", "intent_model.json")
+
+NGRAM_RANGE = (1, 3)
+
+
+def normalize_message(text: str) -> str:
+    """유니코드 정규화, 소문자화, 공백 정리"""
+    return " ".join(unicodedata.normalize("NFKC", text or "").lower().split())
+
+
+def char_ngrams(text: str, ngram_range: Tuple[int, int] = NGRAM_RANGE) -> Counter:
+    """
+    문자 n-gram 빈도 (앞뒤에 공백을 붙여 단어 경계도 특징으로 사용)
+
+    Args:
+        text (str): 메시지
+        ngram_range (Tuple[int, int]): n-gram 길이 범위
+
+    Returns:
+        Counter: n-gram → 빈도
+    """
+    text = f" {normalize_message(text)} "
+    low, high = ngram_range
+    grams = Counter([text[i:i + n] for n in range(low, high + 1) for i in range(len(text) - n + 1)])
+    # 공백을 하나로 정리했으므로 공백만으로 된 n-gram은 한 글자 공백뿐
+    grams.pop(" ", None)
+    return grams
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=-1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+class IntentClassifier:
+    """
+    문자 n-gram TF-IDF + 로지스틱 회귀 의도 분류기
+
+    예측은 메시지 n-gram의 가중치 행만 더하므로 수십 마이크로초 안에 끝난다.
+    """
+
+    def __init__(self, labels: Sequence[str], vocabulary: Sequence[str], idf: Sequence[float],
+                 weights, bias, temperature: float = 1.0, ngram_range: Tuple[int, int] = NGRAM_RANGE):
+        """
+        Args:
+            labels (Sequence[str]): 의도 카테고리 목록
+            vocabulary (Sequence[str]): 특징 n-gram 목록
+            idf (Sequence[float]): n-gram별 IDF
+            weights: (특징 수, 카테고리 수) 가중치
+            bias: 카테고리별 편향
+            temperature (float): 확률 보정 온도
+            ngram_range (Tuple[int, int]): n-gram 길이 범위
+        """
+        self.labels = list(labels)
+        self.vocabulary = {gram: index for index, gram in enumerate(vocabulary)}
+        self.idf = np.asarray(idf, dtype=np.float64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = np.asarray(bias, dtype=np.float64)
+        self.temperature = float(temperature)
+        self.ngram_range = tuple(ngram_range)
+
+    # ----- 특징 -----
+
+    def _features(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """메시지의 (특징 인덱스, L2 정규화된 TF-IDF 값)"""
+        vocabulary = self.vocabulary
+        pairs = [(vocabulary[gram], count) for gram, count in char_ngrams(text, self.ngram_range).items()
+                 if gram in vocabulary]
+        if not pairs:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+        indices = np.fromiter((index for index, _ in pairs), dtype=np.int64, count=len(pairs))
+        counts = np.fromiter((count for _, count in pairs), dtype=np.float64, count=len(pairs))
+        values = (1.0 + np.log(counts)) * self.idf[indices]
+        return indices, values / np.linalg.norm(values)
+
+    def logits(self, text: str) -> np.ndarray:
+        indices, values = self._features(text)
+        return values @ self.weights[indices] + self.bias
+
+    # ----- 예측 -----
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """
+        카테고리별 보정된 확률
+
+        Args:
+            text (str): 메시지
+
+        Returns:
+            Dict[str, float]: 카테고리 → 확률
+        """
+        probabilities = _softmax(self.logits(text) / self.temperature)
+        return dict(zip(self.labels, probabilities.tolist()))
+
+    def predict(self, text: str) -> Tuple[str, float]:
+        """
+        가장 가능성 높은 카테고리와 신뢰도
+
+        Returns:
+            Tuple[str, float]: (카테고리, 보정된 확률)
+        """
+        probabilities = _softmax(self.logits(text) / self.temperature)
+        best = int(probabilities.argmax())
+        return self.labels[best], float(probabilities[best])
+
+    # ----- 학습 -----
+
+    @classmethod
+    def train(cls, samples: Sequence[Dict[str, str]], calibration: Optional[Sequence[Dict[str, str]]] = None,
+              ngram_range: Tuple[int, int] = NGRAM_RANGE, l2: float = 1e-3, epochs: int = 300,
+              learning_rate: float = 0.1, calibration_folds: int = 5, seed: int = 0) -> "IntentClassifier":
+        """
+        학습 데이터로 분류기 학습
+
+        보정 데이터가 있으면 그 예측으로 온도를 맞추고, 없으면 교차 검증 예측(out-of-fold)으로 맞춘다.
+        학습 데이터가 템플릿 문장이면 교차 검증 예측이 실제보다 쉬워 확률이 과신되므로
+        표현이 다른 보정 데이터를 사용하는 것이 좋다.
+
+        Args:
+            samples (Sequence[Dict[str, str]]): {"text", "intent"} 목록
+            calibration (Optional[Sequence[Dict[str, str]]]): 온도 보정용 데이터
+            ngram_range (Tuple[int, int]): n-gram 길이 범위
+            l2 (float): L2 정규화 계수
+            epochs (int): 경사 하강 반복 수
+            learning_rate (float): 학습률 (Adam)
+            calibration_folds (int): 보정 데이터가 없을 때 교차 검증 폴드 수 (1 이하면 보정하지 않음)
+            seed (int): 폴드 분할 시드
+
+        Returns:
+            IntentClassifier: 학습된 분류기
+        """
+        texts = [sample["text"] for sample in samples]
+        labels = sorted({sample["intent"] for sample in samples})
+        y = np.array([labels.index(sample["intent"]) for sample in samples])
+
+        model = cls._fit(texts, y, labels, ngram_range, l2, epochs, learning_rate)
+
+        if calibration:
+            logits = np.array([model.logits(sample["text"]) for sample in calibration])
+            model.temperature = fit_temperature(logits, np.array([labels.index(sample["intent"]) for sample in calibration]))
+
+        elif calibration_folds > 1:
+            logits = np.zeros((len(samples), len(labels)))
+            for fold in stratified_folds(y, calibration_folds, seed):
+                train_index = np.setdiff1d(np.arange(len(samples)), fold)
+                fold_model = cls._fit([texts[i] for i in train_index], y[train_index], labels,
+                                      ngram_range, l2, epochs, learning_rate)
+                logits[fold] = [fold_model.logits(texts[i]) for i in fold]
+            model.temperature = fit_temperature(logits, y)
+
+        return model
+
+    @classmethod
+    def _fit(cls, texts: List[str], y: np.ndarray, labels: List[str], ngram_range: Tuple[int, int],
+             l2: float, epochs: int, learning_rate: float) -> "IntentClassifier":
+        counts = [char_ngrams(text, ngram_range) for text in texts]
+        document_frequency = Counter(gram for grams in counts for gram in grams)
+        vocabulary = sorted(document_frequency)
+        index = {gram: i for i, gram in enumerate(vocabulary)}
+        idf = np.array([math.log((1 + len(texts)) / (1 + document_frequency[gram])) + 1.0 for gram in vocabulary])
+
+        # 희소 행렬 (행, 열, 값) - 메시지당 n-gram 수십 개라 밀집 행렬 곱보다 훨씬 빠름
+        rows, columns, values = [], [], []
+        for row, grams in enumerate(counts):
+            weights = np.array([(1.0 + math.log(count)) * idf[index[gram]] for gram, count in grams.items()])
+            rows.extend([row] * len(grams))
+            columns.extend(index[gram] for gram in grams)
+            values.extend(weights / max(np.linalg.norm(weights), 1e-12))
+        rows, columns, values = np.array(rows), np.array(columns), np.array(values)
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+
+        onehot = np.eye(len(labels))[y]
+        params = [np.zeros((len(vocabulary), len(labels))), np.zeros(len(labels))]
+        moments = [(np.zeros_like(p), np.zeros_like(p)) for p in params]
+        beta1, beta2 = 0.9, 0.999
+
+        for step in range(1, epochs + 1):
+            logits = np.add.reduceat(values[:, None] * params[0][columns], starts) + params[1]
+            error = (_softmax(logits) - onehot) / len(texts)
+            weight_gradient = np.stack([
+                np.bincount(columns, weights=values * error[rows, k], minlength=len(vocabulary))
+                for k in range(len(labels))
+            ], axis=1)
+            gradients = [weight_gradient + l2 * params[0], error.sum(axis=0)]
+            for param, gradient, (m, v) in zip(params, gradients, moments):
+                m *= beta1
+                m += (1 - beta1) * gradient
+                v *= beta2
+                v += (1 - beta2) * gradient ** 2
+                param -= learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)
+
+        return cls(labels, vocabulary, idf, params[0], params[1], ngram_range=ngram_range)
+
+    # ----- 저장/로드 -----
+
+    def to_dict(self) -> Dict[str, Any]:
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        return {
+            "labels": self.labels,
+            "ngram_range": list(self.ngram_range),
+            "temperature": self.temperature,
+            "vocabulary": vocabulary,
+            "idf": np.round(self.idf, 6).tolist(),
+            "weights": np.round(self.weights, 6).tolist(),
+            "bias": np.round(self.bias, 6).tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IntentClassifier":
+        return cls(data["labels"], data["vocabulary"], data["idf"], data["weights"], data["bias"],
+                   temperature=data.get("temperature", 1.0), ngram_range=tuple(data["ngram_range"]))
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path: str) -> "IntentClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def load_intent_samples(path: str = DEFAULT_INTENT_DATASET) -> List[Dict[str, str]]:
+    """학습 데이터 로드 ({"text", "intent"} 목록)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_intent_classifier(model_path: str = DEFAULT_INTENT_MODEL,
+                           dataset_path: str = DEFAULT_INTENT_DATASET,
+                           holdout_path: str = DEFAULT_INTENT_HOLDOUT) -> Optional[IntentClassifier]:
+    """
+    학습된 모델 로드 (없으면 번들 학습/보정 데이터로 학습)
+
+    Returns:
+        Optional[IntentClassifier]: 분류기 (학습 데이터도 없으면 None, 이 경우 LLM만 사용)
+    """
+    try:
+        if model_path and os.path.exists(model_path):
+            return IntentClassifier.load(model_path)
+
+        logger.info("저장된 의도 분류 모델이 없어 학습 데이터로 학습합니다.")
+        calibration = load_intent_samples(holdout_path) if os.path.exists(holdout_path) else None
+        return IntentClassifier.train(load_intent_samples(dataset_path), calibration)
+
+    except Exception as e:
+        logger.error(f"의도 분류기 로드 오류: {str(e)}")
+        return None
+
+
+def stratified_folds(y: np.ndarray, folds: int, seed: int = 0) -> List[np.ndarray]:
+    """카테고리 비율을 유지한 교차 검증 폴드 (인덱스 목록)"""
+    rng = np.random.default_rng(seed)
+    buckets: List[List[int]] = [[] for _ in range(folds)]
+    for label in np.unique(y):
+        members = rng.permutation(np.flatnonzero(y == label))
+        for i, member in enumerate(members):
+            buckets[i % folds].append(int(member))
+    return [np.array(sorted(bucket)) for bucket in buckets]
+
+
+def fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+    """교차 검증 로짓의 음의 로그 우도를 최소화하는 온도 (격자 탐색)"""
+    best, best_loss = 1.0, float("inf")
+    for temperature in np.exp(np.linspace(math.log(0.05), math.log(5.0), 200)):
+        probabilities = _softmax(logits / temperature)
+        loss = -np.mean(np.log(probabilities[np.arange(len(y)), y] + 1e-12))
+        if loss < best_loss:
+            best, best_loss = float(temperature), loss
+    return best
+
+
+def expected_calibration_error(confidences: Sequence[float], correct: Sequence[bool], bins: int = 10) -> float:
+    """신뢰도 구간별 |정확도 - 평균 신뢰도|의 가중 평균"""
+    confidences = np.asarray(confidences, dtype=np.float64)
+    correct = np.asarray(correct, dtype=np.float64)
+    error = 0.0
+    for low in np.linspace(0, 1, bins, endpoint=False):
+        mask = (confidences > low) & (confidences <= low + 1 / bins)
+        if mask.any():
+            error += mask.mean() * abs(correct[mask].mean() - confidences[mask].mean())
+    return float(error)
@@ -0,0 +1,375 @@
+import queue
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+from sqlalchemy import func, literal, String
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.orm import contains_eager, defer, with_expression
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from services.nutrition_engine import NUTRIENT_KEYS
+from services.food_resolution import get_resolution_queue
+
+logger = logging.getLogger(__name__)
+
+
+def nutrient_sum_columns() -> List[Any]:
+    """저장된 영양소 컬럼의 SUM 식 목록 (영양 정보가 있는 음식 수 포함)"""
+    return [func.count(Food.calories).label("resolved_count")] + [
+        func.sum(getattr(Food, key)).label(key) for key in NUTRIENT_KEYS
+    ]
+
+
+def totals_from_row(row) -> Dict[str, float]:
+    """
+    SUM 결과 행을 영양소 딕셔너리로 변환
+
+    Args:
+        row: nutrient_sum_columns()를 포함한 쿼리 결과 행
+
+    Returns:
+        Dict[str, float]: 영양소 합계 (영양 정보가 있는 음식이 없으면 빈 딕셔너리)
+    """
+    if row is None or not row.resolved_count:
+        return {}
+    return {key: round(float(getattr(row, key) or 0), 2) for key in NUTRIENT_KEYS}
+
+
+def totals_from_foods(foods: Iterable[Food]) -> Dict[str, float]:
+    """
+    이미 로드된 음식 행의 영양소 합계 (totals_from_row와 같은 규칙)
+
+    Args:
+        foods (Iterable[Food]): 음식 행 목록
+
+    Returns:
+        Dict[str, float]: 영양소 합계 (영양 정보가 있는 음식이 없으면 빈 딕셔너리)
+    """
+    resolved = [food for food in foods if food.calories is not None]
+    if not resolved:
+        return {}
+    return {key: round(sum(float(getattr(food, key) or 0) for food in resolved), 2) for key in NUTRIENT_KEYS}
+
+
+def meals_with_foods(*criteria) -> List[Meal]:
+    """
+    식사와 음식 목록을 한 번의 조인 쿼리로 조회 (meal.foods 접근 시 추가 쿼리 없음, utils.serializers로 직렬화)
+
+    Args:
+        *criteria: Meal 필터 조건
+
+    Returns:
+        List[Meal]: 음식 목록이 채워진 식사 목록
+    """
+    return Meal.query.outerjoin(Meal.foods) \
+        .options(
+            contains_eager(Meal.foods),
+            defer(Meal.image),
+            with_expression(Meal.image_exists, Meal.image.isnot(None))
+        ) \
+        .filter(*criteria) \
+        .order_by(Meal.mid, Food.fid) \
+        .all()
+
+
+def meal_nutrition_totals(meal_ids: Iterable[int]) -> Dict[int, Dict[str, float]]:
+    """
+    식사별 영양소 합계 (한 번의 GROUP BY 쿼리)
+
+    Args:
+        meal_ids (Iterable[int]): 식사 ID 목록
+
+    Returns:
+        Dict[int, Dict[str, float]]: 식사 ID → 영양소 합계
+    """
+    meal_ids = list(meal_ids)
+    if not meal_ids:
+        return {}
+
+    rows = db.session.query(Food.mid, *nutrient_sum_columns()) \
+        .filter(Food.mid.in_(meal_ids)) \
+        .group_by(Food.mid) \
+        .all()
+    return {row.mid: totals_from_row(row) for row in rows}
+
+
+def nutrition_totals(*criteria) -> Dict[str, float]:
+    """
+    조건에 맞는 식사 전체의 영양소 합계
+
+    Args:
+        *criteria: Meal 필터 조건 (예: Meal.uid == uid, Meal.date == date)
+
+    Returns:
+        Dict[str, float]: 영양소 합계
+    """
+    row = db.session.query(*nutrient_sum_columns()) \
+        .join(Meal, Meal.mid == Food.mid) \
+        .filter(*criteria) \
+        .one()
+    return totals_from_row(row)
+
+
+# 통계 그룹 단위별 날짜 형식 (Python date.strftime 기준, 각 DB에서 같은 문자열이 나오도록 SQL을 만듦)
+DATE_BUCKET_FORMATS = {
+    'day': '%Y-%m-%d',
+    'week': '%Y-%W',  # 월요일 시작 주 단위 (첫 월요일 전은 00주)
+    'month': '%Y-%m'
+}
+
+
+class DateBucket(FunctionElement):
+    """
+    날짜를 DATE_BUCKET_FORMATS 형식 문자열로 바꾸는 SQL 식 (DB별로 컴파일)
+
+    SQLite, PostgreSQL, MySQL을 지원하며 그 외 DB에서는 컴파일 시 CompileError가 발생한다.
+    그룹 단위별 하위 클래스를 사용해 컴파일된 SQL 캐시가 단위별로 구분되도록 한다.
+    """
+    type = String()
+    inherit_cache = True
+    unit = None
+
+
+class DayBucket(DateBucket):
+    inherit_cache = True
+    unit = 'day'
+
+
+class WeekBucket(DateBucket):
+    inherit_cache = True
+    unit = 'week'
+
+
+class MonthBucket(DateBucket):
+    inherit_cache = True
+    unit = 'month'
+
+
+_DATE_BUCKETS = {bucket.unit: bucket for bucket in (DayBucket, WeekBucket, MonthBucket)}
+
+
+def _pattern(compiler, pattern: str) -> str:
+    """형식 문자열 리터럴 (드라이버 파라미터 형식에 맞춰 % 이스케이프)"""
+    return compiler.render_literal_value(pattern, String())
+
+
+@compiles(DateBucket)
+def _compile_date_bucket(element, compiler, **kw):
+    raise CompileError(f"date_bucket은 {compiler.dialect.name} DB를 지원하지 않습니다. (sqlite, postgresql, mysql 지원)")
+
+
+@compiles(DateBucket, 'sqlite')
+def _compile_date_bucket_sqlite(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    return f"strftime({_pattern(compiler, DATE_BUCKET_FORMATS[element.unit])}, {column})"
+
+
+@compiles(DateBucket, 'postgresql')
+def _compile_date_bucket_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if element.unit == 'week':
+        # %W: (1월 1일부터의 일수 + 7 - 요일(월=1)) / 7
+        week = f"(CAST(EXTRACT(DOY FROM {column}) AS INTEGER) + 7 - CAST(EXTRACT(ISODOW FROM {column}) AS INTEGER)) / 7"
+        return f"to_char({column}, 'YYYY') || '-' || lpad(CAST({week} AS TEXT), 2, '0')"
+    pattern = 'YYYY-MM-DD' if element.unit == 'day' else 'YYYY-MM'
+    return f"to_char({column}, {_pattern(compiler, pattern)})"
+
+
+@compiles(DateBucket, 'mysql')
+def _compile_date_bucket_mysql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    if element.unit == 'week':
+        # WEEK() 모드 5: 월요일 시작, 첫 월요일 전은 0주 (%W와 같음)
+        return f"CONCAT(YEAR({column}), '-', LPAD(WEEK({column}, 5), 2, '0'))"
+    return f"DATE_FORMAT({column}, {_pattern(compiler, DATE_BUCKET_FORMATS[element.unit])})"
+
+
+def date_bucket(column, group_by: str):
+    """
+    날짜 컬럼을 그룹 단위 문자열로 바꾸는 SQL 식 (DATE_BUCKET_FORMATS 형식)
+
+    Args:
+        column: 날짜 컬럼 (예: Meal.date)
+        group_by (str): 'day', 'week', 'month' (그 외에는 하나의 'unknown' 그룹)
+
+    Returns:
+        SQL 식
+    """
+    bucket = _DATE_BUCKETS.get(group_by)
+    if bucket is None:
+        return literal('unknown')
+    return bucket(column)
+
+
+def food_frequency(*criteria, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+    """
+    조건에 맞는 식사에서 음식 이름별 기록 횟수 (GROUP BY food_name, 많은 순)
+
+    Args:
+        *criteria: Meal 필터 조건
+        limit (Optional[int]): 최대 개수
+
+    Returns:
+        List[Tuple[str, int]]: (음식 이름, 횟수) 목록
+    """
+    count = func.count(Food.fid)
+    query = db.session.query(Food.food_name, count) \
+        .join(Meal, Meal.mid == Food.mid) \
+        .filter(*criteria) \
+        .group_by(Food.food_name) \
+        .order_by(count.desc(), Food.food_name)
+    if limit:
+        query = query.limit(limit)
+    return [(name, total) for name, total in query.all()]
+
+
+def materialize_food_nutrition(foods: List[Food], aggregator) -> List[str]:
+    """
+    Food 행에 카탈로그 기준 1인분 영양소 저장
+
+    Args:
+        foods (List[Food]): 음식 행 목록
+        aggregator (NutrientAggregator): 영양소 집계 엔진
+
+    Returns:
+        List[str]: 카탈로그에서 찾지 못한 음식 이름
+    """
+    vectors: Dict[str, Optional[Dict[str, float]]] = {}
+    unresolved = []
+    for food in foods:
+        if food.food_name not in vectors:
+            vectors[food.food_name] = aggregator.nutrient_vector(food.food_name)
+            if vectors[food.food_name] is None:
+                unresolved.append(food.food_name)
+
+        nutrition = vectors[food.food_name]
+        if nutrition is not None:
+            food.update_nutrition_info(nutrition)
+    return unresolved
+
+
+def record_food_nutrition(foods: List[Food], aggregator) -> List[str]:
+    """
+    음식 행에 영양 정보 저장 (기록 시점에 한 번만 계산)
+
+    카탈로그에 없는 음식은 백그라운드 해석을 요청하며, 해석되면 백필 작업이 값을 채운다.
+
+    Args:
+        foods (List[Food]): 새로 기록하는 음식 행 목록
+        aggregator (NutrientAggregator): 영양소 집계 엔진
+
+    Returns:
+        List[str]: 카탈로그에서 찾지 못한 음식 이름
+    """
+    unresolved = materialize_food_nutrition(foods, aggregator)
+    if unresolved:
+        resolution_queue = get_resolution_queue(aggregator.food_db)
+        for food_name in unresolved:
+            resolution_queue.request(food_name)
+    return unresolved
+
+
+class NutritionBackfill:
+    """
+    카탈로그 변경 시 저장된 음식 영양소를 백그라운드에서 다시 계산
+
+    Flask 확장과 같은 방식으로 init_app()에서 애플리케이션을 등록하며,
+    FoodDatabaseService의 변경 알림으로 schedule()이 호출된다.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        """
+        Args:
+            batch_size (int): 한 번에 갱신할 음식 행 수
+        """
+        self.batch_size = batch_size
+        self.app = None
+        self._queue: "queue.Queue[Optional[List[str]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def init_app(self, app):
+        """애플리케이션 등록 (백그라운드 스레드에서 앱 컨텍스트 생성용)"""
+        self.app = app
+
+    def schedule(self, names: Optional[List[str]] = None):
+        """
+        백필 작업 예약
+
+        Args:
+            names (Optional[List[str]]): 변경된 식품 이름 (None이면 영양 정보가 없는 모든 음식)
+        """
+        if self.app is None:
+            logger.warning("애플리케이션이 등록되지 않아 영양 정보 백필을 건너뜁니다.")
+            return
+
+        self._queue.put(list(names) if names is not None else None)
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="nutrition-backfill", daemon=True)
+                self._worker.start()
+
+    def join(self):
+        """예약된 백필 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            names = self._queue.get()
+            try:
+                with self.app.app_context():
+                    from services import service_manager
+                    self.backfill(service_manager.nutrient_aggregator, names)
+            except Exception as e:
+                logger.error(f"영양 정보 백필 오류: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def backfill(self, aggregator, names: Optional[List[str]] = None) -> int:
+        """
+        저장된 음식 영양소 재계산 (앱 컨텍스트 안에서 동기 실행)
+
+        Args:
+            aggregator (NutrientAggregator): 영양소 집계 엔진
+            names (Optional[List[str]]): 대상 식품 이름 (None이면 영양 정보가 없는 모든 음식)
+
+        Returns:
+            int: 갱신된 음식 행 수
+        """
+        if names is not None:
+            filters = [Food.food_name.in_(names)]
+        else:
+            filters = [Food.calories.is_(None)]
+
+        updated = 0
+        last_fid = 0
+        try:
+            while True:
+                foods = Food.query.filter(*filters, Food.fid > last_fid) \
+                    .order_by(Food.fid) \
+                    .limit(self.batch_size) \
+                    .all()
+                if not foods:
+                    break
+
+                last_fid = foods[-1].fid
+                unresolved = set(materialize_food_nutrition(foods, aggregator))
+                updated += sum(1 for food in foods if food.food_name not in unresolved)
+                db.session.commit()
+
+            logger.info(f"음식 영양 정보 백필 완료: {updated}개 갱신")
+            return updated
+
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"음식 영양 정보 백필 오류: {str(e)}")
+            return updated
+
+
+# 애플리케이션 전체에서 공유하는 백필 작업자
+nutrition_backfill = NutritionBackfill()
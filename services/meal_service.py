@@ -1,9 +1,47 @@
+import logging
+from sqlalchemy import func
 from app.extensions import db
 from models.meal import Meal
 from models.food import Food
 from datetime import datetime
+from models.daily_nutrition import DailyNutrition
+from services.meal_nutrition import record_food_nutrition, date_bucket, food_frequency
+from utils.serializers import meal_row_columns, serialize_meal_rows
+from utils.pagination import keyset_page, InvalidCursorError
+
+logger = logging.getLogger(__name__)
 
 class MealService:
+    def __init__(self, aggregator=None):
+        """
+        식사 서비스 초기화
+
+        Args:
+            aggregator (Optional[NutrientAggregator]): 영양소 집계 엔진 (없으면 서비스 컨테이너의 인스턴스 사용)
+        """
+        self._aggregator = aggregator
+
+    @property
+    def aggregator(self):
+        if self._aggregator is None:
+            from services import service_manager
+            self._aggregator = service_manager.nutrient_aggregator
+        return self._aggregator
+
+    def _materialize_nutrition(self, foods):
+        """
+        음식 행에 영양 정보 저장 (기록 시점에 한 번만 계산)
+
+        카탈로그에 없는 음식은 백그라운드 해석을 요청하며, 해석되면 백필 작업이 값을 채운다.
+        """
+        if not foods:
+            return
+        try:
+            record_food_nutrition(foods, self.aggregator)
+        except Exception as e:
+            # 영양 정보 계산 실패는 식사 기록 저장을 막지 않음 (백필 대상으로 남음)
+            logger.error(f"음식 영양 정보 저장 중 오류 발생: {str(e)}")
+
     def add_meal_record(self, user_id, data):
         """
         새로운 식사 기록 추가
@@ -21,13 +59,16 @@ class MealService:
 
             # 음식 항목 추가
             food_names = data.get('food_names', [])
+            foods = []
             for food_name in food_names:
                 food = Food(
                     mid=meal.mid,
                     food_name=food_name
                 )
                 db.session.add(food)
+                foods.append(food)
 
+            self._materialize_nutrition(foods)
             db.session.commit()
 
             return {
@@ -44,12 +85,20 @@ class MealService:
 
     def get_user_meals(self, user_id, start_date=None, end_date=None,
                        meal_type=None, page=1, limit=10,
-                       sort_by='datetime', sort_order='desc'):
+                       sort_by='datetime', sort_order='desc',
+                       cursor=None, include_total=None):
         """
         사용자의 식사 기록 조회
+
+        cursor가 주어지면(첫 페이지는 빈 문자열) OFFSET 대신 (정렬 컬럼, mid) 키셋으로 조회하고
+        다음 페이지 커서(next_cursor)를 반환한다. 키셋 조회에서는 include_total=True일 때만 전체 개수를 센다.
+
+        Raises:
+            InvalidCursorError: 커서 토큰이 올바르지 않은 경우
         """
         try:
-            query = Meal.query.filter_by(uid=user_id)
+            # 읽기 전용 목록이므로 ORM 객체 대신 필요한 컬럼만 행으로 조회
+            query = db.session.query(*meal_row_columns()).filter(Meal.uid == user_id)
 
             # 날짜 필터링
             if start_date:
@@ -61,27 +110,38 @@ class MealService:
             if meal_type:
                 query = query.filter(Meal.meal_time == meal_type)
 
-            # 정렬
-            if sort_by == 'datetime':
-                order_by = Meal.created_at.desc() if sort_order == 'desc' else Meal.created_at.asc()
-            elif sort_by == 'date':
-                order_by = Meal.date.desc() if sort_order == 'desc' else Meal.date.asc()
-            else:
-                order_by = Meal.created_at.desc()
-
-            query = query.order_by(order_by)
+            if include_total is None:
+                include_total = cursor is None
+            # 전체 개수는 식사 ID만 세는 COUNT 쿼리로 계산
+            total = query.with_entities(func.count(Meal.mid)).order_by(None).scalar() if include_total else None
+
+            # 정렬 (mid를 보조 키로 사용해 같은 값의 순서를 고정)
+            sort_column = Meal.date if sort_by == 'date' else Meal.created_at
+            descending = sort_order == 'desc' if sort_by in ('datetime', 'date') else True
+
+            if cursor is not None:
+                meals, next_cursor = keyset_page(query, (sort_column, Meal.mid), limit,
+                                                 cursor=cursor, descending=descending)
+                return {
+                    'success': True,
+                    'meals': serialize_meal_rows(meals),
+                    'total': total,
+                    'limit': limit,
+                    'next_cursor': next_cursor
+                }
 
-            # 페이징
-            total = query.count()
-            meals = query.paginate(page=page, per_page=limit, error_out=False)
+            order_by = [sort_column.desc(), Meal.mid.desc()] if descending else [sort_column.asc(), Meal.mid.asc()]
+            meals = query.order_by(*order_by).paginate(page=page, per_page=limit, error_out=False, count=False)
 
             return {
                 'success': True,
-                'meals': [meal.to_dict() for meal in meals.items],
+                'meals': serialize_meal_rows(meals.items),
                 'total': total,
                 'page': page,
                 'limit': limit
             }
+        except InvalidCursorError:
+            raise
         except Exception as e:
             return {
                 'success': False,
@@ -135,9 +195,12 @@ class MealService:
             # 기존 음식 목록 삭제 후 새 음식 추가
             if "foods" in data:
                 Food.query.filter_by(mid=meal_id).delete()
+                new_foods = []
                 for food_name in data["foods"]:
                     new_food = Food(mid=meal_id, food_name=food_name)
                     db.session.add(new_food)
+                    new_foods.append(new_food)
+                self._materialize_nutrition(new_foods)
 
             db.session.commit()  # DB 업데이트 적용
 
@@ -171,53 +234,43 @@ class MealService:
     def get_meal_statistics(self, user_id, start_date=None, end_date=None, group_by='day'):
         """
         사용자의 식사 통계를 조회하는 메서드
+
+        식사 수/칼로리는 일일 합계 테이블을 그룹 단위로 SUM하고,
+        자주 먹은 음식은 음식 이름별 GROUP BY로 계산한다 (결과 그룹만 읽음).
         """
         try:
-            query = Meal.query.filter_by(uid=user_id)
+            rollup_criteria = [DailyNutrition.uid == user_id]
+            meal_criteria = [Meal.uid == user_id]
 
             # 날짜 필터링
             if start_date:
-                query = query.filter(Meal.date >= datetime.strptime(start_date, '%Y-%m-%d').date())
+                start = datetime.strptime(start_date, '%Y-%m-%d').date()
+                rollup_criteria.append(DailyNutrition.date >= start)
+                meal_criteria.append(Meal.date >= start)
             if end_date:
-                query = query.filter(Meal.date <= datetime.strptime(end_date, '%Y-%m-%d').date())
-
-            total_meals = query.count()
-            total_calories = 0
-            food_counts = {}
-
-            meals = query.all()
-            for meal in meals:
-                foods = Food.query.filter_by(mid=meal.mid).all()
-                for food in foods:
-                    food_name = food.food_name
-                    food_counts[food_name] = food_counts.get(food_name, 0) + 1
-                    if food.calories:
-                        total_calories += food.calories
+                end = datetime.strptime(end_date, '%Y-%m-%d').date()
+                rollup_criteria.append(DailyNutrition.date <= end)
+                meal_criteria.append(Meal.date <= end)
 
             # 그룹화 옵션 처리 (날짜별, 주별, 월별)
-            grouped_stats = {}
-            for meal in meals:
-                if group_by == 'day':
-                    key = meal.date.strftime('%Y-%m-%d')
-                elif group_by == 'week':
-                    key = meal.date.strftime('%Y-%W')  # 주 단위
-                elif group_by == 'month':
-                    key = meal.date.strftime('%Y-%m')  # 월 단위
-                else:
-                    key = 'unknown'
-
-                if key not in grouped_stats:
-                    grouped_stats[key] = {'meals': 0, 'calories': 0}
-
-                grouped_stats[key]['meals'] += 1
-                grouped_stats[key]['calories'] += sum(food.calories for food in foods if food.calories)
+            bucket = date_bucket(DailyNutrition.date, group_by).label('bucket')
+            rows = db.session.query(
+                bucket,
+                func.sum(DailyNutrition.meal_count),
+                func.sum(DailyNutrition.calories)
+            ).filter(*rollup_criteria).group_by(bucket).order_by(bucket).all()
+
+            grouped_stats = {
+                key: {'meals': int(meals or 0), 'calories': float(calories or 0)}
+                for key, meals, calories in rows
+            }
 
             return {
                 "success": True,
-                "total_meals": total_meals,
-                "total_calories": total_calories,
-                "most_frequent_foods": dict(sorted(food_counts.items(), key=lambda x: x[1], reverse=True)[:5]),
+                "total_meals": sum(group['meals'] for group in grouped_stats.values()),
+                "total_calories": sum(group['calories'] for group in grouped_stats.values()),
+                "most_frequent_foods": dict(food_frequency(*meal_criteria, limit=5)),
                 "grouped_statistics": grouped_stats
             }
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
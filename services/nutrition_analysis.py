@@ -4,82 +4,99 @@ from flask import current_app
 from models.user import User
 from services.food_database import FoodDatabaseService
 from services.rag_service import RAGService
+from services.nutrition_engine import NutrientAggregator, FoodItem, item_name, item_grams, to_grams, BASE_QUANTITY_GRAMS, NUTRIENT_KEYS
+from services.food_resolution import get_resolution_queue
 
 # 로깅 설정...
 logger = logging.getLogger(__name__)
 
 class NutritionAnalysisService:
-    def __init__(self, food_db=None, rag_service=None):
+    def __init__(self, food_db=None, rag_service=None, aggregator=None):
         # 의존성 주입 패턴 사용
         self.food_db = food_db or FoodDatabaseService()
         self.rag_service = rag_service or RAGService()
+        self.aggregator = aggregator or NutrientAggregator(self.food_db)
+        self.resolution_queue = get_resolution_queue(self.food_db, self.rag_service)
 
-    def analyze_meal_nutrition(self, food_names: List[str]) -> Dict[str, float]:
+    def analyze_meal_nutrition(self, food_names: List[FoodItem]) -> Dict[str, Any]:
         """
         식사의 영양 성분 분석
 
         Args:
-            food_names (List[str]): 음식 이름 목록
+            food_names (List[FoodItem]): 음식 이름 또는 {name, quantity, unit} 목록 (수량이 없으면 1인분)
 
         Returns:
-            Dict[str, float]: 영양 성분 정보
+            Dict[str, Any]: 영양 성분 정보 (추정값이 포함되면 estimated_foods에 해당 음식 이름)
         """
         try:
-            logger.info(f"식사 영양 분석 시작: {', '.join(food_names)}")
-
             if not food_names:
                 logger.warning("분석할 음식이 없습니다.")
                 return {}
 
-            # 초기 영양 성분 집계
-            total_nutrition = {
-                "calories": 0,
-                "carbs": 0,
-                "protein": 0,
-                "fat": 0,
-                "sodium": 0,
-                "fiber": 0,
-                "sugar": 0
-            }
+            # 카탈로그에 있는 음식은 한 번에 조회하여 행렬 연산으로 합산
+            result = self.aggregator.aggregate(food_names)
+            totals = result["totals"]
+            found_foods = len(result["resolved"])
+
+            # 카탈로그에서 찾지 못한 음식만 느린 경로로 처리
+            if result["unresolved"]:
+                fallback = self._analyze_unresolved_foods(result["unresolved"])
+                if fallback["resolved"]:
+                    found_foods += len(fallback["resolved"])
+                    totals = {key: round(totals[key] + fallback["totals"][key], 2) for key in totals}
+                    totals["estimated_foods"] = fallback["resolved"]
 
-            # 영양 성분 합산
-            found_foods = 0
-            for food_name in food_names:
-                # 데이터베이스에서 음식 찾기
-                food_info = self.food_db.get_food_by_name(food_name)
-
-                if food_info and 'nutrients' in food_info:
-                    found_foods += 1
-                    nutrition = food_info['nutrients']
-                    for key, value in nutrition.items():
-                        if key in total_nutrition and isinstance(value, (int, float)):
-                            total_nutrition[key] += value
-                else:
-                    # 데이터베이스에 없는 경우 RAG 시스템 활용
-                    logger.warning(f"'{food_name}'의 영양 정보를 데이터베이스에서 찾을 수 없습니다. RAG 시스템 활용 시도.")
-                    try:
-                        rag_info = self.rag_service.query_food_info(f"{food_name}의 영양 정보")
-                        # RAG 결과에서 영양 정보 추출 로직이 필요함
-                        # 여기서는 단순화를 위해 RAG 결과를 사용하지 않음
-                        logger.info(f"RAG 시스템에서 '{food_name}'의 정보를 조회했으나 구조화된 영양 정보로 변환할 수 없습니다.")
-                    except Exception as e:
-                        logger.error(f"RAG 시스템 조회 중 오류: {str(e)}")
-
-            # 평균 영양 성분 계산 (데이터가 없는 경우 처리)
             if found_foods == 0:
                 logger.warning("영양 정보가 있는 음식이 없습니다.")
                 return {}
 
             logger.info(f"식사 영양 분석 완료: {found_foods}/{len(food_names)} 음식 분석됨")
-            return total_nutrition
+            return totals
 
         except Exception as e:
             logger.error(f"식사 영양 분석 중 오류 발생: {str(e)}")
             return {}
 
-    def get_nutrition_insights(self, nutrition_data: Dict[str, float], user: Optional[User], is_average: bool = False) -> List[Dict[str, Any]]:
+    def _analyze_unresolved_foods(self, items: List[FoodItem]) -> Dict[str, Any]:
+        """
+        카탈로그에 정확히 일치하지 않는 음식의 느린 경로 처리
+
+        해석 큐에 백그라운드 해석을 요청하고, 이름이 비슷한 카탈로그 식품의 추정값(guess())이 있으면
+        그 100g당 영양 정보로 집계한다. 추정값이 없는 음식은 이번 요청에서 제외한다.
+
+        Args:
+            items (List[FoodItem]): 찾지 못한 음식 목록
+
+        Returns:
+            Dict[str, Any]: totals(추정 영양소 합계), resolved(추정값으로 집계한 음식 이름), unresolved(제외한 항목)
+        """
+        totals = dict.fromkeys(NUTRIENT_KEYS, 0.0)
+        resolved, unresolved = [], []
+        for item in items:
+            name = item_name(item)
+            status = self.resolution_queue.request(name)
+            guess = self.resolution_queue.guess(name)
+            if guess is None:
+                logger.warning(f"'{name}'의 영양 정보를 데이터베이스에서 찾을 수 없습니다. (상태: {status})")
+                unresolved.append(item)
+                continue
+
+            logger.info(f"'{name}'을(를) 추정값({guess['source']})으로 분석합니다.")
+            scale = item_grams(item) / BASE_QUANTITY_GRAMS
+            for key in NUTRIENT_KEYS:
+                totals[key] += (guess.get(key) or 0) * scale
+            resolved.append(name)
+
+        return {
+            "totals": {key: round(value, 2) for key, value in totals.items()},
+            "resolved": resolved,
+            "unresolved": unresolved
+        }
+
+    @staticmethod
+    def get_nutrition_insights(nutrition_data: Dict[str, float], user: Optional[User], is_average: bool = False) -> List[Dict[str, Any]]:
         """
-        영양 데이터 기반 인사이트 생성
+        영양 데이터 기반 인사이트 생성 (규칙 기반, 서비스 상태를 사용하지 않음)
 
         Args:
             nutrition_data (Dict[str, float]): 영양 데이터
@@ -96,7 +113,7 @@ class NutritionAnalysisService:
             insights = []
 
             # 사용자별 목표 영양소 계산
-            target_nutrients = self.calculate_target_nutrients(user)
+            target_nutrients = NutritionAnalysisService.calculate_target_nutrients(user)
 
             # 칼로리 인사이트
             if "calories" in nutrition_data:
@@ -223,7 +240,8 @@ class NutritionAnalysisService:
             logger.error(f"영양 인사이트 생성 중 오류 발생: {str(e)}")
             return []
 
-    def calculate_target_nutrients(self, user: Optional[User] = None) -> Dict[str, float]:
+    @staticmethod
+    def calculate_target_nutrients(user: Optional[User] = None) -> Dict[str, float]:
         """
         사용자별 목표 영양소 계산
 
@@ -403,32 +421,25 @@ class NutritionAnalysisService:
             Dict[str, Any]: 영양 정보
         """
         try:
-            # 데이터베이스에서 음식 영양 정보 조회
-            food_info = self.food_db.get_food_by_name(food_name)
+            # 카탈로그에서 100g당 영양 정보 조회
+            nutrition = self.aggregator.nutrient_vector(food_name)
 
-            if food_info and 'nutrients' in food_info:
+            if nutrition is not None:
                 return {
                     "name": food_name,
-                    "nutrition": food_info['nutrients'],
+                    "nutrition": nutrition,
                     "source": "database"
                 }
             else:
-                # 데이터베이스에 없는 경우 RAG 시스템 활용
-                logger.warning(f"'{food_name}'의 영양 정보를 데이터베이스에서 찾을 수 없습니다. RAG 시스템 활용 시도.")
-                try:
-                    rag_info = self.rag_service.query_food_info(f"{food_name}의 영양 정보")
-                    return {
-                        "name": food_name,
-                        "nutrition": {"description": rag_info},
-                        "source": "rag"
-                    }
-                except Exception as e:
-                    logger.error(f"RAG 시스템 조회 중 오류: {str(e)}")
-                    return {
-                        "name": food_name,
-                        "nutrition": {},
-                        "source": "unknown"
-                    }
+                # 데이터베이스에 없는 경우 백그라운드 해석을 요청하고 즉시 반환 (이름이 비슷한 식품의 추정값이 있으면 함께 반환)
+                status = self.resolution_queue.request(food_name)
+                logger.info(f"'{food_name}'의 영양 정보가 데이터베이스에 없습니다. (상태: {status})")
+                guess = self.resolution_queue.guess(food_name)
+                return {
+                    "name": food_name,
+                    "nutrition": {key: guess[key] for key in NUTRIENT_KEYS} if guess else {},
+                    "source": guess["source"] if guess else status
+                }
 
         except Exception as e:
             logger.error(f"음식 영양 정보 조회 중 오류 발생: {str(e)}")
@@ -464,7 +475,7 @@ class NutritionAnalysisService:
                 "source": "database"
             }
         else:
-            # RAG 결과는 이미 get_food_nutrition에서 반환됨
+            # 카탈로그에 없는 식품은 해석 상태(pending/unknown)만 전달
             return {
                 "food_name": food_name,
                 "quantity": quantity,
@@ -475,8 +486,7 @@ class NutritionAnalysisService:
 
     def _calculate_nutrients(self, nutrition, quantity, unit):
         """기본 단위(100g)에서 지정된 양으로 영양소 계산"""
-        base_quantity = 100.0  # 대부분의 영양 데이터는 100g 기준
-        multiplier = quantity / base_quantity
+        multiplier = to_grams(quantity, unit) / BASE_QUANTITY_GRAMS
 
         nutrients = {}
         for nutrient, value in nutrition.items():
@@ -488,13 +498,13 @@ class NutritionAnalysisService:
         return nutrients
 
 
-# 클래스 외부에 래퍼 함수 정의
+# 클래스 외부에 래퍼 함수 정의 (애플리케이션 범위 서비스 컨테이너의 인스턴스 사용)
 def analyze_meal_nutrition(food_names):
     """NutritionAnalysisService.analyze_meal_nutrition의 래퍼 함수"""
-    service = NutritionAnalysisService()
-    return service.analyze_meal_nutrition(food_names)
+    from services import service_manager
+    return service_manager.nutrition_analysis.analyze_meal_nutrition(food_names)
 
 def get_nutrition_insights(nutrition_data, user=None, is_average=False):
     """NutritionAnalysisService.get_nutrition_insights의 래퍼 함수"""
-    service = NutritionAnalysisService()
-    return service.get_nutrition_insights(nutrition_data, user, is_average)
\ No newline at end of file
+    from services import service_manager
+    return service_manager.nutrition_analysis.get_nutrition_insights(nutrition_data, user, is_average)
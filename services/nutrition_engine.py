@@ -0,0 +1,179 @@
+import os
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 집계 대상 영양소 (foods 테이블 컬럼 순서)
+NUTRIENT_KEYS = ("calories", "carbs", "protein", "fat", "sodium", "fiber", "sugar")
+
+# 카탈로그 영양 정보의 기준량 (g)
+BASE_QUANTITY_GRAMS = 100.0
+
+# 단위 → 그램 변환표 (가산 단위는 1인분=기준량으로 환산)
+UNIT_GRAMS: Dict[str, float] = {
+    "g": 1.0,
+    "그램": 1.0,
+    "kg": 1000.0,
+    "mg": 0.001,
+    "ml": 1.0,
+    "l": 1000.0,
+    "인분": BASE_QUANTITY_GRAMS,
+    "serving": BASE_QUANTITY_GRAMS,
+    "개": BASE_QUANTITY_GRAMS,
+    "공기": 210.0,
+    "그릇": 300.0,
+    "접시": 250.0,
+    "컵": 200.0,
+    "큰술": 15.0,
+    "작은술": 5.0,
+    "조각": 30.0
+}
+
+FoodItem = Union[str, Dict[str, Any]]
+
+
+def to_grams(quantity: float, unit: Optional[str] = "g") -> float:
+    """
+    수량과 단위를 그램으로 변환
+
+    Args:
+        quantity (float): 수량
+        unit (Optional[str]): 단위 (알 수 없는 단위는 1인분으로 간주)
+
+    Returns:
+        float: 그램 환산량
+    """
+    unit_key = (unit or "인분").strip().lower()
+    grams_per_unit = UNIT_GRAMS.get(unit_key)
+    if grams_per_unit is None:
+        logger.warning(f"알 수 없는 단위 '{unit}', 1인분({BASE_QUANTITY_GRAMS}g)으로 계산합니다.")
+        grams_per_unit = BASE_QUANTITY_GRAMS
+    return float(quantity) * grams_per_unit
+
+
+def item_name(item: FoodItem) -> str:
+    """식품 항목(이름 또는 딕셔너리)의 이름"""
+    if isinstance(item, dict):
+        return item.get("name") or item.get("food_name", "")
+    return item
+
+
+def item_grams(item: FoodItem) -> float:
+    """식품 항목의 그램 환산량 (수량이 없으면 1인분)"""
+    if isinstance(item, dict):
+        return to_grams(item.get("quantity", 1), item.get("unit", "인분"))
+    return BASE_QUANTITY_GRAMS
+
+
+class NutrientAggregator:
+    """
+    식품 카탈로그 기반 영양소 집계 엔진
+
+    foods 테이블의 100g당 영양소를 (식품 수 x 영양소 수) 행렬로 메모리에 올려두고,
+    식사 단위 집계는 한 번의 인덱싱과 NumPy 행렬 연산으로 수행한다.
+    데이터베이스 파일이 변경되면 다음 호출 시 행렬을 다시 로드한다.
+    """
+
+    def __init__(self, food_db):
+        """
+        Args:
+            food_db (FoodDatabaseService): 식품 데이터베이스 서비스
+        """
+        self.food_db = food_db
+        self._lock = threading.Lock()
+        # (이름 → 행 번호, 영양소 행렬): 다시 로드할 때 튜플째 교체하므로 한 호출 안에서는 같은 스냅샷을 사용
+        self._catalog: Tuple[Dict[str, int], np.ndarray] = ({}, np.zeros((0, len(NUTRIENT_KEYS))))
+        self._loaded_version: Optional[Tuple[int, int]] = None
+
+    def _catalog_version(self) -> Tuple[int, int]:
+        try:
+            mtime = os.stat(self.food_db.db_path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        return mtime, getattr(self.food_db, "catalog_version", 0)
+
+    def _snapshot(self) -> Tuple[Dict[str, int], np.ndarray]:
+        """카탈로그가 변경된 경우 영양소 행렬을 다시 로드하고 현재 (인덱스, 행렬) 반환"""
+        version = self._catalog_version()
+        with self._lock:
+            if version != self._loaded_version:
+                names, rows = self.food_db.get_nutrient_table(NUTRIENT_KEYS)
+                index = {name: i for i, name in enumerate(names)}
+                matrix = np.asarray(rows, dtype=np.float64).reshape(len(names), len(NUTRIENT_KEYS))
+                self._catalog = (index, matrix)
+                self._loaded_version = version
+                logger.info(f"영양소 행렬 로드 완료: {len(names)}개 식품")
+            return self._catalog
+
+    def refresh(self):
+        """다음 집계 시 카탈로그를 강제로 다시 로드"""
+        self._loaded_version = None
+
+    @staticmethod
+    def _rows(index: Dict[str, int], food_names: List[str]) -> Tuple[List[Optional[int]], List[str]]:
+        rows, unresolved = [], []
+        for name in food_names:
+            row = index.get(name.strip())
+            if row is None:
+                unresolved.append(name)
+            rows.append(row)
+        return rows, unresolved
+
+    def lookup(self, food_names: List[str]) -> Tuple[List[int], List[str]]:
+        """
+        식품 이름 목록을 행렬 행 번호로 변환
+
+        Args:
+            food_names (List[str]): 식품 이름 목록
+
+        Returns:
+            Tuple[List[int], List[str]]: (행 번호, 카탈로그에 없는 이름)
+        """
+        index, _ = self._snapshot()
+        return self._rows(index, food_names)
+
+    def nutrient_vector(self, food_name: str) -> Optional[Dict[str, float]]:
+        """단일 식품의 100g당 영양소"""
+        index, matrix = self._snapshot()
+        rows, _ = self._rows(index, [food_name])
+        if rows[0] is None:
+            return None
+        return dict(zip(NUTRIENT_KEYS, matrix[rows[0]].tolist()))
+
+    def aggregate(self, items: List[FoodItem]) -> Dict[str, Any]:
+        """
+        식사 영양소 합계 계산
+
+        Args:
+            items (List[FoodItem]): 식품 이름 또는 {name, quantity, unit} 딕셔너리 목록
+                                    (수량이 없으면 1인분)
+
+        Returns:
+            Dict[str, Any]: totals(영양소 합계), resolved(찾은 식품 이름), unresolved(찾지 못한 항목)
+        """
+        names = [item_name(item) for item in items]
+        grams = [item_grams(item) for item in items]
+
+        # 행 번호와 행렬은 같은 스냅샷에서 가져와야 다른 스레드의 재로드와 섞이지 않음
+        index, matrix = self._snapshot()
+        rows, _ = self._rows(index, names)
+        resolved_rows = [row for row in rows if row is not None]
+        resolved_scale = np.array(
+            [g / BASE_QUANTITY_GRAMS for row, g in zip(rows, grams) if row is not None],
+            dtype=np.float64
+        )
+
+        if resolved_rows:
+            totals = resolved_scale @ matrix[resolved_rows]
+        else:
+            totals = np.zeros(len(NUTRIENT_KEYS))
+
+        return {
+            "totals": {key: round(float(value), 2) for key, value in zip(NUTRIENT_KEYS, totals)},
+            "resolved": [name for name, row in zip(names, rows) if row is not None],
+            "unresolved": [item for item, row in zip(items, rows) if row is None]
+        }
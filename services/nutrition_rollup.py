@@ -0,0 +1,356 @@
+import logging
+from datetime import date as date_type, timedelta
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterable
+
+from sqlalchemy import event, func, select, delete, insert, tuple_
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from models.daily_nutrition import DailyNutrition
+from services import user_cache
+from services.meal_nutrition import nutrient_sum_columns
+from services.nutrition_engine import NUTRIENT_KEYS
+from utils.session_events import bulk_statement_model
+
+logger = logging.getLogger(__name__)
+
+# session.info에 변경된 날짜/식사를 모아두는 키
+_STALE_DAYS = 'daily_nutrition_stale_days'
+_STALE_MEALS = 'daily_nutrition_stale_meals'
+
+DayKey = Tuple[int, date_type]
+
+
+def _day_key(uid, day) -> Optional[DayKey]:
+    """(uid, date) 키 정규화 (JWT identity가 문자열인 경우 포함)"""
+    if uid is None or day is None:
+        return None
+    return int(uid), day
+
+
+def _stale_days(session: Session) -> Set[DayKey]:
+    return session.info.setdefault(_STALE_DAYS, set())
+
+
+def _stale_meals(session: Session) -> Set[int]:
+    return session.info.setdefault(_STALE_MEALS, set())
+
+
+def _clear_stale(session: Session):
+    session.info.pop(_STALE_DAYS, None)
+    session.info.pop(_STALE_MEALS, None)
+
+
+def _history_values(obj, attr: str) -> List[Any]:
+    """속성의 현재 값과 변경 전 값"""
+    history = db.inspect(obj).attrs[attr].history
+    values = list(history.added or []) + list(history.deleted or []) + list(history.unchanged or [])
+    return values or [getattr(obj, attr)]
+
+
+def _track_meal(session: Session, meal: Meal):
+    """식사 변경 시 변경 전/후 (uid, date) 모두 기록"""
+    for uid in _history_values(meal, 'uid'):
+        for day in _history_values(meal, 'date'):
+            key = _day_key(uid, day)
+            if key:
+                _stale_days(session).add(key)
+
+
+def _track_food(session: Session, food: Food):
+    """음식 변경 시 변경 전/후 식사 ID 기록 (날짜는 커밋 직전에 조회)"""
+    for mid in _history_values(food, 'mid'):
+        if mid is not None:
+            _stale_meals(session).add(mid)
+
+
+def _before_flush(session: Session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Meal):
+            _track_meal(session, obj)
+        elif isinstance(obj, Food):
+            _track_food(session, obj)
+
+
+def _do_orm_execute(orm_execute_state):
+    """Query.delete()/update() 같은 일괄 실행은 flush 이벤트를 거치지 않으므로 대상 날짜를 미리 조회"""
+    model = bulk_statement_model(orm_execute_state, (Meal, Food))
+    if model is None:
+        return
+
+    # 조건은 대상 테이블(meal 또는 food)의 것이므로 같은 테이블에서 시작하는 조회에 사용
+    session = orm_execute_state.session
+    whereclause = orm_execute_state.statement.whereclause
+    if model is Meal:
+        query = select(Meal.uid, Meal.date).select_from(Meal)
+    else:
+        query = select(Meal.uid, Meal.date).select_from(Food).join(Meal, Meal.mid == Food.mid)
+    if whereclause is not None:
+        query = query.where(whereclause)
+
+    with session.no_autoflush:
+        days = {_day_key(row.uid, row.date) for row in session.execute(query.distinct())}
+    result = orm_execute_state.invoke_statement()
+
+    if orm_execute_state.is_update:
+        # 일괄 수정으로 식사 날짜가 바뀐 경우 새 날짜도 갱신 대상
+        with session.no_autoflush:
+            days |= {_day_key(row.uid, row.date) for row in session.execute(query.distinct())}
+    _stale_days(session).update(days)
+    return result
+
+
+def _before_commit(session: Session):
+    if not session.info.get(_STALE_DAYS) and not session.info.get(_STALE_MEALS) and not session.new \
+            and not session.dirty and not session.deleted:
+        return
+
+    # 남은 변경 사항을 먼저 반영해 before_flush에서 대상을 수집
+    session.flush()
+
+    days = set(session.info.get(_STALE_DAYS, ()))
+    mids = session.info.get(_STALE_MEALS)
+    if mids:
+        rows = session.execute(select(Meal.uid, Meal.date).where(Meal.mid.in_(mids)))
+        days.update(_day_key(row.uid, row.date) for row in rows)
+
+    try:
+        if days:
+            refresh_days(session, days)
+            # 식사/음식이 바뀐 사용자의 화면 캐시 무효화 (커밋 후 버전 갱신)
+            user_cache.mark_changed(session, {uid for uid, _ in days})
+    finally:
+        _clear_stale(session)
+
+
+def _after_rollback(session: Session, previous_transaction):
+    _clear_stale(session)
+
+
+def init_app(app):
+    """
+    세션 이벤트 등록 (식사/음식 변경이 커밋될 때 같은 트랜잭션에서 일일 합계 갱신)
+
+    Args:
+        app: Flask 애플리케이션 (db.session 사용으로 애플리케이션별 상태는 없음)
+    """
+    for name, listener in (
+        ('before_flush', _before_flush),
+        ('do_orm_execute', _do_orm_execute),
+        ('before_commit', _before_commit),
+        ('after_soft_rollback', _after_rollback)
+    ):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+
+
+def aggregate_days(*criteria) -> Dict[DayKey, Dict[str, Any]]:
+    """
+    식사/음식 테이블에서 (uid, date)별 합계를 직접 계산 (한 번의 GROUP BY 쿼리)
+
+    Args:
+        *criteria: Meal 필터 조건
+
+    Returns:
+        Dict[DayKey, Dict[str, Any]]: (uid, date) → daily_nutrition 행 값
+    """
+    query = select(
+        Meal.uid,
+        Meal.date,
+        func.count(func.distinct(Meal.mid)).label('meal_count'),
+        *nutrient_sum_columns()
+    ).select_from(Meal).outerjoin(Food, Food.mid == Meal.mid) \
+        .where(*criteria) \
+        .group_by(Meal.uid, Meal.date)
+
+    aggregates = {}
+    for row in db.session.execute(query):
+        values = {
+            'uid': row.uid,
+            'date': row.date,
+            'meal_count': row.meal_count,
+            'resolved_food_count': row.resolved_count
+        }
+        for key in NUTRIENT_KEYS:
+            values[key] = float(getattr(row, key) or 0)
+        aggregates[_day_key(row.uid, row.date)] = values
+    return aggregates
+
+
+def refresh_days(session: Session, days: Iterable[DayKey]):
+    """
+    지정한 날짜의 일일 합계 행을 다시 계산 (커밋은 호출자 트랜잭션에 맡김)
+
+    Args:
+        session (Session): 현재 세션
+        days (Iterable[DayKey]): 갱신할 (uid, date) 목록
+    """
+    days = list(days)
+    uids = {uid for uid, _ in days}
+    dates = {day for _, day in days}
+    aggregates = aggregate_days(Meal.uid.in_(uids), Meal.date.in_(dates))
+
+    table = DailyNutrition.__table__
+    session.execute(delete(table).where(tuple_(table.c.uid, table.c.date).in_(days)))
+    rows = [aggregates[key] for key in days if key in aggregates]
+    if rows:
+        session.execute(insert(table), rows)
+
+
+def rebuild_daily_nutrition(uid: Optional[int] = None) -> int:
+    """
+    식사/음식 기록으로부터 일일 합계 테이블 재구축
+
+    Args:
+        uid (Optional[int]): 대상 사용자 ID (None이면 전체)
+
+    Returns:
+        int: 생성된 일일 합계 행 수
+    """
+    table = DailyNutrition.__table__
+    try:
+        criteria = [Meal.uid == uid] if uid is not None else []
+        rows = list(aggregate_days(*criteria).values())
+
+        statement = delete(table)
+        if uid is not None:
+            statement = statement.where(table.c.uid == uid)
+        db.session.execute(statement)
+        if rows:
+            db.session.execute(insert(table), rows)
+        db.session.commit()
+
+        logger.info(f"일일 영양 합계 재구축 완료: {len(rows)}개 행")
+        return len(rows)
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"일일 영양 합계 재구축 오류: {str(e)}")
+        raise
+
+
+def check_daily_nutrition_consistency(uid: Optional[int] = None, tolerance: float = 0.01) -> List[Dict[str, Any]]:
+    """
+    일일 합계 테이블과 식사/음식 기록의 합계 비교
+
+    Args:
+        uid (Optional[int]): 대상 사용자 ID (None이면 전체)
+        tolerance (float): 영양소 값 허용 오차
+
+    Returns:
+        List[Dict[str, Any]]: 불일치 목록 (missing: 합계 행 없음, orphan: 식사 없는 합계 행, mismatch: 값 불일치)
+    """
+    criteria = [Meal.uid == uid] if uid is not None else []
+    expected = aggregate_days(*criteria)
+
+    query = DailyNutrition.query
+    if uid is not None:
+        query = query.filter(DailyNutrition.uid == uid)
+    stored = {_day_key(row.uid, row.date): row for row in query.all()}
+
+    problems = []
+    for key in sorted(set(expected) | set(stored)):
+        base = {'uid': key[0], 'date': key[1].strftime('%Y-%m-%d')}
+        if key not in stored:
+            problems.append({**base, 'problem': 'missing'})
+            continue
+        if key not in expected:
+            problems.append({**base, 'problem': 'orphan'})
+            continue
+
+        row, values = stored[key], expected[key]
+        fields = {}
+        for column in ('meal_count', 'resolved_food_count') + tuple(NUTRIENT_KEYS):
+            if abs((getattr(row, column) or 0) - values[column]) > tolerance:
+                fields[column] = {'stored': getattr(row, column), 'expected': values[column]}
+        if fields:
+            problems.append({**base, 'problem': 'mismatch', 'fields': fields})
+
+    return problems
+
+
+def get_daily_rollups(uid, start_date: date_type, end_date: Optional[date_type] = None) -> Dict[date_type, DailyNutrition]:
+    """
+    기간 내 일일 합계 행 조회
+
+    Args:
+        uid: 사용자 ID
+        start_date (date): 시작 날짜
+        end_date (Optional[date]): 종료 날짜 (None이면 시작 날짜 하루)
+
+    Returns:
+        Dict[date, DailyNutrition]: 날짜 → 일일 합계 행
+    """
+    rows = DailyNutrition.query.filter(
+        DailyNutrition.uid == uid,
+        DailyNutrition.date >= start_date,
+        DailyNutrition.date <= (end_date or start_date)
+    ).all()
+    return {row.date: row for row in rows}
+
+
+def fill_series(rollups: Dict[date_type, DailyNutrition], start_date: date_type, end_date: date_type) -> List[Dict[str, Any]]:
+    """
+    날짜별 일일 합계 행을 기간 전체의 날짜 목록으로 변환 (기록이 없는 날은 빈 값으로 채움)
+
+    Args:
+        rollups (Dict[date, DailyNutrition]): 날짜 → 일일 합계 행
+        start_date (date): 시작 날짜
+        end_date (date): 종료 날짜
+
+    Returns:
+        List[Dict[str, Any]]: 날짜순 {'date', 'nutrition', 'meal_count'} 목록
+    """
+    series = []
+    for offset in range((end_date - start_date).days + 1):
+        day = start_date + timedelta(days=offset)
+        rollup = rollups.get(day)
+        series.append({
+            'date': day.strftime('%Y-%m-%d'),
+            'nutrition': rollup.get_nutrition() if rollup else {},
+            'meal_count': rollup.meal_count if rollup else 0
+        })
+    return series
+
+
+def daily_series(uid, start_date: date_type, end_date: date_type) -> List[Dict[str, Any]]:
+    """
+    기간 내 날짜별 영양 합계 (기록이 없는 날은 빈 값으로 채움)
+
+    Args:
+        uid: 사용자 ID
+        start_date (date): 시작 날짜
+        end_date (date): 종료 날짜
+
+    Returns:
+        List[Dict[str, Any]]: 날짜순 {'date', 'nutrition', 'meal_count'} 목록
+    """
+    return fill_series(get_daily_rollups(uid, start_date, end_date), start_date, end_date)
+
+
+def average_nutrition(series: List[Dict[str, Any]]) -> Tuple[Dict[str, float], int]:
+    """
+    영양 정보가 있는 날의 일평균 영양소
+
+    Args:
+        series (List[Dict[str, Any]]): daily_series() 결과
+
+    Returns:
+        Tuple[Dict[str, float], int]: (일평균 영양소, 영양 정보가 있는 날 수)
+    """
+    average = {}
+    days_with_data = 0
+
+    for day_data in series:
+        if day_data['nutrition']:
+            days_with_data += 1
+            for key, value in day_data['nutrition'].items():
+                average[key] = average.get(key, 0) + value
+
+    if days_with_data > 0:
+        for key in average:
+            average[key] /= days_with_data
+
+    return average, days_with_data
@@ -6,11 +6,42 @@ from datetime import datetime
 from pathlib import Path
 
 from langchain_openai import OpenAIEmbeddings
-from langchain_chroma import Chroma
-from langchain.text_splitter import CharacterTextSplitter
 from langchain.docstore.document import Document
 from langchain_community.chat_models import ChatOpenAI
-from langchain.chains import RetrievalQA
+from langchain.prompts import PromptTemplate
+from langchain.chains import LLMChain
+
+from services.vector_store import create_vector_store
+from utils.text_chunking import DocumentChunker
+from utils.prompt_builder import fit_prompt_sections
+from utils.tokenizer import truncate_tokens
+
+# RAG 프롬프트 섹션별 최대 토큰 수 (검색 문서 전체, 질의, 엔티티 추출 텍스트)
+RAG_CONTEXT_TOKEN_BUDGET = 1200
+RAG_QUESTION_TOKEN_BUDGET = 200
+ENTITY_TEXT_TOKEN_BUDGET = 1000
+
+RAG_QA_PROMPT = PromptTemplate(
+    input_variables=["context", "question"],
+    template="""다음 참고 문서를 바탕으로 질문에 답하세요. 문서에 없는 내용은 모른다고 답하세요.
+
+참고 문서:
+{context}
+
+질문: {question}
+답변:"""
+)
+
+ENTITY_PROMPT = PromptTemplate(
+    input_variables=["text"],
+    template="""
+다음 텍스트에서 모든 음식 이름을 추출하세요.
+음식 이름만 쉼표로 구분하여 나열해주세요.
+다른 설명은 포함하지 말고 음식 이름만 반환하세요.
+
+텍스트: {text}
+"""
+)
 
 class RAGService:
     """RAG(Retrieval-Augmented Generation) 서비스"""
@@ -20,8 +51,10 @@ class RAGService:
             openai_api_key: str,
             vector_db_dir: str = "database/vector_db",
             model_name: str = "gpt-3.5-turbo",
-            chunk_size: int = 1000,
-            chunk_overlap: int = 200
+            chunk_size: int = 400,
+            chunk_overlap: int = 40,
+            dedup_distance: int = 3,
+            vector_store_backend: Optional[str] = None
     ):
         """
         RAG 서비스 초기화
@@ -30,13 +63,17 @@ class RAGService:
             openai_api_key (str): OpenAI API 키
             vector_db_dir (str): 벡터 데이터베이스 디렉토리
             model_name (str): 사용할 모델 이름
-            chunk_size (int): 청크 크기
-            chunk_overlap (int): 청크 겹침 크기
+            chunk_size (int): 청크 크기 (토큰)
+            chunk_overlap (int): 청크 겹침 크기 (토큰)
+            dedup_distance (int): 근접 중복 청크로 판단할 SimHash 해밍 거리
+            vector_store_backend (Optional[str]): 벡터 저장소 백엔드 ('numpy' 또는 'chroma')
         """
         self.logger = logging.getLogger(__name__)
         self.vector_db_dir = vector_db_dir
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
+        self.vector_store_backend = vector_store_backend
+        self.last_chunk_stats: Dict[str, Any] = {}
 
         # 디렉토리 생성
         os.makedirs(vector_db_dir, exist_ok=True)
@@ -48,6 +85,7 @@ class RAGService:
         # 임베딩 및 벡터 저장소 초기화
         self._init_embedding_model()
         self._load_or_create_vector_db()
+        self._init_chunker(dedup_distance)
 
     def is_initialized(self) -> bool:
         """벡터 데이터베이스가 존재하는지 확인"""
@@ -65,25 +103,36 @@ class RAGService:
     def _load_or_create_vector_db(self):
         """벡터 데이터베이스 로드 또는 생성"""
         try:
-            # 기존 벡터 DB 로드 시도
-            if os.path.exists(os.path.join(self.vector_db_dir, "chroma.sqlite3")):
-                self.logger.info("기존 벡터 데이터베이스 로드")
-                self.vector_db = Chroma(
-                    persist_directory=self.vector_db_dir,
-                    embedding_function=self.embeddings
-                )
-            else:
-                self.logger.info("벡터 데이터베이스가 없습니다. 비어있는 데이터베이스 생성")
-                # 빈 문서 리스트로 초기화
-                self.vector_db = Chroma(
-                    persist_directory=self.vector_db_dir,
-                    embedding_function=self.embeddings
-                )
-                self.vector_db.persist()
+            self.vector_db = create_vector_store(
+                persist_directory=self.vector_db_dir,
+                embedding_function=self.embeddings,
+                backend=self.vector_store_backend
+            )
+            self.logger.info(f"벡터 데이터베이스 로드 완료: {type(self.vector_db).__name__}")
         except Exception as e:
             self.logger.error(f"벡터 데이터베이스 로드 오류: {str(e)}")
             raise
 
+    def _init_chunker(self, dedup_distance: int):
+        """토큰 기반 분할 및 중복 제거기 초기화"""
+        self.chunker = DocumentChunker(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            max_distance=dedup_distance,
+            fingerprint_path=os.path.join(self.vector_db_dir, "chunk_fingerprints.json")
+        )
+
+        # 지문 파일 없이 생성된 기존 색인은 저장된 청크로 지문 초기화
+        if self.chunker.is_empty():
+            try:
+                existing = self.vector_db.get(include=["documents"])
+                documents = existing.get("documents") or []
+                if documents:
+                    self.chunker.seed(documents)
+                    self.logger.info(f"기존 벡터 데이터베이스 청크 {len(documents)}개로 지문 초기화")
+            except Exception as e:
+                self.logger.warning(f"기존 청크 지문 초기화 실패: {str(e)}")
+
     def add_documents(self, documents: List[Dict[str, Any]]) -> int:
         """
         문서 추가
@@ -106,16 +155,21 @@ class RAGService:
                     metadata=metadata
                 ))
 
-            # 문서 분할
-            text_splitter = CharacterTextSplitter(
-                chunk_size=self.chunk_size,
-                chunk_overlap=self.chunk_overlap
+            # 토큰 단위 분할 및 근접 중복 제거 (임베딩 호출 전)
+            split_docs, fingerprints, stats = self.chunker.split_documents(langchain_docs)
+            self.last_chunk_stats = stats
+            self.logger.info(
+                f"청크 중복 제거: {stats['eliminated_chunks']}/{stats['total_chunks']}개 제거 "
+                f"({stats['eliminated_percent']}%, 배치 내 {stats['batch_duplicates']}, 기존 색인 {stats['index_duplicates']})"
             )
-            split_docs = text_splitter.split_documents(langchain_docs)
+
+            if not split_docs:
+                return 0
 
             # 벡터 데이터베이스에 추가
             self.vector_db.add_documents(split_docs)
             self.vector_db.persist()
+            self.chunker.commit(fingerprints)
 
             self.logger.info(f"문서 추가 완료: {len(split_docs)}개 청크 생성")
             return len(split_docs)
@@ -187,35 +241,35 @@ class RAGService:
         try:
             self.logger.info(f"영양 인사이트 생성 시작: {query}")
 
-            # RAG 체인 생성
             llm = ChatOpenAI(
                 openai_api_key=self.openai_api_key,
                 model_name=self.model_name,
                 temperature=0.3
             )
 
-            retriever = self.vector_db.as_retriever(search_kwargs={"k": top_k})
+            # 검색 문서는 문서별로 같은 몫의 토큰 예산 안에서 프롬프트에 포함
+            documents = self.vector_db.similarity_search(query, k=top_k)
+            per_document = RAG_CONTEXT_TOKEN_BUDGET // max(len(documents), 1)
+            context = "\n\n".join(truncate_tokens(doc.page_content, per_document) for doc in documents)
 
-            qa_chain = RetrievalQA.from_chain_type(
-                llm=llm,
-                chain_type="stuff",
-                retriever=retriever,
-                return_source_documents=True
+            inputs = fit_prompt_sections(
+                "rag.get_nutrition_insights",
+                {"context": context, "question": query},
+                {"context": RAG_CONTEXT_TOKEN_BUDGET, "question": RAG_QUESTION_TOKEN_BUDGET},
+                template=RAG_QA_PROMPT
             )
-
-            # 질의 실행
-            result = qa_chain({"query": query})
+            answer = LLMChain(llm=llm, prompt=RAG_QA_PROMPT).run(**inputs)
 
             # 소스 문서 추출
             source_documents = []
-            for doc in result.get("source_documents", []):
+            for doc in documents:
                 source_documents.append({
                     "content": doc.page_content,
                     "metadata": doc.metadata
                 })
 
             return {
-                "answer": result["result"],
+                "answer": answer,
                 "source_documents": source_documents,
                 "query": query,
                 "timestamp": datetime.now().isoformat()
@@ -280,14 +334,14 @@ class RAGService:
         try:
             self.logger.info(f"텍스트에서 음식 엔티티 추출 시작")
 
-            # RAG 체인을 사용하여 엔티티 추출
-            prompt = f"""
-다음 텍스트에서 모든 음식 이름을 추출하세요. 
-음식 이름만 쉼표로 구분하여 나열해주세요. 
-다른 설명은 포함하지 말고 음식 이름만 반환하세요.
-
-텍스트: {text}
-"""
+            # 엔티티 추출 프롬프트 (긴 텍스트는 토큰 예산까지만 사용)
+            inputs = fit_prompt_sections(
+                "rag.extract_food_entities",
+                {"text": text},
+                {"text": ENTITY_TEXT_TOKEN_BUDGET},
+                template=ENTITY_PROMPT
+            )
+            prompt = ENTITY_PROMPT.format(**inputs)
 
             llm = ChatOpenAI(
                 openai_api_key=self.openai_api_key,
@@ -308,37 +362,13 @@ class RAGService:
             return []
 
 
-# 클래스 외부에 래퍼 함수 정의
+# 클래스 외부에 래퍼 함수 정의 (애플리케이션 범위 서비스 컨테이너의 인스턴스 사용)
 def get_nutritional_research(query: str, top_k: int = 3) -> Dict[str, Any]:
     """RAGService.get_nutrition_insights의 래퍼 함수"""
-    from dotenv import load_dotenv
-    import os
-
-    # 환경 변수 로드
-    load_dotenv()
-
-    # OpenAI API 키 가져오기
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-
-    service = RAGService(openai_api_key=openai_api_key)
-    return service.get_nutrition_insights(query, top_k)
+    from services import service_manager
+    return service_manager.rag_service.get_nutrition_insights(query, top_k)
 
 def get_recipe_recommendations(query: str, limit: int = 3) -> Dict[str, Any]:
     """RAGService.get_recipe_recommendations의 래퍼 함수"""
-    from dotenv import load_dotenv
-    import os
-
-    # 환경 변수 로드
-    load_dotenv()
-
-    # OpenAI API 키 가져오기
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-
-    service = RAGService(openai_api_key=openai_api_key)
-    return service.get_recipe_recommendations(query, limit)
\ No newline at end of file
+    from services import service_manager
+    return service_manager.rag_service.get_recipe_recommendations(query, limit)
@@ -0,0 +1,509 @@
+import os
+import re
+import json
+import heapq
+import logging
+import threading
+import unicodedata
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple, Iterable, FrozenSet
+
+logger = logging.getLogger(__name__)
+
+# 기본 레시피 데이터 (레시피 테이블이 비어 있어도 검색 가능하도록 항상 함께 로드)
+DEFAULT_RECIPE_CORPUS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "database", "default_data", "korean_recipes.json"
+)
+
+# 알레르기 이름 → 제외할 재료 키워드 (목록에 없는 알레르기는 이름 자체로 검사)
+ALLERGEN_INGREDIENTS: Dict[str, Tuple[str, ...]] = {
+    "우유": ("우유", "치즈", "버터", "요거트", "요구르트", "생크림", "연유"),
+    "유제품": ("우유", "치즈", "버터", "요거트", "요구르트", "생크림", "연유"),
+    "계란": ("계란", "달걀", "메추리알", "마요네즈"),
+    "달걀": ("계란", "달걀", "메추리알", "마요네즈"),
+    "밀": ("밀가루", "부침가루", "튀김가루", "빵", "국수", "소면", "중면", "칼국수", "라면", "만두피", "파스타"),
+    "대두": ("두부", "콩", "간장", "된장", "고추장", "청국장", "춘장"),
+    "땅콩": ("땅콩",),
+    "견과류": ("호두", "아몬드", "잣", "캐슈넛", "피스타치오", "땅콩"),
+    "새우": ("새우", "새우젓"),
+    "갑각류": ("새우", "새우젓", "게", "꽃게", "게살", "대게", "랍스터", "가재"),
+    "생선": ("생선", "고등어", "연어", "참치", "멸치", "명태", "동태", "황태", "북어", "코다리",
+             "갈치", "조기", "삼치", "꽁치", "대구", "어묵", "액젓"),
+    "조개": ("조개", "바지락", "홍합", "굴", "전복", "가리비"),
+    "돼지고기": ("돼지고기", "돼지", "삼겹살", "목살", "베이컨", "햄", "소시지"),
+    "소고기": ("소고기", "쇠고기", "한우", "사골", "양지", "차돌박이"),
+    "닭고기": ("닭", "영계", "닭가슴살"),
+    "참깨": ("참깨", "깨", "깨소금", "참기름")
+}
+
+# 식사 유형별 권장 칼로리 범위와 조리 시간
+MEAL_TYPE_PROFILES: Dict[str, Dict[str, Any]] = {
+    "아침": {"calories": (200, 550), "max_time": 20},
+    "점심": {"calories": (400, 800)},
+    "저녁": {"calories": (300, 700)},
+    "간식": {"calories": (0, 300)}
+}
+
+# 건강 목표 키워드 → 영양 기준 (칼로리 대비 비율)
+LOW_CALORIE_GOALS = ("다이어트", "체중", "저칼로리", "감량")
+HIGH_PROTEIN_GOALS = ("단백질", "근육", "근력")
+LOW_CARB_GOALS = ("저탄수", "당뇨", "혈당")
+LOW_FAT_GOALS = ("저지방", "심장", "콜레스테롤")
+
+# 재료 이름의 손질/상태 수식어 (정규화 시 제거)
+INGREDIENT_MODIFIERS = frozenset({
+    "다진", "간", "채", "썬", "채썬", "삶은", "데친", "불린", "으깬", "말린", "볶은", "구운",
+    "얇게", "굵게", "잘게", "신선한", "냉동", "손질한", "익힌"
+})
+
+# 같은 재료의 다른 이름 → 대표 이름
+INGREDIENT_SYNONYMS: Dict[str, str] = {
+    "달걀": "계란",
+    "쇠고기": "소고기",
+    "파": "대파",
+    "깨": "참깨",
+    "통깨": "참깨",
+    "깨소금": "참깨"
+}
+
+# 대부분의 가정에 있는 기본 양념/재료 (보유 재료 비율 계산에서 제외하고, 없으면 감점)
+STAPLE_INGREDIENTS = frozenset({
+    "소금", "후추", "설탕", "간장", "참기름", "들기름", "식용유", "물", "참깨", "마늘", "식초",
+    "고춧가루", "고추장", "된장", "올리고당", "물엿", "맛술", "생강", "대파"
+})
+
+# 없는 기본 재료 하나당 감점
+STAPLE_PENALTY = 0.05
+
+_QUANTITY = re.compile(r"^\d")
+_PARENTHESES = re.compile(r"\([^)]*\)")
+
+# 레시피 응답 필드
+RECIPE_FIELDS = ("title", "ingredients", "instructions", "calories", "carbs", "protein", "fat",
+                 "time", "difficulty", "tags", "health_goals")
+
+
+def _normalize(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _matches(ingredient: str, keyword: str) -> bool:
+    """재료 이름이 키워드를 포함하는지 (한 글자 키워드는 정확히 일치할 때만)"""
+    if ingredient == keyword:
+        return True
+    return len(keyword) >= 2 and keyword in ingredient
+
+
+def allergen_keywords(allergies: Iterable[str]) -> List[str]:
+    """
+    알레르기 이름 목록을 제외할 재료 키워드로 변환
+
+    Args:
+        allergies (Iterable[str]): 알레르기 이름 목록
+
+    Returns:
+        List[str]: 재료 키워드 목록
+    """
+    keywords = []
+    for allergy in allergies or []:
+        name = _normalize(allergy)
+        if not name:
+            continue
+        keywords.append(name)
+        keywords.extend(ALLERGEN_INGREDIENTS.get(name, ()))
+    return sorted(set(keywords))
+
+
+def contains_allergens(ingredients: Iterable[str], keywords: Iterable[str]) -> bool:
+    """
+    재료 목록에 알레르기 재료가 있는지 확인
+
+    Args:
+        ingredients (Iterable[str]): 재료 목록
+        keywords (Iterable[str]): allergen_keywords()로 만든 키워드 목록
+
+    Returns:
+        bool: 알레르기 재료 포함 여부
+    """
+    keywords = list(keywords)
+    return any(_matches(_normalize(ingredient), keyword) for ingredient in ingredients for keyword in keywords)
+
+
+def normalize_ingredient(name: Any) -> str:
+    """
+    재료 이름 정규화 (괄호, 수량, 손질 수식어 제거 후 대표 이름으로 변환)
+
+    예: '다진 마늘' → '마늘', '두부 1모' → '두부', '달걀(2개)' → '계란'
+
+    Args:
+        name (Any): 재료 이름
+
+    Returns:
+        str: 정규화된 재료 이름 (남는 것이 없으면 빈 문자열)
+    """
+    text = _PARENTHESES.sub(" ", unicodedata.normalize("NFC", _normalize(name)))
+    words = [word for word in text.split() if word not in INGREDIENT_MODIFIERS and not _QUANTITY.match(word)]
+    normalized = " ".join(words)
+    return INGREDIENT_SYNONYMS.get(normalized, normalized)
+
+
+def _ratio(recipe: Dict[str, Any], nutrient: str, kcal_per_gram: float) -> Optional[float]:
+    """칼로리 중 해당 영양소가 차지하는 비율"""
+    calories, amount = recipe.get("calories"), recipe.get(nutrient)
+    if not calories or amount is None:
+        return None
+    return amount * kcal_per_gram / calories
+
+
+def nutrition_fit(recipe: Dict[str, Any], health_goal: str) -> int:
+    """
+    건강 목표에 대한 영양 적합도 (0~2, 관련 기준이 없으면 0)
+
+    Args:
+        recipe (Dict[str, Any]): 레시피
+        health_goal (str): 건강 목표
+
+    Returns:
+        int: 적합도 점수
+    """
+    goal = _normalize(health_goal)
+    if not goal:
+        return 0
+
+    score = 0
+    calories = recipe.get("calories")
+    if any(keyword in goal for keyword in LOW_CALORIE_GOALS) and calories is not None:
+        score = max(score, 2 if calories <= 350 else 1 if calories <= 500 else 0)
+
+    checks = (
+        (HIGH_PROTEIN_GOALS, "protein", 4, lambda ratio: 2 if ratio >= 0.3 else 1 if ratio >= 0.2 else 0),
+        (LOW_CARB_GOALS, "carbs", 4, lambda ratio: 2 if ratio <= 0.3 else 1 if ratio <= 0.45 else 0),
+        (LOW_FAT_GOALS, "fat", 9, lambda ratio: 2 if ratio <= 0.2 else 1 if ratio <= 0.3 else 0)
+    )
+    for keywords, nutrient, kcal_per_gram, grade in checks:
+        if any(keyword in goal for keyword in keywords):
+            ratio = _ratio(recipe, nutrient, kcal_per_gram)
+            if ratio is not None:
+                score = max(score, grade(ratio))
+    return score
+
+
+class RecipeIndex:
+    """
+    레시피 인덱스 스냅샷
+
+    만든 뒤에는 변경하지 않는다. 다시 로드하거나 레시피를 추가하면 새 스냅샷을 만들어 통째로 교체하므로
+    검색은 호출마다 스냅샷을 한 번 읽어 락 없이 사용한다.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = (), table_titles: Iterable[str] = (),
+                 base: Optional["RecipeIndex"] = None):
+        """
+        Args:
+            records (Iterable[Dict[str, Any]]): 추가할 레시피 (같은 제목이 있으면 교체)
+            table_titles (Iterable[str]): 추가할 recipes 테이블 제목
+            base (Optional[RecipeIndex]): 복사해서 이어 만들 스냅샷 (바뀌는 역색인 집합만 복사)
+        """
+        self.recipes: List[Dict[str, Any]] = list(base.recipes) if base else []
+        # 레시피별 (소문자 재료, 소문자 건강 목표/태그)
+        self.features: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = list(base.features) if base else []
+        # 레시피별 정규화된 주재료/기본 재료 집합
+        self.mains: List[FrozenSet[str]] = list(base.mains) if base else []
+        self.staples: List[FrozenSet[str]] = list(base.staples) if base else []
+        # 제목 → 레시피 번호, 정규화된 주재료 → 레시피 번호 집합 (역색인)
+        self.positions: Dict[str, int] = dict(base.positions) if base else {}
+        self.postings: Dict[str, FrozenSet[int]] = dict(base.postings) if base else {}
+        # recipes 테이블에 저장된 제목 (기본 레시피 데이터와 구분)
+        self.table_titles: FrozenSet[str] = (base.table_titles if base else frozenset()) | frozenset(table_titles)
+
+        # 바뀌는 역색인 집합만 새로 만들어 기존 스냅샷의 집합은 그대로 둠
+        changed: Dict[str, set] = {}
+        for record in records:
+            if record.get("title"):
+                self._put(record, changed)
+        self.postings.update((name, frozenset(positions)) for name, positions in changed.items())
+
+    def _posting(self, name: str, changed: Dict[str, set]) -> set:
+        if name not in changed:
+            changed[name] = set(self.postings.get(name, ()))
+        return changed[name]
+
+    def _put(self, record: Dict[str, Any], changed: Dict[str, set]):
+        """레시피를 인덱스에 추가 (같은 제목이 있으면 교체)"""
+        recipe = {field: record.get(field) for field in RECIPE_FIELDS}
+        recipe["ingredients"] = list(recipe["ingredients"] or [])
+        recipe["tags"] = list(recipe["tags"] or [])
+        recipe["health_goals"] = list(recipe["health_goals"] or [])
+
+        names = {normalize_ingredient(ingredient) for ingredient in recipe["ingredients"]} - {""}
+        mains = frozenset(names - STAPLE_INGREDIENTS)
+        features = (
+            tuple(_normalize(ingredient) for ingredient in recipe["ingredients"]),
+            tuple(_normalize(label) for label in recipe["health_goals"] + recipe["tags"])
+        )
+
+        position = self.positions.get(recipe["title"])
+        if position is None:
+            position = len(self.recipes)
+            self.positions[recipe["title"]] = position
+            self.recipes.append(recipe)
+            self.features.append(features)
+            self.mains.append(mains)
+            self.staples.append(frozenset(names & STAPLE_INGREDIENTS))
+        else:
+            for name in self.mains[position]:
+                self._posting(name, changed).discard(position)
+            self.recipes[position] = recipe
+            self.features[position] = features
+            self.mains[position] = mains
+            self.staples[position] = frozenset(names & STAPLE_INGREDIENTS)
+
+        for name in mains:
+            self._posting(name, changed).add(position)
+
+
+class RecipeEngine:
+    """
+    로컬 레시피 검색/추천 엔진
+
+    기본 레시피 데이터와 식품 DB의 recipes 테이블(LLM 생성 레시피 포함)을 메모리에 올려두고
+    식사 유형, 건강 목표, 알레르기, 영양 조건으로 걸러 점수 순으로 반환한다.
+    보유 재료 검색(cook_with)은 정규화된 주재료 → 레시피 역색인을 사용한다.
+    add()로 저장한 레시피는 인덱스에 바로 추가되고, 그 밖의 방법으로 레시피 테이블이 변경되면
+    다음 호출 시 인덱스를 다시 로드한다.
+    """
+
+    def __init__(self, food_db, corpus_path: Optional[str] = DEFAULT_RECIPE_CORPUS):
+        """
+        Args:
+            food_db (FoodDatabaseService): 식품 데이터베이스 서비스
+            corpus_path (Optional[str]): 기본 레시피 JSON 경로 (None이면 recipes 테이블만 사용)
+        """
+        self.food_db = food_db
+        self.corpus_path = corpus_path
+        self._lock = threading.Lock()
+        self._index = RecipeIndex()
+        self._loaded_version: Optional[Tuple[Tuple[int, int], int]] = None
+
+    @staticmethod
+    def _mtime(path: Optional[str]) -> int:
+        try:
+            return os.stat(path).st_mtime_ns if path else 0
+        except OSError:
+            return 0
+
+    def _version(self) -> Tuple[Tuple[int, int], int]:
+        # 식품 추가로는 바뀌지 않도록 DB 파일이 아니라 recipes 테이블 기준 (다른 프로세스의 추가도 감지)
+        return self.food_db.get_recipe_version(), self._mtime(self.corpus_path)
+
+    def _load_corpus(self) -> List[Dict[str, Any]]:
+        if not self.corpus_path or not os.path.exists(self.corpus_path):
+            return []
+        try:
+            with open(self.corpus_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"기본 레시피 로드 오류: {str(e)}")
+            return []
+
+    def _snapshot(self) -> RecipeIndex:
+        """레시피 데이터가 변경된 경우 인덱스를 다시 로드하고 현재 스냅샷 반환"""
+        version = self._version()
+        with self._lock:
+            if version != self._loaded_version:
+                # 같은 제목은 recipes 테이블의 레시피가 우선
+                table = self.food_db.get_recipes()
+                self._index = RecipeIndex(self._load_corpus() + table,
+                                          (record["title"] for record in table if record.get("title")))
+                self._loaded_version = version
+                logger.info(f"레시피 인덱스 로드 완료: {len(self._index.recipes)}개 레시피, "
+                            f"재료 {len(self._index.postings)}개")
+            return self._index
+
+    def refresh(self):
+        """다음 검색 시 레시피 데이터를 강제로 다시 로드"""
+        self._loaded_version = None
+
+    def __len__(self) -> int:
+        return len(self._snapshot().recipes)
+
+    def recommend(
+            self,
+            ingredients: Optional[List[str]] = None,
+            meal_type: str = "",
+            health_goal: str = "",
+            allergies: Optional[List[str]] = None,
+            max_calories: Optional[float] = None,
+            min_protein: Optional[float] = None,
+            limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 레시피 추천
+
+        - 알레르기 재료가 들어간 레시피와 칼로리/단백질 조건을 벗어난 레시피는 제외
+        - 재료를 지정하면 하나 이상 포함한 레시피만, 건강 목표를 지정하면 목표 태그나 영양 기준이 맞는 레시피만 반환
+        - 재료 일치, 건강 목표, 식사 유형(칼로리 범위, 조리 시간) 점수 순으로 정렬
+
+        Args:
+            ingredients (Optional[List[str]]): 사용할 재료 목록
+            meal_type (str): 식사 유형 (아침, 점심, 저녁, 간식)
+            health_goal (str): 건강 목표
+            allergies (Optional[List[str]]): 알레르기 목록
+            max_calories (Optional[float]): 최대 칼로리
+            min_protein (Optional[float]): 최소 단백질 (g)
+            limit (int): 반환할 최대 레시피 수
+
+        Returns:
+            List[Dict[str, Any]]: 레시피 목록 (source='local', score 포함)
+        """
+        index = self._snapshot()
+
+        wanted = [_normalize(ingredient) for ingredient in ingredients or [] if _normalize(ingredient)]
+        excluded = allergen_keywords(allergies or [])
+        goal = _normalize(health_goal)
+        meal = _normalize(meal_type)
+        profile = MEAL_TYPE_PROFILES.get(meal_type.strip() if meal_type else "", {})
+
+        ranked = []
+        for recipe, (recipe_ingredients, labels) in zip(index.recipes, index.features):
+            if excluded and any(_matches(item, keyword) for item in recipe_ingredients for keyword in excluded):
+                continue
+            calories, protein = recipe["calories"], recipe["protein"]
+            if max_calories is not None and (calories is None or calories > max_calories):
+                continue
+            if min_protein is not None and (protein is None or protein < min_protein):
+                continue
+
+            score = 0.0
+            if wanted:
+                matched = sum(1 for keyword in wanted if any(_matches(item, keyword) for item in recipe_ingredients))
+                if not matched:
+                    continue
+                score += 3 * matched
+
+            if goal:
+                labelled = any(goal in label or label in goal for label in labels)
+                fit = nutrition_fit(recipe, goal)
+                if not labelled and not fit:
+                    continue
+                score += (3 if labelled else 0) + fit
+
+            if meal:
+                if meal in labels:
+                    score += 2
+                low, high = profile.get("calories", (None, None))
+                if low is not None and calories is not None and low <= calories <= high:
+                    score += 1
+                max_time = profile.get("max_time")
+                if max_time is not None and recipe["time"] is not None and recipe["time"] <= max_time:
+                    score += 1
+
+            ranked.append((-score, recipe["time"] if recipe["time"] is not None else float("inf"),
+                           recipe["title"], recipe, score))
+
+        ranked.sort(key=lambda item: item[:3])
+        return [dict(recipe, source="local", score=score) for *_, recipe, score in ranked[:limit]]
+
+    def cook_with(
+            self,
+            ingredients: List[str],
+            allergies: Optional[List[str]] = None,
+            limit: int = 5,
+            min_coverage: float = 0.0
+    ) -> List[Dict[str, Any]]:
+        """
+        보유 재료로 만들 수 있는 레시피 검색 (재료 역색인 사용)
+
+        보유 주재료를 하나 이상 쓰는 레시피만 역색인에서 후보로 모으고,
+        점수 = 주재료 보유 비율 - 없는 기본 재료 수 x STAPLE_PENALTY 순으로 정렬한다.
+
+        Args:
+            ingredients (List[str]): 보유 재료 목록
+            allergies (Optional[List[str]]): 알레르기 목록
+            limit (int): 반환할 최대 레시피 수
+            min_coverage (float): 최소 주재료 보유 비율 (0~1)
+
+        Returns:
+            List[Dict[str, Any]]: 레시피 목록 (coverage, score, missing(없는 주재료), missing_staples 포함)
+        """
+        index = self._snapshot()
+
+        owned = {normalize_ingredient(ingredient) for ingredient in ingredients or []} - {""}
+        excluded = allergen_keywords(allergies or [])
+
+        # 역색인으로 후보 레시피와 보유 주재료 수 계산
+        matched = Counter()
+        for name in owned:
+            for position in index.postings.get(name, ()):
+                matched[position] += 1
+
+        ranked = []
+        for position, count in matched.items():
+            coverage = count / len(index.mains[position])
+            if coverage < min_coverage:
+                continue
+            if excluded and any(_matches(item, keyword)
+                                for item in index.features[position][0] for keyword in excluded):
+                continue
+            missing_staples = len(index.staples[position] - owned)
+            score = coverage - STAPLE_PENALTY * missing_staples
+            ranked.append((-score, len(index.mains[position]) - count, index.recipes[position]["title"],
+                           position, coverage, score))
+
+        results = []
+        for _, _, _, position, coverage, score in heapq.nsmallest(limit, ranked):
+            recipe = index.recipes[position]
+            results.append(dict(
+                recipe,
+                source="local",
+                coverage=round(coverage, 3),
+                score=round(score, 3),
+                missing=sorted(index.mains[position] - owned),
+                missing_staples=sorted(index.staples[position] - owned)
+            ))
+        return results
+
+    def add(self, recipes: List[Dict[str, Any]], meal_type: str = "", health_goal: str = "") -> int:
+        """
+        외부(LLM)에서 생성한 레시피를 레시피 테이블에 저장해 다음 검색부터 로컬에서 찾도록 함
+
+        Args:
+            recipes (List[Dict[str, Any]]): 레시피 목록 (title, ingredients, instructions)
+            meal_type (str): 요청한 식사 유형 (태그로 저장)
+            health_goal (str): 요청한 건강 목표 (건강 목표로 저장)
+
+        Returns:
+            int: 새로 저장된 레시피 수
+        """
+        records = []
+        for recipe in recipes:
+            record = {field: recipe.get(field) for field in RECIPE_FIELDS}
+            record["tags"] = list(dict.fromkeys((record["tags"] or []) + ([meal_type] if meal_type else [])))
+            record["health_goals"] = list(dict.fromkeys(
+                (record["health_goals"] or []) + ([health_goal] if health_goal else [])
+            ))
+            records.append(record)
+
+        with self._lock:
+            index, version = self._index, self._loaded_version
+        current = version is not None and version == self._version()
+        count = self.food_db.add_recipes(records)
+        if not count:
+            return count
+
+        with self._lock:
+            # 그 사이 다른 요청이나 프로세스가 레시피 테이블을 바꾸지 않았으면
+            # 새로 저장된 레시피만 추가한 스냅샷으로 교체 (전체 다시 로드 없음)
+            new_version = self._version()
+            if current and self._index is index and new_version[0][0] == version[0][0] + count \
+                    and new_version[1] == version[1]:
+                added = {}
+                for record in records:
+                    if record.get("title") and record["title"] not in index.table_titles:
+                        added.setdefault(record["title"], record)
+                self._index = RecipeIndex(added.values(), added, base=index)
+                self._loaded_version = new_version
+            else:
+                self._loaded_version = None
+        return count
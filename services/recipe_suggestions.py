@@ -0,0 +1,133 @@
+"""
+검색 화면의 AI 레시피 제안
+
+LLM 레시피 검색은 수 초가 걸리므로 통합 검색 응답에서 분리해 백그라운드 스레드에서 생성하고,
+결과는 검색어별로 캐시에 저장한다. 클라이언트는 상태가 'pending'인 동안 결과를 다시 조회한다.
+"""
+import queue
+import hashlib
+import logging
+import threading
+import unicodedata
+from typing import Dict, Any, Optional
+
+from flask import current_app
+
+from app.extensions import cache
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+DONE = 'done'
+ERROR = 'error'
+
+# 실패한 검색어는 짧게 보관한 뒤 다시 시도
+ERROR_TIMEOUT = 60
+
+
+def normalize_query(query: str) -> str:
+    """캐시 키에 사용할 검색어 정규화 (유니코드 정규화, 공백 정리, 소문자)"""
+    return ' '.join(unicodedata.normalize('NFC', query or '').lower().split())
+
+
+def suggestion_key(query: str) -> str:
+    """검색어별 제안 결과 캐시 키"""
+    digest = hashlib.md5(normalize_query(query).encode('utf-8')).hexdigest()
+    return f"recipe_suggestions_{digest}"
+
+
+class RecipeSuggestionQueue:
+    """
+    AI 레시피 제안을 백그라운드에서 생성
+
+    Flask 확장과 같은 방식으로 init_app()에서 애플리케이션을 등록하며,
+    같은 검색어의 요청은 결과가 캐시에 있는 동안 한 번만 생성한다.
+    """
+
+    def __init__(self, limit: int = 5):
+        """
+        Args:
+            limit (int): 검색어당 제안할 레시피 수
+        """
+        self.limit = limit
+        self.app = None
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def init_app(self, app):
+        """애플리케이션 등록 (백그라운드 스레드에서 앱 컨텍스트 생성용)"""
+        self.app = app
+
+    def _timeout(self) -> int:
+        return current_app.config.get('RECIPE_SUGGESTION_CACHE_TIMEOUT', 3600)
+
+    def get(self, query: str) -> Dict[str, Any]:
+        """
+        검색어의 제안 결과 조회 (결과가 없으면 생성 작업 예약)
+
+        Args:
+            query (str): 검색어
+
+        Returns:
+            Dict[str, Any]: status('pending', 'done', 'error')와 recipes
+        """
+        key = suggestion_key(query)
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+        if self.app is None:
+            logger.warning("애플리케이션이 등록되지 않아 AI 레시피 제안을 건너뜁니다.")
+            return {'status': ERROR, 'recipes': []}
+
+        pending = {'status': PENDING, 'recipes': []}
+        # 다른 요청이 먼저 예약했으면 add()가 실패하므로 작업이 한 번만 예약됨
+        if cache.add(key, pending, timeout=self._timeout()):
+            self._queue.put(query)
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="recipe-suggestions", daemon=True)
+                    self._worker.start()
+        return cache.get(key) or pending
+
+    def join(self):
+        """예약된 제안 작업이 모두 끝날 때까지 대기"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            query = self._queue.get()
+            try:
+                with self.app.app_context():
+                    self.generate(query)
+            except Exception as e:
+                logger.error(f"AI 레시피 제안 작업 오류: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def generate(self, query: str) -> Dict[str, Any]:
+        """
+        제안 생성 후 캐시에 저장 (앱 컨텍스트 안에서 동기 실행)
+
+        Args:
+            query (str): 검색어
+
+        Returns:
+            Dict[str, Any]: 저장된 제안 결과
+        """
+        from services.recommendation import search_recipes
+
+        key = suggestion_key(query)
+        try:
+            result = {'status': DONE, 'recipes': search_recipes(query, limit=self.limit)}
+            cache.set(key, result, timeout=self._timeout())
+        except Exception as e:
+            logger.error(f"AI 레시피 제안 생성 오류: {str(e)}")
+            result = {'status': ERROR, 'recipes': []}
+            cache.set(key, result, timeout=ERROR_TIMEOUT)
+        return result
+
+
+# 애플리케이션 공용 작업자 (create_app에서 init_app 호출)
+recipe_suggestions = RecipeSuggestionQueue()
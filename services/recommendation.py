@@ -6,6 +6,8 @@ from flask import current_app
 from models.user import User
 from services.food_database import FoodDatabaseService
 from services.rag_service import RAGService
+from services.food_resolution import get_resolution_queue
+from services.recipe_engine import RecipeEngine
 import random
 
 # 로깅 설정
@@ -52,15 +54,17 @@ class RecommendationService:
         return recommended_meals
         
 
-    def __init__(self, food_db=None, rag_service=None):
+    def __init__(self, food_db=None, rag_service=None, recipe_engine=None):
         """
         추천 서비스 초기화
 
         Args:
             food_db (Optional[FoodDatabaseService]): 식품 데이터베이스 서비스
             rag_service (Optional[RAGService]): RAG 서비스
+            recipe_engine (Optional[RecipeEngine]): 로컬 레시피 엔진
         """
         self.food_db = food_db or FoodDatabaseService()
+        self.recipe_engine = recipe_engine or RecipeEngine(self.food_db)
 
         # 환경 변수에서 OpenAI API 키 가져오기
         openai_api_key = os.getenv('OPENAI_API_KEY')
@@ -69,6 +73,7 @@ class RecommendationService:
 
         # RAG 서비스 초기화 시 API 키 전달
         self.rag_service = rag_service or RAGService(openai_api_key=openai_api_key)
+        self.resolution_queue = get_resolution_queue(self.food_db, self.rag_service)
 
     def get_similar_foods(self, food_name: str, limit=5):
         logger.info(f"get_similar_foods 호출: food_name={food_name}, limit={limit}")
@@ -175,19 +180,13 @@ class RecommendationService:
                     "source": "database"
                 }
         else:
-            logger.warning("DB에 음식 정보가 존재하지 않음. RAG 기반 추천 시도")
-            rag_query = f"{food_name}과 유사한 음식 {limit}개 추천"
-            logger.info(f"RAG 쿼리: {rag_query}")
-            rag_result = self.rag_service.query_food_info(rag_query)
-            logger.info(f"RAG 결과: {rag_result}")
-            parsed_recommendations = self._parse_rag_recommendations(rag_result)
-            if not parsed_recommendations:
-                parsed_recommendations = [{"name": f"{food_name} 유사 음식 {i+1}", "reason": "dummy reason"} for i in range(limit)]
-                logger.info(f"더미 parsed_recommendations 생성: {parsed_recommendations}")
+            # DB에 없는 음식은 백그라운드 해석을 요청하고 즉시 반환 (해석 후 카탈로그 기반 추천)
+            status = self.resolution_queue.request(food_name)
+            logger.warning(f"DB에 음식 정보가 존재하지 않음. 백그라운드 해석 요청 (상태: {status})")
             return {
                 "reference_food": food_name,
-                "similar_foods": parsed_recommendations,
-                "source": "rag"
+                "similar_foods": [],
+                "source": status
             }
 
 
@@ -214,10 +213,19 @@ class RecommendationService:
         Returns:
             List[Dict[str, Any]]: 추천 레시피 목록
         """
+        local_recipes = []
         try:
             logger.info("레시피 추천/검색 시작")
 
-            # 검색어가 있는 경우 ingredients에 추가
+            # 보유 재료가 있으면 재료 역색인에서 먼저 찾고 부족한 수만 RAG로 채움
+            if ingredients:
+                local_recipes = self.recipe_engine.cook_with(ingredients, allergies=allergies, limit=limit)
+                if len(local_recipes) >= limit:
+                    logger.info(f"레시피 추천 완료 (로컬): {len(local_recipes)}개 레시피")
+                    return local_recipes
+
+            # 검색어가 있는 경우 ingredients에 추가 (기본 인자 목록이 호출 간에 공유되지 않도록 복사)
+            ingredients = list(ingredients or [])
             if query:
                 ingredients.append(query)
 
@@ -245,11 +253,11 @@ class RecommendationService:
             recommended_recipes = self._parse_recipes(rag_result)
 
             logger.info(f"레시피 추천/검색 완료: {len(recommended_recipes)}개 레시피 추천됨")
-            return recommended_recipes[:limit]
+            return local_recipes + recommended_recipes[:limit - len(local_recipes)]
 
         except Exception as e:
             logger.error(f"레시피 추천/검색 중 오류 발생: {str(e)}")
-            return []
+            return local_recipes
 
     def generate_meal_recommendations(self, user: Optional[User], allergies: List[str] = [], recent_foods: List[str] = []) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -569,38 +577,17 @@ def search_recipes(query: str, limit: int = 5) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: 검색된 레시피 목록
     """
-    # 환경 변수에서 OpenAI API 키 가져오기
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
+    from services import service_manager
+    return service_manager.recommendation.get_recipe_recommendations(query=query, limit=limit)
 
-    # RAG 서비스를 명시적으로 API 키와 함께 생성
-    rag_service = RAGService(openai_api_key=openai_api_key)
-    service = RecommendationService(rag_service=rag_service)
-    return service.get_recipe_recommendations(query=query, limit=limit)
 
-
-# 클래스 외부에 래퍼 함수 정의
+# 클래스 외부에 래퍼 함수 정의 (애플리케이션 범위 서비스 컨테이너의 인스턴스 사용)
 def generate_meal_recommendations(user=None, allergies=None, recent_foods=None):
     """RecommendationService.generate_meal_recommendations의 래퍼 함수"""
-    # 환경 변수에서 OpenAI API 키 가져오기
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-
-    # RAG 서비스를 명시적으로 API 키와 함께 생성
-    rag_service = RAGService(openai_api_key=openai_api_key)
-    service = RecommendationService(rag_service=rag_service)
-    return service.generate_meal_recommendations(user, allergies or [], recent_foods or [])
+    from services import service_manager
+    return service_manager.recommendation.generate_meal_recommendations(user, allergies or [], recent_foods or [])
 
 def generate_food_alternatives(food_name, health_goal="", allergies=None, limit=3):
     """RecommendationService.generate_food_alternatives의 래퍼 함수"""
-    # 환경 변수에서 OpenAI API 키 가져오기
-    openai_api_key = os.getenv('OPENAI_API_KEY')
-    if not openai_api_key:
-        raise ValueError("OPENAI_API_KEY 환경 변수가 설정되지 않았습니다.")
-
-    # RAG 서비스를 명시적으로 API 키와 함께 생성
-    rag_service = RAGService(openai_api_key=openai_api_key)
-    service = RecommendationService(rag_service=rag_service)
-    return service.generate_food_alternatives(food_name, health_goal, allergies or [], limit)
\ No newline at end of file
+    from services import service_manager
+    return service_manager.recommendation.generate_food_alternatives(food_name, health_goal, allergies or [], limit)
@@ -0,0 +1,403 @@
+"""
+통합 검색용 전문 검색(FTS5) 인덱스
+
+식사 설명, 음식 이름, 저장된 레시피를 SQLite FTS5 가상 테이블에 색인한다.
+한국어는 띄어쓰기 단위 토큰으로는 '김치찌개'에서 '찌개'를 찾을 수 없으므로
+단어를 글자 단위(grams1)와 두 글자 단위(grams2)로 나누어 색인하고,
+검색어는 두 글자 단위 구문(phrase)으로 찾는다. 구문은 연속된 토큰만 일치하므로 LIKE '%검색어%'와 같은 결과가 된다.
+
+식사/음식 인덱스는 owner 컬럼에 사용자 토큰(u{uid})을 두어 사용자별 문서 목록만 교차해 읽는다.
+색인은 식사/음식/레시피 변경이 커밋될 때 같은 트랜잭션에서 갱신된다 (nutrition_rollup과 같은 세션 이벤트 방식).
+FTS5를 사용할 수 없는 DB에서는 LIKE 검색으로 동작한다.
+"""
+import re
+import logging
+import unicodedata
+from typing import List, Dict, Any, Optional, Set, Iterable
+
+from sqlalchemy import event, select, delete, insert, text, table, column, or_
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from utils.session_events import bulk_statement_model
+from models.meal import Meal
+from models.food import Food
+from models.recipe import Recipe
+
+logger = logging.getLogger(__name__)
+
+# FTS5 가상 테이블 (rowid = 원본 테이블의 기본 키)
+meal_search = table('meal_search', column('rowid'), column('owner'), column('grams1'), column('grams2'))
+food_search = table('food_search', column('rowid'), column('owner'), column('grams1'), column('grams2'))
+recipe_search = table('recipe_search', column('rowid'), column('grams1'), column('grams2'))
+
+SEARCH_TABLES = ('meal_search', 'food_search', 'recipe_search')
+
+_CREATE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS meal_search USING fts5(owner, grams1, grams2, tokenize='unicode61')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS food_search USING fts5(owner, grams1, grams2, tokenize='unicode61')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipe_search USING fts5(grams1, grams2, tokenize='unicode61')"
+)
+
+# session.info에 변경된 행을 모아두는 키
+_STALE_MEALS = 'search_index_stale_meals'
+_STALE_FOODS = 'search_index_stale_foods'
+_STALE_RECIPES = 'search_index_stale_recipes'
+# 색인 갱신 중 여부 (갱신 문장은 일괄 실행 추적에서 제외)
+_REFRESHING = 'search_index_refreshing'
+
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+# 엔진별 FTS 테이블 존재 여부
+_available: Dict[str, bool] = {}
+
+
+def _words(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return _WORD_PATTERN.findall(unicodedata.normalize('NFC', value).lower())
+
+
+def search_terms(value: Optional[str]) -> Dict[str, str]:
+    """
+    색인할 문자열을 글자/두 글자 토큰으로 변환
+
+    Args:
+        value (Optional[str]): 원본 문자열
+
+    Returns:
+        Dict[str, str]: grams1(글자 토큰), grams2(두 글자 토큰, 단어 내 순서 유지)
+    """
+    grams1, grams2 = [], []
+    for word in _words(value):
+        grams1.extend(word)
+        if len(word) == 1:
+            grams2.append(word)
+        else:
+            grams2.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return {'grams1': ' '.join(grams1), 'grams2': ' '.join(grams2)}
+
+
+def match_expression(query: str, owner: Optional[int] = None) -> Optional[str]:
+    """
+    검색어를 FTS5 MATCH 식으로 변환 (단어마다 부분 문자열 일치, 모든 단어 포함)
+
+    Args:
+        query (str): 검색어
+        owner (Optional[int]): 사용자 ID (식사/음식 인덱스)
+
+    Returns:
+        Optional[str]: MATCH 식 (검색할 단어가 없으면 None)
+    """
+    clauses = []
+    for word in _words(query):
+        if len(word) == 1:
+            clauses.append(f'grams1:"{word}"')
+        else:
+            clauses.append('grams2:"%s"' % ' '.join(word[i:i + 2] for i in range(len(word) - 1)))
+    if not clauses:
+        return None
+    if owner is not None:
+        clauses.insert(0, f'owner:"u{int(owner)}"')
+    return ' AND '.join(clauses)
+
+
+def _owner(uid) -> str:
+    return f'u{int(uid)}'
+
+
+def _create_tables(target, connection, **kw):
+    if connection.dialect.name != 'sqlite':
+        return
+    for statement in _CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    _available.clear()
+
+
+def _drop_tables(target, connection, **kw):
+    if connection.dialect.name != 'sqlite':
+        return
+    for name in SEARCH_TABLES:
+        connection.exec_driver_sql(f'DROP TABLE IF EXISTS {name}')
+    _available.clear()
+
+
+def is_available() -> bool:
+    """현재 DB에 FTS 검색 인덱스가 있는지 여부 (없으면 LIKE 검색 사용)"""
+    engine = db.engine
+    key = str(engine.url)
+    if key not in _available:
+        if engine.dialect.name != 'sqlite':
+            _available[key] = False
+        else:
+            names = set(db.inspect(engine).get_table_names())
+            _available[key] = set(SEARCH_TABLES) <= names
+            if not _available[key]:
+                logger.warning("검색 인덱스 테이블이 없어 LIKE 검색을 사용합니다. "
+                               "마이그레이션 후 scripts/rebuild_search_index.py를 실행하세요.")
+    return _available[key]
+
+
+def _stale(session: Session, key: str) -> Set[int]:
+    return session.info.setdefault(key, set())
+
+
+def _clear_stale(session: Session):
+    for key in (_STALE_MEALS, _STALE_FOODS, _STALE_RECIPES):
+        session.info.pop(key, None)
+
+
+def _after_flush(session: Session, flush_context):
+    # flush 후에는 새 행의 기본 키가 채워져 있음
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Meal) and obj.mid is not None:
+            _stale(session, _STALE_MEALS).add(obj.mid)
+        elif isinstance(obj, Food) and obj.fid is not None:
+            _stale(session, _STALE_FOODS).add(obj.fid)
+        elif isinstance(obj, Recipe) and obj.id is not None:
+            _stale(session, _STALE_RECIPES).add(obj.id)
+
+
+def _do_orm_execute(orm_execute_state):
+    """Query.delete()/update() 같은 일괄 실행은 flush 이벤트를 거치지 않으므로 대상 행을 미리 조회"""
+    session = orm_execute_state.session
+    # 색인 갱신 중 실행하는 FTS 테이블 문장은 추적 대상이 아님
+    if session.info.get(_REFRESHING):
+        return
+
+    targets = {Meal: (Meal.mid, _STALE_MEALS), Food: (Food.fid, _STALE_FOODS), Recipe: (Recipe.id, _STALE_RECIPES)}
+    model = bulk_statement_model(orm_execute_state, targets)
+    if model is None:
+        return
+
+    # 조건은 대상 테이블(식사/음식/레시피)의 것이므로 같은 테이블의 기본 키 조회에 그대로 사용
+    key_column, stale_key = targets[model]
+    query = select(key_column).select_from(model)
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        query = query.where(whereclause)
+
+    with session.no_autoflush:
+        _stale(session, stale_key).update(session.execute(query).scalars())
+
+
+def _before_commit(session: Session):
+    if session.new or session.dirty or session.deleted:
+        # 남은 변경 사항을 먼저 반영해 after_flush에서 대상을 수집
+        session.flush()
+
+    mids = session.info.get(_STALE_MEALS)
+    fids = session.info.get(_STALE_FOODS)
+    recipe_ids = session.info.get(_STALE_RECIPES)
+    if not (mids or fids or recipe_ids) or not is_available():
+        _clear_stale(session)
+        return
+
+    session.info[_REFRESHING] = True
+    try:
+        if mids or fids:
+            refresh_meals(session, mids or ())
+            refresh_foods(session, fids or (), mids or ())
+        if recipe_ids:
+            refresh_recipes(session, recipe_ids)
+    finally:
+        session.info.pop(_REFRESHING, None)
+        # 갱신이 끝난 뒤 비워야 갱신 중 수집된 값이 다음 커밋으로 넘어가지 않음
+        _clear_stale(session)
+
+
+def _after_rollback(session: Session, previous_transaction):
+    _clear_stale(session)
+
+
+def init_app(app):
+    """
+    검색 인덱스 테이블 생성(db.create_all 시)과 세션 이벤트 등록
+
+    Args:
+        app: Flask 애플리케이션
+    """
+    for target, name, listener in (
+        (db.metadata, 'after_create', _create_tables),
+        (db.metadata, 'before_drop', _drop_tables),
+        (db.session, 'after_flush', _after_flush),
+        (db.session, 'do_orm_execute', _do_orm_execute),
+        (db.session, 'before_commit', _before_commit),
+        (db.session, 'after_soft_rollback', _after_rollback)
+    ):
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+
+
+def _chunks(values: List[int], size: int = 500) -> Iterable[List[int]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def refresh_meals(session: Session, mids: Iterable[int]):
+    """지정한 식사의 색인 다시 생성 (삭제된 식사는 색인에서 제거)"""
+    for chunk in _chunks(list(mids)):
+        session.execute(delete(meal_search).where(meal_search.c.rowid.in_(chunk)))
+        rows = session.execute(select(Meal.mid, Meal.uid, Meal.content).where(Meal.mid.in_(chunk))).all()
+        if rows:
+            session.execute(insert(meal_search), [
+                {'rowid': row.mid, 'owner': _owner(row.uid), **search_terms(row.content)} for row in rows
+            ])
+
+
+def refresh_foods(session: Session, fids: Iterable[int], mids: Iterable[int] = ()):
+    """지정한 음식(및 지정한 식사의 모든 음식)의 색인 다시 생성"""
+    fids, mids = list(fids), list(mids)
+    for chunk in _chunks(fids):
+        session.execute(delete(food_search).where(food_search.c.rowid.in_(chunk)))
+    for chunk in _chunks(mids):
+        # 식사의 사용자가 바뀐 경우 음식 색인의 owner도 바뀌어야 함
+        session.execute(delete(food_search).where(
+            food_search.c.rowid.in_(select(Food.fid).where(Food.mid.in_(chunk)))
+        ))
+
+    criteria = []
+    for chunk in _chunks(fids):
+        criteria.append(Food.fid.in_(chunk))
+    for chunk in _chunks(mids):
+        criteria.append(Food.mid.in_(chunk))
+    if not criteria:
+        return
+
+    rows = session.execute(
+        select(Food.fid, Meal.uid, Food.food_name).join(Meal, Meal.mid == Food.mid).where(or_(*criteria))
+    ).all()
+    if rows:
+        session.execute(insert(food_search), [
+            {'rowid': row.fid, 'owner': _owner(row.uid), **search_terms(row.food_name)} for row in rows
+        ])
+
+
+def refresh_recipes(session: Session, recipe_ids: Iterable[int]):
+    """지정한 레시피의 색인 다시 생성 (제목과 재료)"""
+    for chunk in _chunks(list(recipe_ids)):
+        session.execute(delete(recipe_search).where(recipe_search.c.rowid.in_(chunk)))
+        rows = session.execute(
+            select(Recipe.id, Recipe.title, Recipe.ingredients).where(Recipe.id.in_(chunk))
+        ).all()
+        if rows:
+            session.execute(insert(recipe_search), [
+                {'rowid': row.id, **search_terms(f'{row.title} {row.ingredients}')} for row in rows
+            ])
+
+
+def rebuild_search_index(batch_size: int = 1000) -> Dict[str, int]:
+    """
+    검색 인덱스 전체 재구축
+
+    Args:
+        batch_size (int): 한 번에 색인할 행 수
+
+    Returns:
+        Dict[str, int]: 테이블별 색인된 행 수
+    """
+    if not is_available():
+        raise RuntimeError('검색 인덱스 테이블이 없습니다. 마이그레이션을 먼저 실행하세요.')
+
+    counts = {}
+    try:
+        for search_table, key_column, refresh in (
+            (meal_search, Meal.mid, refresh_meals),
+            (food_search, Food.fid, refresh_foods),
+            (recipe_search, Recipe.id, refresh_recipes)
+        ):
+            db.session.execute(delete(search_table))
+            ids = db.session.execute(select(key_column).order_by(key_column)).scalars().all()
+            for start in range(0, len(ids), batch_size):
+                refresh(db.session, ids[start:start + batch_size])
+            counts[search_table.name] = len(ids)
+        db.session.commit()
+
+        logger.info(f"검색 인덱스 재구축 완료: {counts}")
+        return counts
+
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"검색 인덱스 재구축 오류: {str(e)}")
+        raise
+
+
+def _like(value: str) -> str:
+    escaped = value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+def search_meals(uid: int, query: str, columns: List[Any], limit: int = 5) -> List[Any]:
+    """
+    사용자의 식사 설명 검색 (최근 날짜 순)
+
+    Args:
+        uid (int): 사용자 ID
+        query (str): 검색어
+        columns (List[Any]): 조회할 컬럼 (예: meal_row_columns())
+        limit (int): 최대 개수
+
+    Returns:
+        List[Any]: 식사 행 목록
+    """
+    statement = db.session.query(*columns).filter(Meal.uid == uid)
+    if is_available():
+        expression = match_expression(query, owner=uid)
+        if expression is None:
+            return []
+        matched = select(meal_search.c.rowid).where(text('meal_search MATCH :expression'))
+        statement = statement.filter(Meal.mid.in_(matched)).params(expression=expression)
+    else:
+        statement = statement.filter(Meal.content.like(_like(query), escape='\\'))
+    return statement.order_by(Meal.date.desc(), Meal.mid.desc()).limit(limit).all()
+
+
+def search_foods(uid: int, query: str, limit: int = 5) -> List[Any]:
+    """
+    사용자가 기록한 음식 이름 검색 (최근 기록 순)
+
+    Args:
+        uid (int): 사용자 ID
+        query (str): 검색어
+        limit (int): 최대 개수
+
+    Returns:
+        List[Any]: (fid, food_name, mid) 행 목록
+    """
+    statement = db.session.query(Food.fid, Food.food_name, Food.mid) \
+        .join(Meal, Meal.mid == Food.mid) \
+        .filter(Meal.uid == uid)
+    if is_available():
+        expression = match_expression(query, owner=uid)
+        if expression is None:
+            return []
+        matched = select(food_search.c.rowid).where(text('food_search MATCH :expression'))
+        statement = statement.filter(Food.fid.in_(matched)).params(expression=expression)
+    else:
+        statement = statement.filter(Food.food_name.like(_like(query), escape='\\'))
+    return statement.order_by(Food.fid.desc()).limit(limit).all()
+
+
+def search_recipes(query: str, limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    저장된 레시피 검색 (제목/재료, 최근 저장 순)
+
+    Args:
+        query (str): 검색어
+        limit (int): 최대 개수
+
+    Returns:
+        List[Dict[str, Any]]: 레시피 목록
+    """
+    statement = db.session.query(Recipe)
+    if is_available():
+        expression = match_expression(query)
+        if expression is None:
+            return []
+        matched = select(recipe_search.c.rowid).where(text('recipe_search MATCH :expression'))
+        statement = statement.filter(Recipe.id.in_(matched)).params(expression=expression)
+    else:
+        pattern = _like(query)
+        statement = statement.filter(or_(Recipe.title.like(pattern, escape='\\'),
+                                         Recipe.ingredients.like(pattern, escape='\\')))
+    return [recipe.to_dict() for recipe in statement.order_by(Recipe.id.desc()).limit(limit).all()]
@@ -0,0 +1,222 @@
+import uuid
+import logging
+from functools import wraps
+from typing import Iterable, Dict, Any, Optional, Callable, Set
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db, cache
+from models.user import User
+from models.allergy import Allergy
+from models.recommendation import Recommendation
+from models.insight_snapshot import InsightSnapshot
+from utils.session_events import bulk_statement_model
+
+logger = logging.getLogger(__name__)
+
+# 변경 시 사용자 캐시 버전을 올리는 모델 (식사/음식은 일일 합계 갱신 시 nutrition_rollup이 알림)
+TRACKED_MODELS = (User, Allergy, Recommendation, InsightSnapshot)
+
+# session.info에 변경된 사용자를 모아두는 키
+_CHANGED_UIDS = 'user_cache_changed_uids'
+
+# 캐시 항목 키 형식
+_VERSION_KEY = 'user_cache_version_{uid}'
+_STATS_KEY = 'user_cache_stats_{endpoint}_{result}'
+
+# cached_user_view로 등록된 엔드포인트 (적중률 조회용)
+_ENDPOINTS: Set[str] = set()
+
+
+def get_version(uid) -> str:
+    """
+    사용자 캐시 버전 조회 (없으면 새로 생성)
+
+    버전은 증가하는 숫자가 아닌 임의 토큰이므로 버전 키가 캐시에서 밀려나도
+    이전 버전의 캐시 항목이 다시 사용되지 않는다.
+
+    Args:
+        uid: 사용자 ID
+
+    Returns:
+        str: 캐시 버전
+    """
+    key = _VERSION_KEY.format(uid=uid)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex[:12], timeout=0)
+        version = cache.get(key)
+    return version
+
+
+def bump_versions(uids: Iterable[Any]):
+    """
+    사용자 캐시 버전 갱신 (이전 버전으로 저장된 캐시 항목은 더 이상 조회되지 않고 만료됨)
+
+    Args:
+        uids (Iterable[Any]): 사용자 ID 목록
+    """
+    for uid in uids:
+        try:
+            cache.set(_VERSION_KEY.format(uid=uid), uuid.uuid4().hex[:12], timeout=0)
+        except Exception as e:
+            logger.error(f"사용자 캐시 버전 갱신 오류 (uid={uid}): {str(e)}")
+
+
+def mark_changed(session: Session, uids: Iterable[Any]):
+    """
+    커밋 후 캐시 버전을 올릴 사용자 기록 (롤백되면 취소)
+
+    Args:
+        session (Session): 현재 세션
+        uids (Iterable[Any]): 사용자 ID 목록
+    """
+    changed = session.info.setdefault(_CHANGED_UIDS, set())
+    changed.update(int(uid) for uid in uids if uid is not None)
+
+
+def _history_uids(obj) -> Set[Any]:
+    history = db.inspect(obj).attrs['uid'].history
+    return set(history.added or ()) | set(history.deleted or ()) | {obj.uid}
+
+
+def _before_flush(session: Session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, TRACKED_MODELS):
+            continue
+        mark_changed(session, _history_uids(obj))
+
+
+def _do_orm_execute(orm_execute_state):
+    """Query.delete()/update() 같은 일괄 실행은 flush 이벤트를 거치지 않으므로 대상 사용자를 미리 조회"""
+    model = bulk_statement_model(orm_execute_state, TRACKED_MODELS)
+    if model is None:
+        return
+
+    # 조건은 대상 테이블의 것이므로 같은 테이블의 사용자 ID 조회에 그대로 사용
+    query = select(model.uid).distinct().select_from(model)
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        query = query.where(whereclause)
+
+    session = orm_execute_state.session
+    with session.no_autoflush:
+        mark_changed(session, session.execute(query).scalars())
+
+
+def _after_commit(session: Session):
+    # 커밋 전에 버전을 올리면 그 사이 요청이 이전 데이터를 새 버전으로 저장할 수 있으므로 커밋 후 갱신
+    uids = session.info.pop(_CHANGED_UIDS, None)
+    if uids:
+        bump_versions(uids)
+
+
+def _after_rollback(session: Session, previous_transaction):
+    session.info.pop(_CHANGED_UIDS, None)
+
+
+def init_app(app):
+    """
+    세션 이벤트 등록 (사용자 데이터 변경이 커밋되면 해당 사용자의 캐시 버전 갱신)
+
+    Args:
+        app: Flask 애플리케이션
+    """
+    for name, listener in (
+        ('before_flush', _before_flush),
+        ('do_orm_execute', _do_orm_execute),
+        ('after_commit', _after_commit),
+        ('after_soft_rollback', _after_rollback)
+    ):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+
+
+def user_cache_key(name: str, uid, *parts) -> str:
+    """
+    사용자 캐시 버전이 포함된 캐시 키
+
+    Args:
+        name (str): 캐시 이름 (예: 'dashboard')
+        uid: 사용자 ID
+        *parts: 추가 구분 값 (예: 날짜)
+
+    Returns:
+        str: 캐시 키
+    """
+    return '_'.join([name, str(uid), get_version(uid)] + [str(part) for part in parts])
+
+
+def record_lookup(endpoint: str, hit: bool):
+    """엔드포인트별 캐시 적중/미스 횟수 기록 (여러 작업 프로세스가 공유하도록 캐시에 저장)"""
+    try:
+        cache.cache.inc(_STATS_KEY.format(endpoint=endpoint, result='hits' if hit else 'misses'))
+    except Exception as e:
+        logger.error(f"캐시 통계 기록 오류: {str(e)}")
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    엔드포인트별 캐시 적중률
+
+    Returns:
+        Dict[str, Dict[str, Any]]: 엔드포인트 → hits, misses, hit_rate
+    """
+    stats = {}
+    for endpoint in sorted(_ENDPOINTS):
+        hits = cache.get(_STATS_KEY.format(endpoint=endpoint, result='hits')) or 0
+        misses = cache.get(_STATS_KEY.format(endpoint=endpoint, result='misses')) or 0
+        total = hits + misses
+        stats[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else None
+        }
+    return stats
+
+
+def cached_user_view(endpoint: str, key_parts: Optional[Callable[[], Iterable[Any]]] = None,
+                     timeout: Optional[int] = None):
+    """
+    사용자별 화면 캐시 데코레이터 (jwt_required 아래에 사용)
+
+    캐시 키에 사용자 캐시 버전이 포함되므로 식사/음식/알레르기/프로필 변경이 커밋되면
+    이전 응답은 더 이상 조회되지 않는다. 성공 응답만 저장한다.
+
+    Args:
+        endpoint (str): 캐시 이름 (키 접두사 및 적중률 통계 이름)
+        key_parts (Optional[Callable]): 요청별 추가 키 값을 반환하는 함수 (예: 조회 날짜)
+        timeout (Optional[int]): 만료 시간(초) (기본: USER_VIEW_CACHE_TIMEOUT 설정)
+    """
+    _ENDPOINTS.add(endpoint)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                parts = key_parts() if key_parts else ()
+                key = user_cache_key(endpoint, get_jwt_identity(), *parts)
+                response = cache.get(key)
+            except Exception as e:
+                logger.error(f"캐시 조회 오류 ({endpoint}): {str(e)}")
+                return view(*args, **kwargs)
+
+            if response is not None:
+                record_lookup(endpoint, True)
+                return response
+
+            record_lookup(endpoint, False)
+            response = view(*args, **kwargs)
+
+            status_code = response[1] if isinstance(response, tuple) else getattr(response, 'status_code', 200)
+            if status_code < 400:
+                try:
+                    cache.set(key, response, timeout=timeout or current_app.config.get('USER_VIEW_CACHE_TIMEOUT'))
+                except Exception as e:
+                    logger.error(f"캐시 저장 오류 ({endpoint}): {str(e)}")
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,323 @@
+import os
+import json
+import uuid
+import sqlite3
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
+from langchain.docstore.document import Document
+
+logger = logging.getLogger(__name__)
+
+VECTOR_FILE = "vectors.npy"
+METADATA_FILE = "vectors_meta.sqlite3"
+CHROMA_FILE = "chroma.sqlite3"
+
+# 같은 디렉토리를 여는 저장소는 프로세스 내에서 하나의 인스턴스를 공유
+_open_stores: Dict[str, "NumpyVectorStore"] = {}
+_open_stores_lock = threading.Lock()
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    NumPy 기반 인프로세스 벡터 저장소
+
+    정규화된 임베딩 행렬을 단일 .npy 파일에 저장하고 메모리 맵으로 열며,
+    문서 내용과 메타데이터는 SQLite 사이드 테이블에 행 번호로 저장한다.
+    검색은 전체 행렬과의 내적(코사인 유사도)으로 수행한다.
+    """
+
+    def __init__(self, persist_directory: str, embedding_function: Embeddings):
+        """
+        Args:
+            persist_directory (str): 저장 디렉토리
+            embedding_function (Embeddings): 임베딩 모델
+        """
+        self.persist_directory = persist_directory
+        self.embedding_function = embedding_function
+        self.vector_path = os.path.join(persist_directory, VECTOR_FILE)
+        self.metadata_path = os.path.join(persist_directory, METADATA_FILE)
+        self._lock = threading.Lock()
+
+        os.makedirs(persist_directory, exist_ok=True)
+        self._init_metadata_table()
+        self._vectors = self._load_vectors()
+
+    @property
+    def embeddings(self) -> Embeddings:
+        return self.embedding_function
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.metadata_path)
+
+    def _init_metadata_table(self):
+        """메타데이터 사이드 테이블 생성"""
+        conn = self._connect()
+        try:
+            conn.execute('''
+            CREATE TABLE IF NOT EXISTS vectors (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                content TEXT NOT NULL,
+                metadata TEXT
+            )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _load_vectors(self) -> Optional[np.ndarray]:
+        """임베딩 행렬을 메모리 맵으로 로드"""
+        if not os.path.exists(self.vector_path):
+            return None
+        return np.load(self.vector_path, mmap_mode="r")
+
+    def __len__(self) -> int:
+        return 0 if self._vectors is None else self._vectors.shape[0]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def add_embeddings(
+            self,
+            texts: List[str],
+            embeddings: List[List[float]],
+            metadatas: Optional[List[dict]] = None,
+            ids: Optional[List[str]] = None
+    ) -> List[str]:
+        """
+        계산된 임베딩을 그대로 추가 (마이그레이션용)
+
+        Args:
+            texts (List[str]): 문서 내용
+            embeddings (List[List[float]]): 임베딩 벡터
+            metadatas (Optional[List[dict]]): 메타데이터
+            ids (Optional[List[str]]): 문서 ID
+
+        Returns:
+            List[str]: 추가된 문서 ID
+        """
+        if not texts:
+            return []
+
+        metadatas = metadatas or [{} for _ in texts]
+        ids = ids or [str(uuid.uuid4()) for _ in texts]
+        new_vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            start_row = len(self)
+            if self._vectors is not None and self._vectors.shape[1] != new_vectors.shape[1]:
+                raise ValueError("임베딩 차원이 기존 벡터 저장소와 다릅니다.")
+
+            combined = new_vectors if self._vectors is None else np.concatenate([self._vectors, new_vectors])
+
+            # 메타데이터 먼저 기록 후 벡터 파일을 원자적으로 교체
+            conn = self._connect()
+            try:
+                conn.executemany(
+                    "INSERT INTO vectors (row, id, content, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (start_row + i, doc_id, text, json.dumps(metadata, ensure_ascii=False))
+                        for i, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas))
+                    ]
+                )
+                tmp_path = f"{self.vector_path}.tmp.npy"
+                np.save(tmp_path, combined)
+                os.replace(tmp_path, self.vector_path)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+
+            self._vectors = self._load_vectors()
+
+        return ids
+
+    def add_texts(
+            self,
+            texts: Iterable[str],
+            metadatas: Optional[List[dict]] = None,
+            *,
+            ids: Optional[List[str]] = None,
+            **kwargs: Any
+    ) -> List[str]:
+        """텍스트 임베딩 후 추가"""
+        texts = list(texts)
+        if not texts:
+            return []
+        embeddings = self.embedding_function.embed_documents(texts)
+        return self.add_embeddings(texts, embeddings, metadatas, ids)
+
+    def _fetch_rows(self, rows: List[int]) -> Dict[int, Tuple[str, str, Optional[str]]]:
+        conn = self._connect()
+        try:
+            placeholders = ",".join("?" for _ in rows)
+            cursor = conn.execute(
+                f"SELECT row, id, content, metadata FROM vectors WHERE row IN ({placeholders})",
+                rows
+            )
+            return {row: (doc_id, content, metadata) for row, doc_id, content, metadata in cursor.fetchall()}
+        finally:
+            conn.close()
+
+    def similarity_search_by_vector_with_score(self, embedding: List[float], k: int = 4) -> List[Tuple[Document, float]]:
+        """
+        임베딩 벡터로 유사 문서 검색
+
+        Args:
+            embedding (List[float]): 질의 임베딩
+            k (int): 반환할 문서 수
+
+        Returns:
+            List[Tuple[Document, float]]: (문서, 코사인 유사도) 목록
+        """
+        vectors = self._vectors
+        if vectors is None or len(vectors) == 0:
+            return []
+
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        scores = vectors @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        rows = self._fetch_rows([int(row) for row in top])
+        results = []
+        for row in top:
+            record = rows.get(int(row))
+            if record is None:
+                continue
+            doc_id, content, metadata = record
+            results.append((
+                Document(page_content=content, metadata=json.loads(metadata) if metadata else {}, id=doc_id),
+                float(scores[row])
+            ))
+        return results
+
+    def similarity_search_with_score(self, query: str, k: int = 4, **kwargs: Any) -> List[Tuple[Document, float]]:
+        return self.similarity_search_by_vector_with_score(self.embedding_function.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def similarity_search_by_vector(self, embedding: List[float], k: int = 4, **kwargs: Any) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_by_vector_with_score(embedding, k)]
+
+    def _select_relevance_score_fn(self):
+        # 코사인 유사도 [-1, 1] → [0, 1]
+        return lambda score: (score + 1.0) / 2.0
+
+    def get(self, include: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        저장된 문서 조회 (Chroma.get 호환)
+
+        Args:
+            include (Optional[List[str]]): 포함할 항목 (documents, metadatas)
+
+        Returns:
+            Dict[str, Any]: ids, documents, metadatas
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute("SELECT id, content, metadata FROM vectors ORDER BY row").fetchall()
+        finally:
+            conn.close()
+
+        include = include or ["documents", "metadatas"]
+        result: Dict[str, Any] = {"ids": [row[0] for row in rows]}
+        if "documents" in include:
+            result["documents"] = [row[1] for row in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [json.loads(row[2]) if row[2] else {} for row in rows]
+        return result
+
+    def persist(self):
+        """추가 시점에 이미 디스크에 기록되므로 별도 작업 없음 (Chroma 호환)"""
+        return None
+
+    @classmethod
+    def from_texts(
+            cls,
+            texts: List[str],
+            embedding: Embeddings,
+            metadatas: Optional[List[dict]] = None,
+            *,
+            ids: Optional[List[str]] = None,
+            persist_directory: str = "database/vector_db",
+            **kwargs: Any
+    ) -> "NumpyVectorStore":
+        store = cls(persist_directory=persist_directory, embedding_function=embedding)
+        store.add_texts(texts, metadatas, ids=ids)
+        return store
+
+
+def _migrate_from_chroma(store: NumpyVectorStore, persist_directory: str, embedding_function: Embeddings):
+    """기존 Chroma 색인의 임베딩을 NumPy 저장소로 복사 (재임베딩 없음)"""
+    try:
+        from langchain_chroma import Chroma
+
+        chroma = Chroma(persist_directory=persist_directory, embedding_function=embedding_function)
+        data = chroma.get(include=["documents", "metadatas", "embeddings"])
+        documents = data.get("documents") or []
+        if len(documents) == 0:
+            return
+
+        store.add_embeddings(
+            texts=list(documents),
+            embeddings=[list(vector) for vector in data["embeddings"]],
+            metadatas=[metadata or {} for metadata in data.get("metadatas") or [{} for _ in documents]],
+            ids=list(data["ids"])
+        )
+        logger.info(f"Chroma 색인에서 {len(documents)}개 벡터 마이그레이션 완료")
+    except Exception as e:
+        logger.error(f"Chroma 색인 마이그레이션 오류: {str(e)}")
+
+
+def create_vector_store(
+        persist_directory: str,
+        embedding_function: Embeddings,
+        backend: Optional[str] = None
+):
+    """
+    설정된 백엔드로 벡터 저장소 생성
+
+    Args:
+        persist_directory (str): 저장 디렉토리
+        embedding_function (Embeddings): 임베딩 모델
+        backend (Optional[str]): 'numpy' 또는 'chroma' (기본값: VECTOR_STORE_BACKEND 환경 변수, 없으면 'numpy')
+
+    Returns:
+        VectorStore: 벡터 저장소
+    """
+    backend = (backend or os.getenv("VECTOR_STORE_BACKEND", "numpy")).lower()
+
+    if backend == "chroma":
+        from langchain_chroma import Chroma
+        return Chroma(persist_directory=persist_directory, embedding_function=embedding_function)
+
+    if backend != "numpy":
+        raise ValueError(f"지원하지 않는 벡터 저장소 백엔드입니다: {backend}")
+
+    key = os.path.abspath(persist_directory)
+    with _open_stores_lock:
+        store = _open_stores.get(key)
+        if store is None:
+            is_new = not os.path.exists(os.path.join(persist_directory, VECTOR_FILE))
+            store = NumpyVectorStore(persist_directory=persist_directory, embedding_function=embedding_function)
+            if is_new and os.path.exists(os.path.join(persist_directory, CHROMA_FILE)):
+                _migrate_from_chroma(store, persist_directory, embedding_function)
+            _open_stores[key] = store
+        return store
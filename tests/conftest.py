@@ -0,0 +1,92 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+class FakeNutritionAnalysis:
+    """인사이트 생성 시 RAG/DB를 사용하지 않는 영양 분석 서비스 대역"""
+
+    def get_nutrition_insights(self, nutrition_data, user=None, is_average=False):
+        return []
+
+
+class FakeRecommendation:
+    """레시피 검색 시 RAG를 사용하지 않는 추천 서비스 대역"""
+
+    def search_recipes(self, query, limit=5):
+        return []
+
+
+@pytest.fixture
+def app(monkeypatch, tmp_path):
+    """임시 SQLite DB를 사용하는 테스트 애플리케이션"""
+    from app import create_app
+    from app.config import TestingConfig
+    from app.extensions import db
+    from services import service_manager
+
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app('testing')
+    service_manager._services['nutrition_analysis'] = FakeNutritionAnalysis()
+    service_manager._services['recommendation'] = FakeRecommendation()
+
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+    service_manager.reset()
+
+
+@pytest.fixture
+def uid(app):
+    """테스트 사용자 ID"""
+    from app.extensions import db
+    from models.user import User
+
+    user = User(email='query@test.com', password='password', name='테스트')
+    db.session.add(user)
+    db.session.commit()
+    return user.uid
+
+
+@pytest.fixture
+def client(app, uid):
+    """테스트 사용자로 인증된 테스트 클라이언트"""
+    from flask_jwt_extended import create_access_token
+
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = 'Bearer ' + create_access_token(identity=str(uid))
+    return client
+
+
+@pytest.fixture
+def count_statements(app):
+    """
+    블록 안에서 실행된 SQL 문을 수집하는 컨텍스트 매니저
+
+    JWT 검증 시 사용자 조회(user_lookup_loader) 1회가 요청마다 항상 포함된다.
+    """
+    from app.extensions import db
+
+    @contextmanager
+    def counter():
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+    return counter
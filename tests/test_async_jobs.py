@@ -0,0 +1,148 @@
+import threading
+
+import pytest
+
+from app.extensions import db
+from models.chatbot import Chatbot
+from services import service_manager
+from services.async_jobs import job_queue, JobError, JobQueueFull, DONE, ERROR
+from services.audit_queue import audit_writer
+from tests.test_chatbot_pipeline import build_chatbot, REPLY
+
+
+@pytest.fixture
+def jobs(app):
+    """테스트 후 남은 작업을 모두 끝내는 공용 작업 큐"""
+    yield job_queue
+    assert job_queue.join(timeout=10)
+
+
+class BlockingTask:
+    """release() 전까지 끝나지 않는 작업 함수 (동시 실행 수 기록)"""
+
+    def __init__(self):
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.started = threading.Semaphore(0)
+        self._release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, value):
+        with self._lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        self.started.release()
+        self._release.wait(10)
+        with self._lock:
+            self.running -= 1
+        return {'value': value}
+
+    def release(self):
+        self._release.set()
+
+
+class TestJobQueue:
+    """제한된 작업자 수로 실행하고 실행 중인 같은 요청은 한 번만 실행"""
+
+    def test_deduplicates_inflight(self, jobs, uid):
+        task = BlockingTask()
+        first = jobs.submit('test', uid, task, 'a')
+        assert task.started.acquire(timeout=5)
+        second = jobs.submit('test', uid, task, 'a')
+        other = jobs.submit('test', uid, task, 'b')
+
+        assert second['job_id'] == first['job_id'] and other['job_id'] != first['job_id']
+
+        task.release()
+        result = jobs.wait(first['job_id'], uid, 5)
+        assert result['status'] == DONE and result['result'] == {'value': 'a'}
+        assert task.calls == 2
+
+        # 끝난 작업은 재사용하지 않음
+        assert jobs.wait(other['job_id'], uid, 5)['status'] == DONE
+        again = jobs.submit('test', uid, task, 'a')
+        assert again['job_id'] != first['job_id']
+
+    def test_bounded_pool(self, jobs, uid, monkeypatch):
+        monkeypatch.setattr(jobs, 'max_pending', 3)
+        monkeypatch.setattr(jobs, 'max_workers', 1)
+        jobs.shutdown()
+
+        task = BlockingTask()
+        submitted = [jobs.submit('test', uid, task, i) for i in range(3)]
+        with pytest.raises(JobQueueFull):
+            jobs.submit('test', uid, task, 3)
+
+        task.release()
+        assert all(jobs.wait(job['job_id'], uid, 5)['status'] == DONE for job in submitted)
+        assert task.max_running == 1
+        jobs.shutdown()
+
+    def test_errors_and_ownership(self, jobs, uid):
+        def not_found():
+            raise JobError('사용자 정보를 찾을 수 없습니다.', 404)
+
+        def broken():
+            raise RuntimeError('LLM 오류')
+
+        first = jobs.submit('test', uid, not_found)
+        second = jobs.submit('test', uid, broken)
+
+        result = jobs.wait(first['job_id'], uid, 5)
+        assert (result['status'], result['status_code'], result['error']) == (ERROR, 404, '사용자 정보를 찾을 수 없습니다.')
+        result = jobs.wait(second['job_id'], uid, 5)
+        assert (result['status'], result['status_code']) == (ERROR, 500)
+
+        assert jobs.get(first['job_id'], uid + 1) is None
+        assert jobs.get('unknown', uid) is None
+
+
+class TestAsyncEndpoints:
+    def test_research_long_poll(self, client, jobs, monkeypatch):
+        """async 요청은 작업 ID를 바로 반환하고 상태 API로 결과를 기다림"""
+        task = BlockingTask()
+        monkeypatch.setattr('app.routers.nutrition.get_nutritional_research', task)
+
+        response = client.get('/api/nutrition/research?query=단백질&async=true')
+        body = response.get_json()['data']
+        assert response.status_code == 202
+        assert response.headers['Location'] == body['status_url'] == f"/api/jobs/{body['job_id']}"
+
+        pending = client.get(body['status_url'])
+        assert pending.status_code == 202
+        assert pending.get_json()['data']['status'] in ('pending', 'running')
+
+        task.release()
+        done = client.get(body['status_url'] + '?wait=5')
+        data = done.get_json()['data']
+        assert done.status_code == 200 and 'uid' not in data
+        assert data['status'] == DONE
+        assert data['result'] == {'query': '단백질', 'results': {'value': '단백질'}}
+
+    def test_sync_unchanged(self, client, monkeypatch):
+        monkeypatch.setattr('app.routers.nutrition.get_nutritional_research', lambda query: ['연구'])
+
+        response = client.get('/api/nutrition/research?query=단백질')
+        assert response.status_code == 200
+        assert response.get_json()['data'] == {'query': '단백질', 'results': ['연구']}
+
+    def test_async_chat(self, client, uid, jobs):
+        chatbot = build_chatbot()
+        service_manager._services['nutrition_chatbot'] = chatbot
+
+        response = client.post('/api/chatbot/api/chat', json={'message': '저녁 메뉴 추천해줘', 'async': True})
+        assert response.status_code == 202
+
+        job_id = response.get_json()['data']['job_id']
+        data = client.get(f'/api/jobs/{job_id}?wait=5').get_json()['data']
+        assert data['status'] == DONE
+        assert data['result']['response'] == REPLY['response']
+        assert chatbot.llm.calls == 1
+
+        audit_writer.join()
+        assert db.session.query(Chatbot).filter_by(uid=uid).one().response == REPLY['response']
+
+    def test_unknown_job(self, client):
+        assert client.get('/api/jobs/unknown?wait=0.1').status_code == 404
@@ -0,0 +1,120 @@
+import time
+
+import pytest
+
+from app.extensions import db
+from models.chatbot import Chatbot
+from models.recommendation import Recommendation
+from services import audit_queue, user_cache
+from services.audit_queue import audit_writer
+
+
+@pytest.fixture
+def writer(app, monkeypatch):
+    """짧은 간격으로 저장하는 공용 작업자 (테스트 후 남은 기록 저장)"""
+    monkeypatch.setattr(audit_writer, 'flush_interval', 0.05)
+    monkeypatch.setattr(audit_writer, 'batch_size', 100)
+    yield audit_writer
+    audit_writer.join()
+
+
+def inserts(statements, table):
+    return [statement for statement in statements if statement.startswith(f'INSERT INTO {table}')]
+
+
+class TestAuditWriter:
+    """요청 스레드 대신 백그라운드에서 모아서 저장하는지 확인"""
+
+    def test_batched_insert(self, writer, uid, count_statements):
+        """여러 기록이 모델별 한 번의 INSERT로 저장됨"""
+        with count_statements() as statements:
+            writer.enqueue(Recommendation, [{'uid': uid, 'reason': f'추천 {i}'} for i in range(5)])
+            writer.enqueue(Chatbot, [{'uid': uid, 'query': '질문', 'response': '답변'}])
+            writer.join()
+
+        assert len(inserts(statements, 'recommendation')) == 1
+        assert len(inserts(statements, 'chatbot')) == 1
+        assert Recommendation.query.filter_by(uid=uid).count() == 5
+        chat = db.session.query(Chatbot).filter_by(uid=uid).one()
+        assert chat.timestamp is not None and chat.response == '답변'
+
+    def test_size_threshold(self, writer, uid, monkeypatch):
+        """간격이 지나기 전이라도 batch_size가 차면 저장"""
+        monkeypatch.setattr(writer, 'flush_interval', 30)
+        monkeypatch.setattr(writer, 'batch_size', 3)
+
+        start = time.monotonic()
+        writer.enqueue(Recommendation, [{'uid': uid, 'reason': str(i)} for i in range(3)])
+        writer.join()
+
+        assert time.monotonic() - start < 10
+        assert Recommendation.query.filter_by(uid=uid).count() == 3
+
+    def test_failure_requeues(self, writer, uid, monkeypatch):
+        """저장에 실패한 기록은 다시 큐에 넣어 재시도"""
+        calls = []
+        original = audit_queue.insert
+
+        def flaky_insert(model):
+            calls.append(model)
+            if len(calls) == 1:
+                raise RuntimeError('DB 연결 오류')
+            return original(model)
+
+        monkeypatch.setattr(audit_queue, 'insert', flaky_insert)
+        writer.enqueue(Recommendation, [{'uid': uid, 'reason': '재시도'}])
+        writer.join()
+
+        assert len(calls) == 2
+        assert [rec.reason for rec in Recommendation.query.filter_by(uid=uid)] == ['재시도']
+
+    def test_bad_record_isolated(self, writer, uid, monkeypatch):
+        """일괄 저장이 실패하면 나누어 저장해 문제 있는 기록만 재시도 후 버림"""
+        monkeypatch.setattr(writer, 'max_attempts', 3)
+        batches = []
+        original = writer._insert
+
+        def recording_insert(records):
+            batches.append([row['reason'] for _, row, _ in records])
+            return original(records)
+
+        monkeypatch.setattr(writer, '_insert', recording_insert)
+        rows = [{'uid': uid, 'reason': f'정상 {i}'} for i in range(4)]
+        rows.insert(2, {'uid': None, 'reason': '불량'})
+        writer.enqueue(Recommendation, rows)
+        writer.join()
+
+        reasons = sorted(rec.reason for rec in Recommendation.query.filter_by(uid=uid))
+        assert reasons == [f'정상 {i}' for i in range(4)]
+        # 정상 기록은 한 번만 저장되고 불량 기록만 max_attempts회 시도
+        assert batches.count(['불량']) == 3
+        assert sum(batch.count('정상 0') for batch in batches) == 2
+
+    def test_shutdown_flushes(self, writer, uid, monkeypatch):
+        """종료 시 간격을 기다리지 않고 남은 기록을 저장"""
+        monkeypatch.setattr(writer, 'flush_interval', 30)
+        writer.enqueue(Recommendation, [{'uid': uid, 'reason': '종료 전'}])
+
+        start = time.monotonic()
+        writer.shutdown()
+        assert time.monotonic() - start < 10
+        assert Recommendation.query.filter_by(uid=uid).count() == 1
+
+        writer.init_app(writer.app)
+
+
+class TestAuditEndpoints:
+    """추천 API는 기록을 큐에 넣고 바로 응답"""
+
+    def test_alternatives_recorded(self, client, uid, writer, monkeypatch):
+        monkeypatch.setattr('app.routers.recommendation.generate_food_alternatives',
+                            lambda food_name, health_goal='', allergies=None, limit=3: [{'name': '현미밥'}, {'name': '귀리밥'}])
+        version = user_cache.get_version(uid)
+
+        response = client.post('/api/recommendations/alternatives', json={'food_name': '흰쌀밥', 'reason': '혈당 관리'})
+        assert response.status_code == 200
+
+        writer.join()
+        reasons = [rec.reason for rec in Recommendation.query.filter_by(uid=uid).order_by(Recommendation.rid)]
+        assert reasons == ['흰쌀밥의 대체 음식 (혈당 관리): 현미밥', '흰쌀밥의 대체 음식 (혈당 관리): 귀리밥']
+        assert user_cache.get_version(uid) != version
@@ -0,0 +1,163 @@
+import json
+from datetime import date
+
+import pytest
+from langchain_community.chat_models.fake import FakeListChatModel
+
+from app.extensions import db
+from models.chatbot import Chatbot
+from models.meal import Meal
+from repositories.meal_repository import MealRepository
+from repositories.user_repository import UserRepository
+from services import service_manager, user_cache
+from services.audit_queue import audit_writer
+from services.chatbot import PersonalizedNutritionChatbot, parse_structured_reply
+from services.chatbot_service import ChatbotService
+from services.nutrition_service import NutritionService
+
+REPLY = {
+    'intent_category': '건강 목표 관련',
+    'confidence': 0.9,
+    'key_entities': ['체중'],
+    'response': '저녁 탄수화물을 줄여보세요.'
+}
+
+
+class CountingChatModel(FakeListChatModel):
+    """호출 횟수를 세는 LLM 대역"""
+
+    calls: int = 0
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        return super()._call(messages, stop, run_manager, **kwargs)
+
+
+class CountingUserRepository(UserRepository):
+    def __init__(self):
+        self.calls = 0
+
+    def get_user(self, user_id):
+        self.calls += 1
+        return super().get_user(user_id)
+
+
+class CountingMealRepository(MealRepository):
+    def __init__(self):
+        self.calls = 0
+
+    def get_meals_by_date_range(self, user_id, start_date, end_date):
+        self.calls += 1
+        return super().get_meals_by_date_range(user_id, start_date, end_date)
+
+
+def build_chatbot(**kwargs):
+    return PersonalizedNutritionChatbot(
+        openai_api_key='sk-test',
+        user_repository=CountingUserRepository(),
+        nutrition_service=NutritionService(),
+        meal_repository=CountingMealRepository(),
+        llm=CountingChatModel(responses=[json.dumps(REPLY, ensure_ascii=False)]),
+        **kwargs
+    )
+
+
+@pytest.fixture
+def chatbot():
+    """호출 횟수를 세는 LLM과 저장소를 사용하는 챗봇"""
+    return build_chatbot()
+
+
+class TestChatbotPipeline:
+    """의도 분석과 답변을 한 번의 LLM 호출로 생성하고 컨텍스트는 한 번만 조회"""
+
+    def test_single_round_trip(self, chatbot):
+        result = chatbot.process_message('1', '체중 감량 중인데 저녁은 어떻게 먹을까?')
+
+        assert chatbot.llm.calls == 1
+        assert chatbot.user_repository.calls == 1
+        assert chatbot.meal_repository.calls == 1
+        assert result['response'] == REPLY['response']
+        assert result['intent'] == {key: REPLY[key] for key in ('intent_category', 'confidence', 'key_entities')}
+        # 건강 목표 추천은 이미 조회한 영양 컨텍스트를 사용
+        assert result['recommendations']['nutrition_progress'] == result['nutrition_context']
+        assert result['nutrition_context']['daily_nutrition']['total_calories'] == 800
+
+    def test_service_wrapper(self, chatbot):
+        result = ChatbotService(chatbot).process_conversation('1', '저녁 메뉴 추천해줘')
+
+        assert chatbot.llm.calls == 1
+        assert result['response'] == REPLY['response']
+        assert result['meal_recommendations'][0]['title'] == '식단 조절'
+
+    def test_parse_structured_reply(self):
+        """코드 블록, 알 수 없는 카테고리, JSON이 아닌 출력도 처리"""
+        fenced = '```json\n' + json.dumps(dict(REPLY, intent_category='잡담'), ensure_ascii=False) + '\n```'
+        assert parse_structured_reply(fenced) == {
+            'intent': {'intent_category': '기타', 'confidence': 0.9, 'key_entities': ['체중']},
+            'response': REPLY['response']
+        }
+
+        plain = parse_structured_reply('물을 충분히 드세요.')
+        assert plain['response'] == '물을 충분히 드세요.'
+        assert plain['intent']['intent_category'] == '기타'
+
+
+class TestChatEndpoint:
+    def test_chat_uses_single_call(self, client, uid, chatbot):
+        service_manager._services['nutrition_chatbot'] = chatbot
+
+        response = client.post('/api/chatbot/api/chat', json={'message': '저녁 메뉴 추천해줘'})
+        body = response.get_json()['data']
+
+        assert response.status_code == 200
+        assert chatbot.llm.calls == 1
+        assert body['response'] == REPLY['response']
+        assert body['intent']['intent_category'] == '건강 목표 관련'
+
+        audit_writer.join()
+        chat = db.session.query(Chatbot).filter_by(uid=uid).one()
+        assert chat.response == REPLY['response']
+
+
+class TestContextCache:
+    """사용자 데이터 버전이 같으면 대화 컨텍스트를 다시 계산하지 않음"""
+
+    def test_reused_across_turns_and_steps(self, app, uid):
+        chatbot = build_chatbot(context_version=user_cache.get_version)
+
+        for _ in range(3):
+            result = chatbot.process_message(str(uid), '저녁 메뉴 추천해줘')
+        chatbot.generate_personalized_recommendation(str(uid), '건강 목표 관련')
+        chatbot.generate_chat_response(str(uid), '고마워')
+
+        assert chatbot.user_repository.calls == 1
+        assert chatbot.meal_repository.calls == 1
+        assert result['nutrition_context']['daily_nutrition']['total_calories'] == 800
+
+    def test_invalidated_by_meal_write(self, app, uid):
+        chatbot = build_chatbot(context_version=user_cache.get_version)
+        chatbot.process_message(str(uid), '저녁 메뉴 추천해줘')
+
+        db.session.add(Meal(uid=uid, meal_time='저녁', date=date.today()))
+        db.session.commit()
+        chatbot.process_message(str(uid), '저녁 메뉴 추천해줘')
+        chatbot.process_message(str(uid), '저녁 메뉴 추천해줘')
+
+        assert chatbot.meal_repository.calls == 2
+
+    def test_bounded_and_optional(self):
+        """최대 사용자 수를 넘으면 오래된 사용자부터 제거, 버전 조회 실패 시 캐시 없이 동작"""
+        chatbot = build_chatbot(context_version=lambda user_id: 'v1', context_cache_size=1)
+        chatbot.load_context('1')
+        chatbot.load_context('2')
+        chatbot.load_context('1')
+        assert chatbot.meal_repository.calls == 3
+
+        def broken_version(user_id):
+            raise RuntimeError('캐시 서버 오류')
+
+        chatbot = build_chatbot(context_version=broken_version)
+        chatbot.load_context('1')
+        assert chatbot.load_context('1')['nutrition_context']
+        assert chatbot.meal_repository.calls == 2
@@ -0,0 +1,152 @@
+import json
+
+import pytest
+
+from app.extensions import db
+from database.repositories.chatbot_repository import ChatbotRepository
+from models.chatbot import Chatbot
+from models.chat_memory import ChatMemory
+from services.audit_queue import audit_writer
+from services.conversation_memory import ConversationMemory, select_recent_turns, format_conversation, turn_tokens
+from utils.tokenizer import count_tokens, truncate_tokens
+from tests.test_chatbot_pipeline import CountingChatModel, build_chatbot, REPLY
+
+RECENT_BUDGET = 200
+SUMMARY_BUDGET = 40
+
+
+class FakeSummarizer:
+    """이전 요약 뒤에 질문을 이어 붙이는 요약 함수 대역"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, previous_summary, turns, max_tokens):
+        self.calls.append((previous_summary, [turn['user'] for turn in turns]))
+        return ' '.join([previous_summary] + [turn['user'] for turn in turns]).strip()
+
+
+def add_turn(uid, i):
+    db.session.add(Chatbot(uid=uid, query=f'질문 {i}: 저녁으로 닭가슴살 샐러드 괜찮아?',
+                           response=f'답변 {i}: 네, 단백질이 풍부해서 좋아요.'))
+    db.session.commit()
+
+
+@pytest.fixture
+def memory(app):
+    return ConversationMemory(ChatbotRepository(), recent_token_budget=RECENT_BUDGET,
+                              summary_token_budget=SUMMARY_BUDGET)
+
+
+class TestConversationMemory:
+    """최근 대화는 예산 안에서 원문으로, 오래된 대화는 누적 요약으로"""
+
+    def test_select_recent_turns(self):
+        turns = [{'user': f'질문 {i}', 'assistant': f'답변 {i}'} for i in range(10)]
+        per_turn = turn_tokens(turns[0])
+
+        older, recent = select_recent_turns(turns, per_turn * 3)
+        assert [turn['user'] for turn in recent] == ['질문 7', '질문 8', '질문 9']
+        assert len(older) == 7 and 'tokens' not in turns[0]
+        assert select_recent_turns(turns, 0) == (turns, [])
+
+    def test_truncate_tokens(self):
+        text = '단백질은 근육 유지에 필요합니다. ' * 20
+        assert count_tokens(truncate_tokens(text, 15)) <= 15
+        assert truncate_tokens('짧은 문장', 100) == '짧은 문장'
+
+    def test_prompt_bounded_with_incremental_summary(self, memory, uid):
+        """대화가 길어져도 프롬프트 크기는 예산 이내이고 요약은 이전 요약에 이어서 갱신"""
+        summarizer = FakeSummarizer()
+        sizes = []
+        for i in range(40):
+            add_turn(uid, i)
+            loaded = memory.load(uid, summarizer)
+            sizes.append(count_tokens(loaded['summary']) + sum(turn_tokens(turn) for turn in loaded['turns']))
+
+            # 가장 최근 대화는 항상 원문으로 포함
+            assert loaded['turns'][-1]['user'].startswith(f'질문 {i}:')
+
+        assert max(sizes) <= RECENT_BUDGET + SUMMARY_BUDGET
+        # 예산을 넘을 때마다가 아니라 여러 턴에 한 번 요약
+        assert 2 <= len(summarizer.calls) <= 40 // 2
+        assert all(previous for previous, _ in summarizer.calls[1:])
+
+        saved = db.session.get(ChatMemory, uid)
+        assert saved.summary == loaded['summary'] and saved.summary_tokens <= SUMMARY_BUDGET
+        folded = [int(user.split()[1].rstrip(':')) for _, users in summarizer.calls for user in users]
+        assert folded == list(range(len(folded)))
+        assert saved.last_cid == folded[-1] + 1
+
+    def test_summarizer_failure(self, memory, uid):
+        """요약에 실패하면 요약을 저장하지 않고 예산 안의 최근 대화만 사용"""
+        def broken(previous_summary, turns, max_tokens):
+            raise RuntimeError('LLM 오류')
+
+        for i in range(20):
+            add_turn(uid, i)
+        loaded = memory.load(uid, broken)
+
+        assert loaded['summary'] == '' and db.session.get(ChatMemory, uid) is None
+        assert sum(turn_tokens(turn) for turn in loaded['turns']) <= RECENT_BUDGET
+
+    def test_pending_turns_before_flush(self, memory, uid, monkeypatch):
+        """지연 저장이 끝나기 전의 대화도 다음 턴에 사용하고, 저장 후에는 중복되지 않음"""
+        monkeypatch.setattr(audit_writer, 'flush_interval', 30)
+        memory.record_turn(uid, '두부 칼로리 알려줘', '100g에 약 80kcal예요.')
+
+        assert [turn['user'] for turn in memory.load(uid)['turns']] == ['두부 칼로리 알려줘']
+
+        audit_writer.shutdown()
+        audit_writer.init_app(audit_writer.app)
+        assert db.session.query(Chatbot).filter_by(uid=uid).count() == 1
+        assert [turn['user'] for turn in memory.load(uid)['turns']] == ['두부 칼로리 알려줘']
+
+    def test_clear_history_removes_summary(self, memory, uid):
+        for i in range(20):
+            add_turn(uid, i)
+        memory.load(uid, FakeSummarizer())
+        assert db.session.get(ChatMemory, uid) is not None
+
+        ChatbotRepository().clear_conversation_history(uid)
+        assert db.session.get(ChatMemory, uid) is None
+        assert memory.load(uid) == {'summary': '', 'turns': []}
+
+
+class PromptCapturingChatModel(CountingChatModel):
+    """마지막 프롬프트를 저장하는 LLM 대역"""
+
+    prompts: list = []
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return super()._call(messages, stop, run_manager, **kwargs)
+
+
+class TestChatbotMemory:
+    def test_history_and_summary_in_prompt(self, app, memory, uid):
+        for i in range(20):
+            add_turn(uid, i)
+        db.session.add(ChatMemory(uid=uid, summary='사용자는 체중 감량 중이며 땅콩 알레르기가 있다.', last_cid=0))
+        db.session.commit()
+
+        chatbot = build_chatbot(memory=memory)
+        chatbot.llm = PromptCapturingChatModel(responses=['갱신된 요약', json.dumps(REPLY, ensure_ascii=False)],
+                                               prompts=[])
+        chatbot.structured_llm = chatbot.llm
+        chatbot.process_message(str(uid), '오늘 저녁 뭐 먹지?')
+
+        summary_prompt, chat_prompt = chatbot.llm.prompts
+        assert '땅콩 알레르기' in summary_prompt and '질문 0:' in summary_prompt
+        assert '[이전 대화 요약]\n갱신된 요약' in chat_prompt
+        assert '질문 19:' in chat_prompt and '질문 0:' not in chat_prompt
+
+    def test_explicit_history_is_budgeted(self):
+        """전달받은 대화 이력도 개수가 아닌 토큰 예산으로 자름"""
+        chatbot = build_chatbot()
+        history = [{'user': f'질문 {i} ' + '영양 ' * 50, 'assistant': '답변'} for i in range(30)]
+
+        text = chatbot._conversation_history('1', history)
+        assert '질문 29' in text and '질문 0 ' not in text
+        assert count_tokens(text) <= 1000 + 30
+        assert chatbot._conversation_history('1', None) == format_conversation([])
@@ -0,0 +1,104 @@
+import pytest
+
+from services import food_resolution
+from services.food_database import FoodDatabaseService
+from services.nutrition_analysis import NutritionAnalysisService
+from services.food_resolution import (
+    FoodResolutionQueue, NegativeLookupCache, STATUS_PENDING, STATUS_UNKNOWN, STATUS_GUESS
+)
+
+
+@pytest.fixture
+def food_db(tmp_path):
+    """김치찌개 하나가 들어 있는 임시 식품 카탈로그"""
+    food_db = FoodDatabaseService(str(tmp_path / 'food.db'))
+    food_db.add_food({'name': '김치찌개', 'category': '찌개', 'calories': 80.0, 'protein': 6.0})
+    return food_db
+
+
+class Clock:
+    """time.monotonic 대역"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class EmptyRAGService:
+    """영양 정보를 찾지 못하는 RAG 서비스 대역"""
+
+    def query_food_info(self, prompt):
+        return ''
+
+
+class TestFoodResolutionQueue:
+    """미확인 식품의 백그라운드 해석"""
+
+    def test_normalized_name_persisted(self, food_db):
+        """정규화한 이름이 같은 식품은 별칭으로 카탈로그에 기록"""
+        resolution_queue = FoodResolutionQueue(food_db)
+
+        assert resolution_queue.request('김치 찌개') == STATUS_PENDING
+        assert resolution_queue.request(' 김치 찌개 ') == STATUS_PENDING
+        resolution_queue.join()
+
+        assert not resolution_queue.is_pending('김치 찌개')
+        food = food_db.get_food_by_name('김치 찌개')
+        assert food['calories'] == 80.0 and food['category'] == '찌개'
+
+    def test_fuzzy_match_not_persisted(self, food_db):
+        """이름 일부만 일치하는 식품은 카탈로그에 기록하지 않고 추정값으로만 보관"""
+        resolution_queue = FoodResolutionQueue(food_db)
+
+        resolution_queue.request('김치찌개 한 그릇')
+        resolution_queue.join()
+
+        assert food_db.get_food_by_name('김치찌개 한 그릇') is None
+        assert resolution_queue.request('김치찌개 한 그릇') == STATUS_GUESS
+        guess = resolution_queue.guess('김치찌개 한 그릇')
+        assert guess['source'] == 'guess:김치찌개' and guess['calories'] == 80.0
+
+    def test_meal_analysis_uses_guess(self, food_db):
+        """식사 분석은 해석 큐의 추정값만 사용하고 추정한 음식을 표시"""
+        service = NutritionAnalysisService(food_db, EmptyRAGService())
+        items = [{'name': '김치찌개 한 그릇', 'quantity': 2, 'unit': '인분'}]
+
+        # 요청 경로에서는 이름 일부 일치로 대체하지 않고 해석만 요청
+        assert service.analyze_meal_nutrition(items) == {}
+        service.resolution_queue.join()
+
+        totals = service.analyze_meal_nutrition(['김치찌개'] + items)
+        assert totals['calories'] == 240.0 and totals['protein'] == 18.0
+        assert totals['estimated_foods'] == ['김치찌개 한 그릇']
+        assert food_db.get_food_by_name('김치찌개 한 그릇') is None
+
+    def test_negative_cache_expiry(self, food_db, monkeypatch):
+        """해석에 실패한 이름과 추정값은 TTL이 지나면 다시 해석"""
+        clock = Clock()
+        monkeypatch.setattr(food_resolution.time, 'monotonic', clock)
+        resolution_queue = FoodResolutionQueue(food_db, negative_ttl=60)
+
+        resolution_queue.request('불고기')
+        resolution_queue.request('김치찌개 한 그릇')
+        resolution_queue.join()
+        assert resolution_queue.request('불고기') == STATUS_UNKNOWN
+        assert resolution_queue.request('김치찌개 한 그릇') == STATUS_GUESS
+
+        clock.now += 61
+        assert resolution_queue.guess('김치찌개 한 그릇') is None
+        assert resolution_queue.request('불고기') == STATUS_PENDING
+        resolution_queue.join()
+
+    def test_ttl_cache(self, monkeypatch):
+        clock = Clock()
+        monkeypatch.setattr(food_resolution.time, 'monotonic', clock)
+        cache = NegativeLookupCache(ttl_seconds=10)
+
+        cache.add('라면')
+        cache.add('김밥', {'calories': 150.0})
+        assert '라면' in cache and cache.get('김밥') == {'calories': 150.0}
+
+        clock.now += 11
+        assert '라면' not in cache and cache.get('김밥') is None
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+
+from app.extensions import db
+from models.user import User
+from models.insight_snapshot import InsightSnapshot
+from services import user_cache
+from services.insight_snapshot import InsightSnapshotJob, get_user_snapshot
+from tests.test_nutrition_queries import add_meals
+
+END_DATE = date(2026, 3, 15)
+
+
+def add_users(count):
+    users = [User(email=f'user{index}@test.com', password='password', name=f'사용자{index}') for index in range(count)]
+    db.session.add_all(users)
+    db.session.commit()
+    return [user.uid for user in users]
+
+
+class TestInsightSnapshotJob:
+    """배치 작업은 데이터가 바뀐 사용자만 다시 계산"""
+
+    def test_incremental_run(self, app, uid):
+        add_meals(uid, END_DATE, 2)
+        add_meals(uid, END_DATE - timedelta(days=1), 1)
+        job = InsightSnapshotJob(workers=1, batch_size=2)
+
+        assert job.run(END_DATE) == {'users': 1, 'computed': 1, 'skipped': 0}
+        snapshot = db.session.get(InsightSnapshot, uid)
+        assert (snapshot.days_with_data, snapshot.total_meals) == (2, 3)
+        assert snapshot.get_weekly_average()['calories'] == 750.0
+        assert snapshot.period_end == END_DATE
+
+        assert job.run(END_DATE) == {'users': 1, 'computed': 0, 'skipped': 1}
+        assert job.run(END_DATE + timedelta(days=1))['computed'] == 0
+        assert db.session.get(InsightSnapshot, uid).period_end == END_DATE + timedelta(days=1)
+
+        add_meals(uid, END_DATE, 1)
+        assert job.run(END_DATE)['computed'] == 1
+        assert db.session.get(InsightSnapshot, uid).total_meals == 4
+        assert job.run(END_DATE, full=True)['computed'] == 1
+
+    def test_process_pool(self, app, uid):
+        """작업 프로세스에서 계산한 결과가 현재 프로세스 계산 결과와 같음"""
+        uids = [uid] + add_users(4)
+        for index, user_id in enumerate(uids):
+            add_meals(user_id, END_DATE, index + 1)
+
+        stats = InsightSnapshotJob(workers=2, batch_size=3).run(END_DATE)
+        assert stats == {'users': 5, 'computed': 5, 'skipped': 0}
+        pooled = {snapshot.uid: snapshot.to_dict() for snapshot in InsightSnapshot.query.all()}
+
+        InsightSnapshotJob(workers=1).run(END_DATE, full=True)
+        db.session.expire_all()
+        local = {snapshot.uid: snapshot.to_dict() for snapshot in InsightSnapshot.query.all()}
+
+        for values in list(pooled.values()) + list(local.values()):
+            values.pop('computed_at')
+        assert pooled == local
+        assert [pooled[user_id]['total_meals'] for user_id in uids] == [1, 2, 3, 4, 5]
+
+
+class TestGetUserSnapshot:
+    def test_miss_computed_without_write(self, app, uid, count_statements):
+        """배치 작업 전에는 계산한 값을 반환하고 조회 요청에서 저장하지 않음"""
+        add_meals(uid, date.today(), 2)
+        user = db.session.get(User, uid)
+        version = user_cache.get_version(uid)
+
+        with count_statements() as statements:
+            snapshot = get_user_snapshot(user)
+
+        assert snapshot.total_meals == 2 and snapshot.get_targets()
+        assert snapshot not in db.session
+        assert not any(statement.startswith(('INSERT', 'UPDATE')) for statement in statements), statements
+        db.session.commit()
+        assert InsightSnapshot.query.count() == 0
+        assert user_cache.get_version(uid) == version
+
+    def test_reads_stored_snapshot(self, app, uid):
+        add_meals(uid, date.today(), 1)
+        InsightSnapshotJob(workers=1).run()
+        stored = db.session.get(InsightSnapshot, uid)
+
+        assert get_user_snapshot(db.session.get(User, uid)) is stored
@@ -0,0 +1,118 @@
+import time
+import json
+
+import pytest
+
+from services.chatbot import PersonalizedNutritionChatbot
+from services.intent_classifier import (
+    IntentClassifier, DEFAULT_INTENT_HOLDOUT, char_ngrams, load_intent_classifier, load_intent_samples
+)
+from services.nutrition_service import NutritionService
+from repositories.meal_repository import MealRepository
+from repositories.user_repository import UserRepository
+from tests.test_chatbot_pipeline import CountingChatModel, REPLY
+
+
+@pytest.fixture(scope='module')
+def classifier():
+    """번들 데이터로 학습한 분류기 (모듈에서 한 번만 학습)"""
+    return load_intent_classifier(model_path=None)
+
+
+class FixedClassifier:
+    """항상 같은 결과를 반환하는 분류기 대역"""
+
+    def __init__(self, category, confidence):
+        self.result = (category, confidence)
+
+    def predict(self, text):
+        return self.result
+
+
+def build_chatbot(classifier, responses):
+    return PersonalizedNutritionChatbot(
+        openai_api_key='sk-test',
+        user_repository=UserRepository(),
+        nutrition_service=NutritionService(),
+        meal_repository=MealRepository(),
+        llm=CountingChatModel(responses=responses),
+        intent_classifier=classifier
+    )
+
+
+class TestIntentClassifier:
+    """문자 n-gram 분류기의 정확도, 보정, 속도 확인"""
+
+    def test_char_ngrams(self):
+        grams = char_ngrams('칼로리  알려줘', (1, 2))
+        assert grams['칼'] == 1 and grams[' 칼'] == 1 and grams['리 '] == 1
+        assert ' ' not in grams and '  ' not in grams
+
+    def test_holdout_accuracy(self, classifier):
+        """학습에 쓰지 않은 직접 작성 문장에서도 대부분 맞춤"""
+        holdout = load_intent_samples(DEFAULT_INTENT_HOLDOUT)
+        predictions = [classifier.predict(sample['text']) for sample in holdout]
+
+        accuracy = sum(label == sample['intent'] for (label, _), sample in zip(predictions, holdout)) / len(holdout)
+        assert accuracy >= 0.8
+
+        # 신뢰도가 높은 예측은 더 정확함 (보정된 확률)
+        confident = [(label, sample['intent']) for (label, confidence), sample in zip(predictions, holdout)
+                     if confidence >= 0.7]
+        assert len(confident) >= len(holdout) // 2
+        assert sum(label == intent for label, intent in confident) / len(confident) > accuracy
+
+    def test_probabilities_and_latency(self, classifier):
+        probabilities = classifier.predict_proba('닭가슴살 칼로리 알려줘')
+        assert sum(probabilities.values()) == pytest.approx(1.0)
+        assert max(probabilities, key=probabilities.get) == '식품 정보'
+
+        start = time.perf_counter()
+        for _ in range(200):
+            classifier.predict('요즘 체중이 잘 안 빠지는데 저녁은 어떻게 먹어야 할까?')
+        assert (time.perf_counter() - start) / 200 < 0.001
+
+    def test_save_and_load(self, classifier, tmp_path):
+        path = str(tmp_path / 'intent_model.json')
+        classifier.save(path)
+        loaded = load_intent_classifier(model_path=path)
+
+        for text in ('두부로 뭐 해먹지', '안녕', '비밀번호 변경'):
+            assert loaded.predict(text)[0] == classifier.predict(text)[0]
+            assert loaded.predict(text)[1] == pytest.approx(classifier.predict(text)[1], abs=1e-4)
+
+    def test_train_without_holdout(self):
+        """보정 데이터가 없으면 교차 검증 예측으로 온도를 맞춤"""
+        samples = [{'text': text, 'intent': intent}
+                   for intent, texts in (('레시피 추천', ['두부 요리법', '계란 요리 추천', '감자 레시피']),
+                                         ('일반 대화', ['안녕', '고마워', '반가워']))
+                   for text in texts]
+        model = IntentClassifier.train(samples, calibration_folds=3, epochs=50)
+        assert model.temperature > 0 and model.labels == ['레시피 추천', '일반 대화']
+
+
+class TestChatbotIntentRouting:
+    """신뢰도가 임계값 이상이면 LLM 의도 분석을 생략"""
+
+    def test_confident_local_intent(self):
+        chatbot = build_chatbot(FixedClassifier('식품 정보', 0.95), ['사용되지 않음'])
+
+        intent = chatbot.analyze_conversation_intent('바나나 칼로리')
+        assert intent == {'intent_category': '식품 정보', 'confidence': 0.95, 'key_entities': []}
+        assert chatbot.llm.calls == 0
+
+    def test_low_confidence_falls_back_to_llm(self):
+        chatbot = build_chatbot(FixedClassifier('식품 정보', 0.4), [json.dumps(REPLY, ensure_ascii=False)])
+
+        intent = chatbot.analyze_conversation_intent('음...')
+        assert intent['intent_category'] == '건강 목표 관련'
+        assert chatbot.llm.calls == 1
+
+    def test_process_message_uses_plain_reply(self):
+        """로컬 의도를 사용하면 답변만 생성 (JSON 출력 불필요)"""
+        chatbot = build_chatbot(FixedClassifier('레시피 추천', 0.9), ['두부조림을 추천해요.'])
+
+        result = chatbot.process_message('1', '두부로 뭐 해먹지')
+        assert chatbot.llm.calls == 1
+        assert result['response'] == '두부조림을 추천해요.'
+        assert result['intent']['intent_category'] == '레시피 추천'
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db, cache
+from models.meal import Meal
+from models.food import Food
+
+# 여러 식사를 반환하는 목록 API
+LIST_ENDPOINTS = [
+    '/api/main/dashboard',
+    '/api/main/quick-stats',
+    '/api/main/search?q=김치',
+    '/api/users/dashboard',
+    '/api/meals/'
+]
+
+
+def add_meals(uid, count, foods_per_meal=3):
+    """오늘 날짜의 식사 기록 추가 (검색어 '김치'에 걸리도록 설명 포함)"""
+    for index in range(count):
+        meal = Meal(uid=uid, meal_time='점심', content=f'김치 식사 {index}', date=datetime.now().date())
+        meal.image = b'\x89PNG' * 1024
+        db.session.add(meal)
+        db.session.flush()
+        for _ in range(foods_per_meal):
+            db.session.add(Food(mid=meal.mid, food_name='김치찌개',
+                                nutrition_info={'calories': 250.0, 'protein': 15.0, 'serving': '1인분'}))
+    db.session.commit()
+    db.session.remove()
+
+
+def request_statements(client, count_statements, url):
+    cache.clear()
+    with count_statements() as statements:
+        response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return statements, response.get_json()
+
+
+class TestListEndpointQueries:
+    """목록 API가 행마다 추가 쿼리를 실행하지 않는지 확인하는 회귀 테스트"""
+
+    @pytest.mark.parametrize('url', LIST_ENDPOINTS)
+    def test_statement_count_independent_of_rows(self, client, uid, count_statements, url):
+        """식사/음식 행 수가 늘어나도 SQL 문 수가 같음"""
+        add_meals(uid, 2)
+        request_statements(client, count_statements, url)  # 인사이트 스냅샷 등 최초 1회 작업 제외
+        few, _ = request_statements(client, count_statements, url)
+
+        add_meals(uid, 3)
+        many, _ = request_statements(client, count_statements, url)
+
+        assert len(few) == len(many), '\n'.join(many)
+
+    def test_meal_list_serialized_from_preloaded_rows(self, client, uid, count_statements):
+        """식사 목록은 미리 로드한 음식으로 직렬화되고 이미지 BLOB은 읽지 않음"""
+        add_meals(uid, 2)
+        statements, body = request_statements(client, count_statements, '/api/meals/')
+
+        meals = body['meals']
+        assert body['total'] == 2
+        assert all(meal['has_image'] for meal in meals)
+        assert [len(meal['foods']) for meal in meals] == [3, 3]
+        assert meals[0]['foods'][0]['nutrition_info'] == {'calories': 250.0, 'protein': 15.0, 'serving': '1인분'}
+        assert not any('meal.image AS' in statement for statement in statements), statements
@@ -0,0 +1,83 @@
+from datetime import date
+
+import pytest
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from models.daily_nutrition import DailyNutrition
+from database.repositories.meal_repository import MealRepository
+from services import service_manager
+from services.food_database import FoodDatabaseService
+from services.food_resolution import get_resolution_queue
+from services.meal_nutrition import nutrition_backfill
+
+TARGET_DATE = date(2026, 3, 15)
+
+
+@pytest.fixture
+def food_db(app, tmp_path):
+    """변경 시 백필 작업을 예약하는 임시 식품 카탈로그 (서비스 컨테이너에 등록)"""
+    food_db = FoodDatabaseService(str(tmp_path / 'food.db'))
+    food_db.add_food({'name': '김치찌개', 'category': '찌개', 'calories': 80.0, 'protein': 6.0})
+    food_db.add_change_listener(nutrition_backfill.schedule)
+    service_manager._services['food_db'] = food_db
+    yield food_db
+    get_resolution_queue(food_db).join()
+    nutrition_backfill.join()
+
+
+def add_meal(uid):
+    meal = Meal(uid=uid, meal_time='점심', date=TARGET_DATE)
+    db.session.add(meal)
+    db.session.commit()
+    return meal.mid
+
+
+class TestAddFoodToMeal:
+    """저장소의 음식 추가도 MealService와 같이 카탈로그 영양소를 저장"""
+
+    def test_catalog_nutrition_materialized(self, app, uid, food_db):
+        mid = add_meal(uid)
+        repository = MealRepository()
+
+        kimchi = repository.add_food_to_meal(mid, '김치찌개')
+        manual = repository.add_food_to_meal(mid, '직접 입력', calories=300.0)
+        unknown = repository.add_food_to_meal(mid, '불고기')
+
+        assert (kimchi.calories, kimchi.protein) == (80.0, 6.0)
+        assert kimchi.get_nutrition_info()['protein'] == 6.0
+        assert manual.calories == 300.0 and manual.protein is None
+        assert unknown.calories is None
+        assert db.session.get(DailyNutrition, (uid, TARGET_DATE)).calories == 380.0
+
+
+class TestNutritionBackfill:
+    """카탈로그가 바뀌면 이미 저장된 음식 행의 영양소를 다시 계산"""
+
+    def test_catalog_change_backfills_foods(self, app, uid, food_db):
+        mid = add_meal(uid)
+        repository = MealRepository()
+        kimchi = repository.add_food_to_meal(mid, '김치찌개').fid
+        bulgogi = repository.add_food_to_meal(mid, '불고기').fid
+        get_resolution_queue(food_db).join()
+
+        food_db.add_food({'name': '불고기', 'category': '구이', 'calories': 250.0, 'protein': 20.0})
+        food_db.add_food({'name': '김치찌개', 'category': '찌개', 'calories': 90.0, 'protein': 7.0})
+        nutrition_backfill.join()
+        db.session.expire_all()
+
+        assert db.session.get(Food, bulgogi).protein == 20.0
+        assert db.session.get(Food, kimchi).calories == 90.0
+        rollup = db.session.get(DailyNutrition, (uid, TARGET_DATE))
+        assert (rollup.resolved_food_count, rollup.calories) == (2, 340.0)
+
+    def test_backfill_missing(self, app, uid, food_db):
+        """이름 없이 실행하면 영양 정보가 없는 음식만 갱신"""
+        mid = add_meal(uid)
+        db.session.add(Food(mid=mid, food_name='김치찌개'))
+        db.session.add(Food(mid=mid, food_name='없는 음식'))
+        db.session.commit()
+
+        assert nutrition_backfill.backfill(service_manager.nutrient_aggregator) == 1
+        assert Food.query.filter(Food.calories.isnot(None)).count() == 1
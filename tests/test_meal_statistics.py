@@ -0,0 +1,127 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import select, literal, Date
+from sqlalchemy.dialects import postgresql, mysql, oracle
+from sqlalchemy.exc import CompileError
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from services.meal_service import MealService
+from services.meal_nutrition import date_bucket, DATE_BUCKET_FORMATS
+from database.repositories.meal_repository import MealRepository
+from database.repositories.food_repository import FoodRepository
+
+# (날짜, 식사 시간, [(음식 이름, 칼로리)])
+MEALS = [
+    (date(2026, 3, 2), '아침', [('김치찌개', 250.0), ('공기밥', 300.0)]),
+    (date(2026, 3, 2), '점심', [('김치찌개', 250.0)]),
+    (date(2026, 3, 9), '저녁', [('된장찌개', 200.0), ('공기밥', 300.0), ('김치', None)]),
+    (date(2026, 4, 1), '점심', [])
+]
+
+
+def add_meals(uid):
+    for day, meal_time, foods in MEALS:
+        meal = Meal(uid=uid, meal_time=meal_time, date=day)
+        db.session.add(meal)
+        db.session.flush()
+        for food_name, calories in foods:
+            nutrition = {'calories': calories, 'protein': 10.0} if calories else None
+            db.session.add(Food(mid=meal.mid, food_name=food_name, nutrition_info=nutrition))
+    db.session.commit()
+
+
+class TestMealStatistics:
+    """SQL 집계로 계산한 식사 통계 테스트"""
+
+    def test_grouped_statistics(self, app, uid, count_statements):
+        """그룹마다 그 그룹 음식의 칼로리만 합산하고 고정된 수의 SQL 문으로 계산"""
+        add_meals(uid)
+
+        with count_statements() as statements:
+            result = MealService().get_meal_statistics(uid, group_by='day')
+
+        assert result['success'], result
+        assert result['total_meals'] == 4
+        assert result['total_calories'] == 1300.0
+        assert result['grouped_statistics'] == {
+            '2026-03-02': {'meals': 2, 'calories': 800.0},
+            '2026-03-09': {'meals': 1, 'calories': 500.0},
+            '2026-04-01': {'meals': 1, 'calories': 0.0}
+        }
+        assert list(result['most_frequent_foods'].items())[:2] == [('공기밥', 2), ('김치찌개', 2)]
+        assert len(statements) == 2, statements
+
+    def test_week_and_month_buckets(self, app, uid):
+        """주/월 단위 그룹 키가 Python strftime 형식과 같음"""
+        add_meals(uid)
+        service = MealService()
+
+        weeks = service.get_meal_statistics(uid, group_by='week')['grouped_statistics']
+        months = service.get_meal_statistics(uid, start_date='2026-03-01', end_date='2026-03-31',
+                                             group_by='month')['grouped_statistics']
+
+        assert list(weeks) == [day.strftime('%Y-%W') for day in (date(2026, 3, 2), date(2026, 3, 9), date(2026, 4, 1))]
+        assert months == {'2026-03': {'meals': 3, 'calories': 1300.0}}
+
+    def test_unknown_group(self, app, uid):
+        """알 수 없는 그룹 단위는 하나의 'unknown' 그룹"""
+        add_meals(uid)
+        result = MealService().get_meal_statistics(uid, group_by='year')
+        assert result['grouped_statistics'] == {'unknown': {'meals': 4, 'calories': 1300.0}}
+
+
+class TestRepositoryStatistics:
+    """저장소 통계 집계 테스트"""
+
+    def test_meal_stats(self, app, uid):
+        add_meals(uid)
+        stats = MealRepository().get_meal_stats(uid, date(2026, 3, 1), date(2026, 3, 31))
+
+        assert stats['total_meals'] == 3
+        assert stats['meal_time_stats'] == {'아침': 1, '점심': 1, '저녁': 1}
+        assert stats['date_stats'] == {'2026-03-02': 2, '2026-03-09': 1}
+        assert stats['top_foods'][:2] == [{'name': '공기밥', 'count': 2}, {'name': '김치찌개', 'count': 2}]
+
+    def test_nutrition_stats(self, app, uid):
+        add_meals(uid)
+        stats = FoodRepository().get_nutrition_stats(uid)
+
+        assert stats['food_count'] == 6
+        assert stats['total'] == {'calories': 1300.0, 'protein': 50.0}
+        assert stats['average']['calories'] == 1300.0 / 6
+
+
+
+# 연초 주 경계가 요일마다 다른 날짜 (1월 1일이 월~일요일인 해 포함)
+BOUNDARY_DAYS = [date(year, 1, 1) + timedelta(days=offset) for year in range(2020, 2028) for offset in range(-3, 10)]
+
+
+class TestDateBucket:
+    """DB별 날짜 그룹 키가 Python strftime 형식과 같음"""
+
+    def test_sqlite_matches_python(self, app):
+        for group_by, date_format in DATE_BUCKET_FORMATS.items():
+            query = select(*[date_bucket(literal(day, Date), group_by) for day in BOUNDARY_DAYS])
+            assert list(db.session.execute(query).one()) == [day.strftime(date_format) for day in BOUNDARY_DAYS]
+
+    def test_postgresql_week_formula(self):
+        """PostgreSQL 주 번호 식 ((DOY + 7 - ISODOW) / 7)이 %W와 같음"""
+        for day in BOUNDARY_DAYS:
+            week = (day.timetuple().tm_yday + 7 - day.isoweekday()) // 7
+            assert f"{day.year}-{week:02d}" == day.strftime('%Y-%W')
+
+    def test_dialects(self):
+        column = Meal.__table__.c.date
+
+        def compiled(group_by, dialect):
+            return str(select(date_bucket(column, group_by)).compile(dialect=dialect))
+
+        assert "to_char(meal.date, 'YYYY-MM-DD')" in compiled('day', postgresql.dialect())
+        assert 'EXTRACT(ISODOW FROM meal.date)' in compiled('week', postgresql.dialect())
+        assert 'WEEK(meal.date, 5)' in compiled('week', mysql.dialect())
+        assert 'DATE_FORMAT(meal.date' in compiled('month', mysql.dialect())
+        with pytest.raises(CompileError):
+            compiled('day', oracle.dialect())
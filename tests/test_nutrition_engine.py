@@ -0,0 +1,50 @@
+from services.nutrition_engine import NutrientAggregator, NUTRIENT_KEYS
+
+
+class FakeFoodDatabase:
+    """catalog_version이 바뀌면 다른 카탈로그를 반환하는 식품 데이터베이스"""
+    db_path = '/nonexistent/foods.db'
+
+    def __init__(self, catalogs):
+        self.catalogs = catalogs
+        self.catalog_version = 0
+
+    def get_nutrient_table(self, nutrient_keys):
+        catalog = self.catalogs[self.catalog_version]
+        names = list(catalog)
+        return names, [tuple(catalog[name].get(key, 0) for key in nutrient_keys) for name in names]
+
+
+CATALOGS = [
+    {'현미밥': {'calories': 150.0}, '김치찌개': {'calories': 80.0}, '두부': {'calories': 76.0}},
+    {'두부': {'calories': 70.0}}
+]
+
+
+class TestNutrientAggregator:
+    def test_aggregate(self, app):
+        aggregator = NutrientAggregator(FakeFoodDatabase(CATALOGS))
+        result = aggregator.aggregate(['김치찌개', {'name': '현미밥', 'quantity': 2, 'unit': '인분'}, '라면'])
+
+        assert result['totals']['calories'] == 380.0
+        assert set(result['totals']) == set(NUTRIENT_KEYS)
+        assert result['resolved'] == ['김치찌개', '현미밥'] and result['unresolved'] == ['라면']
+
+    def test_reload_during_call_uses_one_snapshot(self, app, monkeypatch):
+        """호출 도중 다른 스레드가 카탈로그를 다시 로드해도 행 번호와 행렬은 같은 스냅샷에서 사용"""
+        food_db = FakeFoodDatabase(CATALOGS)
+        aggregator = NutrientAggregator(food_db)
+        aggregator.lookup([])
+        rows = NutrientAggregator._rows
+
+        def rows_then_reload(index, names):
+            result = rows(index, names)
+            food_db.catalog_version = 1
+            aggregator._snapshot()  # 동시 재로드
+            return result
+
+        monkeypatch.setattr(NutrientAggregator, '_rows', staticmethod(rows_then_reload))
+        assert aggregator.aggregate(['두부', '김치찌개'])['totals']['calories'] == 156.0
+        monkeypatch.undo()
+
+        assert aggregator.aggregate(['두부', '김치찌개'])['totals']['calories'] == 70.0
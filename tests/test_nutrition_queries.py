@@ -0,0 +1,142 @@
+from datetime import date, timedelta
+
+from sqlalchemy import update
+
+from app.extensions import db, cache
+from models.user import User
+from models.meal import Meal
+from models.food import Food
+from models.daily_nutrition import DailyNutrition
+from services import user_cache
+from services.nutrition_rollup import rebuild_daily_nutrition, check_daily_nutrition_consistency
+
+TARGET_DATE = date(2026, 3, 15)
+
+
+def add_meals(uid, day, count, foods_per_meal=2):
+    """영양소가 저장된 음식을 포함한 식사 기록 추가"""
+    for index in range(count):
+        meal = Meal(uid=uid, meal_time=f'식사{index}', date=day)
+        db.session.add(meal)
+        db.session.flush()
+        for _ in range(foods_per_meal):
+            db.session.add(Food(mid=meal.mid, food_name='김치찌개',
+                                nutrition_info={'calories': 250.0, 'protein': 15.0}))
+    db.session.commit()
+
+
+class TestDailyNutritionQueries:
+    """일일 영양 API의 SQL 실행 횟수 테스트"""
+
+    def test_daily_uses_fixed_number_of_statements(self, client, uid, count_statements):
+        """식사 수와 관계없이 고정된 수의 SQL 문으로 응답"""
+        add_meals(uid, TARGET_DATE, 2)
+        db.session.remove()
+        with count_statements() as few:
+            response = client.get(f'/api/nutrition/daily?date={TARGET_DATE}')
+        assert response.status_code == 200
+
+        add_meals(uid, TARGET_DATE, 6)
+        db.session.remove()
+        with count_statements() as many:
+            response = client.get(f'/api/nutrition/daily?date={TARGET_DATE}')
+
+        data = response.get_json()['data']
+        assert len(data['meals']) == 8
+        assert data['total_nutrition']['calories'] == 8 * 2 * 250.0
+        assert data['meals'][0]['nutrition']['protein'] == 30.0
+        assert len(data['meals'][0]['meal']['foods']) == 2
+        assert len(few) == len(many) <= 3, many
+
+    def test_daily_without_meals(self, client, uid, count_statements):
+        """기록이 없는 날은 식사 조회 한 번으로 빈 결과"""
+        with count_statements() as statements:
+            response = client.get(f'/api/nutrition/daily?date={TARGET_DATE}')
+
+        data = response.get_json()['data']
+        assert data['meals'] == [] and data['total_nutrition'] == {}
+        assert len(statements) == 2, statements
+
+
+class TestWeeklyNutritionQueries:
+    """주간 영양 API의 SQL 실행 횟수 테스트"""
+
+    def test_weekly_uses_fixed_number_of_statements(self, client, uid, count_statements):
+        """7일치 식사가 있어도 고정된 수의 SQL 문으로 응답하고 빈 날짜도 채워짐"""
+        for offset in (0, 1, 3):
+            add_meals(uid, TARGET_DATE - timedelta(days=offset), 3)
+        db.session.remove()
+        cache.clear()
+
+        with count_statements() as statements:
+            response = client.get(f'/api/nutrition/weekly?end_date={TARGET_DATE}')
+
+        data = response.get_json()['data']
+        days = data['daily_nutrition']
+        assert [day['date'] for day in days] == [
+            (TARGET_DATE - timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(6, -1, -1)
+        ]
+        assert [day['meal_count'] for day in days] == [0, 0, 0, 3, 0, 3, 3]
+        assert days[-1]['nutrition']['calories'] == 3 * 2 * 250.0
+        assert days[0]['nutrition'] == {}
+        assert data['total_meals'] == 9
+        assert data['weekly_average']['calories'] == 1500.0
+        assert len(statements) <= 2, statements
+
+
+class TestDailyNutritionRollup:
+    """일일 합계 테이블 갱신, 점검, 재구축 테스트"""
+
+    def test_unrelated_bulk_statement_ignored(self, app, uid):
+        """음식을 조건에만 쓰는 다른 테이블의 일괄 실행은 일일 합계를 건드리지 않음"""
+        other = User(email='other@test.com', password='password', name='다른 사용자')
+        db.session.add(other)
+        db.session.commit()
+        add_meals(uid, TARGET_DATE, 1)
+        add_meals(other.uid, TARGET_DATE, 1)
+        other_version = user_cache.get_version(other.uid)
+
+        # WHERE 절에만 food 테이블이 나오는 daily_nutrition UPDATE
+        db.session.execute(
+            update(DailyNutrition)
+            .where(DailyNutrition.uid == uid, DailyNutrition.meal_count.in_(db.select(Food.mid)))
+            .values(meal_count=DailyNutrition.meal_count)
+        )
+        db.session.commit()
+
+        assert not [key for key in db.session.info if key.startswith('daily_nutrition_')]
+        assert user_cache.get_version(other.uid) == other_version
+
+    def test_bulk_food_delete(self, app, uid):
+        """Query.delete()로 음식을 지우면 그 식사의 날짜 합계만 갱신"""
+        add_meals(uid, TARGET_DATE, 2)
+        mid = Meal.query.filter_by(uid=uid).first().mid
+
+        Food.query.filter(Food.mid == mid).delete()
+        db.session.commit()
+
+        row = db.session.get(DailyNutrition, (uid, TARGET_DATE))
+        assert (row.meal_count, row.resolved_food_count, row.calories) == (2, 2, 500.0)
+        assert check_daily_nutrition_consistency(uid) == []
+
+    def test_consistency_check_and_rebuild(self, app, uid):
+        """손상된 합계 행을 점검에서 찾고 재구축으로 복구"""
+        add_meals(uid, TARGET_DATE, 2)
+        add_meals(uid, TARGET_DATE - timedelta(days=1), 1)
+        assert check_daily_nutrition_consistency(uid) == []
+
+        table = DailyNutrition.__table__
+        db.session.execute(table.update().where(table.c.date == TARGET_DATE).values(calories=1.0))
+        db.session.execute(table.delete().where(table.c.date == TARGET_DATE - timedelta(days=1)))
+        db.session.execute(table.insert().values(uid=uid, date=TARGET_DATE + timedelta(days=1), meal_count=1))
+        db.session.commit()
+
+        problems = {problem['date']: problem for problem in check_daily_nutrition_consistency(uid)}
+        assert problems[str(TARGET_DATE)]['problem'] == 'mismatch'
+        assert problems[str(TARGET_DATE)]['fields']['calories'] == {'stored': 1.0, 'expected': 1000.0}
+        assert problems[str(TARGET_DATE - timedelta(days=1))]['problem'] == 'missing'
+        assert problems[str(TARGET_DATE + timedelta(days=1))]['problem'] == 'orphan'
+
+        assert rebuild_daily_nutrition(uid) == 2
+        assert check_daily_nutrition_consistency(uid) == []
+        assert db.session.get(DailyNutrition, (uid, TARGET_DATE)).calories == 1000.0
@@ -0,0 +1,119 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.extensions import db
+from models.meal import Meal
+from models.recommendation import Recommendation
+from database.repositories.recommendation_repository import RecommendationRepository
+from utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+START_DATE = date(2026, 3, 1)
+
+
+def add_meals(uid, count):
+    """하루에 두 끼씩 식사 기록 추가 (같은 날짜가 있어야 mid 보조 키가 검증됨)"""
+    for index in range(count):
+        db.session.add(Meal(uid=uid, meal_time='점심', content=f'식사 {index}',
+                            date=START_DATE + timedelta(days=index // 2)))
+    db.session.commit()
+
+
+def add_recommendations(uid, count):
+    for index in range(count):
+        db.session.add(Recommendation(uid=uid, reason=f'추천 {index}'))
+    db.session.commit()
+
+
+def walk(client, url, key, next_key):
+    """next_cursor를 따라 마지막 페이지까지 조회"""
+    items, cursor, pages = [], '', 0
+    while cursor is not None:
+        body = client.get(f'{url}&cursor={cursor}').get_json()
+        body = body.get('data', body)
+        items.extend(body[key])
+        cursor = next_key(body)
+        pages += 1
+    return items, pages
+
+
+class TestCursorToken:
+    """커서 토큰 인코딩 테스트"""
+
+    def test_round_trip(self):
+        """날짜와 정수 키가 같은 값으로 복원됨"""
+        token = encode_cursor([START_DATE, 42])
+        assert decode_cursor(token, (Meal.date, Meal.mid)) == [START_DATE, 42]
+
+    @pytest.mark.parametrize('token', ['not-a-cursor', encode_cursor([1]), encode_cursor(['x', 1])])
+    def test_invalid_token(self, token):
+        """형식이나 키 개수가 맞지 않으면 InvalidCursorError"""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(token, (Meal.date, Meal.mid))
+
+
+class TestMealCursorPagination:
+    """식사 목록 키셋 페이징 테스트"""
+
+    def test_cursor_pages_match_offset_order(self, client, uid):
+        """커서를 따라 읽은 결과가 기존 page/limit 결과와 같은 순서이고 중복/누락이 없음"""
+        add_meals(uid, 11)
+
+        by_cursor, pages = walk(client, '/api/meals/?sort_by=date&limit=4', 'meals',
+                                lambda body: body['next_cursor'])
+        by_page = []
+        for page in range(1, 4):
+            by_page.extend(client.get(f'/api/meals/?sort_by=date&limit=4&page={page}').get_json()['meals'])
+
+        assert pages == 3
+        assert [meal['mid'] for meal in by_cursor] == [meal['mid'] for meal in by_page]
+        assert len({meal['mid'] for meal in by_cursor}) == 11
+
+    def test_total_is_optional(self, client, uid):
+        """키셋 조회는 기본적으로 전체 개수를 세지 않고 include_total로 요청 가능"""
+        add_meals(uid, 3)
+
+        assert client.get('/api/meals/?cursor=').get_json()['total'] is None
+        assert client.get('/api/meals/?cursor=&include_total=true').get_json()['total'] == 3
+        assert client.get('/api/meals/?page=1').get_json()['total'] == 3
+
+    def test_invalid_cursor(self, client, uid):
+        """잘못된 커서는 400"""
+        response = client.get('/api/meals/?cursor=garbage')
+        assert response.status_code == 400
+
+
+class TestRecommendationCursorPagination:
+    """추천 히스토리 키셋 페이징 테스트"""
+
+    def test_history_cursor(self, client, uid):
+        """rid 내림차순으로 모든 추천을 한 번씩 반환"""
+        add_recommendations(uid, 7)
+
+        items, pages = walk(client, '/api/recommendations/history?limit=3', 'recommendations',
+                            lambda body: body['pagination']['next_cursor'])
+
+        rids = [item['rid'] for item in items]
+        assert pages == 3
+        assert rids == sorted(rids, reverse=True) and len(set(rids)) == 7
+
+    def test_history_page_mode_unchanged(self, client, uid):
+        """기존 page/limit 응답 형식 유지"""
+        add_recommendations(uid, 5)
+
+        data = client.get('/api/recommendations/history?limit=2&page=3').get_json()['data']
+        assert len(data['recommendations']) == 1
+        assert data['pagination'] == {'total_count': 5, 'total_pages': 3, 'current_page': 3, 'limit': 2}
+
+    def test_repository_cursor(self, app, uid):
+        """BaseRepository.paginate_by_cursor가 기본 키 순서로 페이지를 나눔"""
+        add_recommendations(uid, 5)
+        repository = RecommendationRepository()
+
+        first = repository.paginate_by_cursor(per_page=3, uid=uid)
+        second = repository.paginate_by_cursor(cursor=first['next_cursor'], per_page=3, uid=uid)
+
+        assert first['has_next'] and not second['has_next']
+        assert [rec.rid for rec in first['items'] + second['items']] == \
+            sorted((rec.rid for rec in first['items'] + second['items']), reverse=True)
+        assert len(second['items']) == 2
@@ -0,0 +1,100 @@
+import json
+from datetime import datetime, date
+
+from flask.json.provider import DefaultJSONProvider
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from models.recommendation import Recommendation
+from utils.fast_json import FastJSONProvider
+from utils.serializers import (
+    meal_list_options, serialize_meals, meal_row_columns, serialize_meal_rows,
+    recommendation_row_columns, serialize_recommendation_rows
+)
+
+
+def add_data(uid):
+    """이미지/음식 유무와 추천 내용 형식이 다양한 기록 추가"""
+    with_image = Meal(uid=uid, meal_time='점심', content='김치 식사', date=date(2026, 3, 2))
+    with_image.image = b'\x89PNG'
+    with_path = Meal(uid=uid, meal_time='저녁', date=date(2026, 3, 3), image_path='uploads/a.png')
+    empty = Meal(uid=uid, meal_time='아침', date=date(2026, 3, 4))
+    db.session.add_all([with_image, with_path, empty])
+    db.session.flush()
+
+    db.session.add(Food(mid=with_image.mid, food_name='김치찌개', nutrition_info={'calories': 250.0, 'protein': 15.0, 'serving': '1인분'}))
+    db.session.add(Food(mid=with_image.mid, food_name='공기밥'))
+    db.session.add(Food(mid=with_path.mid, food_name='비빔밥', category='밥', nutrition_info={'calories': 550.0}))
+
+    db.session.add(Recommendation(uid=uid, reason='JSON', content='{"recipe": "두부조림", "steps": [1, 2]}'))
+    db.session.add(Recommendation(uid=uid, reason='텍스트', content='그냥 문장'))
+    db.session.add(Recommendation(uid=uid, reason='없음'))
+    db.session.commit()
+    db.session.expunge_all()
+
+
+class TestRowProjections:
+    """프로젝션 직렬화 결과가 ORM 직렬화 결과와 같은지 확인"""
+
+    def test_meal_rows_match_orm(self, app, uid):
+        add_data(uid)
+        meals = Meal.query.options(*meal_list_options()).filter_by(uid=uid).order_by(Meal.mid).all()
+        rows = db.session.query(*meal_row_columns()).filter(Meal.uid == uid).order_by(Meal.mid).all()
+
+        assert serialize_meal_rows(rows) == serialize_meals(meals)
+        assert [meal['has_image'] for meal in serialize_meal_rows(rows)] == [True, True, False]
+
+        # 영양소 컬럼에 없는 키도 Food.to_dict()처럼 그대로 포함
+        foods = [food for meal in serialize_meal_rows(rows) for food in meal['foods']]
+        assert foods == [food.to_dict() for meal in meals for food in meal.foods]
+        assert foods[0]['nutrition_info']['serving'] == '1인분'
+
+    def test_recommendation_rows_match_to_dict(self, app, uid):
+        add_data(uid)
+        recommendations = Recommendation.query.filter_by(uid=uid).order_by(Recommendation.rid).all()
+        rows = db.session.query(*recommendation_row_columns()) \
+            .filter(Recommendation.uid == uid).order_by(Recommendation.rid).all()
+
+        assert serialize_recommendation_rows(rows) == [rec.to_dict() for rec in recommendations]
+
+
+class TestFastJSONProvider:
+    """orjson 제공자가 Flask 기본 제공자와 같은 JSON을 만드는지 확인"""
+
+    def test_same_output_as_default(self, app):
+        data = {
+            'b': [1, 2.5, None, True],
+            'a': {'이름': '김치', 'x': 3},
+            'when': datetime(2026, 3, 2, 12, 30),
+            'day': date(2026, 3, 2)
+        }
+        fast = FastJSONProvider(app)
+        fast.ensure_ascii = False
+        default = DefaultJSONProvider(app)
+
+        assert json.loads(fast.dumps(data)) == json.loads(default.dumps(data))
+        assert list(json.loads(fast.dumps(data))) == ['a', 'b', 'day', 'when']
+        assert fast.loads(fast.dumps(data)) == default.loads(default.dumps(data))
+
+    def test_ensure_ascii(self, app):
+        """ensure_ascii가 True이면 기본 구현과 같은 문자열, False이면 UTF-8 그대로 출력"""
+        data = {'name': '김치', 'value': float('nan')}
+        fast = FastJSONProvider(app)
+        default = DefaultJSONProvider(app)
+
+        assert fast.ensure_ascii is True
+        assert fast.dumps(data) == default.dumps(data) == '{"name": "\\uae40\\uce58", "value": NaN}'
+
+        fast.ensure_ascii = False
+        # orjson은 NaN을 표준 JSON인 null로 출력
+        assert fast.dumps(data) == '{"name":"김치","value":null}'
+
+    def test_response(self, app):
+        """앱 응답은 orjson 제공자로 한글을 UTF-8 그대로 직렬화"""
+        assert isinstance(app.json, FastJSONProvider) and app.json.ensure_ascii is False
+        with app.test_request_context():
+            response = app.json.response({'a': '김치'})
+        assert response.mimetype == 'application/json'
+        assert json.loads(response.get_data()) == {'a': '김치'}
+        assert '김치'.encode('utf-8') in response.get_data()
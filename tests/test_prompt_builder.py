@@ -0,0 +1,97 @@
+import json
+import logging
+from datetime import date
+
+from app.extensions import db
+from models.user import User
+from utils.prompt_builder import (
+    compact_json, user_profile_fields, nutrition_context_fields, fit_prompt_sections, prompt_token_stats,
+    TRUNCATION_MARK
+)
+from utils.tokenizer import count_tokens
+from tests.test_chatbot_pipeline import build_chatbot, CountingChatModel, REPLY
+
+
+class ModelUserRepository:
+    """DB의 User 모델을 그대로 반환하는 사용자 저장소"""
+
+    def get_user(self, user_id):
+        return db.session.get(User, int(user_id))
+
+
+class PromptCapturingChatModel(CountingChatModel):
+    prompts: list = []
+
+    def _call(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(messages[-1].content)
+        return super()._call(messages, stop, run_manager, **kwargs)
+
+
+class TestPromptBuilder:
+    """프롬프트에는 필요한 필드만 간결하게, 섹션별 토큰 예산 적용"""
+
+    def test_compact_json(self):
+        value = {'total_calories': 812.0, 'total_fat': 20.456, 'memo': None, 'tags': [], 'name': '현미밥'}
+        assert compact_json(value) == '{"total_calories":812,"total_fat":20.5,"name":"현미밥"}'
+
+    def test_user_model_profile(self, app, uid):
+        user = db.session.get(User, uid)
+        user.birth = date(1990, 1, 1)
+        user.health_goal = '체중 감량'
+
+        profile = user_profile_fields(user)
+        assert profile == {'name': '테스트', 'age': user.calculate_age(), 'health_goal': '체중 감량'}
+        assert user_profile_fields({'name': '홍길동', 'password': 'x'}) == {'name': '홍길동'}
+
+    def test_nutrition_context(self):
+        context = {
+            'daily_nutrition': {'total_calories': 800, 'total_protein': 30},
+            'nutrition_insights': {'total_calories': 800, 'insights': ['총 칼로리: 800kcal']}
+        }
+        assert nutrition_context_fields(context) == {
+            'daily_nutrition': {'total_calories': 800, 'total_protein': 30},
+            'insights': ['총 칼로리: 800kcal']
+        }
+        assert nutrition_context_fields({}) == {}
+
+    def test_budgets_and_accounting(self, caplog):
+        prompt_token_stats(reset=True)
+        long_message = '단백질 섭취를 늘리고 싶은데 ' * 100
+
+        with caplog.at_level(logging.INFO, logger='utils.prompt_builder'):
+            inputs = fit_prompt_sections('test.site', {'user_message': long_message, 'health_goal': None},
+                                         {'user_message': 50})
+
+        assert inputs['user_message'].endswith(TRUNCATION_MARK)
+        assert count_tokens(inputs['user_message']) <= 50
+        assert inputs['health_goal'] == ''
+        assert '프롬프트 토큰 [test.site]' in caplog.text and 'user_message' in caplog.text
+
+        stats = prompt_token_stats()['test.site']
+        assert stats['calls'] == 1 and stats['truncated'] == 1
+        assert stats['tokens'] == count_tokens(inputs['user_message'])
+
+
+class TestChatbotPrompt:
+    def test_user_model_prompt(self, app, uid):
+        """User 모델의 내부 상태와 비밀번호 해시는 프롬프트에 들어가지 않음"""
+        user = db.session.get(User, uid)
+        user.health_goal = '근육 증가'
+        db.session.commit()
+
+        chatbot = build_chatbot()
+        chatbot.user_repository = ModelUserRepository()
+        chatbot.structured_llm = chatbot.llm = PromptCapturingChatModel(
+            responses=[json.dumps(REPLY, ensure_ascii=False)], prompts=[]
+        )
+        prompt_token_stats(reset=True)
+        chatbot.process_message(str(uid), '단백질 보충제 먹어도 돼?')
+
+        prompt = chatbot.llm.prompts[0]
+        assert '_sa_instance_state' not in prompt and user.password not in prompt
+        assert '{"name":"테스트"}' in prompt and '건강 목표: 근육 증가' in prompt
+        assert '"daily_nutrition":{"total_calories":800' in prompt
+
+        old_profile = json.dumps(user.__dict__, ensure_ascii=False, default=str)
+        assert count_tokens(old_profile) > 3 * count_tokens('{"name":"테스트"}')
+        assert prompt_token_stats()['chatbot.process_message']['tokens'] == count_tokens(prompt)
@@ -0,0 +1,119 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from models.allergy import Allergy
+from models.recommendation import Recommendation
+from models.chatbot import Chatbot
+from database.repositories.meal_repository import MealRepository
+from database.repositories.food_repository import FoodRepository
+from database.repositories.allergy_repository import AllergyRepository
+from database.repositories.recommendation_repository import RecommendationRepository
+from database.repositories.chatbot_repository import ChatbotRepository
+
+# 인덱스 없이 전체를 읽으면 안 되는 테이블
+HOT_TABLES = ('meal', 'food', 'allergy', 'recommendation', 'chatbot')
+FULL_SCAN = re.compile(r'^SCAN (%s)\b' % '|'.join(HOT_TABLES))
+
+TODAY = datetime.now().date()
+WEEK_AGO = TODAY - timedelta(days=7)
+NOW = datetime.now()
+
+# 사용자 범위 저장소 조회 (이름, 호출 함수). 사용자 조건이 없는 전체 통계와
+# LIKE '%키워드%' 전체 검색(FoodRepository.search_foods)은 B-tree 인덱스 대상이 아니므로 제외한다.
+REPOSITORY_QUERIES = [
+    ('meal.get_user_meals', lambda uid, mid: MealRepository().get_user_meals(uid, WEEK_AGO, TODAY)),
+    ('meal.get_today_meals', lambda uid, mid: MealRepository().get_today_meals(uid)),
+    ('meal.get_weekly_meals', lambda uid, mid: MealRepository().get_weekly_meals(uid)),
+    ('meal.get_meal_stats', lambda uid, mid: MealRepository().get_meal_stats(uid, WEEK_AGO, TODAY)),
+    ('food.get_foods_by_meal', lambda uid, mid: FoodRepository().get_foods_by_meal(mid)),
+    ('food.get_most_common_foods', lambda uid, mid: FoodRepository().get_most_common_foods(uid)),
+    ('food.get_average_calories_by_category', lambda uid, mid: FoodRepository().get_average_calories_by_category(uid)),
+    ('food.get_nutrition_stats', lambda uid, mid: FoodRepository().get_nutrition_stats(uid)),
+    ('allergy.get_user_allergies', lambda uid, mid: AllergyRepository().get_user_allergies(uid)),
+    ('allergy.check_existing_allergy', lambda uid, mid: AllergyRepository().check_existing_allergy(uid, '땅콩')),
+    ('recommendation.get_user_recommendations', lambda uid, mid: RecommendationRepository().get_user_recommendations(uid)),
+    ('recommendation.get_recent_recommendations', lambda uid, mid: RecommendationRepository().get_recent_recommendations(uid)),
+    ('recommendation.get_meal_recommendations', lambda uid, mid: RecommendationRepository().get_meal_recommendations(uid, mid)),
+    ('recommendation.get_recommendations_by_date',
+     lambda uid, mid: RecommendationRepository().get_recommendations_by_date(uid, NOW - timedelta(days=7), NOW)),
+    ('recommendation.search_recommendations', lambda uid, mid: RecommendationRepository().search_recommendations(uid, '두부')),
+    ('chatbot.get_user_conversation_history', lambda uid, mid: ChatbotRepository().get_user_conversation_history(uid)),
+    ('chatbot.get_recent_conversations', lambda uid, mid: ChatbotRepository().get_recent_conversations(uid)),
+    ('chatbot.get_conversations_by_date',
+     lambda uid, mid: ChatbotRepository().get_conversations_by_date(uid, NOW - timedelta(days=7), NOW)),
+    ('chatbot.search_conversations', lambda uid, mid: ChatbotRepository().search_conversations(uid, '단백질'))
+]
+
+
+@pytest.fixture
+def seeded(app, uid):
+    """각 테이블에 사용자 데이터 추가 (식사 ID 반환)"""
+    meal = Meal(uid=uid, meal_time='점심', content='두부 정식', date=TODAY)
+    db.session.add(meal)
+    db.session.flush()
+    food = Food(mid=meal.mid, food_name='두부조림', category='반찬', calories=120.0)
+    db.session.add(food)
+    db.session.flush()
+    db.session.add(Allergy(uid=uid, allergy_name='땅콩'))
+    db.session.add(Recommendation(uid=uid, mid=meal.mid, fid=food.fid, reason='단백질 보충'))
+    db.session.add(Chatbot(uid=uid, query='단백질 많은 음식은?', response='두부를 추천합니다.'))
+    db.session.commit()
+    return meal.mid
+
+
+def capture_selects(func):
+    """함수 실행 중 실행된 SELECT 문과 파라미터 수집"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        func()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return captured
+
+
+def query_plan(statement, parameters):
+    """EXPLAIN QUERY PLAN 결과의 detail 목록"""
+    with db.engine.connect() as connection:
+        rows = connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+    return [row[-1] for row in rows]
+
+
+class TestQueryPlans:
+    """저장소 쿼리가 인덱스를 사용하는지 확인 (전체 테이블 스캔이면 실패)"""
+
+    @pytest.mark.parametrize('name, call', REPOSITORY_QUERIES, ids=[name for name, _ in REPOSITORY_QUERIES])
+    def test_repository_query_uses_index(self, app, uid, seeded, name, call):
+        """사용자/식사 조건 조회는 인덱스 검색으로 실행됨"""
+        statements = capture_selects(lambda: call(uid, seeded))
+        assert statements, f'{name}: 실행된 SELECT 문이 없습니다.'
+
+        for statement, parameters in statements:
+            plan = query_plan(statement, parameters)
+            scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+            assert not scans, f'{name}: 전체 테이블 스캔 {scans}\n{statement}'
+
+    def test_hot_path_indexes_exist(self, app):
+        """모델에 선언한 인덱스가 생성됨"""
+        expected = {
+            'meal': {'ix_meal_uid_date'},
+            'food': {'ix_food_mid'},
+            'allergy': {'ix_allergy_uid'},
+            'recommendation': {'ix_recommendation_uid_rid'},
+            'chatbot': {'ix_chatbot_uid_timestamp'}
+        }
+        inspector = db.inspect(db.engine)
+        for table, indexes in expected.items():
+            names = {index['name'] for index in inspector.get_indexes(table)}
+            assert indexes <= names, f'{table}: {names}'
@@ -0,0 +1,227 @@
+import json
+import threading
+
+import pytest
+
+from app.extensions import db
+from models.allergy import Allergy
+from models.recipe import Recipe
+from services import service_manager
+from services.food_database import FoodDatabaseService
+from services.recommendation import RecommendationService
+from services.recipe_engine import RecipeEngine, allergen_keywords, contains_allergens, normalize_ingredient
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """임시 식품 DB와 기본 레시피 데이터를 사용하는 레시피 엔진"""
+    return RecipeEngine(FoodDatabaseService(db_path=str(tmp_path / 'food.db')))
+
+
+class FakeRAGService:
+    """요청마다 고정된 LLM 레시피를 반환하는 RAG 서비스 대역"""
+
+    def __init__(self, recipes):
+        self.recipes = recipes
+        self.calls = []
+
+    def get_recipe_recommendations(self, query, limit=3):
+        self.calls.append((query, limit))
+        return {'recipes': json.dumps({'recipes': self.recipes}, ensure_ascii=False)}
+
+
+class TestRecipeEngine:
+    """로컬 레시피 엔진의 필터와 정렬 확인"""
+
+    def test_allergens_excluded(self, engine):
+        """알레르기 재료(관련 재료 포함)가 들어간 레시피는 제외"""
+        keywords = allergen_keywords(['계란'])
+        assert {'계란', '달걀', '마요네즈'} <= set(keywords)
+
+        recipes = engine.recommend(allergies=['계란', '대두'], limit=200)
+        assert recipes
+        assert not any(contains_allergens(recipe['ingredients'], allergen_keywords(['계란', '대두']))
+                       for recipe in recipes)
+        assert all(recipe['source'] == 'local' for recipe in recipes)
+
+    def test_filters_and_ranking(self, engine):
+        """재료, 건강 목표, 영양 조건으로 걸러지고 점수 순으로 정렬"""
+        recipes = engine.recommend(ingredients=['두부'], limit=200)
+        assert recipes and all(any('두부' in item for item in recipe['ingredients']) for recipe in recipes)
+
+        diet = engine.recommend(health_goal='다이어트', meal_type='아침', max_calories=300, limit=10)
+        assert diet and all(recipe['calories'] <= 300 for recipe in diet)
+        assert [recipe['score'] for recipe in diet] == sorted((recipe['score'] for recipe in diet), reverse=True)
+
+        protein = engine.recommend(health_goal='단백질 섭취', min_protein=30, limit=10)
+        assert protein and all(recipe['protein'] >= 30 for recipe in protein)
+
+        assert engine.recommend(ingredients=['존재하지않는재료']) == []
+
+    def test_added_recipes_are_indexed(self, engine):
+        """LLM 레시피를 추가하면 다음 검색부터 요청 조건으로 찾음"""
+        count = len(engine)
+        added = engine.add([{'title': '귀리 죽', 'ingredients': ['귀리', '우유'], 'instructions': '끓인다'}],
+                           meal_type='아침', health_goal='장 건강')
+
+        assert added == 1 and len(engine) == count + 1
+        recipes = engine.recommend(ingredients=['귀리'], meal_type='아침', health_goal='장 건강')
+        assert [recipe['title'] for recipe in recipes] == ['귀리 죽']
+        assert recipes[0]['tags'] == ['아침'] and recipes[0]['health_goals'] == ['장 건강']
+        assert engine.recommend(ingredients=['귀리'], allergies=['우유']) == []
+
+        # 같은 제목은 다시 저장하지 않음
+        assert engine.add([{'title': '귀리 죽', 'ingredients': ['귀리'], 'instructions': '끓인다'}]) == 0
+
+
+class TestIngredientIndex:
+    """보유 재료 검색 (재료 역색인과 보유 비율 점수) 확인"""
+
+    @pytest.fixture
+    def pantry_engine(self, tmp_path):
+        food_db = FoodDatabaseService(db_path=str(tmp_path / 'pantry.db'))
+        food_db.add_recipes([
+            {'title': '두부조림', 'ingredients': ['두부 1모', '간장', '다진 마늘', '대파'], 'instructions': '졸인다'},
+            {'title': '두부김치', 'ingredients': ['두부', '김치', '돼지고기', '참기름'], 'instructions': '볶는다'},
+            {'title': '계란말이', 'ingredients': ['달걀(3개)', '당근', '소금'], 'instructions': '만다'},
+            {'title': '김치전', 'ingredients': ['김치', '밀가루', '식용유'], 'instructions': '부친다'}
+        ])
+        return RecipeEngine(food_db, corpus_path=None)
+
+    def test_normalize_ingredient(self):
+        assert normalize_ingredient('다진 마늘') == '마늘'
+        assert normalize_ingredient('두부 1모') == '두부'
+        assert normalize_ingredient('달걀(2개)') == '계란'
+        assert normalize_ingredient('채 썬 양파') == '양파'
+        assert normalize_ingredient('비타민C 음료') == '비타민c 음료'
+
+    def test_coverage_ranking(self, pantry_engine):
+        """주재료 보유 비율 순, 같으면 없는 기본 재료가 적은 순"""
+        recipes = pantry_engine.cook_with(['두부', '김치', '간장', '마늘', '대파'])
+
+        assert [recipe['title'] for recipe in recipes] == ['두부조림', '두부김치', '김치전']
+        assert recipes[0]['coverage'] == 1.0 and recipes[0]['missing_staples'] == []
+        assert recipes[1]['coverage'] == pytest.approx(2 / 3, abs=0.001)
+        assert recipes[1]['missing'] == ['돼지고기'] and recipes[1]['missing_staples'] == ['참기름']
+        assert recipes[2]['missing'] == ['밀가루'] and recipes[2]['score'] == pytest.approx(0.45)
+
+        # 같은 재료의 다른 이름, 최소 보유 비율, 알레르기
+        assert [recipe['title'] for recipe in pantry_engine.cook_with(['계란', '당근'])] == ['계란말이']
+        assert [recipe['title'] for recipe in pantry_engine.cook_with(['김치'], min_coverage=0.5)] == ['김치전']
+        assert [recipe['title'] for recipe in pantry_engine.cook_with(['김치'], allergies=['밀'])] == ['두부김치']
+        assert pantry_engine.cook_with(['소금', '간장']) == []
+
+    def test_incremental_add(self, pantry_engine, monkeypatch):
+        """add()로 저장한 레시피는 전체 다시 로드 없이 인덱스에 추가됨"""
+        pantry_engine.cook_with(['두부'])
+        loads = []
+        get_recipes = pantry_engine.food_db.get_recipes
+        monkeypatch.setattr(pantry_engine.food_db, 'get_recipes', lambda: loads.append(1) or get_recipes())
+
+        pantry_engine.add([{'title': '두부 스테이크', 'ingredients': ['두부', '양파'], 'instructions': '굽는다'}])
+        recipes = pantry_engine.cook_with(['두부', '양파'])
+
+        assert recipes[0]['title'] == '두부 스테이크'
+        assert loads == []
+
+    def test_add_keeps_published_snapshot(self, pantry_engine):
+        """add()는 새 스냅샷으로 교체하고 검색 중인 기존 스냅샷은 바꾸지 않음"""
+        before = pantry_engine._snapshot()
+        tofu = before.postings['두부']
+
+        pantry_engine.add([{'title': '두부 스테이크', 'ingredients': ['두부', '양파'], 'instructions': '굽는다'}])
+
+        assert pantry_engine._snapshot() is not before
+        assert before.postings['두부'] is tofu and len(tofu) == 2
+        assert len(before.recipes) == 4 and '양파' not in before.postings
+        assert len(pantry_engine._snapshot().postings['두부']) == 3
+
+    def test_food_changes_do_not_reload(self, pantry_engine, monkeypatch):
+        """식품 추가는 레시피 테이블 버전을 바꾸지 않아 인덱스를 다시 로드하지 않음"""
+        pantry_engine.cook_with(['두부'])
+        loads = []
+        get_recipes = pantry_engine.food_db.get_recipes
+        monkeypatch.setattr(pantry_engine.food_db, 'get_recipes', lambda: loads.append(1) or get_recipes())
+
+        assert pantry_engine.food_db.add_food({'name': '귀리', 'calories': 380})
+        pantry_engine.cook_with(['두부'])
+        assert loads == []
+
+    def test_search_during_reload(self, pantry_engine):
+        """다시 로드하는 동안 검색해도 한 스냅샷만 읽어 오류 없이 같은 결과를 반환"""
+        expected = [recipe['title'] for recipe in pantry_engine.cook_with(['두부', '김치'])]
+        errors, results = [], []
+        done = threading.Event()
+
+        def search():
+            try:
+                while not done.is_set():
+                    results.append([recipe['title'] for recipe in pantry_engine.cook_with(['두부', '김치'])])
+                    pantry_engine.recommend(ingredients=['두부'])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=search) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for _ in range(50):
+            pantry_engine.refresh()
+            pantry_engine._snapshot()
+        done.set()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert results and all(titles == expected for titles in results)
+
+    def test_service_uses_index_before_llm(self, pantry_engine, monkeypatch):
+        """보유 재료 추천은 로컬 결과가 충분하면 RAG를 호출하지 않음"""
+        rag = FakeRAGService([])
+        monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+        service = RecommendationService(pantry_engine.food_db, rag, pantry_engine)
+
+        recipes = service.get_recipe_recommendations(ingredients=['김치', '두부'], limit=2)
+        assert [recipe['title'] for recipe in recipes] == ['두부조림', '두부김치']
+        assert rag.calls == []
+
+
+class TestRecipeEndpoint:
+    """레시피 추천 API는 로컬 결과가 부족할 때만 LLM을 호출"""
+
+    @pytest.fixture
+    def rag(self, app, engine, monkeypatch):
+        rag = FakeRAGService([
+            {'음식명': '퀴노아 볼', '재료': ['퀴노아', '아보카도'], '조리법': '섞는다'},
+            {'음식명': '땅콩 퀴노아', '재료': ['퀴노아', '땅콩'], '조리법': '볶는다'}
+        ])
+        service_manager._services['recipe_engine'] = engine
+        service_manager._services['rag_service'] = rag
+        monkeypatch.setenv('OPENAI_API_KEY', 'sk-test')
+        service_manager._services['recommendation'] = RecommendationService(engine.food_db, rag)
+        return rag
+
+    def test_local_results_skip_llm(self, client, rag):
+        response = client.get('/api/recommendations/recipes?ingredients=두부&limit=3')
+        recipes = response.get_json()['data']['recipes']
+
+        assert response.status_code == 200
+        assert len(recipes) == 3 and all(recipe['source'] == 'local' for recipe in recipes)
+        assert rag.calls == []
+
+    def test_llm_fills_gap_and_is_cached(self, client, uid, rag):
+        db.session.add(Allergy(uid=uid, allergy_name='땅콩'))
+        db.session.commit()
+
+        url = '/api/recommendations/recipes?ingredients=퀴노아&limit=2&meal_type=점심'
+        recipes = client.get(url).get_json()['data']['recipes']
+
+        # 알레르기 재료가 들어간 LLM 레시피는 제외되고 부족한 수만큼만 요청
+        assert [(recipe['title'], recipe['source']) for recipe in recipes] == [('퀴노아 볼', 'ai')]
+        assert len(rag.calls) == 1 and rag.calls[0][1] == 2
+        assert '땅콩' in rag.calls[0][0]
+        assert [recipe.title for recipe in Recipe.query.all()] == ['퀴노아 볼']
+
+        # 다음 요청은 로컬 인덱스에서 찾음 (결과가 여전히 부족하면 다시 요청)
+        recipes = client.get(url + '&ai=false').get_json()['data']['recipes']
+        assert [(recipe['title'], recipe['source']) for recipe in recipes] == [('퀴노아 볼', 'local')]
+        assert len(rag.calls) == 1
@@ -0,0 +1,173 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.extensions import db, cache
+from models.user import User
+from models.meal import Meal
+from models.food import Food
+from models.recipe import Recipe
+from services import search_index, user_cache
+from services.recipe_suggestions import recipe_suggestions
+from utils.serializers import meal_row_columns
+from tests.test_query_plans import capture_selects, query_plan, FULL_SCAN
+
+
+def add_meal(uid, content, *food_names, day=date(2026, 3, 2)):
+    meal = Meal(uid=uid, meal_time='점심', content=content, date=day)
+    db.session.add(meal)
+    db.session.flush()
+    for name in food_names:
+        db.session.add(Food(mid=meal.mid, food_name=name))
+    db.session.commit()
+    return meal.mid
+
+
+def meal_ids(uid, query):
+    return [row.mid for row in search_index.search_meals(uid, query, meal_row_columns())]
+
+
+def food_names(uid, query):
+    return [row.food_name for row in search_index.search_foods(uid, query)]
+
+
+class TestSearchIndex:
+    """FTS 검색 결과가 부분 문자열 검색(LIKE)과 같고 변경 시 색인이 갱신되는지 확인"""
+
+    def test_substring_match(self, app, uid):
+        """단어 중간의 검색어와 한 글자 검색어도 찾음"""
+        kimchi = add_meal(uid, '김치찌개와 공기밥', '김치찌개', '공기밥')
+        add_meal(uid, '된장찌개', '된장찌개')
+
+        assert search_index.is_available()
+        assert set(meal_ids(uid, '찌개')) == {kimchi, kimchi + 1}
+        assert meal_ids(uid, '김치찌') == [kimchi]
+        assert meal_ids(uid, '치찌개') == [kimchi]
+        assert meal_ids(uid, '공기 김치') == [kimchi]
+        assert meal_ids(uid, '된장국') == []
+        assert sorted(food_names(uid, '밥')) == ['공기밥']
+
+    def test_user_isolation(self, app, uid):
+        """다른 사용자의 식사/음식은 검색되지 않음"""
+        other = User(email='other@test.com', password='password', name='다른 사용자')
+        db.session.add(other)
+        db.session.commit()
+        add_meal(other.uid, '김치찌개', '김치찌개')
+
+        assert meal_ids(uid, '김치') == []
+        assert food_names(uid, '김치') == []
+        assert len(meal_ids(other.uid, '김치')) == 1
+
+    def test_index_follows_writes(self, app, uid):
+        """수정, 삭제, 일괄 삭제, 롤백이 색인에 반영됨"""
+        mid = add_meal(uid, '김치찌개', '김치찌개')
+
+        meal = db.session.get(Meal, mid)
+        meal.content = '비빔밥'
+        meal.foods[0].food_name = '비빔밥'
+        db.session.commit()
+        assert meal_ids(uid, '김치') == [] and meal_ids(uid, '비빔') == [mid]
+        assert food_names(uid, '비빔') == ['비빔밥']
+
+        db.session.get(Meal, mid).content = '불고기'
+        db.session.rollback()
+        assert meal_ids(uid, '비빔') == [mid]
+
+        Food.query.filter_by(mid=mid).delete()
+        db.session.commit()
+        assert food_names(uid, '비빔') == []
+
+        db.session.delete(db.session.get(Meal, mid))
+        db.session.commit()
+        assert meal_ids(uid, '비빔') == []
+
+    def test_refresh_leaves_no_stale_state(self, app, uid):
+        """색인 갱신 문장은 다시 추적되지 않아 다음 커밋에서 전체 재색인/캐시 무효화가 일어나지 않음"""
+        other = User(email='other@test.com', password='password', name='다른 사용자')
+        db.session.add(other)
+        db.session.commit()
+        add_meal(other.uid, '된장찌개', '된장찌개')
+        mid = add_meal(uid, '김치찌개', '김치찌개')
+        other_version = user_cache.get_version(other.uid)
+
+        db.session.get(Meal, mid).content = '김치볶음밥'
+        db.session.commit()
+        assert db.session.info == {}
+
+        # 관계없는 커밋 후에도 다른 사용자의 캐시 버전은 그대로
+        db.session.add(Recipe(title='비빔밥', ingredients='밥, 나물', instructions='섞는다'))
+        db.session.commit()
+        assert db.session.info == {}
+        assert user_cache.get_version(other.uid) == other_version
+        assert meal_ids(uid, '볶음') == [mid]
+
+    def test_recipes_and_rebuild(self, app, uid):
+        """레시피는 제목과 재료로 검색되며 재구축 후에도 같은 결과"""
+        db.session.add(Recipe(title='두부조림', ingredients='두부, 간장, 파', instructions='졸인다'))
+        db.session.add(Recipe(title='계란말이', ingredients='계란, 파', instructions='만다'))
+        db.session.commit()
+        add_meal(uid, '두부 정식', '두부조림')
+
+        assert [recipe['title'] for recipe in search_index.search_recipes('간장')] == ['두부조림']
+        assert [recipe['title'] for recipe in search_index.search_recipes('파')] == ['계란말이', '두부조림']
+
+        db.session.execute(text('DELETE FROM recipe_search'))
+        db.session.commit()
+        assert search_index.search_recipes('간장') == []
+
+        assert search_index.rebuild_search_index(batch_size=1) == {'meal_search': 1, 'food_search': 1, 'recipe_search': 2}
+        assert [recipe['title'] for recipe in search_index.search_recipes('간장')] == ['두부조림']
+        assert len(meal_ids(uid, '두부')) == 1
+
+    def test_match_uses_index(self, app, uid):
+        """검색은 사용자 식사/음식을 전체 검색하지 않고 FTS 결과의 기본 키로 조회"""
+        add_meal(uid, '김치찌개', '김치찌개')
+        statements = capture_selects(lambda: (meal_ids(uid, '찌개'), food_names(uid, '찌개')))
+        assert len(statements) == 2
+
+        for statement, parameters in statements:
+            plan = query_plan(statement, parameters)
+            assert any('VIRTUAL TABLE INDEX' in detail for detail in plan), plan
+            assert not any(FULL_SCAN.match(detail) for detail in plan), f'{plan}\n{statement}'
+
+
+class TestSearchEndpoint:
+    """통합 검색 API는 LLM을 기다리지 않고 AI 레시피 제안은 요청한 경우에만 백그라운드에서 생성"""
+
+    def test_no_llm_by_default(self, client, uid, monkeypatch):
+        calls = []
+        monkeypatch.setattr('services.recommendation.search_recipes', lambda query, limit=5: calls.append(query))
+        add_meal(uid, '김치찌개', '김치찌개')
+
+        response = client.get('/api/main/search?q=찌개')
+        body = response.get_json()['data']
+
+        assert response.status_code == 200
+        assert [meal['content'] for meal in body['meals']] == ['김치찌개']
+        assert [food['food_name'] for food in body['foods']] == ['김치찌개']
+        assert 'ai_recipes' not in body
+        assert calls == []
+
+    def test_ai_recipes_polling(self, client, uid, monkeypatch):
+        calls = []
+
+        def fake_search(query, limit=5):
+            calls.append(query)
+            return [{'title': f'{query} 레시피'}]
+
+        monkeypatch.setattr('services.recommendation.search_recipes', fake_search)
+        cache.clear()
+
+        body = client.get('/api/main/search?q=두부&ai_recipes=true').get_json()['data']
+        assert body['ai_recipes']['status'] in ('pending', 'done')
+        poll_url = body['ai_recipes']['poll_url']
+
+        recipe_suggestions.join()
+        result = client.get(poll_url).get_json()['data']
+        assert result['status'] == 'done'
+        assert result['recipes'] == [{'title': '두부 레시피'}]
+
+        # 같은 검색어는 캐시된 제안을 사용
+        client.get('/api/main/search?q=두부&ai_recipes=true')
+        recipe_suggestions.join()
+        assert calls == ['두부']
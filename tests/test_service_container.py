@@ -0,0 +1,139 @@
+import os
+import sys
+import time
+import threading
+import subprocess
+
+import pytest
+
+# 프로젝트 루트 경로 추가
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import services
+import services.food_database
+import services.rag_service
+import services.nutrition_analysis
+import services.recommendation
+import services.food_recognition
+import services.food_recognition_service
+from services import service_manager
+
+
+class FakeRAGService:
+    """임베딩/벡터 저장소를 만들지 않는 RAG 서비스 대역"""
+
+    def __init__(self, openai_api_key: str, **kwargs):
+        time.sleep(0.01)  # 생성 비용이 있는 객체처럼 동작
+        self.openai_api_key = openai_api_key
+
+    def is_initialized(self) -> bool:
+        return True
+
+    def query_food_info(self, query: str) -> str:
+        return ""
+
+    def get_nutrition_insights(self, query: str, top_k: int = 3):
+        return {"answer": "", "query": query}
+
+
+@pytest.fixture
+def construction_counts(monkeypatch, tmp_path):
+    """비용이 큰 서비스 클래스의 생성 횟수 집계"""
+    counts = {}
+
+    def count(module, name, base, init=None):
+        counts[name] = 0
+
+        class Counted(base):
+            def __init__(self, *args, **kwargs):
+                counts[name] += 1
+                if init:
+                    init(self, *args, **kwargs)
+                else:
+                    super().__init__(*args, **kwargs)
+
+        monkeypatch.setattr(module, name, Counted)
+
+    food_db_class = services.food_database.FoodDatabaseService
+    count(services.food_database, "FoodDatabaseService", food_db_class,
+          init=lambda self, *a, **k: food_db_class.__init__(self, db_path=str(tmp_path / "food.db")))
+    count(services.rag_service, "RAGService", FakeRAGService)
+    count(services.nutrition_analysis, "NutritionAnalysisService",
+          services.nutrition_analysis.NutritionAnalysisService)
+    count(services.recommendation, "RecommendationService", services.recommendation.RecommendationService)
+    count(services.food_recognition_service, "FoodRecognitionService",
+          services.food_recognition_service.FoodRecognitionService)
+
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    service_manager.reset()
+    yield counts
+    service_manager.reset()
+
+
+class TestServiceContainer:
+    """애플리케이션 범위 서비스 컨테이너 테스트"""
+
+    def test_import_does_not_construct_services(self):
+        """패키지/래퍼 모듈 임포트만으로는 서비스가 생성되지 않음 (API 키 없이도 임포트 가능)"""
+        env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+        code = (
+            "import services.food_recognition, services.recommendation, services.nutrition_analysis\n"
+            "from services import service_manager\n"
+            "assert service_manager._services == {}, service_manager._services\n"
+        )
+        project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+        result = subprocess.run([sys.executable, "-c", code], cwd=project_root, env=env,
+                                capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
+    def test_service_manager_is_singleton(self):
+        """ServiceManager는 프로세스 내에서 하나"""
+        assert services.ServiceManager() is service_manager
+
+    def test_wrappers_share_single_instances(self, construction_counts):
+        """래퍼 함수를 여러 번 호출해도 각 서비스는 한 번만 생성됨"""
+        for _ in range(3):
+            services.nutrition_analysis.analyze_meal_nutrition(["존재하지않는음식"])
+            services.nutrition_analysis.get_nutrition_insights({"calories": 500})
+            services.rag_service.get_nutritional_research("단백질")
+            services.recommendation.generate_food_alternatives("김치")
+            services.recommendation.search_recipes("두부")
+            services.food_recognition.recognize_food_from_image(None)
+
+        assert construction_counts == {
+            "FoodDatabaseService": 1,
+            "RAGService": 1,
+            "NutritionAnalysisService": 1,
+            "RecommendationService": 1,
+            "FoodRecognitionService": 1
+        }
+
+    def test_services_share_dependencies(self, construction_counts):
+        """기능 서비스는 같은 식품 DB/RAG 인스턴스를 주입받음"""
+        nutrition = service_manager.get_service('nutrition')
+        recommendation = service_manager.get_service('recommendation')
+        recognition = service_manager.get_service('recognition')
+
+        assert nutrition.food_db is recommendation.food_db is recognition.food_db is service_manager.food_db
+        assert nutrition.rag_service is recommendation.rag_service is service_manager.rag_service
+        assert services.food_db is service_manager.food_db
+
+    def test_concurrent_access_constructs_once(self, construction_counts):
+        """동시에 처음 접근해도 한 번만 생성됨"""
+        results = []
+
+        def access():
+            results.append(service_manager.rag_service)
+
+        threads = [threading.Thread(target=access) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert construction_counts["RAGService"] == 1
+        assert all(result is results[0] for result in results)
+
+    def test_unknown_service_name(self):
+        """알 수 없는 서비스 이름은 None 반환"""
+        assert service_manager.get_service('unknown') is None
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+from langchain.docstore.document import Document
+
+from utils.text_chunking import DocumentChunker, SimHashIndex, simhash, hamming_distance
+from utils.tokenizer import count_tokens
+
+FOODS = ['현미밥', '김치찌개', '두부조림', '닭가슴살', '고등어구이', '시금치나물', '미역국', '계란말이', '잡곡밥', '된장국']
+
+
+def sentences(seed, count):
+    """같은 seed면 같은 문장 목록 (서로 다른 seed는 겹치는 단어 조합이 거의 없음)"""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(FOODS)} {rng.randint(1, 9)}인분은 단백질 {rng.randint(5, 40)}g 탄수화물 {rng.randint(10, 90)}g 문장{seed}-{i}."
+        for i in range(count)
+    ]
+
+
+class TestDocumentChunker:
+    def test_token_budget_and_overlap(self):
+        """청크는 토큰 예산을 넘지 않고 이웃 청크와 일부가 겹침"""
+        chunker = DocumentChunker(chunk_size=60, chunk_overlap=15)
+        text = ' '.join(sentences(1, 40))
+        chunks, fingerprints, stats = chunker.split_documents([Document(page_content=text, metadata={'source': 'a'})])
+
+        assert len(chunks) > 3 and stats['kept_chunks'] == len(chunks) == len(fingerprints)
+        assert all(count_tokens(chunk.page_content) <= 60 for chunk in chunks)
+        assert all(chunk.metadata['source'] == 'a' for chunk in chunks)
+        for previous, current in zip(chunks, chunks[1:]):
+            head = current.page_content.split()[0]
+            assert head in previous.page_content.split()[-8:]
+
+    def test_near_duplicates_dropped(self):
+        """한 단어만 다른 문서는 중복으로 병합되고 다른 문서는 유지"""
+        chunker = DocumentChunker(chunk_size=2000, chunk_overlap=0)
+        base = ' '.join(sentences(2, 12))
+        words = base.split()
+        words[len(words) // 2] = '바뀐단어'
+        documents = [
+            Document(page_content=base),
+            Document(page_content=' '.join(words)),
+            Document(page_content='  '.join(base.split())),
+            Document(page_content=' '.join(sentences(3, 12)))
+        ]
+
+        chunks, fingerprints, stats = chunker.split_documents(documents)
+
+        assert [chunk.page_content for chunk in chunks] == [base, documents[3].page_content]
+        assert chunks[0].metadata['duplicate_count'] == 2
+        assert (stats['batch_duplicates'], stats['index_duplicates'], stats['eliminated_percent']) == (2, 0, 50.0)
+
+    def test_committed_fingerprints_persisted(self, tmp_path):
+        """커밋한 지문은 파일에 저장되어 다음 실행에서 기존 색인 중복으로 제거"""
+        path = str(tmp_path / 'fingerprints.json')
+        document = Document(page_content=' '.join(sentences(4, 10)))
+
+        chunker = DocumentChunker(chunk_size=2000, fingerprint_path=path)
+        chunks, fingerprints, _ = chunker.split_documents([document])
+        assert len(chunks) == 1
+        chunker.commit(fingerprints)
+
+        reloaded = DocumentChunker(chunk_size=2000, fingerprint_path=path)
+        assert not reloaded.is_empty()
+        chunks, _, stats = reloaded.split_documents([document, Document(page_content=' '.join(sentences(5, 10)))])
+        assert len(chunks) == 1 and stats['index_duplicates'] == 1
+
+
+class TestSimHashIndex:
+    def test_find_near(self):
+        fingerprint = simhash(' '.join(sentences(6, 10)))
+        index = SimHashIndex(max_distance=3)
+        index.add(fingerprint)
+
+        assert index.find_near(fingerprint ^ 0b111) == fingerprint
+        # 서로 다른 밴드의 비트를 바꿔 거리 4가 되면 찾지 않음
+        far = fingerprint ^ (1 | 1 << 16 | 1 << 32 | 1 << 48)
+        assert hamming_distance(far, fingerprint) == 4 and index.find_near(far) is None
+
+        with pytest.raises(ValueError):
+            SimHashIndex(max_distance=4)
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete
+
+from app.extensions import db
+from models.user import User
+from models.meal import Meal
+from models.food import Food
+from models.allergy import Allergy
+from models.daily_nutrition import DailyNutrition
+from models.insight_snapshot import InsightSnapshot
+from services import user_cache
+
+
+def add_meal(uid, food_name='김치찌개'):
+    meal = Meal(uid=uid, meal_time='점심', date=datetime.now().date())
+    db.session.add(meal)
+    db.session.flush()
+    food = Food(mid=meal.mid, food_name=food_name, nutrition_info={'calories': 250.0})
+    db.session.add(food)
+    db.session.commit()
+    return meal.mid, food.fid
+
+
+def dashboard_meals(client):
+    return client.get('/api/main/dashboard').get_json()['data']['today_meals']
+
+
+class TestUserCacheVersion:
+    """사용자 캐시 버전 갱신 테스트"""
+
+    def test_version_bumped_on_commit(self, app, uid):
+        """식사/음식/알레르기/프로필 변경이 커밋되면 버전이 바뀜"""
+        mid, fid = add_meal(uid)
+        changes = [
+            lambda: db.session.add(Meal(uid=uid, meal_time='저녁', date=datetime.now().date())),
+            lambda: setattr(db.session.get(Food, fid), 'food_name', '된장찌개'),
+            lambda: db.session.add(Allergy(uid=uid, allergy_name='땅콩')),
+            lambda: setattr(db.session.get(User, uid), 'health_goal', '체중 감량'),
+            lambda: Allergy.query.filter_by(uid=uid).delete()
+        ]
+        for change in changes:
+            before = user_cache.get_version(uid)
+            change()
+            db.session.commit()
+            assert user_cache.get_version(uid) != before
+
+    def test_first_snapshot_bumps_version(self, app, uid):
+        """사용자의 첫 인사이트 스냅샷 저장도 버전을 바꿈"""
+        before = user_cache.get_version(uid)
+        today = datetime.now().date()
+        db.session.add(InsightSnapshot(uid=uid, period_start=today - timedelta(days=6), period_end=today))
+        db.session.commit()
+        assert user_cache.get_version(uid) != before
+
+    def test_rollback_keeps_version(self, app, uid):
+        """롤백된 변경은 버전을 바꾸지 않음"""
+        before = user_cache.get_version(uid)
+        db.session.add(Allergy(uid=uid, allergy_name='우유'))
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+        assert user_cache.get_version(uid) == before
+
+    def test_other_users_unaffected(self, app, uid):
+        """다른 사용자의 변경은 버전에 영향 없음"""
+        other = User(email='other@test.com', password='password', name='다른 사용자')
+        db.session.add(other)
+        db.session.commit()
+
+        before = user_cache.get_version(uid)
+        add_meal(other.uid)
+        assert user_cache.get_version(uid) == before
+
+    def test_bulk_statement_on_other_table(self, app, uid):
+        """사용자 테이블을 하위 쿼리에만 쓰는 다른 테이블의 일괄 삭제는 다른 사용자 버전을 바꾸지 않음"""
+        other = User(email='other@test.com', password='password', name='다른 사용자')
+        db.session.add(other)
+        db.session.commit()
+        add_meal(other.uid)
+        before = user_cache.get_version(uid)
+
+        table = DailyNutrition.__table__
+        db.session.execute(delete(table).where(table.c.uid.in_(select(User.uid).where(User.email == 'other@test.com'))))
+        db.session.commit()
+        assert user_cache.get_version(uid) == before
+
+
+class TestCachedViews:
+    """버전 키로 캐시된 화면 API 테스트"""
+
+    def test_dashboard_invalidated_by_meal_write(self, client, uid):
+        """캐시된 대시보드는 식사가 추가/삭제되면 바로 새 데이터를 반환"""
+        add_meal(uid)
+        assert len(dashboard_meals(client)) == 1
+
+        mid, _ = add_meal(uid, '비빔밥')
+        assert len(dashboard_meals(client)) == 2
+
+        Food.query.filter_by(mid=mid).delete()
+        Meal.query.filter_by(mid=mid).delete()
+        db.session.commit()
+        assert len(dashboard_meals(client)) == 1
+
+    def test_weekly_invalidated_by_food_edit(self, client, uid):
+        """음식 영양 정보가 바뀌면 주간 분석 캐시도 무효화"""
+        _, fid = add_meal(uid)
+        first = client.get('/api/nutrition/weekly').get_json()['data']
+        assert first['daily_nutrition'][-1]['nutrition']['calories'] == 250.0
+
+        db.session.get(Food, fid).update_nutrition_info({'calories': 400.0})
+        db.session.commit()
+
+        second = client.get('/api/nutrition/weekly').get_json()['data']
+        assert second['daily_nutrition'][-1]['nutrition']['calories'] == 400.0
+
+    def test_hit_rate_stats(self, client, uid, count_statements):
+        """반복 요청은 캐시에서 응답하고 엔드포인트별 적중률이 기록됨"""
+        client.get('/api/main/dashboard')
+        with count_statements() as statements:
+            client.get('/api/main/dashboard')
+            client.get('/api/main/dashboard')
+        # JWT 사용자 조회만 실행됨
+        assert len(statements) == 2, statements
+
+        stats = client.get('/api/main/cache-stats').get_json()['data']['endpoints']
+        assert stats['dashboard']['hits'] == 2
+        assert stats['dashboard']['misses'] == 1
+        assert stats['dashboard']['hit_rate'] == round(2 / 3, 4)
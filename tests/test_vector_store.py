@@ -0,0 +1,104 @@
+import sys
+import types
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from services.vector_store import NumpyVectorStore, create_vector_store, CHROMA_FILE
+
+# 단어별 임베딩 축 (문서 임베딩은 포함된 단어 축의 합)
+AXES = ['김치', '찌개', '샐러드', '단백질']
+
+
+class KeywordEmbeddings(Embeddings):
+    """단어 포함 여부로 임베딩을 만드는 결정적 임베딩 모델 (호출 횟수 기록)"""
+
+    def __init__(self):
+        self.document_calls = 0
+
+    def _embed(self, text):
+        return [float(text.count(word)) for word in AXES]
+
+    def embed_documents(self, texts):
+        self.document_calls += 1
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+
+TEXTS = ['김치찌개 김치', '된장찌개', '닭가슴살 샐러드 단백질', '김치 샐러드']
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = NumpyVectorStore(str(tmp_path / 'vectors'), KeywordEmbeddings())
+    store.add_texts(TEXTS, [{'index': i} for i in range(len(TEXTS))], ids=[f'doc{i}' for i in range(len(TEXTS))])
+    return store
+
+
+class TestNumpyVectorStore:
+    def test_search_ordering(self, store):
+        """코사인 유사도 내림차순으로 반환"""
+        results = store.similarity_search_with_score('김치', k=3)
+
+        assert [doc.id for doc, _ in results[:2]] == ['doc0', 'doc3']
+        assert [score for _, score in results] == pytest.approx([2 / 5 ** 0.5, 1 / 2 ** 0.5, 0.0], abs=1e-6)
+        assert results[1][0].metadata == {'index': 3} and results[1][0].page_content == '김치 샐러드'
+        assert len(store.similarity_search('김치', k=10)) == len(TEXTS)
+        assert store.similarity_search('단백질', k=1)[0].page_content == '닭가슴살 샐러드 단백질'
+
+    def test_reopen(self, store, tmp_path):
+        """같은 디렉토리를 다시 열면 저장된 벡터와 문서를 그대로 사용"""
+        reopened = NumpyVectorStore(store.persist_directory, KeywordEmbeddings())
+
+        assert len(reopened) == len(TEXTS)
+        assert reopened.get() == store.get()
+        assert reopened.similarity_search('샐러드 단백질', k=1)[0].id == 'doc2'
+
+        reopened.add_texts(['김치찌개'], ids=['doc4'])
+        assert NumpyVectorStore(store.persist_directory, KeywordEmbeddings()).get()['ids'][-1] == 'doc4'
+        with pytest.raises(ValueError):
+            reopened.add_embeddings(['차원 오류'], [[1.0, 0.0]])
+
+    def test_empty_store(self, tmp_path):
+        store = NumpyVectorStore(str(tmp_path / 'empty'), KeywordEmbeddings())
+        assert len(store) == 0 and store.similarity_search('김치') == []
+
+
+class TestCreateVectorStore:
+    def test_shared_instance(self, tmp_path):
+        directory = str(tmp_path / 'shared')
+        assert create_vector_store(directory, KeywordEmbeddings()) is create_vector_store(directory, KeywordEmbeddings())
+        with pytest.raises(ValueError):
+            create_vector_store(str(tmp_path / 'other'), KeywordEmbeddings(), backend='faiss')
+
+    def test_migrate_from_chroma(self, tmp_path, monkeypatch):
+        """기존 Chroma 색인의 임베딩을 재임베딩 없이 복사"""
+        directory = tmp_path / 'chroma'
+        directory.mkdir()
+        (directory / CHROMA_FILE).write_bytes(b'')
+
+        class FakeChroma:
+            def __init__(self, persist_directory, embedding_function):
+                self.persist_directory = persist_directory
+
+            def get(self, include):
+                return {
+                    'ids': ['a', 'b'],
+                    'documents': ['김치찌개', '샐러드'],
+                    'metadatas': [{'source': 'chroma'}, None],
+                    'embeddings': [[1.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0]]
+                }
+
+        monkeypatch.setitem(sys.modules, 'langchain_chroma', types.SimpleNamespace(Chroma=FakeChroma))
+        embeddings = KeywordEmbeddings()
+        store = create_vector_store(str(directory), embeddings, backend='numpy')
+
+        assert store.get() == {
+            'ids': ['a', 'b'],
+            'documents': ['김치찌개', '샐러드'],
+            'metadatas': [{'source': 'chroma'}, {}]
+        }
+        assert embeddings.document_calls == 0
+        assert store.similarity_search('샐러드', k=1)[0].id == 'b'
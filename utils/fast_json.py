@@ -0,0 +1,80 @@
+"""
+빠른 JSON 인코딩/디코딩
+
+orjson이 설치되어 있으면 사용하고 없으면 표준 json 모듈로 동작한다.
+FastJSONProvider는 Flask 기본 JSON 제공자의 키 정렬(sort_keys)과 날짜 형식(HTTP 날짜)을 따른다.
+
+orjson은 비 ASCII 문자를 이스케이프하지 못하므로 ensure_ascii가 True(Flask 기본값)이면
+기본 구현을 그대로 사용하고, False일 때만 orjson으로 UTF-8 출력을 만든다.
+orjson 경로에서 NaN/Infinity는 null로 출력된다 (기본 구현은 JSON 표준이 아닌 NaN/Infinity를 출력).
+"""
+import json
+from typing import Any
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # requirements.txt에 포함되어 있으나 없는 환경에서도 동작
+    orjson = None
+
+
+def loads(text) -> Any:
+    """
+    JSON 문자열(또는 UTF-8 바이트) 디코딩
+
+    Raises:
+        ValueError: JSON 형식이 아닌 경우 (json.JSONDecodeError, orjson.JSONDecodeError 모두 ValueError의 하위 클래스)
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson을 사용하는 Flask JSON 제공자
+
+    ensure_ascii가 True이거나 indent/separators 외의 json.dumps 인자가 주어지면 기본 구현을 사용한다.
+    """
+
+    def _orjson_enabled(self) -> bool:
+        return orjson is not None and not self.ensure_ascii
+
+    def _options(self, indent: bool) -> int:
+        # 날짜/데이터클래스는 Flask 기본 변환(default)을 그대로 사용
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def _dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=self._options(indent))
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not self._orjson_enabled() or set(kwargs) - {'indent', 'separators'}:
+            return super().dumps(obj, **kwargs)
+        try:
+            return self._dumps_bytes(obj, bool(kwargs.get('indent'))).decode('utf-8')
+        except TypeError:
+            # 64비트를 넘는 정수 등 orjson이 지원하지 않는 값
+            return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        if not self._orjson_enabled():
+            return super().response(*args, **kwargs)
+
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = self._dumps_bytes(obj, indent)
+        except TypeError:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(body + b'\n', mimetype=self.mimetype)
@@ -0,0 +1,129 @@
+"""
+키셋(커서) 페이지네이션
+
+OFFSET은 앞 페이지의 행을 모두 읽고 버리므로 깊은 페이지일수록 느려진다.
+키셋 방식은 마지막 항목의 정렬 키를 커서로 넘겨 다음 페이지를 인덱스 범위 검색으로 읽는다.
+커서는 정렬 키 값을 base64로 인코딩한 불투명 문자열이다.
+"""
+import json
+import base64
+from datetime import date, datetime
+from typing import List, Tuple, Any, Optional, Sequence
+
+from sqlalchemy import and_, or_
+
+
+class InvalidCursorError(ValueError):
+    """잘못된 커서 토큰"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    if value is None:
+        return None
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    정렬 키 값을 커서 토큰으로 인코딩
+
+    Args:
+        values (Sequence[Any]): 정렬 키 값 (정렬 컬럼 순서)
+
+    Returns:
+        str: 커서 토큰
+    """
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str, columns: Sequence[Any]) -> List[Any]:
+    """
+    커서 토큰을 정렬 키 값으로 디코딩
+
+    Args:
+        token (str): 커서 토큰
+        columns (Sequence[Any]): 정렬 컬럼 (값 타입 변환용)
+
+    Returns:
+        List[Any]: 정렬 키 값
+
+    Raises:
+        InvalidCursorError: 토큰 형식이 올바르지 않은 경우
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError('정렬 키 개수가 맞지 않습니다.')
+        return [_decode_value(column, value) for column, value in zip(columns, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f'잘못된 커서입니다: {token}') from e
+
+
+def _after(columns: Sequence[Any], values: Sequence[Any], descending: bool):
+    """(c1, c2, ...) 가 커서 값 뒤에 오는 조건 (c1 < v1) OR (c1 = v1 AND c2 < v2) ..."""
+    conditions = []
+    for index, column in enumerate(columns):
+        compare = column < values[index] if descending else column > values[index]
+        equal = [columns[i] == values[i] for i in range(index)]
+        conditions.append(and_(*equal, compare))
+    return or_(*conditions)
+
+
+def keyset_page(query, columns: Sequence[Any], limit: int, cursor: Optional[str] = None,
+                descending: bool = True) -> Tuple[List[Any], Optional[str]]:
+    """
+    키셋 방식으로 한 페이지 조회
+
+    Args:
+        query: 필터가 적용된 ORM 쿼리 (정렬은 이 함수에서 적용)
+        columns (Sequence[Any]): 정렬 컬럼 (마지막 컬럼은 고유해야 함, 예: (Meal.date, Meal.mid))
+        limit (int): 페이지 크기
+        cursor (Optional[str]): 이전 페이지의 next_cursor (None이면 첫 페이지)
+        descending (bool): 내림차순 여부
+
+    Returns:
+        Tuple[List[Any], Optional[str]]: (항목 목록, 다음 페이지 커서 또는 None)
+
+    Raises:
+        InvalidCursorError: 커서 토큰이 올바르지 않은 경우
+    """
+    if cursor:
+        query = query.filter(_after(columns, decode_cursor(cursor, columns), descending))
+
+    order = [column.desc() if descending else column.asc() for column in columns]
+    items = query.order_by(None).order_by(*order).limit(limit + 1).all()
+
+    if len(items) <= limit:
+        return items, None
+
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor([getattr(last, column.key) for column in columns])
+
+
+def parse_include_total(value: Optional[str]) -> Optional[bool]:
+    """
+    include_total 요청 파라미터 해석
+
+    Args:
+        value (Optional[str]): 요청 값 ('true', '1', 'false', '0' 등)
+
+    Returns:
+        Optional[bool]: 지정하지 않았으면 None (조회 방식별 기본값 사용)
+    """
+    if value is None or value == '':
+        return None
+    return value.strip().lower() in ('1', 'true', 'yes')
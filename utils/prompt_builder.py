@@ -0,0 +1,168 @@
+"""
+LLM 프롬프트 입력 구성과 토큰 계산
+
+프롬프트에는 템플릿이 사용하는 필드만 간결한 형식으로 넣는다.
+(User 객체의 __dict__를 그대로 넣으면 _sa_instance_state, 비밀번호 해시,
+생성/수정 시각처럼 답변에 필요 없는 값까지 들어간다)
+
+fit_prompt_sections()는 섹션별 토큰 예산을 넘는 입력을 자르고,
+호출 위치별로 프롬프트 토큰 수를 기록한다.
+"""
+import json
+import logging
+import threading
+from typing import Dict, Any, Optional, Iterable
+
+from utils.tokenizer import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 상담 프롬프트에 넣는 사용자 프로필 필드 (순서 유지)
+USER_PROFILE_FIELDS = ('name', 'gender', 'age', 'height', 'weight', 'allergies', 'health_goal')
+
+# 예산을 넘어 잘린 섹션 끝에 붙이는 표시
+TRUNCATION_MARK = " …(생략)"
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _compact_value(value: Any) -> Any:
+    """빈 값을 제거하고 실수는 소수점 한 자리로 반올림"""
+    if isinstance(value, dict):
+        compacted = {key: _compact_value(item) for key, item in value.items()}
+        return {key: item for key, item in compacted.items() if item not in (None, '', [], {})}
+    if isinstance(value, (list, tuple)):
+        return [_compact_value(item) for item in value if item not in (None, '', [], {})]
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else round(value, 1)
+    return value
+
+
+def compact_json(value: Any) -> str:
+    """
+    프롬프트용 간결한 JSON (공백 없는 구분자, 빈 값 제거, 실수 반올림)
+
+    Args:
+        value (Any): 직렬화할 값
+
+    Returns:
+        str: JSON 문자열
+    """
+    return json.dumps(_compact_value(value), ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def user_profile_fields(user: Any, fields: Iterable[str] = USER_PROFILE_FIELDS) -> Dict[str, Any]:
+    """
+    사용자 객체(User 모델, 저장소 객체, 딕셔너리)에서 프롬프트에 필요한 필드만 추출
+
+    Args:
+        user (Any): 사용자
+        fields (Iterable[str]): 추출할 필드
+
+    Returns:
+        Dict[str, Any]: 값이 있는 필드만 담은 딕셔너리
+    """
+    if user is None:
+        return {}
+
+    profile = {}
+    for field in fields:
+        value = user.get(field) if isinstance(user, dict) else getattr(user, field, None)
+        # User 모델은 나이를 생년월일로 계산
+        if field == 'age' and value is None and callable(getattr(user, 'calculate_age', None)):
+            value = user.calculate_age()
+        if value not in (None, '', [], {}):
+            profile[field] = value
+    return profile
+
+
+def nutrition_context_fields(nutrition_context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    챗봇 영양 컨텍스트에서 프롬프트에 필요한 값만 추출 (중복 합계 제외)
+
+    Args:
+        nutrition_context (Optional[Dict[str, Any]]): {"daily_nutrition", "nutrition_insights"}
+
+    Returns:
+        Dict[str, Any]: {"daily_nutrition": 영양소 합계, "insights": 인사이트 문장 목록}
+    """
+    if not nutrition_context:
+        return {}
+
+    insights = nutrition_context.get('nutrition_insights') or {}
+    return {
+        'daily_nutrition': nutrition_context.get('daily_nutrition') or {},
+        'insights': insights.get('insights') if isinstance(insights, dict) else insights
+    }
+
+
+def fit_prompt_sections(
+        call_site: str,
+        sections: Dict[str, Any],
+        budgets: Optional[Dict[str, int]] = None,
+        template: Any = None
+) -> Dict[str, str]:
+    """
+    프롬프트 입력을 섹션별 토큰 예산에 맞추고 토큰 수 기록
+
+    Args:
+        call_site (str): 호출 위치 (로그/통계 키, 예: "chatbot.process_message")
+        sections (Dict[str, Any]): 템플릿 변수 → 값 (문자열이 아니면 문자열로 변환)
+        budgets (Optional[Dict[str, int]]): 템플릿 변수 → 최대 토큰 수 (없는 변수는 제한 없음)
+        template: PromptTemplate (주어지면 템플릿 문구를 포함한 전체 프롬프트 토큰 수 계산)
+
+    Returns:
+        Dict[str, str]: 예산에 맞춘 템플릿 입력
+    """
+    budgets = budgets or {}
+    inputs: Dict[str, str] = {}
+    section_tokens: Dict[str, int] = {}
+    truncated = []
+
+    for name, value in sections.items():
+        text = value if isinstance(value, str) else str(value if value is not None else "")
+        tokens = count_tokens(text)
+        budget = budgets.get(name)
+        if budget is not None and tokens > budget:
+            text = truncate_tokens(text, max(budget - count_tokens(TRUNCATION_MARK), 0)) + TRUNCATION_MARK
+            tokens = count_tokens(text)
+            truncated.append(name)
+        inputs[name] = text
+        section_tokens[name] = tokens
+
+    total = sum(section_tokens.values())
+    if template is not None:
+        try:
+            total = count_tokens(template.format(**inputs))
+        except Exception as e:
+            logger.debug(f"프롬프트 전체 토큰 계산 실패 ({call_site}): {str(e)}")
+
+    with _stats_lock:
+        stats = _stats.setdefault(call_site, {'calls': 0, 'tokens': 0, 'max_tokens': 0, 'truncated': 0})
+        stats['calls'] += 1
+        stats['tokens'] += total
+        stats['max_tokens'] = max(stats['max_tokens'], total)
+        stats['truncated'] += bool(truncated)
+
+    detail = ", ".join(f"{name}={tokens}" for name, tokens in section_tokens.items())
+    logger.info(f"프롬프트 토큰 [{call_site}] 총 {total} ({detail})"
+                + (f", 예산 초과로 자름: {', '.join(truncated)}" if truncated else ""))
+    return inputs
+
+
+def prompt_token_stats(reset: bool = False) -> Dict[str, Dict[str, int]]:
+    """
+    호출 위치별 프롬프트 토큰 통계 (프로세스 내 누적)
+
+    Args:
+        reset (bool): 조회 후 통계 초기화 여부
+
+    Returns:
+        Dict[str, Dict[str, int]]: 호출 위치 → {"calls", "tokens", "max_tokens", "truncated"}
+    """
+    with _stats_lock:
+        snapshot = {call_site: dict(stats) for call_site, stats in _stats.items()}
+        if reset:
+            _stats.clear()
+    return snapshot
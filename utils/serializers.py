@@ -0,0 +1,242 @@
+"""
+목록 API용 직렬화 함수와 로더 옵션
+
+모델의 to_dict()는 관계를 지연 로딩하므로, 여러 행을 반환하는 목록 API는
+meal_list_options()로 필요한 데이터를 미리 로드한 뒤 이 모듈의 직렬화 함수로 변환한다.
+
+읽기 전용 목록 API는 *_row_columns()로 필요한 컬럼만 행 튜플로 조회하고
+serialize_*_rows()로 변환하는 경로를 사용한다 (ORM 객체 생성과 날짜 변환 생략).
+"""
+from typing import List, Dict, Any, Optional
+
+from sqlalchemy import inspect, select, type_coerce, String
+from sqlalchemy.orm import selectinload, defer, with_expression
+
+from app.extensions import db
+from models.meal import Meal
+from models.food import Food
+from models.recommendation import Recommendation
+from utils import fast_json
+
+
+def meal_list_options() -> List[Any]:
+    """
+    식사 목록 쿼리의 로더 옵션
+
+    - foods: selectinload로 한 번의 IN 쿼리에서 모든 식사의 음식 로드
+    - Meal.image(BLOB): 지연 로딩 (목록에서는 사용하지 않음)
+    - Meal.image_exists: 이미지 존재 여부만 SQL로 계산
+
+    Returns:
+        List[Any]: Query.options()에 전달할 로더 옵션 목록
+    """
+    return [
+        defer(Meal.image),
+        with_expression(Meal.image_exists, Meal.image.isnot(None)),
+        selectinload(Meal.foods)
+    ]
+
+
+def serialize_food(food: Food) -> Dict[str, Any]:
+    """
+    음식 목록 항목 (Food.to_dict()와 같은 형식)
+
+    Args:
+        food (Food): 음식
+
+    Returns:
+        Dict[str, Any]: 음식 정보
+    """
+    return {
+        'fid': food.fid,
+        'mid': food.mid,
+        'food_name': food.food_name,
+        'category': food.category,
+        'calories': food.calories,
+        'nutrition_info': _nutrition_info(food.nutrition_info),
+        'created_at': food.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated_at': food.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
+def _nutrition_info(text: Optional[str]) -> Dict[str, Any]:
+    """
+    저장된 영양 정보 JSON 파싱 (Food.get_nutrition_info()와 같은 결과)
+
+    영양소 컬럼에 없는 키(예: 1회 제공량)도 응답에 포함되어야 하므로 컬럼 값이 아닌 저장된 JSON을 사용한다.
+    """
+    if not text:
+        return {}
+    try:
+        return fast_json.loads(text)
+    except ValueError:
+        return {}
+
+
+def _has_image(meal: Meal) -> bool:
+    if meal.image_path:
+        return True
+    if 'image' in inspect(meal).unloaded and meal.image_exists is not None:
+        return bool(meal.image_exists)
+    return meal.image is not None
+
+
+def serialize_meal(meal: Meal) -> Dict[str, Any]:
+    """
+    식사 목록 항목 (Meal.to_dict()와 같은 키, 미리 로드된 foods 사용)
+
+    Args:
+        meal (Meal): meal_list_options()로 조회한 식사
+
+    Returns:
+        Dict[str, Any]: 식사 정보
+    """
+    return {
+        'mid': meal.mid,
+        'uid': meal.uid,
+        'date': meal.date.strftime('%Y-%m-%d'),
+        'meal_time': meal.meal_time,
+        'content': meal.content,
+        'has_image': _has_image(meal),
+        'image_path': meal.image_path,
+        'created_at': meal.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'updated_at': meal.updated_at.strftime('%Y-%m-%d %H:%M:%S'),
+        'foods': [serialize_food(food) for food in meal.foods]
+    }
+
+
+def serialize_meals(meals: List[Meal]) -> List[Dict[str, Any]]:
+    """식사 목록 직렬화"""
+    return [serialize_meal(meal) for meal in meals]
+
+
+def _raw(column):
+    """
+    컬럼 값을 DB 문자열 그대로 조회 (SQLite는 날짜/시각을 문자열로 저장하므로 datetime 변환을 생략)
+
+    다른 DB 드라이버는 날짜 객체를 반환하며 _timestamp/_date가 두 경우를 모두 처리한다.
+    """
+    return type_coerce(column, String).label(column.key)
+
+
+def _timestamp(value) -> Optional[str]:
+    """'%Y-%m-%d %H:%M:%S' 형식 시각 문자열"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:19]
+    return value.isoformat(' ', 'seconds')
+
+
+def _date(value) -> Optional[str]:
+    """'%Y-%m-%d' 형식 날짜 문자열"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value[:10]
+    return value.isoformat()
+
+
+def meal_row_columns() -> List[Any]:
+    """
+    식사 목록 프로젝션 컬럼 (이미지 BLOB 대신 존재 여부만 조회)
+
+    Returns:
+        List[Any]: select()/session.query()에 전달할 컬럼 목록
+    """
+    return [
+        Meal.mid, Meal.uid, Meal.meal_time, Meal.content, Meal.image_path,
+        Meal.image.isnot(None).label('image_exists'),
+        _raw(Meal.date), _raw(Meal.created_at), _raw(Meal.updated_at)
+    ]
+
+
+def _food_rows(meal_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    """식사별 음식 목록 (한 번의 IN 쿼리)"""
+    foods = {mid: [] for mid in meal_ids}
+    if not meal_ids:
+        return foods
+
+    query = select(
+        Food.fid, Food.mid, Food.food_name, Food.category, Food.calories, Food.nutrition_info,
+        _raw(Food.created_at), _raw(Food.updated_at)
+    ).where(Food.mid.in_(meal_ids)).order_by(Food.fid)
+
+    for row in db.session.execute(query):
+        foods[row.mid].append({
+            'fid': row.fid,
+            'mid': row.mid,
+            'food_name': row.food_name,
+            'category': row.category,
+            'calories': row.calories,
+            'nutrition_info': _nutrition_info(row.nutrition_info),
+            'created_at': _timestamp(row.created_at),
+            'updated_at': _timestamp(row.updated_at)
+        })
+    return foods
+
+
+def serialize_meal_rows(rows) -> List[Dict[str, Any]]:
+    """
+    meal_row_columns()로 조회한 행을 serialize_meal()과 같은 형식으로 변환
+
+    Args:
+        rows: 식사 프로젝션 행 목록
+
+    Returns:
+        List[Dict[str, Any]]: 식사 정보 목록
+    """
+    foods = _food_rows([row.mid for row in rows])
+    return [
+        {
+            'mid': row.mid,
+            'uid': row.uid,
+            'date': _date(row.date),
+            'meal_time': row.meal_time,
+            'content': row.content,
+            'has_image': bool(row.image_path) or bool(row.image_exists),
+            'image_path': row.image_path,
+            'created_at': _timestamp(row.created_at),
+            'updated_at': _timestamp(row.updated_at),
+            'foods': foods[row.mid]
+        }
+        for row in rows
+    ]
+
+
+def recommendation_row_columns() -> List[Any]:
+    """추천 목록 프로젝션 컬럼"""
+    return [
+        Recommendation.rid, Recommendation.uid, Recommendation.mid, Recommendation.fid,
+        Recommendation.reason, Recommendation.content, _raw(Recommendation.created_at)
+    ]
+
+
+def serialize_recommendation_rows(rows) -> List[Dict[str, Any]]:
+    """
+    recommendation_row_columns()로 조회한 행을 Recommendation.to_dict()와 같은 형식으로 변환
+
+    Args:
+        rows: 추천 프로젝션 행 목록
+
+    Returns:
+        List[Dict[str, Any]]: 추천 정보 목록
+    """
+    items = []
+    for row in rows:
+        data = {
+            'rid': row.rid,
+            'uid': row.uid,
+            'mid': row.mid,
+            'fid': row.fid,
+            'reason': row.reason,
+            'created_at': _timestamp(row.created_at)
+        }
+        # 추천 내용이 있는 경우 JSON 파싱 시도
+        if row.content:
+            try:
+                data['content'] = fast_json.loads(row.content)
+            except ValueError:
+                data['content'] = row.content
+        items.append(data)
+    return items
@@ -0,0 +1,34 @@
+"""
+세션 이벤트 공용 함수
+
+일일 합계, 검색 인덱스, 사용자 캐시는 Query.delete()/update() 같은 일괄 실행을
+do_orm_execute 이벤트에서 직접 추적한다. bind_mapper는 문장의 WHERE 절이나 하위 쿼리에
+나오는 모델로도 정해지므로(예: FTS 테이블 DELETE의 IN (SELECT food.fid ...)),
+대상 모델은 반드시 UPDATE/DELETE 문의 대상 테이블로 판단한다.
+"""
+from typing import Any, Iterable, Optional
+
+
+def bulk_statement_model(orm_execute_state, models: Iterable[Any]) -> Optional[Any]:
+    """
+    일괄 UPDATE/DELETE 문의 대상 테이블에 해당하는 모델
+
+    Args:
+        orm_execute_state: do_orm_execute 이벤트 상태
+        models (Iterable[Any]): 추적하는 모델 클래스
+
+    Returns:
+        Optional[Any]: 대상 모델 (UPDATE/DELETE가 아니거나 추적하지 않는 테이블이면 None)
+    """
+    if not (orm_execute_state.is_delete or orm_execute_state.is_update):
+        return None
+
+    table = getattr(orm_execute_state.statement, 'table', None)
+    name = getattr(table, 'name', None)
+    if name is None:
+        return None
+
+    for model in models:
+        if model.__table__.name == name:
+            return model
+    return None
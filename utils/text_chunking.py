@@ -0,0 +1,261 @@
+import os
+import re
+import json
+import hashlib
+import logging
+from typing import List, Dict, Any, Tuple, Optional, Iterable
+
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+from langchain.docstore.document import Document
+
+from utils.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+SIMHASH_BITS = 64
+# 64비트를 16비트 4개 밴드로 분할 → 해밍 거리 3 이하인 지문은 최소 1개 밴드가 일치
+SIMHASH_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+_WORD_PATTERN = re.compile(r'\w+')
+
+
+def _normalize(text: str) -> str:
+    """공백을 정리한 비교용 텍스트"""
+    return " ".join(text.split())
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    단어 n-gram(shingle) 기반 64비트 SimHash 계산
+
+    Args:
+        text (str): 텍스트
+        shingle_size (int): shingle 단어 수
+
+    Returns:
+        int: 64비트 지문
+    """
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return 0
+
+    if len(words) < shingle_size:
+        shingles = [" ".join(words)]
+    else:
+        shingles = [" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)]
+
+    weights = [0] * SIMHASH_BITS
+    for shingle in shingles:
+        # 프로세스 간에도 동일한 값이 나와야 하므로 내장 hash() 대신 blake2b 사용
+        h = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if (h >> bit) & 1 else -1
+
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """두 지문 사이의 해밍 거리"""
+    return bin(a ^ b).count("1")
+
+
+class SimHashIndex:
+    """밴드 버킷 기반 SimHash 근접 중복 색인"""
+
+    def __init__(self, max_distance: int = 3):
+        """
+        Args:
+            max_distance (int): 중복으로 판단할 최대 해밍 거리 (밴드 수 미만이어야 함)
+        """
+        if max_distance >= SIMHASH_BANDS:
+            raise ValueError(f"max_distance는 {SIMHASH_BANDS} 미만이어야 합니다.")
+        self.max_distance = max_distance
+        self.fingerprints: List[int] = []
+        self._buckets: List[Dict[int, List[int]]] = [{} for _ in range(SIMHASH_BANDS)]
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def add(self, fingerprint: int) -> None:
+        """지문 추가"""
+        self.fingerprints.append(fingerprint)
+        for band in range(SIMHASH_BANDS):
+            key = (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK
+            self._buckets[band].setdefault(key, []).append(fingerprint)
+
+    def find_near(self, fingerprint: int) -> Optional[int]:
+        """
+        근접 중복 지문 검색
+
+        Args:
+            fingerprint (int): 검색할 지문
+
+        Returns:
+            Optional[int]: 해밍 거리 max_distance 이하인 기존 지문 또는 None
+        """
+        for band in range(SIMHASH_BANDS):
+            key = (fingerprint >> (band * _BAND_BITS)) & _BAND_MASK
+            for candidate in self._buckets[band].get(key, ()):
+                if hamming_distance(fingerprint, candidate) <= self.max_distance:
+                    return candidate
+        return None
+
+
+class DocumentChunker:
+    """
+    토큰 예산 기반 문서 분할 및 근접 중복 제거
+
+    임베딩 호출 전에 배치 내부 중복과 기존 색인에 이미 있는 청크를 제거한다.
+    기존 색인의 지문은 fingerprint_path 파일에 저장된다.
+    """
+
+    def __init__(
+            self,
+            chunk_size: int = 400,
+            chunk_overlap: int = 40,
+            max_distance: int = 3,
+            fingerprint_path: Optional[str] = None
+    ):
+        """
+        Args:
+            chunk_size (int): 청크 최대 토큰 수
+            chunk_overlap (int): 청크 간 겹치는 토큰 수
+            max_distance (int): 근접 중복 판단 해밍 거리
+            fingerprint_path (Optional[str]): 기존 색인 지문 저장 파일 경로
+        """
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=count_tokens
+        )
+        self.fingerprint_path = fingerprint_path
+        self.index = SimHashIndex(max_distance=max_distance)
+        self._exact_hashes = set()
+        self._load_fingerprints()
+
+    def _load_fingerprints(self) -> None:
+        """저장된 기존 색인 지문 로드"""
+        if not self.fingerprint_path or not os.path.exists(self.fingerprint_path):
+            return
+        try:
+            with open(self.fingerprint_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for fingerprint in data.get("simhash", []):
+                self.index.add(int(fingerprint))
+            self._exact_hashes.update(data.get("exact", []))
+            logger.info(f"청크 지문 {len(self.index)}개 로드 완료")
+        except Exception as e:
+            logger.error(f"청크 지문 로드 오류: {str(e)}")
+
+    def _save_fingerprints(self) -> None:
+        """기존 색인 지문 저장"""
+        if not self.fingerprint_path:
+            return
+        try:
+            tmp_path = f"{self.fingerprint_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "simhash": self.index.fingerprints,
+                    "exact": sorted(self._exact_hashes)
+                }, f)
+            os.replace(tmp_path, self.fingerprint_path)
+        except Exception as e:
+            logger.error(f"청크 지문 저장 오류: {str(e)}")
+
+    def is_empty(self) -> bool:
+        """등록된 지문이 없는지 여부"""
+        return len(self.index) == 0
+
+    def seed(self, texts: Iterable[str]) -> None:
+        """
+        기존 색인 내용으로 지문 초기화 (지문 파일이 없던 색인용)
+
+        Args:
+            texts (Iterable[str]): 기존 청크 텍스트
+        """
+        self.commit([self._fingerprint(text) for text in texts if text])
+
+    def _fingerprint(self, text: str) -> Tuple[str, int]:
+        normalized = _normalize(text)
+        exact = hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+        return exact, simhash(normalized)
+
+    def split_documents(self, documents: List[Document]) -> Tuple[List[Document], List[Tuple[str, int]], Dict[str, Any]]:
+        """
+        문서를 토큰 단위로 분할하고 근접 중복 청크 제거
+
+        Args:
+            documents (List[Document]): 원본 문서 목록
+
+        Returns:
+            Tuple: (남은 청크, 커밋할 지문 목록, 제거 통계)
+        """
+        chunks = self.splitter.split_documents(documents)
+
+        kept: List[Document] = []
+        fingerprints: List[Tuple[str, int]] = []
+        batch_index = SimHashIndex(max_distance=self.index.max_distance)
+        batch_exact: Dict[str, int] = {}
+        batch_near: Dict[int, int] = {}
+        index_duplicates = 0
+        batch_duplicates = 0
+
+        for chunk in chunks:
+            if not chunk.page_content.strip():
+                continue
+
+            exact, fingerprint = self._fingerprint(chunk.page_content)
+
+            # 기존 색인과 중복 → 제거
+            if exact in self._exact_hashes or self.index.find_near(fingerprint) is not None:
+                index_duplicates += 1
+                continue
+
+            # 배치 내부 중복 → 먼저 나온 청크에 병합 (중복 횟수만 기록)
+            position = batch_exact.get(exact)
+            if position is None:
+                near = batch_index.find_near(fingerprint)
+                position = batch_near.get(near) if near is not None else None
+            if position is not None:
+                batch_duplicates += 1
+                kept_metadata = kept[position].metadata
+                kept_metadata["duplicate_count"] = kept_metadata.get("duplicate_count", 0) + 1
+                continue
+
+            batch_exact[exact] = len(kept)
+            batch_near.setdefault(fingerprint, len(kept))
+            batch_index.add(fingerprint)
+            fingerprints.append((exact, fingerprint))
+            kept.append(chunk)
+
+        total = len(kept) + index_duplicates + batch_duplicates
+        eliminated = index_duplicates + batch_duplicates
+        stats = {
+            "total_chunks": total,
+            "kept_chunks": len(kept),
+            "eliminated_chunks": eliminated,
+            "batch_duplicates": batch_duplicates,
+            "index_duplicates": index_duplicates,
+            "eliminated_percent": round(eliminated / total * 100, 1) if total else 0.0
+        }
+        return kept, fingerprints, stats
+
+    def commit(self, fingerprints: List[Tuple[str, int]]) -> None:
+        """
+        색인에 추가된 청크의 지문 등록 및 저장
+
+        Args:
+            fingerprints (List[Tuple[str, int]]): split_documents가 반환한 지문 목록
+        """
+        if not fingerprints:
+            return
+        for exact, fingerprint in fingerprints:
+            self._exact_hashes.add(exact)
+            self.index.add(fingerprint)
+        self._save_fingerprints()
@@ -0,0 +1,87 @@
+import re
+import logging
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken은 langchain-openai 설치 시 함께 설치됨
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# OpenAI 임베딩/채팅 모델이 사용하는 인코딩
+DEFAULT_ENCODING = "cl100k_base"
+
+# tiktoken이 없을 때 사용하는 근사 토큰 패턴 (한글 음절, 영숫자 덩어리, 기타 기호)
+_APPROX_TOKEN_PATTERN = re.compile(r'[가-힣]|[A-Za-z]+|\d+|[^\sA-Za-z\d가-힣]')
+
+_encoding = None
+_encoding_loaded = False
+
+
+def _get_encoding():
+    """tiktoken 인코딩 객체 반환 (최초 1회만 로드, 실패하면 다시 시도하지 않음)"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded and tiktoken is not None:
+        _encoding_loaded = True
+        try:
+            _encoding = tiktoken.get_encoding(DEFAULT_ENCODING)
+        except Exception as e:
+            logger.warning(f"tiktoken 인코딩 로드 실패, 근사 토큰 계산 사용: {str(e)}")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수 계산
+
+    Args:
+        text (str): 텍스트
+
+    Returns:
+        int: 토큰 수 (tiktoken이 없으면 근사값)
+    """
+    if not text:
+        return 0
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+
+    # 근사 계산: 영문 단어는 약 4글자당 1토큰, 한글 음절/숫자/기호는 1토큰
+    count = 0
+    for piece in _APPROX_TOKEN_PATTERN.findall(text):
+        if piece.isascii() and piece.isalpha():
+            count += (len(piece) + 3) // 4
+        elif piece.isdigit():
+            count += (len(piece) + 2) // 3
+        else:
+            count += 1
+    return count
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    텍스트를 최대 토큰 수 이내로 자르기 (앞부분 유지)
+
+    Args:
+        text (str): 텍스트
+        max_tokens (int): 최대 토큰 수
+
+    Returns:
+        str: 잘린 텍스트 (이미 짧으면 그대로)
+    """
+    if not text or max_tokens <= 0:
+        return ""
+
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text)
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+    # 근사 계산: 조각 단위로 누적해 예산을 넘기 직전 위치에서 자름
+    count = 0
+    for match in _APPROX_TOKEN_PATTERN.finditer(text):
+        count += count_tokens(match.group())
+        if count > max_tokens:
+            return text[:match.start()].rstrip()
+    return text